@@ -0,0 +1,99 @@
+"""
+Speed benchmark for auto-cropped (sparse) beam doses.
+
+Run with:
+    python benchmarks/bench_cropped_dose.py [--shape Z Y X] [--beams N] [--field F]
+
+A stereotactic-like plan is simulated with several small-field beam doses that
+each occupy a cube of side F (as a fraction of each axis) in the centre of the
+grid. Weighted summation, dose statistics, DVH value gathering and trilinear
+interpolation are timed with dense pixel data and again after Dose.crop().
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from pinnacle_io.models import Dose
+from pinnacle_io.utils.cropped_dose import CroppedVolume
+
+
+def make_beam_doses(shape, beams, field):
+    """Create small-field beam doses with slightly shifted fields."""
+    rng = np.random.default_rng(0)
+    doses = []
+    for i in range(beams):
+        pixel_data = np.zeros(shape, dtype=np.float32)
+        box = tuple(
+            slice(
+                int(n * (0.5 - field / 2)) + i % 2, int(n * (0.5 + field / 2)) + i % 2
+            )
+            for n in shape
+        )
+        pixel_data[box] = rng.random(pixel_data[box].shape, dtype=np.float32) + 1.0
+        doses.append(Dose(dose_id=str(i), pixel_data=pixel_data, dose_grid_scaling=1.0))
+    return doses
+
+
+def timed(func, repeat=3):
+    """Return the best wall time of several calls."""
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(doses, mask, points):
+    """Time the dose operations for the current pixel data representation."""
+    weights = np.linspace(0.5, 1.5, len(doses))
+    expression = sum(w * dose.lazy() for w, dose in zip(weights, doses))
+    first = doses[0].pixel_data
+    if not isinstance(first, CroppedVolume):
+        # An uncropped volume runs the same interpolation over the full grid
+        first = CroppedVolume(first, (0, 0, 0), first.shape)
+
+    return {
+        "sum": timed(lambda: expression.evaluate(chunk_size=32)),
+        "max/mean": timed(lambda: (doses[0].get_max_dose(), doses[0].get_mean_dose())),
+        "dvh values": timed(lambda: first.masked_values(mask)),
+        "interpolate": timed(lambda: first.interpolate(points)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--shape", type=int, nargs=3, default=(160, 256, 256))
+    parser.add_argument("--beams", type=int, default=8)
+    parser.add_argument("--field", type=float, default=0.25)
+    args = parser.parse_args()
+
+    shape = tuple(args.shape)
+    doses = make_beam_doses(shape, args.beams, args.field)
+    mask = np.zeros(shape, dtype=bool)
+    mask[tuple(slice(int(n * 0.4), int(n * 0.6)) for n in shape)] = True
+    points = np.random.default_rng(1).uniform(0, 1, (100_000, 3)) * (
+        np.array(shape[::-1]) - 1
+    )
+
+    dense = run(doses, mask, points)
+    for dose in doses:
+        dose.crop()
+    cropped = run(doses, mask, points)
+
+    print(
+        f"Grid {shape}, {args.beams} beams, occupancy "
+        f"{doses[0].pixel_data.occupancy:.1%} of the grid per beam"
+    )
+    print(f"{'operation':>12} {'dense ms':>9} {'cropped ms':>11} {'speedup':>8}")
+    for name, cropped_s in cropped.items():
+        dense_s = dense[name]
+        print(
+            f"{name:>12} {dense_s * 1e3:9.2f} {cropped_s * 1e3:11.2f} {dense_s / cropped_s:7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
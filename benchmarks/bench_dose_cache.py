@@ -0,0 +1,79 @@
+"""
+Size and speed benchmark for the compact dose cache format.
+
+Run with:
+    python benchmarks/bench_dose_cache.py [--shape Z Y X]
+
+A synthetic beam dose (a smooth field on an otherwise near-zero grid) is saved
+with each combination of storage dtype and codec, and the file size, save time,
+full load time, single-slab load time and maximum round-trip error are reported
+against the raw float32 volume.
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from pinnacle_io.models import Dose
+from pinnacle_io.utils.dose_cache import load_compact, load_compact_slab, save_compact
+
+
+def make_dose(shape):
+    """Create a synthetic beam-like dose distribution."""
+    z, y, x = np.meshgrid(
+        np.linspace(-1, 1, shape[0], dtype=np.float32),
+        np.linspace(-1, 1, shape[1], dtype=np.float32),
+        np.linspace(-1, 1, shape[2], dtype=np.float32),
+        indexing="ij",
+    )
+    field = (np.abs(x) < 0.4) & (np.abs(z) < 0.5)
+    pixel_data = np.where(field, 2.0 * np.exp(-(y + 1.0)), 0.02 * np.exp(-(x**2) * 8))
+    return Dose(pixel_data=pixel_data.astype(np.float32), dose_grid_scaling=1.0)
+
+
+def timed(func, *args, **kwargs):
+    """Return (result, seconds) for a single call."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--shape", type=int, nargs=3, default=(120, 200, 200))
+    args = parser.parse_args()
+
+    dose = make_dose(tuple(args.shape))
+    raw_bytes = dose.pixel_data.nbytes
+    print(
+        f"Dose shape {dose.pixel_data.shape}, raw float32 size {raw_bytes / 1e6:.2f} MB"
+    )
+    print(
+        f"{'dtype':>7} {'codec':>5} {'size MB':>8} {'ratio':>6} "
+        f"{'save s':>7} {'load s':>7} {'slab ms':>8} {'max err':>9}"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "dose.pcd"
+        for dtype in ("uint16", "uint32"):
+            for compression in ("zlib", "lzma"):
+                size, save_s = timed(
+                    save_compact, dose, path, dtype=dtype, compression=compression
+                )
+                loaded, load_s = timed(load_compact, path)
+                _, slab_s = timed(
+                    load_compact_slab, path, dose.pixel_data.shape[0] // 2
+                )
+                error = float(np.max(np.abs(loaded.pixel_data - dose.pixel_data)))
+                print(
+                    f"{dtype:>7} {compression:>5} {size / 1e6:8.2f} "
+                    f"{raw_bytes / size:6.1f} {save_s:7.2f} {load_s:7.2f} "
+                    f"{slab_s * 1e3:8.2f} {error:9.2e}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,37 +5,46 @@ from pinnacle_io.models.cp_manager import CPManager
 from pinnacle_io.models.dose import Dose, MaxDosePoint
 from pinnacle_io.models.dose_engine import DoseEngine
 from pinnacle_io.models.dose_grid import DoseGrid
+from pinnacle_io.models.image_info import ImageInfo, ImageInfoTable
 from pinnacle_io.models.image_set import ImageSet
-from pinnacle_io.models.image_info import ImageInfo
 from pinnacle_io.models.institution import Institution
-from pinnacle_io.models.machine import Machine, ElectronApplicator
+from pinnacle_io.models.machine import ElectronApplicator, Machine
 from pinnacle_io.models.machine_angle import (
+    CollimatorAngle,
     CouchAngle,
     GantryAngle,
-    CollimatorAngle,
 )
 from pinnacle_io.models.machine_config import ConfigRV, TolTable
-from pinnacle_io.models.machine_energy import MachineEnergy, PhotonEnergy, ElectronEnergy, PhysicsData, OutputFactor
-from pinnacle_io.models.mlc import MLCLeafPositions, MultiLeaf, MLCLeafPair
+from pinnacle_io.models.machine_energy import (
+    ElectronEnergy,
+    MachineEnergy,
+    OutputFactor,
+    PhotonEnergy,
+    PhysicsData,
+)
+from pinnacle_io.models.mlc import MLCLeafPair, MLCLeafPositions, MultiLeaf
 from pinnacle_io.models.monitor_unit_info import MonitorUnitInfo
-from pinnacle_io.models.patient_representation import PatientRepresentation
-from pinnacle_io.models.patient_setup import PatientSetup
 from pinnacle_io.models.patient import Patient
 from pinnacle_io.models.patient_lite import PatientLite
+from pinnacle_io.models.patient_representation import PatientRepresentation
+from pinnacle_io.models.patient_setup import PatientSetup
 from pinnacle_io.models.plan import Plan
 from pinnacle_io.models.point import Point
 from pinnacle_io.models.prescription import Prescription
-from pinnacle_io.models.roi import ROI, Curve
+from pinnacle_io.models.roi import ROI, Curve, RaggedCurves
 from pinnacle_io.models.trial import Trial
 from pinnacle_io.models.types import (
-    JsonList,
-    VoxelSize,
-    VolumeSize,
-    Coordinate,
-    Index,
     ContinuousIndex,
+    Coordinate,
+    CoordinateArray,
     Dimension,
+    Index,
+    IndexArray,
+    JsonList,
+    VolumeSize,
+    VoxelSize,
 )
+from pinnacle_io.models.volume import Volume
 from pinnacle_io.models.wedge_context import WedgeContext
 
 __all__ = [
@@ -49,6 +58,8 @@ __all__ = [
     "Coordinate",
     "Curve",
     "Dimension",
+    "CoordinateArray",
+    "IndexArray",
     "Dose",
     "DoseEngine",
     "DoseGrid",
@@ -56,6 +67,7 @@ __all__ = [
     "ElectronEnergy",
     "GantryAngle",
     "ImageInfo",
+    "ImageInfoTable",
     "ImageSet",
     "Index",
     "Institution",
@@ -84,9 +96,11 @@ __all__ = [
     "Point",
     "Prescription",
     "ROI",
+    "RaggedCurves",
     "TableMotionEnum",
     "TolTable",
     "Trial",
     "Vector",
+    "Volume",
     "WedgeContext",
 ]
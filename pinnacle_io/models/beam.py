@@ -7,24 +7,26 @@ beam modifiers like wedges and MLCs.
 """
 
 from __future__ import annotations
-from typing import Optional, List, TYPE_CHECKING, TypeVar, Any
 
-from sqlalchemy import Column, String, Integer, ForeignKey, Float
+from typing import TYPE_CHECKING, Any, List, Optional, TypeVar
+
+import numpy as np
+from sqlalchemy import Column, Float, ForeignKey, Integer, String
 from sqlalchemy.orm import Mapped, relationship
 
 from pinnacle_io.models.pinnacle_base import PinnacleBase
 
 if TYPE_CHECKING:
+    from pinnacle_io.models.compensator import Compensator
     from pinnacle_io.models.control_point import ControlPoint
-    from pinnacle_io.models.trial import Trial
+    from pinnacle_io.models.cp_manager import CPManager
     from pinnacle_io.models.dose import Dose, MaxDosePoint
-    from pinnacle_io.models.compensator import Compensator
     from pinnacle_io.models.dose_engine import DoseEngine
     from pinnacle_io.models.monitor_unit_info import MonitorUnitInfo
-    from pinnacle_io.models.cp_manager import CPManager
+    from pinnacle_io.models.trial import Trial
 
 # Type variable for the Beam class to support better type hints
-B = TypeVar('B', bound='Beam')
+B = TypeVar("B", bound="Beam")
 
 
 class Beam(PinnacleBase):
@@ -43,7 +45,7 @@ class Beam(PinnacleBase):
         modality (str): Beam modality (e.g., "PHOTON", "ELECTRON")
         machine_energy_name (str): Name of the machine energy for this beam
         monitor_units (float): Number of monitor units for this beam
-        
+
     Relationships:
         trial (Trial): Parent trial that this beam belongs to
         control_point_list (List[ControlPoint]): List of control points defining this beam
@@ -60,10 +62,14 @@ class Beam(PinnacleBase):
     # Identification and basic info
     name: Mapped[Optional[str]] = Column("Name", String, nullable=True)
     beam_number: Mapped[Optional[int]] = Column("BeamNumber", Integer, nullable=True)
-    isocenter_name: Mapped[Optional[str]] = Column("IsocenterName", String, nullable=True)
-    
+    isocenter_name: Mapped[Optional[str]] = Column(
+        "IsocenterName", String, nullable=True
+    )
+
     # Prescription and dose
-    prescription_name: Mapped[Optional[str]] = Column("PrescriptionName", String, nullable=True)
+    prescription_name: Mapped[Optional[str]] = Column(
+        "PrescriptionName", String, nullable=True
+    )
     use_poi_for_prescription_point: Mapped[Optional[int]] = Column(
         "UsePoiForPrescriptionPoint", Integer, nullable=True
     )
@@ -283,56 +289,42 @@ class Beam(PinnacleBase):
     _monitor_units: Mapped[float] = Column(
         "MonitorUnits", Float, nullable=True, default=0.0
     )
-    
+
     # Relationships
     trial_id: Mapped[Optional[int]] = Column("TrialID", Integer, ForeignKey("Trial.ID"))
-    trial: Mapped[Optional["Trial"]] = relationship(
-        "Trial", 
-        back_populates="beam_list"
-    )
-    
+    trial: Mapped[Optional["Trial"]] = relationship("Trial", back_populates="beam_list")
+
     # One-to-many relationships (parent side)
     control_point_list: Mapped[List["ControlPoint"]] = relationship(
-        "ControlPoint", 
-        back_populates="beam", 
-        cascade="all, delete-orphan"
+        "ControlPoint", back_populates="beam", cascade="all, delete-orphan"
     )
-    
+
     # One-to-one relationships
     compensator: Mapped[Optional["Compensator"]] = relationship(
         "Compensator",
         back_populates="beam",
         uselist=False,
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
     )
     cp_manager: Mapped[Optional["CPManager"]] = relationship(
-        "CPManager", 
-        back_populates="beam", 
-        uselist=False, 
-        cascade="all, delete-orphan"
+        "CPManager", back_populates="beam", uselist=False, cascade="all, delete-orphan"
     )
     dose: Mapped[Optional["Dose"]] = relationship(
-        "Dose", 
-        back_populates="beam", 
-        uselist=False, 
-        cascade="all, delete-orphan"
+        "Dose", back_populates="beam", uselist=False, cascade="all, delete-orphan"
     )
     dose_engine: Mapped[Optional["DoseEngine"]] = relationship(
-        "DoseEngine", 
-        back_populates="beam", 
-        uselist=False, 
-        cascade="all, delete-orphan"
+        "DoseEngine", back_populates="beam", uselist=False, cascade="all, delete-orphan"
     )
     max_dose_point: Mapped[Optional["MaxDosePoint"]] = relationship(
-        "MaxDosePoint", 
-        back_populates="beam", 
+        "MaxDosePoint",
+        back_populates="beam",
         uselist=False,
     )
     monitor_unit_info: Mapped[Optional["MonitorUnitInfo"]] = relationship(
         "MonitorUnitInfo",
         back_populates="beam",
         uselist=False,
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
     )
 
     def __init__(self, **kwargs: Any) -> None:
@@ -348,7 +340,7 @@ class Beam(PinnacleBase):
                 - modality: Beam modality (e.g., "PHOTON", "ELECTRON")
                 - machine_energy_name: Name of the machine energy
                 - monitor_units: Number of monitor units
-        
+
         Note:
             This constructor is typically called by SQLAlchemy during object loading.
             For creating new beams programmatically, consider using the appropriate
@@ -359,11 +351,13 @@ class Beam(PinnacleBase):
     def __repr__(self) -> str:
         """
         Return a string representation of this beam.
-        
+
         Returns:
             str: A string containing the beam's ID, number, name, and modality.
         """
-        return f"<Beam(id={self.id}, beam_number={self.beam_number}, name='{self.name}')>"
+        return (
+            f"<Beam(id={self.id}, beam_number={self.beam_number}, name='{self.name}')>"
+        )
 
     def add_control_point(self, control_point: "ControlPoint") -> None:
         """
@@ -452,6 +446,20 @@ class Beam(PinnacleBase):
 
         return False
 
+    def get_mlc_leaf_positions(self) -> Optional[np.ndarray]:
+        """
+        Get the MLC leaf positions of all control points as one array.
+
+        The array is cached on the CPManager. See CPManager.get_mlc_leaf_positions.
+
+        Returns:
+            float32 array of shape (n_control_points, n_leaf_pairs, 2) in cm, or None if
+            the beam has no CPManager.
+        """
+        if not self.cp_manager:
+            return None
+        return self.cp_manager.get_mlc_leaf_positions()
+
     def has_mlc(self) -> bool:
         """
         Check if this beam has MLC positions.
@@ -7,16 +7,18 @@ including gantry, couch, and collimator movement settings.
 """
 
 from __future__ import annotations
-from typing import TYPE_CHECKING, List, Any
 
-from sqlalchemy import Column, String, Integer, ForeignKey
+from typing import TYPE_CHECKING, Any, ClassVar, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import Column, ForeignKey, Integer, String
 from sqlalchemy.orm import Mapped, relationship
 
 from pinnacle_io.models.pinnacle_base import PinnacleBase
 
 if TYPE_CHECKING:
-    from pinnacle_io.models.control_point import ControlPoint
     from pinnacle_io.models.beam import Beam
+    from pinnacle_io.models.control_point import ControlPoint
 
 
 class CPManager(PinnacleBase):
@@ -38,7 +40,7 @@ class CPManager(PinnacleBase):
         gantry_is_ccw (int): Gantry rotation direction (1 for counter-clockwise)
         mlc_push_method (str): MLC push method configuration
         jaws_conformance (str): Jaws conformance configuration
-        
+
     Relationships:
         beam (Beam): The parent beam that this manager belongs to
         control_point_list (List[ControlPoint]): List of control points managed by this manager
@@ -78,6 +80,10 @@ class CPManager(PinnacleBase):
         "ControlPoint", back_populates="cp_manager", cascade="all, delete-orphan"
     )
 
+    # (key, array) of the stacked leaf positions; the key holds the MLCLeafPositions of
+    # each control point and their position arrays, compared by identity
+    _mlc_leaf_position_array: ClassVar[Optional[Tuple[tuple, np.ndarray]]] = None
+
     def __init__(self, **kwargs: Any) -> None:
         """
         Initialize a CPManager instance.
@@ -89,7 +95,7 @@ class CPManager(PinnacleBase):
                 - control_point_list: Optional[List[ControlPoint]] - List of control points
         """
         # Initialize control point list if provided
-        self.control_point_list = kwargs.pop('control_point_list', [])
+        self.control_point_list = kwargs.pop("control_point_list", [])
         super().__init__(**kwargs)
 
     def __repr__(self) -> str:
@@ -100,7 +106,7 @@ class CPManager(PinnacleBase):
             str: A string representation in the format:
                 <CPManager(id=X, beam='beam_name', number_of_control_points=Y)>
         """
-        beam_name = getattr(getattr(self, 'beam', ''), 'name', '')
+        beam_name = getattr(getattr(self, "beam", ""), "name", "")
         return (
             f"<CPManager(id={self.id}, "
             f"beam='{beam_name}', "
@@ -116,7 +122,7 @@ class CPManager(PinnacleBase):
             int: The number of control points in the control_point_list.
                 Returns 0 if control_point_list is None.
         """
-        if not hasattr(self, 'control_point_list') or self.control_point_list is None:
+        if not hasattr(self, "control_point_list") or self.control_point_list is None:
             return 0
         return len(self.control_point_list)
 
@@ -136,38 +142,93 @@ class CPManager(PinnacleBase):
         if not isinstance(value, int) or value < 0:
             raise ValueError("Number of control points must be a non-negative integer")
         self._number_of_control_points = value
-        
-    def add_control_point(self, control_point: 'ControlPoint') -> None:
+
+    def get_mlc_leaf_positions(self) -> np.ndarray:
+        """
+        Get the MLC leaf positions of all control points as one array.
+
+        The array is built once and cached until a control point is added or removed or
+        the leaf positions of a control point are replaced. The leaf positions of each
+        control point become views into this array, so in-place changes to either are
+        shared, and they are written to the stored positions when the session is flushed
+        or committed.
+
+        Returns:
+            float32 array of shape (n_control_points, n_leaf_pairs, 2) in cm. Control
+            points without MLC positions are NaN.
+
+        Raises:
+            ValueError: If the control points have different numbers of leaf pairs.
+        """
+        positions = [cp._mlc_leaf_positions for cp in self.control_point_list]
+        key = tuple(
+            item
+            for mlc in positions
+            for item in (mlc, None if mlc is None else mlc._points)
+        )
+        cached = self._mlc_leaf_position_array
+        if (
+            cached is not None
+            and len(cached[0]) == len(key)
+            and all(a is b for a, b in zip(cached[0], key))
+        ):
+            return cached[1]
+
+        points = [None if mlc is None else mlc.points for mlc in positions]
+        shapes = {p.shape for p in points if p is not None}
+        if len(shapes) > 1:
+            raise ValueError(
+                f"Control points have different MLC leaf position shapes: {sorted(shapes)}"
+            )
+        n_pairs, n_dims = shapes.pop() if shapes else (0, 2)
+        array = np.full((len(points), n_pairs, n_dims), np.nan, dtype=np.float32)
+        for i, (mlc, value) in enumerate(zip(positions, points)):
+            if value is not None:
+                array[i] = value
+                mlc._points = array[i]
+
+        key = tuple(
+            item
+            for mlc in positions
+            for item in (mlc, None if mlc is None else mlc._points)
+        )
+        self._mlc_leaf_position_array = (key, array)
+        return array
+
+    def add_control_point(self, control_point: "ControlPoint") -> None:
         """
         Add a control point to this manager.
 
         Args:
             control_point: The ControlPoint instance to add.
                 The control point will be associated with this manager.
-                
+
         Raises:
             TypeError: If control_point is not a ControlPoint instance
             ValueError: If the control point is already associated with another manager
         """
         if not isinstance(control_point, ControlPoint):
             raise TypeError("control_point must be an instance of ControlPoint")
-            
+
         if control_point in self.control_point_list:
             return  # Already in the list
-            
-        if control_point.cp_manager is not None and control_point.cp_manager is not self:
+
+        if (
+            control_point.cp_manager is not None
+            and control_point.cp_manager is not self
+        ):
             raise ValueError("Control point is already associated with another manager")
-            
+
         self.control_point_list.append(control_point)
         control_point.cp_manager = self
-        
-    def remove_control_point(self, control_point: 'ControlPoint') -> None:
+
+    def remove_control_point(self, control_point: "ControlPoint") -> None:
         """
         Remove a control point from this manager.
-        
+
         Args:
             control_point: The ControlPoint instance to remove.
-            
+
         Returns:
             bool: True if the control point was removed, False if it wasn't found
         """
@@ -4,16 +4,23 @@ Dose model for Pinnacle IO.
 This module provides the Dose data model for representing dose distribution data.
 """
 
-from typing import Any, ClassVar, List, Optional, Tuple, TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, ClassVar, Dict, List, Optional, Tuple
+
 import numpy as np
-from sqlalchemy import Column, Integer, String, Float, ForeignKey
+from sqlalchemy import Column, Float, ForeignKey, Integer, String
 from sqlalchemy.orm import Mapped, relationship
 
 from pinnacle_io.models.pinnacle_base import PinnacleBase
+from pinnacle_io.models.volume import Volume
 
 if TYPE_CHECKING:
-    from pinnacle_io.models.trial import DoseGrid, Trial
     from pinnacle_io.models.beam import Beam
+    from pinnacle_io.models.roi import ROI
+    from pinnacle_io.models.trial import DoseGrid, Trial
+    from pinnacle_io.utils.cropped_dose import CroppedVolume
+    from pinnacle_io.utils.dose_expression import DoseExpression
+    from pinnacle_io.utils.dose_index import SortedDoseIndex
+    from pinnacle_io.utils.frames import FrameRegistry
 
 
 class Dose(PinnacleBase):
@@ -110,11 +117,11 @@ class Dose(PinnacleBase):
 
     # Child relationship
     max_dose_point: Mapped[Optional["MaxDosePoint"]] = relationship(
-        "MaxDosePoint", 
-        back_populates="dose", 
+        "MaxDosePoint",
+        back_populates="dose",
         uselist=False,
         cascade="all, delete-orphan",
-        lazy="joined"
+        lazy="joined",
     )
 
     # For storing serialized pixel data (optional, could use external storage)
@@ -123,6 +130,12 @@ class Dose(PinnacleBase):
 
     # Transient attributes (not stored in database)
     _pixel_data: ClassVar[Optional[np.ndarray]] = None
+    _source_path: ClassVar[Optional[str]] = None
+    # Sorted-dose indices keyed by id(roi):
+    # (roi, ROI content hash or mask, pixel_data, dose_grid_scaling, index)
+    _dose_index_cache: ClassVar[Optional[Dict[int, Tuple[Any, Any, Any, Any, Any]]]] = (
+        None
+    )
 
     def __init__(self, **kwargs: Any) -> None:
         """Initialize a Dose instance with optional attributes and relationships.
@@ -189,6 +202,29 @@ class Dose(PinnacleBase):
     def pixel_data(self, value: Optional[np.ndarray]) -> None:
         """Set the pixel data."""
         self._pixel_data = value
+        self.clear_dose_index_cache()
+
+    @property
+    def volume(self) -> Optional[Volume]:
+        """Get the pixel data as a (z, y, x) Volume, or None if it is not loaded."""
+        if self.pixel_data is None:
+            return None
+        return Volume(self.pixel_data)
+
+    @volume.setter
+    def volume(self, value) -> None:
+        """Set the pixel data from a Volume or a (z, y, x) array."""
+        self.pixel_data = value.array if isinstance(value, Volume) else value
+
+    @property
+    def source_path(self) -> Optional[str]:
+        """Get the path of the binary dose file used for on-demand slice reads."""
+        return self._source_path
+
+    @source_path.setter
+    def source_path(self, value: Optional[str]) -> None:
+        """Set the path of the binary dose file used for on-demand slice reads."""
+        self._source_path = None if value is None else str(value)
 
     def get_dose_dimensions(self) -> Tuple[int, int, int]:
         """
@@ -242,17 +278,29 @@ class Dose(PinnacleBase):
         Args:
             slice_index: Index of the slice to retrieve.
 
+        If the pixel data has not been loaded but the Dose has a source_path (e.g. it was
+        read with DoseReader.read_beam_dose(..., lazy=True)), only the requested axial slice
+        is read from the binary dose file.
+
         Returns:
             2D numpy array of dose data for the specified slice, or None if dose data is not available.
         """
         if self.pixel_data is None:
-            return None
+            if self.source_path is None or self.dose_grid is None:
+                return None
+            if not 0 <= slice_index < self.get_dose_dimensions()[2]:
+                return None
+            from pinnacle_io.readers.dose_reader import DoseReader
+
+            return DoseReader.read_slices(
+                self.source_path, self.dose_grid, [slice_index]
+            )[0]
 
         dimensions = self.get_dose_dimensions()
-        if slice_index >= dimensions[2]:
+        if not 0 <= slice_index < dimensions[2]:
             return None
 
-        return self.pixel_data[:, :, slice_index]
+        return self.volume.axial(slice_index)
 
     def set_slice_data(self, slice_index: int, data: np.ndarray) -> None:
         """
@@ -260,18 +308,17 @@ class Dose(PinnacleBase):
 
         Args:
             slice_index: Index of the slice to set.
-            data: 2D numpy array of dose data for the slice.
+            data: 2D numpy array of dose data for the slice, in (y, x) order.
         """
-        dimensions = self.get_dose_dimensions()
+        x_dim, y_dim, z_dim = self.get_dose_dimensions()
 
         if self.pixel_data is None:
             # Initialize dose data array if it doesn't exist
-            self.pixel_data = np.zeros(
-                (dimensions[0], dimensions[1], dimensions[2]), dtype=data.dtype
-            )
+            self.pixel_data = np.zeros((z_dim, y_dim, x_dim), dtype=data.dtype)
 
-        if slice_index < dimensions[2]:
-            self.pixel_data[:, :, slice_index] = data
+        if 0 <= slice_index < z_dim:
+            self.volume[slice_index] = data
+            self.clear_dose_index_cache()
 
     def get_dose_value(self, x: int, y: int, z: int) -> Optional[float]:
         """
@@ -285,21 +332,11 @@ class Dose(PinnacleBase):
         Returns:
             Dose value at the specified grid point, or None if coordinates are out of bounds or dose data is not available.
         """
-        if self.pixel_data is None:
-            return None
-
-        dimensions = self.get_dose_dimensions()
-        if (
-            x < 0
-            or x >= dimensions[0]
-            or y < 0
-            or y >= dimensions[1]
-            or z < 0
-            or z >= dimensions[2]
-        ):
+        volume = self.volume
+        if volume is None or not volume.contains(x, y, z):
             return None
 
-        return float(self.pixel_data[x, y, z] * self.dose_grid_scaling)
+        return float(volume.get_value(x, y, z) * self.dose_grid_scaling)
 
     def get_max_dose(self) -> Optional[float]:
         """
@@ -337,6 +374,331 @@ class Dose(PinnacleBase):
 
         return float(np.mean(self.pixel_data) * self.dose_grid_scaling)
 
+    def get_dose_index(
+        self, roi: "ROI", mask: Optional[np.ndarray] = None
+    ) -> "SortedDoseIndex":
+        """
+        Get the cached sorted-dose index of the voxels inside an ROI.
+
+        The index is built once per (Dose, ROI) and reused for Vx/Dx queries until the
+        ROI curves, the pixel data or the dose_grid_scaling of this Dose change.
+
+        Args:
+            roi: ROI whose voxels are indexed.
+            mask: Boolean (or fractional) mask of the ROI on the dose grid, with the same
+                shape as the pixel data, or a FractionalMask. If given, the index is
+                always rebuilt from it, and reused by later calls without a mask only
+                if the ROI has no curves. Defaults to the ROI curves rasterized on the
+                dose grid.
+
+        Returns:
+            SortedDoseIndex for the ROI.
+        """
+        from pinnacle_io.utils.dose_index import SortedDoseIndex
+        from pinnacle_io.utils.roi_mask import roi_content_hash
+
+        cache = self._dose_index_cache
+        if mask is None:
+            source = roi_content_hash(roi) if roi.curve_list else None
+            entry = cache.get(id(roi)) if cache else None
+            if (
+                entry is not None
+                and entry[0] is roi
+                # Without curves, the index built from the last mask is reused
+                and (
+                    entry[1] is not None
+                    if source is None
+                    else isinstance(entry[1], str) and entry[1] == source
+                )
+                and entry[2] is self.pixel_data
+                and entry[3] == self.dose_grid_scaling
+            ):
+                return entry[4]
+        else:
+            source = mask
+
+        if self.pixel_data is None:
+            raise ValueError("Dose has no pixel data to index.")
+        if mask is None:
+            if self.dose_grid is None or source is None:
+                raise ValueError(f"A mask is required to index ROI '{roi.name}'.")
+            mask = roi.get_mask(self.dose_grid)
+
+        voxel_volume = 1.0
+        if self.dose_grid is not None and self.dose_grid.voxel_size_x is not None:
+            voxel_volume = float(np.prod(self.get_dose_grid_resolution()))
+        index = SortedDoseIndex.from_mask(
+            self.pixel_data,
+            mask,
+            scaling=(
+                self.dose_grid_scaling if self.dose_grid_scaling is not None else 1.0
+            ),
+            voxel_volume=voxel_volume,
+        )
+        if cache is None:
+            cache = self._dose_index_cache = {}
+        cache[id(roi)] = (roi, source, self.pixel_data, self.dose_grid_scaling, index)
+        return index
+
+    def get_volume_at_dose(
+        self,
+        roi: "ROI",
+        dose: float,
+        relative: bool = False,
+        mask: Optional[np.ndarray] = None,
+    ) -> float:
+        """
+        Vx: volume of an ROI receiving at least the given dose.
+
+        Args:
+            roi: ROI to evaluate.
+            dose: Dose threshold.
+            relative: If True, return the fraction of the ROI volume (0 to 1).
+            mask: ROI mask used to build the sorted-dose index if it is not cached.
+
+        Returns:
+            Volume in cm^3 (or a fraction if relative).
+        """
+        return self.get_dose_index(roi, mask).volume_receiving(dose, relative=relative)
+
+    def get_dose_at_volume(
+        self,
+        roi: "ROI",
+        volume: float,
+        relative: bool = False,
+        mask: Optional[np.ndarray] = None,
+    ) -> float:
+        """
+        Dx: minimum dose received by the hottest volume of an ROI.
+
+        Args:
+            roi: ROI to evaluate.
+            volume: Volume in cm^3 (or a fraction 0 to 1 if relative).
+            relative: If True, volume is a fraction of the ROI volume.
+            mask: ROI mask used to build the sorted-dose index if it is not cached.
+
+        Returns:
+            Dose to the hottest volume.
+        """
+        return self.get_dose_index(roi, mask).dose_to_volume(volume, relative=relative)
+
+    def interpolate(
+        self,
+        points: Any,
+        frame: str = "patient",
+        registry: Optional["FrameRegistry"] = None,
+    ) -> np.ndarray:
+        """
+        Trilinearly interpolate the dose at (N, 3) points.
+
+        Args:
+            points: (N, 3) points.
+            frame: Frame of the points. Frames other than "patient" are looked up in
+                registry, e.g. "image" voxel indices or "dicom" coordinates.
+            registry: FrameRegistry defining frame.
+
+        Returns:
+            Dose at each point (after dose_grid_scaling), 0 outside the dose grid.
+        """
+        from pinnacle_io.utils.frames import PATIENT, interpolate
+
+        if self.pixel_data is None or self.dose_grid is None:
+            raise ValueError("Dose has no pixel data or dose grid to interpolate.")
+        if frame != PATIENT:
+            if registry is None:
+                raise ValueError(
+                    f"A FrameRegistry is required for points in frame '{frame}'."
+                )
+            points = registry.transform(points, frame, PATIENT)
+        values = interpolate(self.pixel_data, points, self.dose_grid)
+        return values * (
+            self.dose_grid_scaling if self.dose_grid_scaling is not None else 1.0
+        )
+
+    def resample(self, grid: Any, fill_value: float = 0.0) -> np.ndarray:
+        """
+        Linearly resample the dose onto another axis-aligned grid, e.g. the CT grid.
+
+        Args:
+            grid: Target grid (ImageSet, DoseGrid or GridGeometry).
+            fill_value: Value of target voxels outside the dose grid.
+
+        Returns:
+            (z, y, x) array of the dose on the target grid (after dose_grid_scaling).
+        """
+        from pinnacle_io.utils.frames import resample
+
+        if self.pixel_data is None or self.dose_grid is None:
+            raise ValueError("Dose has no pixel data or dose grid to resample.")
+        scaling = self.dose_grid_scaling if self.dose_grid_scaling is not None else 1.0
+        return (
+            resample(self.pixel_data, self.dose_grid, grid, fill_value / scaling)
+            * scaling
+        )
+
+    def clear_dose_index_cache(self) -> None:
+        """Discard all cached sorted-dose indices for this dose."""
+        self._dose_index_cache = None
+
+    def get_number_of_fractions(self) -> Optional[int]:
+        """
+        Get the number of fractions from the prescriptions of the associated trial.
+
+        The trial is taken from the dose itself, its beam, or its dose grid.
+
+        Returns:
+            Number of fractions, or None if no prescription defines it.
+        """
+        trial = self.trial
+        if trial is None and self.beam is not None:
+            trial = self.beam.trial
+        if trial is None and self.dose_grid is not None:
+            trial = self.dose_grid.trial
+        return trial.number_of_fractions if trial is not None else None
+
+    def to_bed(
+        self,
+        number_of_fractions: Optional[int] = None,
+        alpha_beta: float = 10.0,
+        roi_alpha_beta: Optional[Dict["ROI", float]] = None,
+        masks: Optional[Dict["ROI", np.ndarray]] = None,
+    ) -> "Dose":
+        """
+        Convert this physical dose to biologically effective dose (BED).
+
+        See pinnacle_io.utils.biological_dose.compute_bed for details.
+
+        Args:
+            number_of_fractions: Number of fractions. Defaults to the trial prescriptions.
+            alpha_beta: Default alpha/beta ratio in Gy.
+            roi_alpha_beta: Alpha/beta ratio per ROI in Gy.
+            masks: Mask on the dose grid for each ROI in roi_alpha_beta.
+
+        Returns:
+            New Dose with dose_type "EFFECTIVE".
+        """
+        from pinnacle_io.utils.biological_dose import compute_bed
+
+        return compute_bed(self, number_of_fractions, alpha_beta, roi_alpha_beta, masks)
+
+    def to_eqd2(
+        self,
+        number_of_fractions: Optional[int] = None,
+        alpha_beta: float = 10.0,
+        roi_alpha_beta: Optional[Dict["ROI", float]] = None,
+        masks: Optional[Dict["ROI", np.ndarray]] = None,
+    ) -> "Dose":
+        """
+        Convert this physical dose to the equivalent dose in 2 Gy fractions (EQD2).
+
+        See pinnacle_io.utils.biological_dose.compute_eqd2 for details.
+
+        Args:
+            number_of_fractions: Number of fractions. Defaults to the trial prescriptions.
+            alpha_beta: Default alpha/beta ratio in Gy.
+            roi_alpha_beta: Alpha/beta ratio per ROI in Gy.
+            masks: Mask on the dose grid for each ROI in roi_alpha_beta.
+
+        Returns:
+            New Dose with dose_type "EFFECTIVE".
+        """
+        from pinnacle_io.utils.biological_dose import compute_eqd2
+
+        return compute_eqd2(
+            self, number_of_fractions, alpha_beta, roi_alpha_beta, masks
+        )
+
+    def crop(self, threshold: float = 0.0, margin: int = 0) -> "CroppedVolume":
+        """
+        Replace the pixel data with a CroppedVolume holding only the occupied region.
+
+        The bounding box covers voxels whose dose exceeds the threshold. Access to the
+        pixel data is transparently padded with zeros outside the box, while dose
+        summation, statistics and interpolation only visit the occupied region.
+        See pinnacle_io.utils.cropped_dose for details.
+
+        Args:
+            threshold: Dose (after dose_grid_scaling) above which voxels are kept.
+            margin: Number of voxels added on each side of the bounding box.
+
+        Returns:
+            The CroppedVolume now used as pixel data.
+        """
+        from pinnacle_io.utils.cropped_dose import CroppedVolume
+
+        if self.pixel_data is None:
+            raise ValueError("Dose has no pixel data to crop.")
+        scaling = self.dose_grid_scaling or 1.0
+        cropped = CroppedVolume.from_array(
+            self.pixel_data, threshold=threshold / scaling, margin=margin
+        )
+        self.pixel_data = cropped
+        return cropped
+
+    def lazy(self) -> "DoseExpression":
+        """
+        Return a lazy expression for this dose.
+
+        Expressions support +, -, scalar * and /, maximum() and clip(), and are evaluated
+        chunk by chunk along z. See pinnacle_io.utils.dose_expression for details.
+
+        Returns:
+            DoseExpression wrapping this dose (values in dose units).
+        """
+        from pinnacle_io.utils.dose_expression import DoseTerm
+
+        return DoseTerm(self)
+
+    def save_compact(
+        self,
+        path: str,
+        dtype: str = "auto",
+        compression: str = "zlib",
+        level: int = 6,
+        tolerance: Optional[float] = None,
+    ) -> int:
+        """
+        Save the pixel data in the compact quantized, slab-compressed format.
+
+        See pinnacle_io.utils.dose_cache.save_compact for details.
+
+        Args:
+            path: Destination file path.
+            dtype: Quantized storage type ("uint16", "uint32" or "auto").
+            compression: Slab compression codec ("zlib" or "lzma").
+            level: Compression level.
+            tolerance: Maximum absolute round-trip error in dose units, or None.
+
+        Returns:
+            Number of bytes written.
+        """
+        from pinnacle_io.utils.dose_cache import save_compact
+
+        return save_compact(
+            self,
+            path,
+            dtype=dtype,
+            compression=compression,
+            level=level,
+            tolerance=tolerance,
+        )
+
+    @classmethod
+    def load_compact(cls, path: str, dose_grid: Optional["DoseGrid"] = None) -> "Dose":
+        """
+        Load a Dose previously written with save_compact.
+
+        Args:
+            path: Path to the compact dose file.
+            dose_grid: Optional DoseGrid to associate with the loaded dose.
+
+        Returns:
+            Dose with float32 pixel data.
+        """
+        from pinnacle_io.utils.dose_cache import load_compact
+
+        return load_compact(path, dose_grid=dose_grid)
+
     def __repr__(self) -> str:
         """
         Return a string representation of this dose.
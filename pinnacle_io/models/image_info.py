@@ -2,8 +2,10 @@
 SQLAlchemy model for Pinnacle ImageInfo data.
 """
 
-from typing import Any, Optional, TYPE_CHECKING
-from sqlalchemy import Column, String, Integer, Float, ForeignKey
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import Column, Float, ForeignKey, Integer, String
 from sqlalchemy.orm import Mapped, relationship
 
 from pinnacle_io.models.pinnacle_base import PinnacleBase
@@ -74,9 +76,7 @@ class ImageInfo(PinnacleBase):
     # Parent relationship
     image_set_id: Mapped[int] = Column(Integer, ForeignKey("ImageSet.ID"))
     image_set: Mapped["ImageSet"] = relationship(
-        "ImageSet", 
-        back_populates="image_info_list",
-        lazy="selectin"
+        "ImageSet", back_populates="image_info_list", lazy="selectin"
     )
 
     def __init__(self, **kwargs: Any) -> None:
@@ -107,8 +107,179 @@ class ImageInfo(PinnacleBase):
 
     def __repr__(self) -> str:
         """Return a string representation of the ImageInfo instance.
-        
+
         Returns:
             str: String representation including ID, slice number, and table position.
         """
         return f"<ImageInfo(id={self.id}, slice_number={self.slice_number}, table_position={self.table_position})>"
+
+
+class ImageInfoTable:
+    """
+    Columnar per-slice metadata of an image set.
+
+    Numeric columns are NumPy arrays (float64 positions and scales, int64 slice numbers)
+    and text columns are lists, each built in a single pass over the slices. Missing
+    values are NaN (or 0 for slice numbers) in the arrays and are tracked by a mask so
+    that the list accessors return None for them, as the ImageInfo attributes do.
+
+    Example:
+        >>> table = ImageInfoTable.from_image_info_list(image_set.image_info_list)
+        >>> table.table_position[:3]
+        array([-12.5, -12.25, -12. ])
+        >>> table.find_slice(-12.2)
+        1
+    """
+
+    FLOAT_COLUMNS = ("table_position", "couch_pos", "suv_scale", "color_lut_scale")
+    INT_COLUMNS = ("slice_number",)
+    TEXT_COLUMNS = (
+        "series_uid",
+        "study_instance_uid",
+        "frame_uid",
+        "class_uid",
+        "instance_uid",
+        "dicom_file_name",
+        "acquisition_time",
+        "image_time",
+    )
+
+    def __init__(self, columns: Dict[str, Any], missing: Dict[str, np.ndarray]) -> None:
+        self.columns = columns
+        self.missing = missing
+        self._sorted_positions: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    @classmethod
+    def from_records(
+        cls, records: Iterable[Any], getter: Any = getattr
+    ) -> "ImageInfoTable":
+        """
+        Build the table from ImageInfo objects or other per-slice records.
+
+        Args:
+            records: Per-slice records in slice order.
+            getter: Function (record, attribute name) -> value. Defaults to getattr.
+        """
+        names = cls.FLOAT_COLUMNS + cls.INT_COLUMNS + cls.TEXT_COLUMNS
+        values: Dict[str, List[Any]] = {name: [] for name in names}
+        for record in records:
+            for name in names:
+                values[name].append(getter(record, name))
+
+        columns: Dict[str, Any] = {}
+        missing: Dict[str, np.ndarray] = {}
+        for name in cls.FLOAT_COLUMNS + cls.INT_COLUMNS:
+            column = values[name]
+            is_missing = np.fromiter(
+                (value is None for value in column), dtype=bool, count=len(column)
+            )
+            if name in cls.INT_COLUMNS:
+                array = np.array(
+                    [0 if value is None else value for value in column], dtype=np.int64
+                )
+            else:
+                array = np.array(
+                    [np.nan if value is None else value for value in column],
+                    dtype=np.float64,
+                )
+            columns[name] = array
+            missing[name] = is_missing
+        for name in cls.TEXT_COLUMNS:
+            columns[name] = values[name]
+        return cls(columns, missing)
+
+    @classmethod
+    def from_image_info_list(
+        cls, image_info_list: Iterable["ImageInfo"]
+    ) -> "ImageInfoTable":
+        """Build the table from ImageInfo objects."""
+        return cls.from_records(image_info_list)
+
+    def __len__(self) -> int:
+        return len(self.columns["table_position"])
+
+    def __getattr__(self, name: str) -> Any:
+        columns = self.__dict__.get("columns")
+        if columns is not None and name in columns:
+            return columns[name]
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
+        )
+
+    def to_list(self, name: str) -> List[Any]:
+        """Return a column as a Python list, with None for missing values."""
+        column = self.columns[name]
+        if name in self.TEXT_COLUMNS:
+            return list(column)
+        values = column.tolist()
+        missing = self.missing[name]
+        if missing.any():
+            for index in np.flatnonzero(missing):
+                values[index] = None
+        return values
+
+    def first(self, name: str, default: Any = None) -> Any:
+        """Value of a column for the first slice."""
+        return self.to_list(name)[0] if len(self) else default
+
+    def find_slice(
+        self, table_position: float, tolerance: Optional[float] = None
+    ) -> Optional[int]:
+        """
+        Index of the slice nearest to a table position.
+
+        Positions are sorted once, so each lookup is a binary search. Slices in either
+        ascending or descending order (and unordered slices) are supported.
+
+        Args:
+            table_position: Position to look up, in the unit of TablePosition.
+            tolerance: If given, return None when the nearest slice is further away.
+
+        Returns:
+            Index of the nearest slice, or None if there are no slices with a position or
+            the nearest one is outside the tolerance.
+        """
+        index = int(self.find_slices([table_position], tolerance)[0])
+        return None if index < 0 else index
+
+    def find_slices(
+        self, table_positions: Any, tolerance: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Indices of the slices nearest to many table positions, with one searchsorted call.
+
+        Args:
+            table_positions: Positions to look up, in the unit of TablePosition.
+            tolerance: If given, positions further than this from the nearest slice get -1.
+
+        Returns:
+            int64 array of slice indices, with -1 where no slice matches.
+        """
+        if self._sorted_positions is None:
+            positions = self.columns["table_position"]
+            valid = np.flatnonzero(~self.missing["table_position"])
+            order = valid[np.argsort(positions[valid], kind="stable")]
+            self._sorted_positions = (positions[order], order)
+        positions, order = self._sorted_positions
+        table_positions = np.asarray(table_positions, dtype=np.float64).ravel()
+        if not len(positions):
+            return np.full(len(table_positions), -1, dtype=np.int64)
+
+        upper = np.clip(
+            np.searchsorted(positions, table_positions), 0, len(positions) - 1
+        )
+        lower = np.clip(upper - 1, 0, len(positions) - 1)
+        # Ties go to the lower position, as with the scalar lookup
+        nearest = np.where(
+            np.abs(positions[lower] - table_positions)
+            <= np.abs(positions[upper] - table_positions),
+            lower,
+            upper,
+        )
+        indices = order[nearest].astype(np.int64)
+        if tolerance is not None:
+            indices[np.abs(positions[nearest] - table_positions) > tolerance] = -1
+        return indices
+
+    def __repr__(self) -> str:
+        return f"<ImageInfoTable(slices={len(self)})>"
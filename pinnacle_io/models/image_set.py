@@ -6,21 +6,30 @@ including all image-specific parameters, relationships to image info, and associ
 """
 
 from __future__ import annotations
-from typing import Optional, List, Tuple, TYPE_CHECKING
+
 import warnings
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, ClassVar, Dict, List, Optional, Tuple
 
 import numpy as np
-from sqlalchemy import Column, String, Integer, Float, ForeignKey, LargeBinary
+from sqlalchemy import Column, Float, ForeignKey, Integer, LargeBinary, String, event
 from sqlalchemy.orm import Mapped, relationship
+from sqlalchemy.orm.attributes import flag_dirty
 
 from pinnacle_io.models.pinnacle_base import PinnacleBase
 from pinnacle_io.models.types import JsonList
+from pinnacle_io.models.volume import Volume
 
 # Use TYPE_CHECKING to avoid circular imports
 if TYPE_CHECKING:
-    from pinnacle_io.models.image_info import ImageInfo
-    from pinnacle_io.models.plan import Plan
+    from pinnacle_io.models.image_info import ImageInfo, ImageInfoTable
     from pinnacle_io.models.patient import Patient
+    from pinnacle_io.models.plan import Plan
+    from pinnacle_io.models.roi import ROI
+    from pinnacle_io.readers.image_slice_reader import ImageSliceReader
+    from pinnacle_io.utils.density import CTToDensityTable
+    from pinnacle_io.utils.image_pyramid import ImagePyramid
 
 
 class ImageSet(PinnacleBase):
@@ -43,8 +52,9 @@ class ImageSet(PinnacleBase):
         x_pixdim (float): Pixel spacing in X dimension (mm)
         y_pixdim (float): Pixel spacing in Y dimension (mm)
         z_pixdim (float): Slice thickness in Z dimension (mm)
-        pixel_data (bytes): Raw pixel data as bytes
-        
+        volume (Volume): Pixel data as a (z, y, x) Volume (optionally backed by a memmap)
+        pixel_data (bytes): Raw pixel data as bytes, produced lazily from the volume
+
     Relationships:
         patient (Patient): The patient this image set belongs to
         image_info_list (List[ImageInfo]): List of ImageInfo objects with per-slice information
@@ -56,16 +66,26 @@ class ImageSet(PinnacleBase):
     # Identification and basic info
     series_uid: Mapped[Optional[str]] = Column("SeriesUID", String, nullable=True)
     study_uid: Mapped[Optional[str]] = Column("StudyUID", String, nullable=True)
-    series_number: Mapped[Optional[int]] = Column("SeriesNumber", Integer, nullable=True)
-    acquisition_number: Mapped[Optional[int]] = Column("AcquisitionNumber", Integer, nullable=True)
+    series_number: Mapped[Optional[int]] = Column(
+        "SeriesNumber", Integer, nullable=True
+    )
+    acquisition_number: Mapped[Optional[int]] = Column(
+        "AcquisitionNumber", Integer, nullable=True
+    )
 
     # Image information
-    image_set_id: Mapped[Optional[int]] = Column("ImageSetID", Integer, nullable=True)  # From the Patient file. Not the primary key.
+    image_set_id: Mapped[Optional[int]] = Column(
+        "ImageSetID", Integer, nullable=True
+    )  # From the Patient file. Not the primary key.
     image_name: Mapped[Optional[str]] = Column("ImageName", String, nullable=True)
-    name_from_scanner: Mapped[Optional[str]] = Column("NameFromScanner", String, nullable=True)
+    name_from_scanner: Mapped[Optional[str]] = Column(
+        "NameFromScanner", String, nullable=True
+    )
     exam_id: Mapped[Optional[str]] = Column("ExamID", String, nullable=True)
     study_id: Mapped[Optional[str]] = Column("StudyID", String, nullable=True)
-    modality: Mapped[Optional[str]] = Column("Modality", String, nullable=True)  # CT, MR, etc.
+    modality: Mapped[Optional[str]] = Column(
+        "Modality", String, nullable=True
+    )  # CT, MR, etc.
     modality_type: Mapped[Optional[str]] = Column("ModalityType", String, nullable=True)
     number_of_images: Mapped[Optional[int]] = Column(
         "NumberOfImages", Integer, nullable=True
@@ -194,126 +214,402 @@ class ImageSet(PinnacleBase):
         "ImagePositionPatient", JsonList, default=[0, 0, 0]
     )
 
-    # Pixel data - stored separately as binary data
-    pixel_data: Mapped[bytes] = Column("PixelData", LargeBinary, nullable=True)
+    # Pixel data - stored separately as binary data. The in-memory representation is the
+    # volume array; the bytes are only produced when needed (e.g. when the ORM flushes).
+    _pixel_data_bytes: Mapped[Optional[bytes]] = Column(
+        "PixelData", LargeBinary, nullable=True
+    )
 
     # Relationships
     patient_id: Mapped[int] = Column("PatientID", Integer, ForeignKey("Patient.ID"))
-    patient: Mapped["Patient"] = relationship("Patient", back_populates="image_set_list")
-    
+    patient: Mapped["Patient"] = relationship(
+        "Patient", back_populates="image_set_list"
+    )
+
     image_info_list: Mapped[List["ImageInfo"]] = relationship(
-        "ImageInfo", 
-        back_populates="image_set", 
+        "ImageInfo",
+        back_populates="image_set",
         cascade="all, delete-orphan",
-        lazy="selectin"  # Use selectin loading for better performance
+        lazy="selectin",  # Use selectin loading for better performance
     )
-    
+
     plan_list: Mapped[List["Plan"]] = relationship(
         "Plan",
         back_populates="primary_ct_image_set",
         foreign_keys="Plan.primary_ct_image_set_id",
         primaryjoin="ImageSet.id == Plan.primary_ct_image_set_id",
-        lazy="selectin"  # Use selectin loading for better performance
+        lazy="selectin",  # Use selectin loading for better performance
     )
 
+    # Transient attributes (not stored in database)
+    _source_path: ClassVar[Optional[str]] = None
+    _slice_reader: ClassVar[Optional["ImageSliceReader"]] = None
+    _pyramid: ClassVar[Optional["ImagePyramid"]] = None
+    _density_cache: ClassVar[Optional["OrderedDict"]] = None
+    _DENSITY_CACHE_SIZE: ClassVar[int] = 2
+    _image_info_table: ClassVar[Optional["ImageInfoTable"]] = None
+    _pixel_array: ClassVar[Optional[np.ndarray]] = None
+    _pixel_data_bytes_stale: ClassVar[bool] = False
+
     def __init__(self, pixel_data: Optional[np.ndarray] = None, **kwargs):
         """
         Initialize an ImageSet instance.
 
         Args:
-            pixel_data: Numpy array of pixel data to store in the database
+            pixel_data: Numpy array of pixel data in (z, y, x) order (or raw bytes). Arrays
+                are used as the volume without copying.
             **kwargs: Keyword arguments used to initialize ImageSet attributes
 
         Relationships:
             image_info_list (List[ImageInfo]): List of ImageInfo objects associated with this ImageSet (one-to-many).
             plan (Plan): The parent Plan to which this ImageSet belongs (many-to-one), if applicable.
         """
-        # Handle pixel_data if it's a numpy array
+        # Pixel data is applied after the columns so that the dimensions are known
         if pixel_data is None:
             pixel_data = kwargs.pop("pixel_data", kwargs.pop("PixelData", None))
-        if pixel_data is not None:
-            try:
-                if isinstance(pixel_data, np.ndarray):
-                    kwargs["pixel_data"] = pixel_data.tobytes()
-                else:
-                    warnings.warn(
-                        f"pixel_data is not a numpy array (pixel_data={pixel_data!r})",
-                        stacklevel=2,
-                    )
-            except ImportError:
-                warnings.warn(
-                    f"Could not convert pixel_data to a byte array (pixel_data={pixel_data!r})",
-                    stacklevel=2,
-                )
+        if pixel_data is not None and not isinstance(
+            pixel_data, (np.ndarray, bytes, bytearray)
+        ):
+            warnings.warn(
+                f"pixel_data is not a numpy array (pixel_data={pixel_data!r})",
+                stacklevel=2,
+            )
+            pixel_data = None
 
         # Initialize the model with the remaining kwargs
         super().__init__(**kwargs)
 
+        if pixel_data is not None:
+            self.pixel_data = pixel_data
+
     def __repr__(self) -> str:
         """Return a string representation of the ImageSet instance."""
         return f"<ImageSet(id={self.id}, name='{self.image_name}', modality='{self.modality}')>"
 
+    @property
+    def volume(self) -> Optional[Volume]:
+        """
+        Pixel data as a (z, y, x) Volume.
+
+        This is the canonical in-memory representation. Volumes loaded from the database
+        are decoded from the stored bytes on first access without copying; the first
+        write then makes a private copy.
+        """
+        if self._pixel_array is None and self._pixel_data_bytes is not None:
+            self._pixel_array = Volume.from_bytes(
+                self._pixel_data_bytes,
+                (self.z_dim, self.y_dim, self.x_dim),
+                self.volume_dtype,
+            ).array
+        if self._pixel_array is None:
+            return None
+        return Volume(self._pixel_array, binary_header_size=self.binary_header_size)
+
+    @volume.setter
+    def volume(self, value) -> None:
+        """Set the volume from a Volume or a (z, y, x) numpy array (used without copying)."""
+        self._pixel_array = value.array if isinstance(value, Volume) else value
+        if value is None:
+            self._pixel_data_bytes = None
+            self._pixel_data_bytes_stale = False
+        else:
+            self._mark_volume_modified()
+
+    @property
+    def volume_dtype(self) -> np.dtype:
+        """Data type of the volume: the dtype of the current array, else derived from BytesPix and ByteOrder."""
+        if self._pixel_array is not None:
+            return self._pixel_array.dtype
+        return Volume.pinnacle_dtype(self.bytes_pix, self.byte_order)
+
+    @property
+    def pixel_data(self) -> Optional[bytes]:
+        """Raw pixel data bytes, produced lazily from the volume."""
+        self._sync_pixel_data_bytes()
+        return self._pixel_data_bytes
+
+    @pixel_data.setter
+    def pixel_data(self, value) -> None:
+        """Set the pixel data from a (z, y, x) numpy array or Volume (used without copying) or raw bytes."""
+        if isinstance(value, (np.ndarray, Volume)):
+            self.volume = value
+        else:
+            self._pixel_array = None
+            self._pixel_data_bytes_stale = False
+            self._pixel_data_bytes = None if value is None else bytes(value)
+
+    def _mark_volume_modified(self) -> None:
+        """Mark the stored bytes as stale so they are regenerated on access or flush."""
+        self._pixel_data_bytes_stale = True
+        self._pyramid = None
+        self._density_cache = None
+        flag_dirty(self)
+
+    def _sync_pixel_data_bytes(self) -> None:
+        """Regenerate the stored bytes from the volume if it has been modified."""
+        if self._pixel_data_bytes_stale:
+            self._pixel_data_bytes = (
+                None if self._pixel_array is None else self._pixel_array.tobytes()
+            )
+            self._pixel_data_bytes_stale = False
+
+    @property
+    def source_path(self) -> Optional[str]:
+        """Path of the .img file used for on-demand slice reads."""
+        return self._source_path
+
+    @source_path.setter
+    def source_path(self, value: Optional[str]) -> None:
+        self._source_path = None if value is None else str(value)
+
+    @property
+    def slice_reader(self) -> Optional["ImageSliceReader"]:
+        """Reader used for on-demand slice reads of a multi-file (FnameFormat) image set."""
+        return self._slice_reader
+
+    @slice_reader.setter
+    def slice_reader(self, value: Optional["ImageSliceReader"]) -> None:
+        self._slice_reader = value
+
+    def prefetch_slices(self, workers: Optional[int] = None) -> None:
+        """
+        Read every slice of a multi-file image set into the slice cache in parallel.
+
+        Args:
+            workers: Number of threads used to read the slice files.
+        """
+        if self.slice_reader is None:
+            raise ValueError(
+                "Prefetching requires an ImageSet read with a slice reader."
+            )
+        self.slice_reader.prefetch(workers=workers)
+
+    def pyramid(
+        self,
+        levels: int = 4,
+        cache_dir: Optional[str] = None,
+        persist: bool = True,
+        rebuild: bool = False,
+    ) -> "ImagePyramid":
+        """
+        Get the multi-resolution pyramid of the image set, building it if needed.
+
+        Each level halves the in-plane resolution (2x2 block mean). Use
+        ImagePyramid.get_slice_for_size to serve thumbnails and low-zoom views from the
+        coarsest sufficient level.
+
+        Args:
+            levels: Number of downsampled levels.
+            cache_dir: Directory the levels are persisted to and memory-mapped from. By
+                default, and if the directory cannot be written, the levels are kept in
+                memory, so patient directories are never written to.
+            persist: If False, the levels are kept in memory even if cache_dir is given.
+            rebuild: If True, the pyramid is rebuilt even if a persisted one matches. Persisted
+                levels are matched against the source file, so pass rebuild=True after
+                editing the volume in memory.
+
+        Returns:
+            ImagePyramid with levels + 1 levels (level 0 is the full volume).
+        """
+        from pinnacle_io.utils.image_pyramid import ImagePyramid
+
+        pyramid = self._pyramid
+        if pyramid is not None and not rebuild and pyramid.number_of_levels > levels:
+            return pyramid
+
+        shape = (self.z_dim, self.y_dim, self.x_dim)
+        source = None
+        if self.source_path is not None:
+            source = Path(self.source_path)
+        elif self.slice_reader is not None:
+            source = self.slice_reader.slice_path(0)
+        if not persist:
+            cache_dir = None
+
+        signature = {}
+        if source is not None and source.exists():
+            stat = source.stat()
+            signature = {
+                "source": str(source),
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+            }
+
+        if (
+            self._pixel_array is None
+            and self._pixel_data_bytes is None
+            and source is None
+        ):
+            raise ValueError(
+                f"ImageSet '{self.image_name}' has no pixel data to build a pyramid from."
+            )
+
+        pyramid = None
+        if cache_dir is not None and not rebuild:
+            pyramid = ImagePyramid.load(
+                cache_dir, shape, levels, self.get_slice_data, signature
+            )
+        if pyramid is None:
+            pyramid = ImagePyramid.build(
+                self.get_slice_data,
+                shape,
+                levels,
+                self.volume_dtype,
+                cache_dir,
+                signature,
+            )
+        self._pyramid = pyramid
+        return pyramid
+
+    def get_density(
+        self,
+        table: "CTToDensityTable",
+        rois: Optional[List["ROI"]] = None,
+        masks: Optional[Dict["ROI", np.ndarray]] = None,
+    ) -> np.ndarray:
+        """
+        Get the density volume for a CT-to-density table, with ROI density overrides.
+
+        The most recent results are cached per table, override settings and mask contents,
+        and cleared when the volume is modified.
+
+        Args:
+            table: CT-to-density table, e.g. from
+                PatientRepresentation.get_ct_to_density_table.
+            rois: ROIs to consider for density overrides.
+            masks: Boolean (z, y, x) mask on the image grid for each overriding ROI. ROIs
+                without a mask are rasterized from their curves through the mask cache.
+
+        Returns:
+            Read-only float32 (z, y, x) density array.
+        """
+        from pinnacle_io.utils.density import compute_density, density_overrides
+        from pinnacle_io.utils.roi_mask import mask_content_hash, resolve_masks
+
+        overrides = density_overrides(rois or ())
+        if overrides:
+            masks = resolve_masks(overrides, self, masks)
+        key = (id(table),) + tuple(
+            (
+                roi.density,
+                roi.override_order,
+                bool(roi.invert_density_loading),
+                (
+                    None
+                    if masks is None or masks.get(roi) is None
+                    else mask_content_hash(masks[roi])
+                ),
+            )
+            for roi in overrides
+        )
+        if self._density_cache is None:
+            self._density_cache = OrderedDict()
+        cached = self._density_cache.get(key)
+        # The table is kept with the result so its id cannot be reused while cached
+        if cached is not None and cached[0] is table:
+            self._density_cache.move_to_end(key)
+            return cached[1]
+
+        density = compute_density(self, table, overrides, masks)
+        density.flags.writeable = False
+        self._density_cache[key] = (table, density)
+        while len(self._density_cache) > self._DENSITY_CACHE_SIZE:
+            self._density_cache.popitem(last=False)
+        return density
+
+    @property
+    def image_info_table(self) -> "ImageInfoTable":
+        """
+        Columnar per-slice metadata built from image_info_list.
+
+        The table is built once and rebuilt only after image_info_list or one of its
+        ImageInfo objects changes.
+        """
+        if self._image_info_table is None:
+            from pinnacle_io.models.image_info import ImageInfoTable
+
+            self._image_info_table = ImageInfoTable.from_image_info_list(
+                self.image_info_list
+            )
+        return self._image_info_table
+
+    def _invalidate_image_info_table(self) -> None:
+        self._image_info_table = None
+
+    def find_slice_index(
+        self, table_position: float, tolerance: Optional[float] = None
+    ) -> Optional[int]:
+        """
+        Index of the slice nearest to a table position (binary search).
+
+        Args:
+            table_position: Table position of the slice.
+            tolerance: If given, return None when the nearest slice is further away.
+
+        Returns:
+            Slice index, or None if no slice matches.
+        """
+        return self.image_info_table.find_slice(table_position, tolerance)
+
     @property
     def table_positions(self) -> List[float]:
         """Get list of table positions."""
-        return [image_info.table_position for image_info in self.image_info_list]
+        return self.image_info_table.to_list("table_position")
 
     @property
     def couch_positions(self) -> List[float]:
         """Get list of couch positions."""
-        return [image_info.couch_pos for image_info in self.image_info_list]
+        return self.image_info_table.to_list("couch_pos")
 
     @property
     def slice_numbers(self) -> List[int]:
         """Get list of slice numbers."""
-        return [image_info.slice_number for image_info in self.image_info_list]
+        return self.image_info_table.to_list("slice_number")
 
     @property
     def study_instance_uid(self) -> str:
         """Study instance UID."""
-        return (
-            self.image_info_list[0].study_instance_uid if self.image_info_list else ""
-        )
+        return self.image_info_table.first("study_instance_uid", "")
 
     @property
     def frame_of_reference_uid(self) -> str:
         """Frame of reference UID."""
-        return self.image_info_list[0].frame_uid if self.image_info_list else ""
+        return self.image_info_table.first("frame_uid", "")
 
     @property
     def class_uid(self) -> str:
         """DICOM Class UID."""
-        return self.image_info_list[0].class_uid if self.image_info_list else ""
+        return self.image_info_table.first("class_uid", "")
 
     @property
     def instance_uids(self) -> List[str]:
         """Get list of instance UIDs."""
-        return [image_info.instance_uid for image_info in self.image_info_list]
+        return self.image_info_table.to_list("instance_uid")
 
     @property
     def suv_scales(self) -> List[float]:
         """Get list of SUV scales."""
-        return [image_info.suv_scale for image_info in self.image_info_list]
+        return self.image_info_table.to_list("suv_scale")
 
     @property
     def color_lut_scales(self) -> List[float]:
         """Get list of color LUT scales."""
-        return [image_info.color_lut_scale for image_info in self.image_info_list]
+        return self.image_info_table.to_list("color_lut_scale")
 
     @property
     def dicom_file_names(self) -> List[str]:
         """Get list of DICOM file names."""
-        return [image_info.dicom_file_name for image_info in self.image_info_list]
+        return self.image_info_table.to_list("dicom_file_name")
 
     @property
     def acquisition_times(self) -> List[str]:
         """Get list of acquisition times."""
-        return [image_info.acquisition_time for image_info in self.image_info_list]
+        return self.image_info_table.to_list("acquisition_time")
 
     @property
     def image_times(self) -> List[str]:
         """Get list of image times."""
-        return [image_info.image_time for image_info in self.image_info_list]
+        return self.image_info_table.to_list("image_time")
 
     def get_image_dimensions(self) -> Tuple[int, int, int]:
         """
@@ -340,48 +636,129 @@ class ImageSet(PinnacleBase):
         Args:
             slice_index: Index of the slice to retrieve.
 
+        If the pixel data has not been loaded but the ImageSet has a source_path (e.g. it was
+        read with ImageSetReader.read_image_set(..., lazy=True)), only the requested axial slice
+        is read from the .img file. Multi-file image sets read the slice file through the
+        slice reader's cache.
+
         Returns:
             2D numpy array of pixel data for the specified slice, or None if pixel data is not available.
         """
-        try:
-            import numpy as np
+        volume = self.volume
+        if volume is None and self.slice_reader is not None:
+            if not 0 <= slice_index < self.z_dim:
+                return None
+            return self.slice_reader.read_slice(slice_index)
 
-            if self.pixel_data is None or slice_index >= self.z_dim:
+        if volume is None and self.source_path is not None:
+            if not 0 <= slice_index < self.z_dim:
                 return None
+            from pinnacle_io.readers.image_set_reader import ImageSetReader
 
-            # Convert bytes back to numpy array
-            array_data = np.frombuffer(self.pixel_data, dtype=np.int16)
-            reshaped_data = array_data.reshape((self.x_dim, self.y_dim, self.z_dim))
+            return ImageSetReader.read_slices(self.source_path, self, [slice_index])[0]
 
-            return reshaped_data[:, :, slice_index]
-        except ImportError:
+        if volume is None or not 0 <= slice_index < volume.shape[0]:
             return None
 
+        # A (y, x) view of the slice; no copy of the volume is made
+        return volume.axial(slice_index)
+
+    def get_slab_data(self, z_start: int, z_stop: int) -> Optional["np.ndarray"]:
+        """
+        Get the pixel data for a range of axial slices.
+
+        Like get_slice_data, unloaded pixel data is read from the source file(s), and only
+        the requested slices are read.
+
+        Args:
+            z_start: Index of the first slice.
+            z_stop: Index after the last slice.
+
+        Returns:
+            (z_stop - z_start, y, x) numpy array, or None if pixel data is not available.
+        """
+        z_start, z_stop = max(int(z_start), 0), min(int(z_stop), int(self.z_dim or 0))
+        volume = self.volume
+        if volume is not None:
+            return volume[z_start:z_stop]
+        if self.slice_reader is not None:
+            return self.slice_reader.read_slices(range(z_start, z_stop))
+        if self.source_path is not None:
+            from pinnacle_io.readers.image_set_reader import ImageSetReader
+
+            return ImageSetReader.read_slices(
+                self.source_path, self, range(z_start, z_stop)
+            )
+        return None
+
     def set_slice_data(self, slice_index: int, data: "np.ndarray") -> None:
         """
         Set the pixel data for a specific slice.
 
+        The slice is written in place into the volume; the stored bytes are regenerated
+        lazily when pixel_data is next read or the ImageSet is flushed. Lazily read image
+        sets first load the full volume from their source file(s).
+
         Args:
             slice_index: Index of the slice to set.
-            data: 2D numpy array of pixel data for the slice.
+            data: 2D numpy array of pixel data for the slice, in (y, x) order.
         """
-        try:
-            import numpy as np
-
-            # Convert bytes to numpy array if pixel_data exists
-            if self.pixel_data is not None:
-                array_data = np.frombuffer(self.pixel_data, dtype=np.int16)
-                reshaped_data = array_data.reshape((self.x_dim, self.y_dim, self.z_dim))
-            else:
-                # Initialize pixel data array if it doesn't exist
-                reshaped_data = np.zeros(
-                    (self.x_dim, self.y_dim, self.z_dim), dtype=np.int16
-                )
-
-            if slice_index < self.z_dim:
-                reshaped_data[:, :, slice_index] = data
-
-            # Store back as bytes
-            self.pixel_data = reshaped_data.tobytes()
-        except ImportError:
-            pass
+        volume = None if self.volume is None else self.volume.array
+        if volume is None and (
+            self.slice_reader is not None or self.source_path is not None
+        ):
+            # Load the other slices so they are not lost when the volume is set
+            volume = self.get_slab_data(0, self.z_dim)
+            if not volume.flags.writeable:
+                volume = volume.copy()
+        elif volume is None:
+            # Initialize pixel data array if it doesn't exist
+            volume = np.zeros(
+                (self.z_dim, self.y_dim, self.x_dim), dtype=self.volume_dtype
+            )
+        elif not volume.flags.writeable:
+            # Volumes decoded from the stored bytes are read-only views
+            volume = volume.copy()
+
+        if 0 <= slice_index < volume.shape[0]:
+            volume[slice_index] = data
+        self.volume = volume
+
+
+@event.listens_for(ImageSet, "before_insert")
+@event.listens_for(ImageSet, "before_update")
+def _sync_image_set_pixel_data(mapper, connection, target: ImageSet) -> None:
+    """Produce the pixel data bytes from the volume only when the ImageSet is persisted."""
+    target._sync_pixel_data_bytes()
+
+
+@event.listens_for(ImageSet.image_info_list, "append")
+@event.listens_for(ImageSet.image_info_list, "remove")
+@event.listens_for(ImageSet.image_info_list, "bulk_replace")
+def _invalidate_image_info_table(target: ImageSet, *args) -> None:
+    """Rebuild the columnar slice metadata after the ImageInfo list changes."""
+    target._invalidate_image_info_table()
+
+
+def _invalidate_parent_image_info_table(target: "ImageInfo", *args) -> None:
+    """Rebuild the columnar slice metadata of the parent ImageSet after an ImageInfo edit."""
+    # The relationship is resolved because it is not loaded for rows read from the database
+    image_set = target.image_set
+    if image_set is not None:
+        image_set._invalidate_image_info_table()
+
+
+def _register_image_info_listeners() -> None:
+    from pinnacle_io.models.image_info import ImageInfo, ImageInfoTable
+
+    for name in (
+        ImageInfoTable.FLOAT_COLUMNS
+        + ImageInfoTable.INT_COLUMNS
+        + ImageInfoTable.TEXT_COLUMNS
+    ):
+        event.listen(
+            getattr(ImageInfo, name), "set", _invalidate_parent_image_info_table
+        )
+
+
+_register_image_info_listeners()
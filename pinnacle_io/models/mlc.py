@@ -7,18 +7,18 @@ The models handle both static MLC configurations and dynamic leaf position data
 for treatment delivery.
 """
 
-from typing import Optional, ClassVar, List, TYPE_CHECKING
-import numpy as np
-import struct
 import warnings
-from sqlalchemy import Column, Integer, ForeignKey, LargeBinary, Float, String
+from typing import TYPE_CHECKING, ClassVar, List, Optional
+
+import numpy as np
+from sqlalchemy import Column, Float, ForeignKey, Integer, LargeBinary, String
 from sqlalchemy.orm import Mapped, relationship
 
-from pinnacle_io.models.pinnacle_base import PinnacleBase
+from pinnacle_io.models.pinnacle_base import PinnacleBase, track_array_data
 
 if TYPE_CHECKING:
-    from pinnacle_io.models.machine import Machine
     from pinnacle_io.models.control_point import ControlPoint
+    from pinnacle_io.models.machine import Machine
 
 
 class MLCLeafPositions(PinnacleBase):
@@ -66,8 +66,12 @@ class MLCLeafPositions(PinnacleBase):
 
     __tablename__ = "MLCLeafPositions"
 
-    number_of_dimensions: Mapped[Optional[int]] = Column("NumberOfDimensions", Integer, nullable=True)
-    number_of_points: Mapped[Optional[int]] = Column("NumberOfPoints", Integer, nullable=True)
+    number_of_dimensions: Mapped[Optional[int]] = Column(
+        "NumberOfDimensions", Integer, nullable=True
+    )
+    number_of_points: Mapped[Optional[int]] = Column(
+        "NumberOfPoints", Integer, nullable=True
+    )
 
     # For storing serialized points data as int16 values (millimeters)
     _points_data: Mapped[Optional[bytes]] = Column(
@@ -81,7 +85,7 @@ class MLCLeafPositions(PinnacleBase):
     control_point: Mapped[Optional["ControlPoint"]] = relationship(
         "ControlPoint",
         back_populates="_mlc_leaf_positions",
-        lazy="selectin"  # Use selectin loading for better performance
+        lazy="selectin",  # Use selectin loading for better performance
     )
 
     # Transient attributes (not stored in database)
@@ -140,12 +144,12 @@ class MLCLeafPositions(PinnacleBase):
                             f"MLCLeafPositions: Buffer size still mismatched after resetting dimensions. "
                             f"Expected {expected_bytes} bytes, got {actual_bytes} bytes."
                         )
-                int_values = struct.unpack(f"<{total_elements}h", self._points_data)
-                mm_array = np.array(int_values, dtype=np.int16)
-                reshaped_array = mm_array.reshape(
+                # int16 millimeters are decoded straight from the buffer
+                mm_array = np.frombuffer(self._points_data, dtype="<i2").reshape(
                     self.number_of_points, self.number_of_dimensions
                 )
-                self._points = reshaped_array.astype(np.float32) / 10.0
+                self._points = mm_array.astype(np.float32) / np.float32(10.0)
+                track_array_data(self)
         return self._points
 
     @points.setter
@@ -183,14 +187,23 @@ class MLCLeafPositions(PinnacleBase):
         self.number_of_dimensions = 2
         self.number_of_points = value.shape[0]
 
-        # Convert from centimeters (float) to millimeters (int16)
-        mm_values = np.round(value * 10).astype(np.int16)
+        self._points_data = self._serialize(value)
+        track_array_data(self)
 
-        # Ensure values are within the valid range (-200 to 200)
-        np.clip(mm_values, -200, 200, out=mm_values)
+    @staticmethod
+    def _serialize(points: np.ndarray) -> bytes:
+        """Convert positions in centimeters to little-endian int16 millimeters, clipped to +-200 mm."""
+        mm_values = np.clip(
+            np.round(np.asarray(points, dtype=np.float64) * 10), -200, 200
+        )
+        return mm_values.astype("<i2").tobytes()
 
-        # Serialize to binary
-        self._points_data = struct.pack(f"<{mm_values.size}h", *mm_values.flatten())
+    def _sync_array_data(self) -> None:
+        """Write positions changed in place (e.g. through a beam-level array) to the binary data."""
+        if self._points is not None:
+            data = self._serialize(self._points)
+            if self._points_data != data:
+                self._points_data = data
 
 
 class MLCLeafPair(PinnacleBase):
@@ -240,20 +253,32 @@ class MLCLeafPair(PinnacleBase):
 
     __tablename__ = "MLCLeafPair"
 
-    y_center_position: Mapped[Optional[float]] = Column("YCenterPosition", Float, nullable=True)
-    negate_leaf_coordinate: Mapped[Optional[int]] = Column("NegateLeafCoordinate", Integer, nullable=True)
+    y_center_position: Mapped[Optional[float]] = Column(
+        "YCenterPosition", Float, nullable=True
+    )
+    negate_leaf_coordinate: Mapped[Optional[int]] = Column(
+        "NegateLeafCoordinate", Integer, nullable=True
+    )
     width: Mapped[Optional[float]] = Column("Width", Float, nullable=True)
-    min_tip_position: Mapped[Optional[float]] = Column("MinTipPosition", Float, nullable=True)
-    max_tip_position: Mapped[Optional[float]] = Column("MaxTipPosition", Float, nullable=True)
-    side_leakage_width: Mapped[Optional[float]] = Column("SideLeakageWidth", Float, nullable=True)
-    tip_leakage_width: Mapped[Optional[float]] = Column("TipLeakageWidth", Float, nullable=True)
+    min_tip_position: Mapped[Optional[float]] = Column(
+        "MinTipPosition", Float, nullable=True
+    )
+    max_tip_position: Mapped[Optional[float]] = Column(
+        "MaxTipPosition", Float, nullable=True
+    )
+    side_leakage_width: Mapped[Optional[float]] = Column(
+        "SideLeakageWidth", Float, nullable=True
+    )
+    tip_leakage_width: Mapped[Optional[float]] = Column(
+        "TipLeakageWidth", Float, nullable=True
+    )
 
     # Foreign key relationship to MultiLeaf
     multi_leaf_id: Mapped[int] = Column(Integer, ForeignKey("MultiLeaf.ID"))
     multi_leaf: Mapped["MultiLeaf"] = relationship(
         "MultiLeaf",
         back_populates="leaf_pair_list",
-        lazy="selectin"  # Use selectin loading for better performance
+        lazy="selectin",  # Use selectin loading for better performance
     )
 
     def __repr__(self) -> str:
@@ -340,53 +365,89 @@ class MultiLeaf(PinnacleBase):
     __tablename__ = "MultiLeaf"
 
     # Primary key is inherited from PinnacleBase
-    left_bank_name: Mapped[Optional[str]] = Column("LeftBankName", String, nullable=True)
-    right_bank_name: Mapped[Optional[str]] = Column("RightBankName", String, nullable=True)
-    leaf_x_base_position: Mapped[Optional[float]] = Column("LeafXBasePosition", Float, nullable=True)
+    left_bank_name: Mapped[Optional[str]] = Column(
+        "LeftBankName", String, nullable=True
+    )
+    right_bank_name: Mapped[Optional[str]] = Column(
+        "RightBankName", String, nullable=True
+    )
+    leaf_x_base_position: Mapped[Optional[float]] = Column(
+        "LeafXBasePosition", Float, nullable=True
+    )
     max_overall_leaf_difference: Mapped[Optional[float]] = Column(
         "MaxOverallLeafDifference", Float, nullable=True
     )
-    min_static_leaf_gap: Mapped[Optional[float]] = Column("MinStaticLeafGap", Float, nullable=True)
-    min_dynamic_leaf_gap: Mapped[Optional[float]] = Column("MinDynamicLeafGap", Float, nullable=True)
+    min_static_leaf_gap: Mapped[Optional[float]] = Column(
+        "MinStaticLeafGap", Float, nullable=True
+    )
+    min_dynamic_leaf_gap: Mapped[Optional[float]] = Column(
+        "MinDynamicLeafGap", Float, nullable=True
+    )
     opposing_adjacent_leaves_can_overlap: Mapped[Optional[int]] = Column(
         "OpposingAdjacentLeavesCanOverlap", Integer, nullable=True
     )
     tongue_and_groove_leakage_width: Mapped[Optional[float]] = Column(
         "TongueAndGrooveLeakageWidth", Float, nullable=True
     )
-    tip_leakage_radius: Mapped[Optional[float]] = Column("TipLeakageRadius", Float, nullable=True)
-    rounded_leaf_mlc: Mapped[Optional[int]] = Column("RoundedLeafMLC", Integer, nullable=True)
-    inter_leaf_leakage_trans: Mapped[Optional[float]] = Column("InterLeafLeakageTrans", Float, nullable=True)
+    tip_leakage_radius: Mapped[Optional[float]] = Column(
+        "TipLeakageRadius", Float, nullable=True
+    )
+    rounded_leaf_mlc: Mapped[Optional[int]] = Column(
+        "RoundedLeafMLC", Integer, nullable=True
+    )
+    inter_leaf_leakage_trans: Mapped[Optional[float]] = Column(
+        "InterLeafLeakageTrans", Float, nullable=True
+    )
     replaces_jaw: Mapped[Optional[int]] = Column("ReplacesJaw", Integer, nullable=True)
-    negate_leaf_coordinates: Mapped[Optional[int]] = Column("NegateLeafCoordinates", Integer, nullable=True)
+    negate_leaf_coordinates: Mapped[Optional[int]] = Column(
+        "NegateLeafCoordinates", Integer, nullable=True
+    )
     aligned_with_left_right_jaw: Mapped[Optional[int]] = Column(
         "AlignedWithLeftRightJaw", Integer, nullable=True
     )
     mlc_tracks_jaw_for_open_fields: Mapped[Optional[str]] = Column(
         "MLCTracksJawForOpenFields", String, nullable=True
     )
-    source_to_mlc_distance: Mapped[Optional[float]] = Column("SourceToMLCDistance", Float, nullable=True)
+    source_to_mlc_distance: Mapped[Optional[float]] = Column(
+        "SourceToMLCDistance", Float, nullable=True
+    )
     thickness: Mapped[Optional[float]] = Column("Thickness", Float, nullable=True)
-    decimal_places: Mapped[Optional[int]] = Column("DecimalPlaces", Integer, nullable=True)
+    decimal_places: Mapped[Optional[int]] = Column(
+        "DecimalPlaces", Integer, nullable=True
+    )
     vendor: Mapped[Optional[str]] = Column("Vendor", String, nullable=True)
     has_carriage: Mapped[Optional[int]] = Column("HasCarriage", Integer, nullable=True)
-    max_tip_position_from_jaw: Mapped[Optional[float]] = Column("MaxTipPositionFromJaw", Float, nullable=True)
-    default_max_leaf_speed: Mapped[Optional[float]] = Column("DefaultMaxLeafSpeed", Float, nullable=True)
-    default_max_leaf_speed_mu: Mapped[Optional[float]] = Column("DefaultMaxLeafSpeedMU", Float, nullable=True)
-    open_extra_leaf_pairs: Mapped[Optional[int]] = Column("OpenExtraLeafPairs", Integer, nullable=True)
+    max_tip_position_from_jaw: Mapped[Optional[float]] = Column(
+        "MaxTipPositionFromJaw", Float, nullable=True
+    )
+    default_max_leaf_speed: Mapped[Optional[float]] = Column(
+        "DefaultMaxLeafSpeed", Float, nullable=True
+    )
+    default_max_leaf_speed_mu: Mapped[Optional[float]] = Column(
+        "DefaultMaxLeafSpeedMU", Float, nullable=True
+    )
+    open_extra_leaf_pairs: Mapped[Optional[int]] = Column(
+        "OpenExtraLeafPairs", Integer, nullable=True
+    )
     default_leaf_position_tolerance: Mapped[Optional[float]] = Column(
         "DefaultLeafPositionTolerance", Float, nullable=True
     )
-    jaws_conformance: Mapped[Optional[str]] = Column("JawsConformance", String, nullable=True)
-    min_leaf_jaw_overlap: Mapped[Optional[float]] = Column("MinLeafJawOverlap", Float, nullable=True)
-    max_leaf_jaw_overlap: Mapped[Optional[float]] = Column("MaxLeafJawOverlap", Float, nullable=True)
+    jaws_conformance: Mapped[Optional[str]] = Column(
+        "JawsConformance", String, nullable=True
+    )
+    min_leaf_jaw_overlap: Mapped[Optional[float]] = Column(
+        "MinLeafJawOverlap", Float, nullable=True
+    )
+    max_leaf_jaw_overlap: Mapped[Optional[float]] = Column(
+        "MaxLeafJawOverlap", Float, nullable=True
+    )
 
     # One-to-one relationship with Machine
     machine_id: Mapped[int] = Column(Integer, ForeignKey("Machine.ID"))
     machine: Mapped["Machine"] = relationship(
         "Machine",
         back_populates="multi_leaf",
-        lazy="selectin"  # Use selectin loading for better performance
+        lazy="selectin",  # Use selectin loading for better performance
     )
 
     # One-to-many relationship with LeafPairList
@@ -394,7 +455,7 @@ class MultiLeaf(PinnacleBase):
         "MLCLeafPair",
         back_populates="multi_leaf",
         cascade="all, delete-orphan",
-        lazy="selectin"  # Use selectin loading for better performance
+        lazy="selectin",  # Use selectin loading for better performance
     )
 
     def __init__(self, **kwargs):
@@ -4,11 +4,16 @@ SQLAlchemy model for Pinnacle PatientRepresentation data.
 This module provides the PatientRepresentation model for representing patient position and setup information.
 """
 
-from sqlalchemy import Column, String, Integer, Float, ForeignKey
-from sqlalchemy.orm import relationship, Mapped
+from typing import TYPE_CHECKING
+
+from sqlalchemy import Column, Float, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, relationship
 
 from pinnacle_io.models.pinnacle_base import PinnacleBase
 
+if TYPE_CHECKING:
+    from pinnacle_io.utils.density import CTToDensityTable
+
 
 class PatientRepresentation(PinnacleBase):
     """
@@ -20,7 +25,9 @@ class PatientRepresentation(PinnacleBase):
     __tablename__ = "PatientRepresentation"
 
     # Primary key is inherited from PinnacleBase
-    patient_volume_name: Mapped[str] = Column("PatientVolumeName", String, nullable=True)
+    patient_volume_name: Mapped[str] = Column(
+        "PatientVolumeName", String, nullable=True
+    )
     ct_to_density_name: Mapped[str] = Column("CTToDensityName", String, nullable=True)
     ct_to_density_version: Mapped[str] = Column(
         "CTToDensityVersion", String, nullable=True
@@ -77,5 +84,23 @@ class PatientRepresentation(PinnacleBase):
         """
         super().__init__(**kwargs)
 
+    def get_ct_to_density_table(self, directory: str) -> "CTToDensityTable":
+        """
+        Load the CT-to-density table referenced by ct_to_density_name.
+
+        Args:
+            directory: Directory holding the CT-to-density table files.
+
+        Returns:
+            The referenced CTToDensityTable. Tables are cached, so each file is parsed once.
+        """
+        from pinnacle_io.utils.density import find_ct_to_density_table
+
+        if not self.ct_to_density_name:
+            raise ValueError(
+                "PatientRepresentation does not reference a CT-to-density table."
+            )
+        return find_ct_to_density_table(directory, self.ct_to_density_name)
+
     def __repr__(self) -> str:
         return f"<PatientRepresentation(id={self.id}, top_z_padding={self.top_z_padding}, bottom_z_padding={self.bottom_z_padding})>"
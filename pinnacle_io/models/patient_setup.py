@@ -4,21 +4,26 @@ SQLAlchemy model for Pinnacle PatientPosition data.
 This module provides the PatientPosition model for representing patient position and setup information.
 """
 
-from typing import Optional, List
-import numpy as np
 import json
+from typing import TYPE_CHECKING, ClassVar, Dict, List, Optional, Tuple, Union
 
-from sqlalchemy import Column, String, Integer, ForeignKey
-from sqlalchemy.orm import relationship, Mapped
+import numpy as np
+from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, relationship
+from sqlalchemy.orm.attributes import flag_dirty
 
 from pinnacle_io.models.versioned_base import VersionedBase
+from pinnacle_io.utils.frames import apply_affine
 from pinnacle_io.utils.patient_enum import (
-    PatientPositionEnum,
     PatientOrientationEnum,
-    TableMotionEnum,
+    PatientPositionEnum,
     PatientSetupEnum,
+    TableMotionEnum,
 )
 
+if TYPE_CHECKING:
+    from pinnacle_io.models.roi import ROI, RaggedCurves
+
 
 class PatientSetup(VersionedBase):
     """
@@ -33,20 +38,12 @@ class PatientSetup(VersionedBase):
     # Primary key is inherited from VersionedBase
 
     # These fields come from the plan.PatientSetup file
-    position: Mapped[str] = Column(
-        "Position", String, nullable=True
-    )
-    orientation: Mapped[str] = Column(
-        "Orientation", String, nullable=True
-    )
-    table_motion: Mapped[str] = Column(
-        "TableMotion", String, nullable=True
-    )
+    position: Mapped[str] = Column("Position", String, nullable=True)
+    orientation: Mapped[str] = Column("Orientation", String, nullable=True)
+    table_motion: Mapped[str] = Column("TableMotion", String, nullable=True)
 
     # Patient setup is derived from the fields above
-    patient_setup: Mapped[str] = Column(
-        "PatientSetup", String, nullable=True
-    )
+    patient_setup: Mapped[str] = Column("PatientSetup", String, nullable=True)
 
     # Transformation matrices stored as serialized strings
     # These matrices transform coordinates from one system to another
@@ -76,6 +73,9 @@ class PatientSetup(VersionedBase):
     )
     plan = relationship("Plan", back_populates="_patient_position")
 
+    # Parsed matrices keyed by column name, as (serialized value, read-only array)
+    _matrix_cache: ClassVar[Optional[Dict[str, Tuple[str, np.ndarray]]]] = None
+
     # trial_id: Mapped[Optional[int]] = Column(
     #     "TrialID", Integer, ForeignKey("Trial.ID"), nullable=True
     # )
@@ -204,31 +204,50 @@ class PatientSetup(VersionedBase):
         except ValueError:
             return PatientSetupEnum.Unknown
 
+    def _get_matrix(self, name: str) -> np.ndarray:
+        """
+        Parse a serialized transformation matrix column once.
+
+        The parsed matrix is cached with the serialized value it came from, so it is
+        parsed again only after the column changes.
+        """
+        value = getattr(self, name)
+        if self._matrix_cache is None:
+            self._matrix_cache = {}
+        cached = self._matrix_cache.get(name)
+        if cached is not None and cached[0] == value:
+            return cached[1]
+        try:
+            matrix = np.array(json.loads(value), dtype=np.float64)
+        except (json.JSONDecodeError, ValueError, TypeError):
+            matrix = np.eye(4)
+        matrix.flags.writeable = False
+        self._matrix_cache[name] = (value, matrix)
+        return matrix
+
     @property
     def pinnacle_to_dicom_matrix_array(self) -> np.ndarray:
         """
         Get the pinnacle to DICOM transformation matrix as a numpy array.
 
+        The matrix is parsed once and cached until pinnacle_to_dicom_matrix changes.
+
         Returns:
-            Transformation matrix as a numpy array.
+            Read-only transformation matrix as a numpy array.
         """
-        try:
-            return np.array(json.loads(self.pinnacle_to_dicom_matrix))
-        except (json.JSONDecodeError, ValueError):
-            return np.eye(4)
+        return self._get_matrix("pinnacle_to_dicom_matrix")
 
     @property
     def dicom_to_pinnacle_matrix_array(self) -> np.ndarray:
         """
         Get the DICOM to pinnacle transformation matrix as a numpy array.
 
+        The matrix is parsed once and cached until dicom_to_pinnacle_matrix changes.
+
         Returns:
-            Transformation matrix as a numpy array.
+            Read-only transformation matrix as a numpy array.
         """
-        try:
-            return np.array(json.loads(self.dicom_to_pinnacle_matrix))
-        except (json.JSONDecodeError, ValueError):
-            return np.eye(4)
+        return self._get_matrix("dicom_to_pinnacle_matrix")
 
     @property
     def image_orientation_patient_array(self) -> List[float]:
@@ -317,6 +336,94 @@ class PatientSetup(VersionedBase):
             # Image orientation for FFP
             self.image_orientation_patient = ",".join(map(str, [1, 0, 0, 0, -1, 0]))
 
+    def transform_points_pinnacle_to_dicom(
+        self, points: np.ndarray, out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Transform (N, 3) points from Pinnacle coordinates to DICOM coordinates.
+
+        Args:
+            points: (N, 3) array of points in Pinnacle coordinates.
+            out: Optional (N, 3) output array; pass points itself to transform in place.
+
+        Returns:
+            (N, 3) array of points in DICOM coordinates.
+        """
+        return apply_affine(self.pinnacle_to_dicom_matrix_array, points, out)
+
+    def transform_points_dicom_to_pinnacle(
+        self, points: np.ndarray, out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Transform (N, 3) points from DICOM coordinates to Pinnacle coordinates.
+
+        Args:
+            points: (N, 3) array of points in DICOM coordinates.
+            out: Optional (N, 3) output array; pass points itself to transform in place.
+
+        Returns:
+            (N, 3) array of points in Pinnacle coordinates.
+        """
+        return apply_affine(self.dicom_to_pinnacle_matrix_array, points, out)
+
+    def transform_roi_pinnacle_to_dicom(
+        self, roi: Union["ROI", "RaggedCurves"], in_place: bool = True
+    ) -> "RaggedCurves":
+        """
+        Transform all curves of an ROI from Pinnacle to DICOM coordinates.
+
+        Args:
+            roi: ROI, or the RaggedCurves point buffer of an ROI.
+            in_place: If True, overwrite the point buffer (the curves of the ROI are views
+                into it and follow the transform). Otherwise return a transformed copy.
+
+        Returns:
+            RaggedCurves with the transformed points.
+        """
+        return self._transform_curves(
+            self.pinnacle_to_dicom_matrix_array, roi, in_place
+        )
+
+    def transform_roi_dicom_to_pinnacle(
+        self, roi: Union["ROI", "RaggedCurves"], in_place: bool = True
+    ) -> "RaggedCurves":
+        """
+        Transform all curves of an ROI from DICOM to Pinnacle coordinates.
+
+        Args:
+            roi: ROI, or the RaggedCurves point buffer of an ROI.
+            in_place: If True, overwrite the point buffer. Otherwise return a copy.
+
+        Returns:
+            RaggedCurves with the transformed points.
+        """
+        return self._transform_curves(
+            self.dicom_to_pinnacle_matrix_array, roi, in_place
+        )
+
+    @staticmethod
+    def _transform_curves(
+        matrix: np.ndarray, roi: Union["ROI", "RaggedCurves"], in_place: bool
+    ) -> "RaggedCurves":
+        from pinnacle_io.models.roi import RaggedCurves
+
+        owner = None if isinstance(roi, RaggedCurves) else roi
+        ragged = roi if owner is None else owner.curve_points
+        if not in_place:
+            return RaggedCurves(apply_affine(matrix, ragged.points), ragged.offsets)
+        apply_affine(matrix, ragged.points, out=ragged.points)
+        ragged.update_z()
+        if owner is not None:
+            # A new buffer object over the same points marks cached geometry, masks and
+            # slice indexes of the ROI as stale
+            owner.set_curve_points(
+                RaggedCurves(ragged.points, ragged.offsets, ragged.z)
+            )
+            # The buffer was modified in place, so the curves are flushed with the ROI
+            for curve in owner.curve_list:
+                flag_dirty(curve)
+        return ragged
+
     def transform_point_pinnacle_to_dicom(self, point: List[float]) -> List[float]:
         """
         Transform a point from Pinnacle coordinates to DICOM coordinates.
@@ -327,14 +434,9 @@ class PatientSetup(VersionedBase):
         Returns:
             Point in DICOM coordinates [x, y, z].
         """
-        # Convert to homogeneous coordinates
-        homogeneous_point = np.array([point[0], point[1], point[2], 1.0])
-
-        # Apply transformation
-        transformed_point = np.dot(self.pinnacle_to_dicom_matrix_array, homogeneous_point)
-
-        # Convert back to 3D coordinates
-        return [transformed_point[0], transformed_point[1], transformed_point[2]]
+        return self.transform_points_pinnacle_to_dicom(
+            np.asarray(point[:3], dtype=np.float64)[None]
+        )[0].tolist()
 
     def transform_point_dicom_to_pinnacle(self, point: List[float]) -> List[float]:
         """
@@ -346,14 +448,9 @@ class PatientSetup(VersionedBase):
         Returns:
             Point in Pinnacle coordinates [x, y, z].
         """
-        # Convert to homogeneous coordinates
-        homogeneous_point = np.array([point[0], point[1], point[2], 1.0])
-
-        # Apply transformation
-        transformed_point = np.dot(self.dicom_to_pinnacle_matrix_array, homogeneous_point)
-
-        # Convert back to 3D coordinates
-        return [transformed_point[0], transformed_point[1], transformed_point[2]]
+        return self.transform_points_dicom_to_pinnacle(
+            np.asarray(point[:3], dtype=np.float64)[None]
+        )[0].tolist()
 
     def transform_contour_pinnacle_to_dicom(
         self, contour_points: List[List[float]]
@@ -367,9 +464,8 @@ class PatientSetup(VersionedBase):
         Returns:
             List of points in DICOM coordinates [[x1, y1, z1], [x2, y2, z2], ...].
         """
-        return [
-            self.transform_point_pinnacle_to_dicom(point) for point in contour_points
-        ]
+        points = np.asarray(contour_points, dtype=np.float64).reshape(-1, 3)
+        return self.transform_points_pinnacle_to_dicom(points).tolist()
 
     def transform_contour_dicom_to_pinnacle(
         self, contour_points: List[List[float]]
@@ -383,6 +479,5 @@ class PatientSetup(VersionedBase):
         Returns:
             List of points in Pinnacle coordinates [[x1, y1, z1], [x2, y2, z2], ...].
         """
-        return [
-            self.transform_point_dicom_to_pinnacle(point) for point in contour_points
-        ]
+        points = np.asarray(contour_points, dtype=np.float64).reshape(-1, 3)
+        return self.transform_points_dicom_to_pinnacle(points).tolist()
@@ -5,24 +5,26 @@ This module provides base classes and utilities for all Pinnacle data models,
 including common fields and methods used throughout the application.
 """
 
+import weakref
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, TypeVar
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, Float
-from sqlalchemy.orm import Mapped, declarative_base
+
+from sqlalchemy import Boolean, Column, DateTime, Float, Integer, String, Text, event
+from sqlalchemy.orm import Mapped, Session, declarative_base, object_session
 
 from pinnacle_io.utils.converters import (
-    convert_integer,
-    convert_float,
-    convert_string,
     convert_boolean,
     convert_datetime,
+    convert_float,
+    convert_integer,
+    convert_string,
 )
 
 # Create the base class
 Base = declarative_base()
 
 # Type variable for model instances
-T = TypeVar('T', bound='PinnacleBase')
+T = TypeVar("T", bound="PinnacleBase")
 
 
 class PinnacleBase(Base):
@@ -45,26 +47,26 @@ class PinnacleBase(Base):
 
     # Common tracking fields with proper type hints
     created_at: Mapped[datetime] = Column(
-        "CreatedAt", 
-        DateTime, 
+        "CreatedAt",
+        DateTime,
         default=lambda: datetime.now(timezone.utc),
         nullable=False,
-        doc="Timestamp when the record was created"
+        doc="Timestamp when the record was created",
     )
-    
+
     updated_at: Mapped[datetime] = Column(
-        "UpdatedAt", 
-        DateTime, 
+        "UpdatedAt",
+        DateTime,
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
         nullable=False,
-        doc="Timestamp when the record was last updated"
+        doc="Timestamp when the record was last updated",
     )
 
     def __repr__(self) -> str:
         """
         Return a string representation of the model instance.
-        
+
         Returns:
             str: A string representation including the class name and primary key.
         """
@@ -73,36 +75,40 @@ class PinnacleBase(Base):
     def to_dict(self, exclude: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Convert the model instance to a dictionary.
-        
+
         Args:
             exclude: Optional list of field names to exclude from the result.
-            
+
         Returns:
             Dict containing the model's field names and values.
         """
         if exclude is None:
             exclude = []
-            
+
         result = {}
         for column in self.__table__.columns:
             # Skip excluded fields
-            if column.name in exclude or column.name in ['ID', 'CreatedAt', 'UpdatedAt']:
+            if column.name in exclude or column.name in [
+                "ID",
+                "CreatedAt",
+                "UpdatedAt",
+            ]:
                 continue
-                
+
             # Get the value and handle special cases
             value = getattr(self, column.name)
             if isinstance(value, datetime):
                 value = value.isoformat()
-            
+
             result[column.name] = value
-            
+
         return result
 
     @classmethod
     def _get_column_to_field_mapping(cls) -> Dict[str, str]:
         """
         Get mapping from database column names to model field names.
-        
+
         Returns:
             Dict mapping database column names to model field names.
         """
@@ -170,25 +176,25 @@ class PinnacleBase(Base):
         kwargs: Dict[str, Any],
         model_fields: Dict[str, str],
         database_columns: Dict[str, str],
-        relationship_mapping: Dict[str, Dict[str, Any]]
+        relationship_mapping: Dict[str, Dict[str, Any]],
     ) -> tuple[Dict[str, Any], Dict[str, Any]]:
         """Process and map regular field kwargs to their database column names.
-        
+
         This method separates relationship fields from regular fields and normalizes
         the field names to handle case and underscore differences between the Python
         model attributes and database column names.
-        
+
         Args:
             kwargs: Original keyword arguments passed to the model constructor
             model_fields: Mapping of model field names to database column names
             database_columns: Mapping of database column names to model field names
             relationship_mapping: Mapping of relationship configurations
-            
+
         Returns:
             A tuple containing two dictionaries:
             - mapped_kwargs: Regular field names mapped to their values
             - relationship_kwargs: Relationship field names mapped to their values
-            
+
         Example:
             >>> model_fields = {'name': 'Name', 'description': 'Description'}
             >>> db_columns = {'name': 'Name', 'description': 'Description'}
@@ -203,21 +209,24 @@ class PinnacleBase(Base):
         """
         mapped_kwargs: Dict[str, Any] = {}
         relationship_kwargs: Dict[str, Any] = {}
-        
+
         for key, value in kwargs.items():
             if value is None:
                 continue
-                
+
             # Normalize the key (lowercase and remove underscores)
             normalized_key = self._normalize_key(key)
 
             # Try to find a matching relationship field (case-insensitive and no underscores)
             relationship_field = next(
-                (k for k in relationship_mapping.keys() 
-                 if self._normalize_key(k) == normalized_key),
+                (
+                    k
+                    for k in relationship_mapping.keys()
+                    if self._normalize_key(k) == normalized_key
+                ),
                 None,
             )
-            
+
             if relationship_field:
                 # This is a relationship field
                 relationship_kwargs[relationship_field] = value
@@ -229,28 +238,28 @@ class PinnacleBase(Base):
                     mapped_key = database_columns.get(normalized_key, normalized_key)
                     if mapped_key in model_fields:
                         mapped_kwargs[mapped_key] = value
-                        
+
         return mapped_kwargs, relationship_kwargs
-    
+
     def _process_relationships(
         self,
         relationship_kwargs: Dict[str, Any],
-        relationship_mapping: Dict[str, Dict[str, Any]]
+        relationship_mapping: Dict[str, Dict[str, Any]],
     ) -> None:
         """Process relationship attributes after parent initialization.
-        
+
         This method processes relationship fields that were separated from regular
         fields during initialization. It handles different types of relationships
         (one-to-many, one-to-one) by delegating to the appropriate handler method.
-        
+
         Args:
             relationship_kwargs: Dictionary mapping relationship field names to their values
             relationship_mapping: Dictionary containing relationship configurations
-            
+
         Raises:
             AttributeError: If a relationship field exists in the mapping but not on the model
             ValueError: If an unknown relationship type is encountered
-            
+
         Example:
             >>> rel_kwargs = {'beams': [beam1, beam2], 'dose': dose_obj}
             >>> rel_mapping = {
@@ -262,47 +271,48 @@ class PinnacleBase(Base):
         for rel_field, rel_value in relationship_kwargs.items():
             if rel_value is None:
                 continue
-                
+
             if rel_field not in relationship_mapping:
                 continue
-                
+
             if not hasattr(self, rel_field):
                 raise AttributeError(
                     f"Relationship field '{rel_field}' not found on {self.__class__.__name__}"
                 )
-                
+
             rel_info = relationship_mapping[rel_field]
             rel_type = rel_info.get("type")
             target_class = rel_info.get("target_class")
-            
+
             if rel_type == "one-to-many":
-                self._process_one_to_many_relationship(rel_field, rel_value, target_class)
+                self._process_one_to_many_relationship(
+                    rel_field, rel_value, target_class
+                )
             elif rel_type == "one-to-one":
-                self._process_one_to_one_relationship(rel_field, rel_value, target_class)
+                self._process_one_to_one_relationship(
+                    rel_field, rel_value, target_class
+                )
             else:
                 raise ValueError(f"Unknown relationship type: {rel_type}")
-    
+
     def _process_one_to_many_relationship(
-        self,
-        rel_field: str,
-        rel_value: Any,
-        target_class: Optional[type] = None
+        self, rel_field: str, rel_value: Any, target_class: Optional[type] = None
     ) -> None:
         """Process a one-to-many relationship.
-        
+
         This method handles setting up one-to-many relationships. It can process
         both model instances and dictionaries that should be converted to model
         instances.
-        
+
         Args:
             rel_field: Name of the relationship field on the model
             rel_value: Single item or list of items to add to the relationship
             target_class: The target model class for the relationship
-            
+
         Raises:
             TypeError: If rel_value is not iterable or items cannot be converted
                      to the target class
-            
+
         Example:
             >>> model._process_one_to_many_relationship(
             ...     'beams',
@@ -312,25 +322,29 @@ class PinnacleBase(Base):
         """
         if not rel_value:
             return
-            
+
         # Convert single item to list for uniform processing
         if not isinstance(rel_value, (list, tuple, set)):
             rel_value = [rel_value]
-            
+
         # Initialize the list if it doesn't exist
         if getattr(self, rel_field) is None:
             setattr(self, rel_field, [])
-        
+
         # Get the current relationship collection
         relationship = getattr(self, rel_field)
-        
+
         # Add items to the relationship list
         for item in rel_value:
             if item is None:
                 continue
-                
+
             # Convert dict to model instance if target class is provided
-            if target_class and not isinstance(item, target_class) and isinstance(item, dict):
+            if (
+                target_class
+                and not isinstance(item, target_class)
+                and isinstance(item, dict)
+            ):
                 try:
                     item = target_class(**item)
                 except Exception as e:
@@ -338,36 +352,33 @@ class PinnacleBase(Base):
                         f"Failed to convert dict to {target_class.__name__} for "
                         f"field '{rel_field}': {str(e)}"
                     ) from e
-            
+
             # Ensure the item is of the correct type
             if target_class and not isinstance(item, target_class):
                 raise TypeError(
                     f"Expected {target_class.__name__} for field '{rel_field}', "
                     f"got {type(item).__name__}"
                 )
-                
+
             relationship.append(item)
-    
+
     def _process_one_to_one_relationship(
-        self,
-        rel_field: str,
-        rel_value: Any,
-        target_class: Optional[type] = None
+        self, rel_field: str, rel_value: Any, target_class: Optional[type] = None
     ) -> None:
         """Process a one-to-one relationship.
-        
+
         This method handles setting up one-to-one relationships. It can process
         both model instances and dictionaries that should be converted to model
         instances.
-        
+
         Args:
             rel_field: Name of the relationship field on the model
             rel_value: The value to set for the relationship
             target_class: The target model class for the relationship
-            
+
         Raises:
             TypeError: If rel_value cannot be converted to the target class
-            
+
         Example:
             >>> model._process_one_to_one_relationship(
             ...     'dose',
@@ -377,7 +388,7 @@ class PinnacleBase(Base):
         """
         if rel_value is None:
             return
-            
+
         # Convert dict to model instance if target class is provided
         if target_class and not isinstance(rel_value, target_class):
             if isinstance(rel_value, dict):
@@ -393,20 +404,20 @@ class PinnacleBase(Base):
                     f"Expected {target_class.__name__} or dict for field "
                     f"'{rel_field}', got {type(rel_value).__name__}"
                 )
-        
+
         setattr(self, rel_field, rel_value)
-    
+
     def __init__(self, **kwargs):
         """Initialize a new instance with the given keyword arguments."""
         # Ensure created_at is set if not provided
         now = datetime.now(timezone.utc)
-        created_at = kwargs.pop('created_at', kwargs.pop('CreatedAt', None))
-        updated_at = kwargs.pop('updated_at', kwargs.pop('UpdatedAt', None))
+        created_at = kwargs.pop("created_at", kwargs.pop("CreatedAt", None))
+        updated_at = kwargs.pop("updated_at", kwargs.pop("UpdatedAt", None))
         if created_at is None:
-            kwargs['created_at'] = now
+            kwargs["created_at"] = now
         if updated_at is None:
-            kwargs['updated_at'] = now
-        
+            kwargs["updated_at"] = now
+
         # Get database column and relationship mappings
         database_columns = {
             self._normalize_key(k): v
@@ -414,33 +425,33 @@ class PinnacleBase(Base):
         }
         model_fields = {v: k for k, v in database_columns.items()}
         relationship_mapping = self._get_relationship_mapping()
-        
+
         # Process and separate regular fields from relationships
         mapped_kwargs, relationship_kwargs = self._get_mapped_kwargs(
             kwargs, model_fields, database_columns, relationship_mapping
         )
-        
+
         # Initialize the model with the mapped fields
         super().__init__(**mapped_kwargs)
-        
+
         # Process relationships after parent initialization
         self._process_relationships(relationship_kwargs, relationship_mapping)
 
     def __setattr__(self, name: str, value: Any) -> None:
         """Set an attribute on the model with type conversion.
-        
+
         This method is called when setting attributes on the model instance.
         It performs type conversion for SQLAlchemy columns based on their
         column types before setting the value.
-        
+
         Args:
             name: The name of the attribute to set
             value: The value to set
-            
+
         Raises:
             ValueError: If the value cannot be converted to the column type
             TypeError: If the value is of an incompatible type
-            
+
         Example:
             >>> model = MyModel()
             >>> model.some_field = "123"  # Will be converted to int if column is Integer
@@ -556,3 +567,30 @@ class PinnacleBase(Base):
                 f"Warning: Could not convert {field_name}='{value}' to {column_type}: {e}"
             )
             return value  # Return original value if conversion fails
+
+
+# Instances whose mapped columns are produced from in-memory arrays (see track_array_data)
+_array_backed_instances: "weakref.WeakSet[PinnacleBase]" = weakref.WeakSet()
+
+
+def track_array_data(instance: PinnacleBase) -> None:
+    """
+    Register an instance whose mapped columns are produced from in-memory array data.
+
+    In-place edits of the arrays do not mark the instance dirty, so before a session
+    holding the instance flushes or commits, the instance's _sync_array_data() method
+    is called to write changed arrays to their columns. Instances are held weakly.
+
+    Args:
+        instance: Model instance implementing _sync_array_data().
+    """
+    _array_backed_instances.add(instance)
+
+
+@event.listens_for(Session, "before_commit")
+@event.listens_for(Session, "before_flush")
+def _sync_array_backed_instances(session: Session, *args: Any) -> None:
+    """Write the array data of tracked instances in the session to their columns."""
+    for instance in list(_array_backed_instances):
+        if object_session(instance) is session:
+            instance._sync_array_data()
@@ -5,22 +5,28 @@ This module defines the Plan model which represents a treatment plan in the Pinn
 A Plan is a container for one or more treatment Trials and is associated with a single Patient.
 """
 
-from typing import Optional, List, Dict, Any, Union, TYPE_CHECKING
-
-from sqlalchemy import Column, String, Integer, ForeignKey, Boolean, DateTime
-from sqlalchemy.orm import relationship, Mapped
 from datetime import datetime
+from typing import TYPE_CHECKING, Any, ClassVar, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, relationship
 
 from pinnacle_io.models.versioned_base import VersionedBase
 from pinnacle_io.utils.patient_enum import PatientSetupEnum
 
 if TYPE_CHECKING:
+    from pinnacle_io.models.dose_grid import DoseGrid
+    from pinnacle_io.models.image_set import ImageSet
     from pinnacle_io.models.patient import Patient
     from pinnacle_io.models.patient_setup import PatientSetup
     from pinnacle_io.models.point import Point
     from pinnacle_io.models.roi import ROI
     from pinnacle_io.models.trial import Trial
-    from pinnacle_io.models.image_set import ImageSet
+    from pinnacle_io.utils.curve_index import CurveSliceIndex
+    from pinnacle_io.utils.frames import FrameRegistry
+    from pinnacle_io.utils.roi_geometry import ROIGeometry
+    from pinnacle_io.utils.roi_mask import PackedMask
+    from pinnacle_io.utils.roi_statistics import ROIStatistics
 
 
 class Plan(VersionedBase):
@@ -72,68 +78,94 @@ class Plan(VersionedBase):
             plan_is_locked=False,
             ok_for_syntegra_in_launchpad=True
         )
-        
+
         # Add plan to a patient
         patient.add_plan(plan)
-        
+
         # Get a trial by ID
         trial = plan.get_trial_by_id(1)
-        
+
         # Get a trial by name
         trial = plan.get_trial_by_name('Trial 1')
         ```
     """
 
     __tablename__ = "Plan"
-    __mapper_args__ = {'eager_defaults': True}
+    __mapper_args__ = {"eager_defaults": True}
 
     # Primary key is inherited from PinnacleBase
-    plan_id: Mapped[Optional[int]] = Column("PlanID", Integer, nullable=True, index=True)
+    plan_id: Mapped[Optional[int]] = Column(
+        "PlanID", Integer, nullable=True, index=True
+    )
     name: Mapped[Optional[str]] = Column("PlanName", String(255), nullable=True)
 
     # Plan metadata
     tool_type: Mapped[Optional[str]] = Column("ToolType", String(64), nullable=True)
     comment: Mapped[Optional[str]] = Column("Comment", String(1024), nullable=True)
     physicist: Mapped[Optional[str]] = Column("Physicist", String(128), nullable=True)
-    dosimetrist: Mapped[Optional[str]] = Column("Dosimetrist", String(128), nullable=True)
+    dosimetrist: Mapped[Optional[str]] = Column(
+        "Dosimetrist", String(128), nullable=True
+    )
     primary_ct_image_set_id: Mapped[Optional[int]] = Column(
-        "PrimaryCTImageSetID", Integer, ForeignKey("ImageSet.ID"), nullable=True, index=True
+        "PrimaryCTImageSetID",
+        Integer,
+        ForeignKey("ImageSet.ID"),
+        nullable=True,
+        index=True,
+    )
+    primary_image_type: Mapped[Optional[str]] = Column(
+        "PrimaryImageType", String(64), nullable=True
     )
-    primary_image_type: Mapped[Optional[str]] = Column("PrimaryImageType", String(64), nullable=True)
     pinnacle_version_description: Mapped[Optional[str]] = Column(
         "PinnacleVersionDescription", String(128), nullable=True
     )
 
     # Plan status
-    is_new_plan_prefix: Mapped[Optional[bool]] = Column("IsNewPlanPrefix", Boolean, default=False, nullable=True)
-    plan_is_locked: Mapped[Optional[bool]] = Column("PlanIsLocked", Boolean, default=False, nullable=True)
+    is_new_plan_prefix: Mapped[Optional[bool]] = Column(
+        "IsNewPlanPrefix", Boolean, default=False, nullable=True
+    )
+    plan_is_locked: Mapped[Optional[bool]] = Column(
+        "PlanIsLocked", Boolean, default=False, nullable=True
+    )
     ok_for_syntegra_in_launchpad: Mapped[Optional[bool]] = Column(
         "OkForSyntegraInLaunchpad", Boolean, default=False, nullable=True
     )
 
     # Fusion information
-    fusion_id_array: Mapped[Optional[str]] = Column("FusionIDArray", String(255), nullable=True)
+    fusion_id_array: Mapped[Optional[str]] = Column(
+        "FusionIDArray", String(255), nullable=True
+    )
 
     # Timestamps
-    created_date: Mapped[Optional[datetime]] = Column("CreatedDate", DateTime, default=datetime.utcnow, nullable=True)
+    created_date: Mapped[Optional[datetime]] = Column(
+        "CreatedDate", DateTime, default=datetime.utcnow, nullable=True
+    )
     modified_date: Mapped[Optional[datetime]] = Column(
-        "ModifiedDate", DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True
+        "ModifiedDate",
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        nullable=True,
     )
 
     # Parent Relationships
     patient_id: Mapped[Optional[int]] = Column(
-        "PatientID", Integer, ForeignKey("Patient.ID", ondelete="CASCADE"), nullable=True, index=True
+        "PatientID",
+        Integer,
+        ForeignKey("Patient.ID", ondelete="CASCADE"),
+        nullable=True,
+        index=True,
     )
     patient: Mapped[Optional["Patient"]] = relationship(
         "Patient", back_populates="plan_list", lazy="selectin"
     )
-    
+
     primary_ct_image_set: Mapped[Optional["ImageSet"]] = relationship(
         "ImageSet",
         back_populates="plan_list",
         foreign_keys=[primary_ct_image_set_id],
         primaryjoin="Plan.primary_ct_image_set_id == ImageSet.id",
-        lazy="selectin"
+        lazy="selectin",
     )
 
     # Child Relationships
@@ -142,7 +174,7 @@ class Plan(VersionedBase):
         back_populates="plan",
         uselist=False,
         cascade="all, delete-orphan",
-        lazy="selectin"
+        lazy="selectin",
     )
     point_list: Mapped[List["Point"]] = relationship(
         "Point", back_populates="plan", cascade="all, delete-orphan", lazy="selectin"
@@ -154,6 +186,12 @@ class Plan(VersionedBase):
         "Trial", back_populates="plan", cascade="all, delete-orphan", lazy="selectin"
     )
 
+    # Cached (key, tolerance, CurveSliceIndex); the key holds the image set, its slice
+    # table and the ROI point buffers the index was built from
+    _curve_slice_index: ClassVar[
+        Optional[Tuple[tuple, Optional[float], "CurveSliceIndex"]]
+    ] = None
+
     def __init__(self, **kwargs):
         """
         Initialize a Plan instance.
@@ -182,7 +220,7 @@ class Plan(VersionedBase):
             # Get a trial by ID (works with string or int)
             trial = plan.get_trial_by_id(1)
             trial = plan.get_trial_by_id('1')
-            
+
             if trial:
                 print(f"Found trial: {trial.name}")
             else:
@@ -208,7 +246,7 @@ class Plan(VersionedBase):
             ```python
             # Get a trial by name
             trial = plan.get_trial_by_name('Trial 1')
-            
+
             if trial:
                 print(f"Found trial with ID: {trial.trial_id}")
             else:
@@ -301,13 +339,13 @@ class Plan(VersionedBase):
         """
         if not self._patient_position:
             return None
-            
+
         val = self._patient_position.patient_setup
-        
+
         # If already a PatientSetupEnum, return as is
         if isinstance(val, PatientSetupEnum):
             return val
-            
+
         # If string, try to convert to enum
         try:
             return PatientSetupEnum(val)
@@ -321,7 +359,7 @@ class Plan(VersionedBase):
 
         Returns:
             A string in the format 'Plan_X' where X is the plan_id.
-            
+
         Example:
             ```python
             # For a plan with plan_id=3
@@ -339,51 +377,60 @@ class Plan(VersionedBase):
 
         Returns:
             A dictionary representation of the Plan.
-            
+
         Example:
             ```python
             # Get basic plan info
             plan_dict = plan.to_dict()
-            
+
             # Get plan info with related objects
             plan_dict_full = plan.to_dict(include_related=True)
             ```
         """
         data = {
-            'id': self.id,
-            'plan_id': self.plan_id,
-            'name': self.name,
-            'tool_type': self.tool_type,
-            'comment': self.comment,
-            'physicist': self.physicist,
-            'dosimetrist': self.dosimetrist,
-            'primary_image_type': self.primary_image_type,
-            'pinnacle_version_description': self.pinnacle_version_description,
-            'is_new_plan_prefix': self.is_new_plan_prefix,
-            'plan_is_locked': self.plan_is_locked,
-            'ok_for_syntegra_in_launchpad': self.ok_for_syntegra_in_launchpad,
-            'fusion_id_array': self.fusion_id_array,
-            'created_date': self.created_date.isoformat() if self.created_date else None,
-            'modified_date': self.modified_date.isoformat() if self.modified_date else None,
-            'patient_position': self.patient_position.value if self.patient_position else None,
-            'plan_folder': self.plan_folder
+            "id": self.id,
+            "plan_id": self.plan_id,
+            "name": self.name,
+            "tool_type": self.tool_type,
+            "comment": self.comment,
+            "physicist": self.physicist,
+            "dosimetrist": self.dosimetrist,
+            "primary_image_type": self.primary_image_type,
+            "pinnacle_version_description": self.pinnacle_version_description,
+            "is_new_plan_prefix": self.is_new_plan_prefix,
+            "plan_is_locked": self.plan_is_locked,
+            "ok_for_syntegra_in_launchpad": self.ok_for_syntegra_in_launchpad,
+            "fusion_id_array": self.fusion_id_array,
+            "created_date": (
+                self.created_date.isoformat() if self.created_date else None
+            ),
+            "modified_date": (
+                self.modified_date.isoformat() if self.modified_date else None
+            ),
+            "patient_position": (
+                self.patient_position.value if self.patient_position else None
+            ),
+            "plan_folder": self.plan_folder,
         }
-        
+
         if include_related:
             if self.primary_ct_image_set:
-                data['primary_ct_image_set'] = self.primary_ct_image_set.to_dict()
+                data["primary_ct_image_set"] = self.primary_ct_image_set.to_dict()
             if self.patient:
-                data['patient'] = {'id': self.patient.id, 'patient_id': self.patient.patient_id}
-                
-            data['trial_count'] = len(self.trial_list)
-            data['roi_count'] = len(self.roi_list)
-            data['point_count'] = len(self.point_list)
-            
-            if include_related == 'full':
-                data['trials'] = [trial.to_dict() for trial in self.trial_list]
-                data['rois'] = [roi.to_dict() for roi in self.roi_list]
-                data['points'] = [point.to_dict() for point in self.point_list]
-        
+                data["patient"] = {
+                    "id": self.patient.id,
+                    "patient_id": self.patient.patient_id,
+                }
+
+            data["trial_count"] = len(self.trial_list)
+            data["roi_count"] = len(self.roi_list)
+            data["point_count"] = len(self.point_list)
+
+            if include_related == "full":
+                data["trials"] = [trial.to_dict() for trial in self.trial_list]
+                data["rois"] = [roi.to_dict() for roi in self.roi_list]
+                data["points"] = [point.to_dict() for point in self.point_list]
+
         return data
 
     def add_trial(self, trial: "Trial") -> None:
@@ -392,22 +439,24 @@ class Plan(VersionedBase):
 
         Args:
             trial: The Trial object to add.
-            
+
         Raises:
             ValueError: If the trial is already associated with this plan.
-            
+
         Example:
             ```python
             # Create a new trial
             trial = Trial(trial_id=1, name='Trial 1')
-            
+
             # Add it to the plan
             plan.add_trial(trial)
             ```
         """
         if trial in self.trial_list:
-            raise ValueError(f"Trial with ID {trial.trial_id} is already associated with this plan")
-            
+            raise ValueError(
+                f"Trial with ID {trial.trial_id} is already associated with this plan"
+            )
+
         self.trial_list.append(trial)
         trial.plan = self
 
@@ -417,28 +466,172 @@ class Plan(VersionedBase):
 
         Args:
             roi: The ROI object to add.
-            
+
         Raises:
             ValueError: If the ROI is already associated with this plan.
         """
         if roi in self.roi_list:
-            raise ValueError(f"ROI with ID {roi.id} is already associated with this plan")
-            
+            raise ValueError(
+                f"ROI with ID {roi.id} is already associated with this plan"
+            )
+
         self.roi_list.append(roi)
         roi.plan = self
 
+    def update_roi_statistics(
+        self,
+        masks: Optional[Dict["ROI", Any]] = None,
+        image_set: Optional["ImageSet"] = None,
+        chunk_size: int = 16,
+    ) -> Dict["ROI", "ROIStatistics"]:
+        """
+        Recompute the pixel statistics and volume of the plan's ROIs from the image.
+
+        All ROIs are evaluated in a single pass over the image slabs and the results are
+        written to their pixel_min, pixel_max, pixel_mean, pixel_std and volume columns.
+
+        Args:
+            masks: Boolean (z, y, x) mask on the image grid for each ROI. ROIs without a
+                mask are rasterized from their curves; ROIs without curves are left unchanged.
+            image_set: Image to evaluate. Defaults to the primary CT image set.
+            chunk_size: Number of axial slices read at a time.
+
+        Returns:
+            ROIStatistics for each evaluated ROI.
+        """
+        from pinnacle_io.utils.roi_statistics import compute_roi_statistics
+
+        image_set = image_set or self.primary_ct_image_set
+        if image_set is None:
+            raise ValueError(
+                "Plan has no primary CT image set to compute ROI statistics from."
+            )
+        return compute_roi_statistics(
+            image_set, self.roi_list, masks, chunk_size=chunk_size
+        )
+
+    def get_roi_masks(
+        self, grid: Any = None, workers: Optional[int] = None
+    ) -> Dict["ROI", "PackedMask"]:
+        """
+        Rasterize all ROIs of the plan in parallel, using the mask cache.
+
+        Args:
+            grid: Target grid (ImageSet, DoseGrid, Dose or GridGeometry). Defaults to the
+                primary CT image set.
+            workers: Number of threads.
+
+        Returns:
+            PackedMask for each ROI.
+        """
+        from pinnacle_io.utils.roi_mask import get_roi_masks
+
+        grid = grid if grid is not None else self.primary_ct_image_set
+        if grid is None:
+            raise ValueError(
+                "A grid is required when the plan has no primary CT image set."
+            )
+        return get_roi_masks(self.roi_list, grid, workers=workers)
+
+    def compute_roi_geometry(
+        self, slice_thickness: Optional[float] = None
+    ) -> Dict["ROI", "ROIGeometry"]:
+        """
+        Compute the volume, centroid and extents of all ROIs in one batch.
+
+        Results are cached on each ROI until its curves change.
+
+        Args:
+            slice_thickness: Thickness of each contoured slice in cm, e.g. the z pixel
+                size of the primary CT. Defaults to the spacing between the curves of
+                each ROI.
+
+        Returns:
+            ROIGeometry for each ROI.
+        """
+        from pinnacle_io.utils.roi_geometry import compute_roi_geometry
+
+        return compute_roi_geometry(self.roi_list, slice_thickness)
+
+    def get_curve_slice_index(
+        self, image_set: Optional["ImageSet"] = None, tolerance: Optional[float] = None
+    ) -> "CurveSliceIndex":
+        """
+        Index the curves of all ROIs by image slice.
+
+        Curve.slice_index and Curve.z_position are filled when the index is built. The
+        index is cached and rebuilt after the ROIs, their curves or the slice positions of
+        the image set change.
+
+        Args:
+            image_set: ImageSet defining the slices. Defaults to the primary CT.
+            tolerance: Maximum distance between a curve and its slice in cm. Defaults to
+                half the slice spacing.
+
+        Returns:
+            CurveSliceIndex of the plan ROIs.
+        """
+        from pinnacle_io.utils.curve_index import CurveSliceIndex
+
+        image_set = image_set if image_set is not None else self.primary_ct_image_set
+        if image_set is None:
+            raise ValueError(
+                "An image set is required when the plan has no primary CT image set."
+            )
+        # The key holds the objects themselves and is compared by identity
+        key = (image_set, image_set.image_info_table) + tuple(
+            item for roi in self.roi_list for item in (roi, roi.curve_points)
+        )
+        cached = self._curve_slice_index
+        if (
+            cached is not None
+            and cached[1] == tolerance
+            and len(cached[0]) == len(key)
+            and all(a is b for a, b in zip(cached[0], key))
+        ):
+            return cached[2]
+        index = CurveSliceIndex.build(self.roi_list, image_set, tolerance)
+        self._curve_slice_index = (key, tolerance, index)
+        return index
+
+    def get_frame_registry(
+        self,
+        image_set: Optional["ImageSet"] = None,
+        dose_grid: Optional["DoseGrid"] = None,
+    ) -> "FrameRegistry":
+        """
+        Coordinate frames of the plan.
+
+        The registry holds the "patient" frame, the "image" voxel-index frame of the image
+        set, the "dose" voxel-index frame of the dose grid (if given) and the "dicom"
+        frame of the patient setup (if set).
+
+        Args:
+            image_set: ImageSet of the "image" frame. Defaults to the primary CT.
+            dose_grid: DoseGrid of the "dose" frame.
+
+        Returns:
+            FrameRegistry of the plan.
+        """
+        from pinnacle_io.utils.frames import FrameRegistry
+
+        image_set = image_set if image_set is not None else self.primary_ct_image_set
+        return FrameRegistry.from_objects(image_set, dose_grid, self._patient_position)
+
     def add_point(self, point: "Point") -> None:
         """
         Add a point to this plan.
 
         Args:
             point: The Point object to add.
-            
+
         Raises:
             ValueError: If the point is already associated with this plan.
         """
         if point in self.point_list:
-            raise ValueError(f"Point with ID {point.id} is already associated with this plan")
-            
+            raise ValueError(
+                f"Point with ID {point.id} is already associated with this plan"
+            )
+
         self.point_list.append(point)
         point.plan = self
@@ -4,17 +4,129 @@ ROI model for Pinnacle IO.
 This module provides the ROI data model for representing structure set information.
 """
 
-from typing import Optional, List, Union, TYPE_CHECKING
+import hashlib
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ClassVar,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import numpy as np
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, LargeBinary
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Float,
+    ForeignKey,
+    Integer,
+    LargeBinary,
+    String,
+    event,
+)
 from sqlalchemy.orm import Mapped, relationship
 
-from pinnacle_io.models.pinnacle_base import PinnacleBase
+from pinnacle_io.models.pinnacle_base import PinnacleBase, track_array_data
 from pinnacle_io.models.plan import Plan
 
 if TYPE_CHECKING:
     from pinnacle_io.models.plan import Plan
+    from pinnacle_io.utils.roi_geometry import ROIGeometry
+    from pinnacle_io.utils.roi_mask import FractionalMask, PackedMask
+
+
+class RaggedCurves:
+    """
+    Points of all curves of an ROI in one contiguous buffer.
+
+    Curve i holds the points points[offsets[i]:offsets[i + 1]], so whole-ROI operations
+    (transforms, bounding boxes, rasterization) are single NumPy calls on points. Curve
+    objects attached to the buffer return views into it.
+
+    Attributes:
+        points: float32 (N_total, 3) points of all curves.
+        offsets: int32 (n_curves + 1,) start of each curve in points; the last entry is
+            N_total.
+        z: float32 (n_curves,) z-position of each curve (mean z of its points).
+    """
+
+    def __init__(
+        self, points: np.ndarray, offsets: Sequence[int], z: Optional[np.ndarray] = None
+    ) -> None:
+        self.points = np.ascontiguousarray(points, dtype=np.float32).reshape(-1, 3)
+        self.offsets = np.asarray(offsets, dtype=np.int32)
+        if (
+            self.offsets.ndim != 1
+            or not len(self.offsets)
+            or self.offsets[0] != 0
+            or self.offsets[-1] != len(self.points)
+            or np.any(np.diff(self.offsets) < 0)
+        ):
+            raise ValueError("Offsets must increase from 0 to the number of points.")
+        self.z = self._curve_z() if z is None else np.asarray(z, dtype=np.float32)
+
+    @classmethod
+    def from_arrays(cls, arrays: Iterable[Any]) -> "RaggedCurves":
+        """Concatenate (N_i, 3) point arrays of individual curves."""
+        arrays = [np.asarray(a, dtype=np.float32).reshape(-1, 3) for a in arrays]
+        counts = [len(a) for a in arrays]
+        points = (
+            np.concatenate(arrays) if arrays else np.zeros((0, 3), dtype=np.float32)
+        )
+        return cls(points, np.concatenate(([0], np.cumsum(counts))))
+
+    def _curve_z(self) -> np.ndarray:
+        counts = self.counts
+        z = np.zeros(len(counts), dtype=np.float32)
+        nonempty = counts > 0
+        if nonempty.any():
+            sums = np.add.reduceat(
+                self.points[:, 2].astype(np.float64), self.offsets[:-1][nonempty]
+            )
+            z[nonempty] = sums / counts[nonempty]
+        return z
+
+    @property
+    def counts(self) -> np.ndarray:
+        """Number of points of each curve."""
+        return np.diff(self.offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        """Points of curve index, as a view into the buffer."""
+        if index < 0:
+            index += len(self)
+        return self.points[self.offsets[index] : self.offsets[index + 1]]
+
+    def bounding_box(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """(min, max) (x, y, z) corners of all points, or None without points."""
+        if not len(self.points):
+            return None
+        return self.points.min(axis=0), self.points.max(axis=0)
+
+    def update_z(self) -> None:
+        """Recompute the curve z-positions after the points were modified in place."""
+        self.z = self._curve_z()
+
+    def content_hash(self) -> str:
+        """Hash of the offsets and points, used to detect changes to the curves."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.offsets.tobytes())
+        digest.update(self.points.tobytes())
+        return digest.hexdigest()
+
+    @property
+    def nbytes(self) -> int:
+        return self.points.nbytes + self.offsets.nbytes + self.z.nbytes
+
+    def __repr__(self) -> str:
+        return f"<RaggedCurves(curves={len(self)}, points={len(self.points)})>"
 
 
 class Curve(PinnacleBase):
@@ -43,6 +155,11 @@ class Curve(PinnacleBase):
     roi_id: Mapped[int] = Column("ROIID", Integer, ForeignKey("ROI.ID"))
     roi = relationship("ROI", back_populates="curve_list")
 
+    # (RaggedCurves, curve index) when the points are a view into the ROI point buffer.
+    # points_data is then written from the view when the ROI is flushed.
+    _points_view: ClassVar[Optional[Tuple[RaggedCurves, int]]] = None
+    _syncing_points_data: ClassVar[bool] = False
+
     def __init__(self, points: Optional[np.ndarray] = None, **kwargs):
         """Initialize a Curve instance.
 
@@ -64,6 +181,9 @@ class Curve(PinnacleBase):
     @property
     def points(self) -> np.ndarray:
         """Get the points as a numpy array of shape (N, 3) where N is the number of points."""
+        if self._points_view is not None:
+            ragged, index = self._points_view
+            return ragged[index]
         if self.points_data is None:
             return np.zeros((0, 3), dtype=np.float32)
         return np.frombuffer(self.points_data, dtype=np.float32).reshape(-1, 3)
@@ -81,6 +201,17 @@ class Curve(PinnacleBase):
         self.points_data = arr.tobytes()
         self.num_points = len(arr)
 
+    def _sync_points_data(self) -> None:
+        """Write the points of a view into the ROI point buffer to points_data."""
+        if self._points_view is not None:
+            data = self.points.tobytes()
+            if self.points_data != data:
+                self._syncing_points_data = True
+                try:
+                    self.points_data = data
+                finally:
+                    self._syncing_points_data = False
+
     @property
     def point_count(self) -> int:
         """
@@ -172,6 +303,15 @@ class ROI(PinnacleBase):
         "Curve", back_populates="roi", cascade="all, delete-orphan"
     )
 
+    # Cached (slice thickness, ROIGeometry) computed from the curves
+    _geometry: ClassVar[Optional[Tuple[Optional[float], "ROIGeometry"]]] = None
+    # Contiguous points of all curves; the curves are views into it
+    _curve_points: ClassVar[Optional[RaggedCurves]] = None
+    # Curves viewing _curve_points, held so that in-place edits survive expiry of curve_list
+    _curve_point_curves: ClassVar[Optional[Tuple[Curve, ...]]] = None
+    # Content hash of _curve_points when the points_data of its curves last matched it
+    _synced_curve_points_hash: ClassVar[Optional[str]] = None
+
     def __init__(self, **kwargs):
         """Initialize an ROI instance.
 
@@ -184,6 +324,175 @@ class ROI(PinnacleBase):
         """
         super().__init__(**kwargs)
 
+    @property
+    def geometry(self) -> "ROIGeometry":
+        """Volume, centroid and extents computed from the curves (cached)."""
+        return self.get_geometry()
+
+    def get_geometry(self, slice_thickness: Optional[float] = None) -> "ROIGeometry":
+        """
+        Compute the volume, centroid and extents of the ROI from its curves.
+
+        The result is cached until curve_list or the points of a curve change. Use
+        Plan.compute_roi_geometry to evaluate all ROIs of a plan in one batch.
+
+        Args:
+            slice_thickness: Thickness of each contoured slice in cm. Defaults to the
+                spacing between the curves.
+
+        Returns:
+            ROIGeometry of the ROI.
+        """
+        from pinnacle_io.utils.roi_geometry import compute_roi_geometry
+
+        return compute_roi_geometry([self], slice_thickness)[self]
+
+    def _invalidate_geometry(self) -> None:
+        self._geometry = None
+
+    def _invalidate_curves(self) -> None:
+        self._curve_points = None
+        self._curve_point_curves = None
+        self._synced_curve_points_hash = None
+        self._geometry = None
+
+    @property
+    def curve_points(self) -> RaggedCurves:
+        """
+        Points of all curves in one contiguous buffer.
+
+        ROIs read by ROIReader are created with the buffer. Otherwise it is built from
+        curve_list on first access, and the curves become views into it. Modifying
+        curve_list or assigning Curve.points rebuilds the buffer on the next access.
+        """
+        if self._curve_points is None:
+            ragged = RaggedCurves.from_arrays(curve.points for curve in self.curve_list)
+            self.set_curve_points(ragged)
+            if all(curve.points_data is not None for curve in self._curve_point_curves):
+                self._synced_curve_points_hash = ragged.content_hash()
+        return self._curve_points
+
+    def set_curve_points(self, ragged: RaggedCurves) -> None:
+        """
+        Use a point buffer for the curves of the ROI.
+
+        Args:
+            ragged: Points of each curve of curve_list, in order.
+        """
+        curves = self.curve_list
+        if len(ragged) != len(curves):
+            raise ValueError(
+                f"Point buffer has {len(ragged)} curves, ROI '{self.name}' has {len(curves)}"
+            )
+        counts = ragged.counts
+        for index, curve in enumerate(curves):
+            curve._points_view = (ragged, index)
+            if curve.num_points != counts[index]:
+                curve.num_points = int(counts[index])
+        self._curve_points = ragged
+        self._curve_point_curves = tuple(curves)
+        self._synced_curve_points_hash = None
+        self._geometry = None
+        track_array_data(self)
+
+    def _sync_array_data(self) -> None:
+        """Write the point buffer to the points_data of the curves if it has changed."""
+        ragged = self._curve_points
+        if ragged is None:
+            return
+        content_hash = ragged.content_hash()
+        if content_hash != self._synced_curve_points_hash:
+            for curve in self._curve_point_curves:
+                curve._sync_points_data()
+            self._synced_curve_points_hash = content_hash
+
+    def get_mask(
+        self, grid: Any, packed: bool = False
+    ) -> Union[np.ndarray, "PackedMask"]:
+        """
+        Rasterize the ROI curves onto a grid, using the mask cache.
+
+        Args:
+            grid: Target grid (ImageSet, DoseGrid, Dose or GridGeometry).
+            packed: If True, return the cached PackedMask (bit-packed and cropped to the
+                ROI bounding box) instead of a full boolean array.
+
+        Returns:
+            Boolean (z, y, x) mask on the grid, or a PackedMask.
+        """
+        from pinnacle_io.utils.roi_mask import get_roi_mask
+
+        mask = get_roi_mask(self, grid)
+        return mask if packed else mask.to_array()
+
+    def get_fractional_mask(self, grid: Any, samples: int = 8) -> "FractionalMask":
+        """
+        Rasterize the ROI curves onto a grid with partial-volume fractions.
+
+        Boundary voxels are supersampled on a samples x samples in-plane grid, so small
+        structures are represented accurately on coarse dose grids. The result can be
+        passed as the mask of Dose.get_dose_index for weighted DVH and mean dose.
+
+        Args:
+            grid: Target grid (ImageSet, DoseGrid, Dose or GridGeometry).
+            samples: Number of sub-pixel samples along each in-plane axis.
+
+        Returns:
+            FractionalMask of the ROI on the grid.
+        """
+        from pinnacle_io.utils.roi_mask import get_roi_fractional_mask
+
+        return get_roi_fractional_mask(self, grid, samples)
+
+    def expand(
+        self,
+        margin: Union[float, Sequence[float]],
+        grid: Any,
+        name: Optional[str] = None,
+    ) -> "ROI":
+        """
+        Create a new ROI by expanding or contracting this ROI.
+
+        The margin is applied to the mask of the ROI on the grid with an exact Euclidean
+        distance transform and contoured back into curves. See
+        pinnacle_io.utils.roi_margin for details.
+
+        Args:
+            margin: Margin along x, y and z in cm, or one value for all axes. Negative
+                values contract the ROI.
+            grid: Grid on which the margin is applied (ImageSet, DoseGrid or GridGeometry).
+            name: Name of the new ROI. Defaults to this name with a "_margin" suffix.
+
+        Returns:
+            New ROI, not added to the plan.
+        """
+        from pinnacle_io.utils.roi_margin import expand_roi
+
+        return expand_roi(self, margin, grid, name)
+
     def __repr__(self) -> str:
         """String representation of the ROI instance."""
         return f"<ROI(id={self.id}, number={self.roi_number}, name='{self.name}')>"
+
+
+@event.listens_for(ROI.curve_list, "append")
+@event.listens_for(ROI.curve_list, "remove")
+@event.listens_for(ROI.curve_list, "bulk_replace")
+def _invalidate_roi_curves(target: ROI, *args) -> None:
+    """Rebuild the point buffer and geometry after the curve list changes."""
+    target._invalidate_curves()
+
+
+@event.listens_for(Curve.points_data, "set")
+def _invalidate_parent_roi_geometry(target: Curve, *args) -> None:
+    """Detach the curve from the ROI point buffer and recompute the geometry after points_data is assigned."""
+    if target._syncing_points_data:
+        return
+    # Curves loaded through curve_list do not have roi populated until it is accessed
+    roi = target.roi
+    if target._points_view is not None:
+        target._points_view = None
+        if roi is not None:
+            roi._invalidate_curves()
+    elif roi is not None:
+        roi._invalidate_geometry()
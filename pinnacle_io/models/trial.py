@@ -4,10 +4,10 @@ SQLAlchemy model for Pinnacle Trial data.
 This module provides the Trial model for representing treatment trial details.
 """
 
-from typing import List, Optional, TYPE_CHECKING
+from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import Column, String, Integer, Float, ForeignKey
-from sqlalchemy.orm import relationship, Mapped
+from sqlalchemy import Column, Float, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, relationship
 
 from pinnacle_io.models.versioned_base import VersionedBase
 
@@ -15,10 +15,10 @@ if TYPE_CHECKING:
     from pinnacle_io.models.beam import Beam
     from pinnacle_io.models.dose import Dose, MaxDosePoint
     from pinnacle_io.models.dose_grid import DoseGrid
+    from pinnacle_io.models.patient_setup import PatientRepresentation
 
     # from pinnacle_io.models.patient_setup import PatientSetup
     from pinnacle_io.models.plan import Plan
-    from pinnacle_io.models.patient_setup import PatientRepresentation
     from pinnacle_io.models.prescription import Prescription
 
 
@@ -77,7 +77,9 @@ class Trial(VersionedBase):
     mc_statistics_threshold: Mapped[int] = Column(
         "MCStatisticsThreshold", Integer, nullable=True
     )
-    mc_uncertainty_goal: Mapped[int] = Column("MCUncertaintyGoal", Integer, nullable=True)
+    mc_uncertainty_goal: Mapped[int] = Column(
+        "MCUncertaintyGoal", Integer, nullable=True
+    )
     remove_couch_from_scan: Mapped[int] = Column(
         "RemoveCouchFromScan", Integer, nullable=True
     )
@@ -90,7 +92,9 @@ class Trial(VersionedBase):
     display_3d_couch_position: Mapped[int] = Column(
         "Display3DCouchPosition", Integer, nullable=True
     )
-    couch_display_color: Mapped[str] = Column("CouchDisplayColor", String, nullable=True)
+    couch_display_color: Mapped[str] = Column(
+        "CouchDisplayColor", String, nullable=True
+    )
     recompute_density: Mapped[int] = Column("RecomputeDensity", Integer, nullable=True)
     physics_plan: Mapped[int] = Column("PhysicsPlan", Integer, nullable=True)
     compute_relative_dose: Mapped[int] = Column(
@@ -134,7 +138,9 @@ class Trial(VersionedBase):
     use_trial_for_treatment: Mapped[int] = Column(
         "UseTrialForTreatment", Integer, nullable=True
     )
-    use_coord_ref_point: Mapped[int] = Column("UseCoordRefPoint", Integer, nullable=True)
+    use_coord_ref_point: Mapped[int] = Column(
+        "UseCoordRefPoint", Integer, nullable=True
+    )
     course_id: Mapped[int] = Column("CourseID", Integer, nullable=True)
     tolerance_table: Mapped[int] = Column("ToleranceTable", Integer, nullable=True)
     always_display_2d_couch_position: Mapped[int] = Column(
@@ -172,14 +178,18 @@ class Trial(VersionedBase):
     lr_error: Mapped[int] = Column("LRError", Integer, nullable=True)
     is_error: Mapped[int] = Column("IsError", Integer, nullable=True)
     depth_error: Mapped[int] = Column("DepthError", Integer, nullable=True)
-    fluence_dose_spread: Mapped[int] = Column("FluenceDoseSpread", Integer, nullable=True)
+    fluence_dose_spread: Mapped[int] = Column(
+        "FluenceDoseSpread", Integer, nullable=True
+    )
     single_gaussian_dose_spread: Mapped[int] = Column(
         "SingleGaussianDoseSpread", Integer, nullable=True
     )
     double_gaussian_dose_spread: Mapped[int] = Column(
         "DoubleGaussianDoseSpread", Integer, nullable=True
     )
-    nuclear_dose_spread: Mapped[int] = Column("NuclearDoseSpread", Integer, nullable=True)
+    nuclear_dose_spread: Mapped[int] = Column(
+        "NuclearDoseSpread", Integer, nullable=True
+    )
     min_dose_threshold: Mapped[float] = Column("MinDoseThreshold", Float, nullable=True)
     is_ro: Mapped[int] = Column("IsRO", Integer, nullable=True)
     ant_post_weight: Mapped[int] = Column("AntPostWeight", Integer, nullable=True)
@@ -242,7 +252,9 @@ class Trial(VersionedBase):
         super().__init__(**kwargs)
 
     def __repr__(self) -> str:
-        return f"<Trial(id={self.id}, trial_id={self.trial_id}, trial_name='{self.name}')>"
+        return (
+            f"<Trial(id={self.id}, trial_id={self.trial_id}, trial_name='{self.name}')>"
+        )
 
     def get_beam_by_number(self, beam_number: int) -> Optional["Beam"]:
         """
@@ -283,3 +295,16 @@ class Trial(VersionedBase):
             Total monitor units.
         """
         return sum(beam.compute_monitor_units() for beam in self.beam_list)
+
+    @property
+    def number_of_fractions(self) -> Optional[int]:
+        """
+        Get the number of fractions from the trial's prescriptions.
+
+        Returns:
+            Number of fractions of the first prescription that defines one, or None.
+        """
+        for prescription in self.prescription_list:
+            if prescription.number_of_fractions:
+                return int(prescription.number_of_fractions)
+        return None
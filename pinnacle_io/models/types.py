@@ -4,12 +4,14 @@ Custom SQLAlchemy types and spatial coordinate classes for Pinnacle data models.
 This module provides:
 1. Custom SQLAlchemy types for database storage
 2. A hierarchy of spatial coordinate types for 3D medical imaging data
+3. Array-backed coordinate and index types for many points at once
 """
 
-from abc import ABC, abstractmethod
-from typing import Any, Dict, Generic, List, Optional, TypeVar, final
 import math
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Generic, Iterator, List, Optional, TypeVar, Union, final
 
+import numpy as np
 from sqlalchemy import String, Text
 from sqlalchemy.types import TypeDecorator
 
@@ -17,14 +19,14 @@ from sqlalchemy.types import TypeDecorator
 class JsonList(TypeDecorator):
     """
     SQLAlchemy type for storing Python lists as JSON strings in the database.
-    
+
     This type handles automatic conversion between Python lists and JSON strings
     when reading from and writing to the database.
-    
+
     Example:
         class MyModel(Base):
             __tablename__ = 'my_model'
-            
+
             id = Column(Integer, primary_key=True)
             tags = Column(JsonList)  # Will be stored as JSON string
     """
@@ -37,11 +39,11 @@ class JsonList(TypeDecorator):
     def process_bind_param(self, value: Optional[List[Any]], dialect) -> Optional[str]:
         """
         Convert Python list to JSON string for database storage.
-        
+
         Args:
             value: The Python list to convert, or None.
             dialect: The DBAPI in use.
-            
+
         Returns:
             JSON string representation of the list, or None if value is None.
         """
@@ -49,14 +51,16 @@ class JsonList(TypeDecorator):
             return None
         return str(value)
 
-    def process_result_value(self, value: Optional[str], dialect) -> Optional[List[Any]]:
+    def process_result_value(
+        self, value: Optional[str], dialect
+    ) -> Optional[List[Any]]:
         """
         Convert JSON string from database back to Python list.
-        
+
         Args:
             value: The JSON string from the database, or None.
             dialect: The DBAPI in use.
-            
+
         Returns:
             Python list, or None if value is None or empty.
         """
@@ -69,67 +73,74 @@ class JsonList(TypeDecorator):
 
 
 # Type variables for generic base class
-T = TypeVar('T', int, float, covariant=True)
+T = TypeVar("T", int, float, covariant=True)
 
 
 class SpatialBase(ABC, Generic[T]):
     """
     Abstract base class for 3D spatial coordinates.
-    
+
     This class provides common functionality for all spatial coordinate types
     while allowing type-specific implementations for different use cases.
     """
-    __slots__ = ('_x', '_y', '_z')
-    
+
+    __slots__ = ("_x", "_y", "_z")
+
     def __init__(self, x: T, y: T, z: T) -> None:
         """Initialize with x, y, z components."""
-        self._x = self._validate_component('x', x)
-        self._y = self._validate_component('y', y)
-        self._z = self._validate_component('z', z)
-    
+        self._x = self._validate_component("x", x)
+        self._y = self._validate_component("y", y)
+        self._z = self._validate_component("z", z)
+
     @abstractmethod
     def _validate_component(self, name: str, value: T) -> T:
         """Validate a component value. Must be implemented by subclasses."""
         pass
-    
+
     @property
     def x(self) -> T:
         """X component of the coordinate."""
         return self._x
-    
+
     @property
     def y(self) -> T:
         """Y component of the coordinate."""
         return self._y
-    
+
     @property
     def z(self) -> T:
         """Z component of the coordinate."""
         return self._z
-    
+
     def to_dict(self) -> Dict[str, T]:
         """Convert to a dictionary with x, y, z keys."""
-        return {'x': self.x, 'y': self.y, 'z': self.z}
-    
+        return {"x": self.x, "y": self.y, "z": self.z}
+
     def to_list(self) -> List[T]:
         """Convert to a list [x, y, z]."""
         return [self.x, self.y, self.z]
-    
+
     @classmethod
-    def from_dict(cls, data: Dict[str, T]) -> 'SpatialBase[T]':
+    def from_dict(cls, data: Dict[str, T]) -> "SpatialBase[T]":
         """Create from a dictionary with x, y, z keys."""
         return cls(
-            x=data.get('x', 0),  # type: ignore
-            y=data.get('y', 0),  # type: ignore
-            z=data.get('z', 0)   # type: ignore
+            x=data.get("x", 0),  # type: ignore
+            y=data.get("y", 0),  # type: ignore
+            z=data.get("z", 0),  # type: ignore
         )
-    
+
     def __eq__(self, other: object) -> bool:
         """Test equality with another coordinate."""
         if not isinstance(other, SpatialBase):
             return False
         return self.x == other.x and self.y == other.y and self.z == other.z
-    
+
+    def __array__(
+        self, dtype: Optional[Any] = None, copy: Optional[bool] = None
+    ) -> np.ndarray:
+        """Convert to a (3,) array [x, y, z], so the types broadcast with point arrays."""
+        return np.array([self.x, self.y, self.z], dtype=dtype)
+
     def __repr__(self) -> str:
         """String representation of the coordinate."""
         return f"{self.__class__.__name__}(x={self.x}, y={self.y}, z={self.z})"
@@ -139,10 +150,10 @@ class SpatialBase(ABC, Generic[T]):
 class VoxelSize(SpatialBase[float]):
     """
     Represents the physical size of a voxel in millimeters.
-    
+
     All components must be positive floating-point numbers.
     """
-    
+
     def _validate_component(self, name: str, value: float) -> float:
         """Validate that the component is a positive number."""
         if value is None:
@@ -151,7 +162,7 @@ class VoxelSize(SpatialBase[float]):
         if val < 0:
             raise ValueError(f"{name} must be non-negative, got {val}")
         return val
-    
+
     def volume(self) -> float:
         """Calculate the volume of a voxel with these dimensions."""
         return self.x * self.y * self.z
@@ -161,17 +172,17 @@ class VoxelSize(SpatialBase[float]):
 class VolumeSize(SpatialBase[float]):
     """
     Represents the physical dimensions of a volume in millimeters.
-    
+
     All components must be non-negative floating-point numbers.
     """
-    
+
     def _validate_component(self, name: str, value: float) -> float:
         """Validate that the component is a non-negative number."""
         val = float(value)
         if val < 0:
             raise ValueError(f"{name} must be non-negative, got {val}")
         return val
-    
+
     def volume(self) -> float:
         """Calculate the total volume."""
         return self.x * self.y * self.z
@@ -181,41 +192,33 @@ class VolumeSize(SpatialBase[float]):
 class Coordinate(SpatialBase[float]):
     """
     Represents a physical point in 3D space in millimeters.
-    
+
     No constraints on component values.
     """
-    
+
     def _validate_component(self, name: str, value: float) -> float:
         """Convert to float with no additional validation."""
         return float(value)
-    
-    def distance_to(self, other: 'Coordinate') -> float:
+
+    def distance_to(self, other: "Coordinate") -> float:
         """Calculate Euclidean distance to another coordinate."""
         dx = self.x - other.x
         dy = self.y - other.y
         dz = self.z - other.z
-        return math.sqrt(dx*dx + dy*dy + dz*dz)
-        
-    def __add__(self, other: 'Coordinate') -> 'Coordinate':
+        return math.sqrt(dx * dx + dy * dy + dz * dz)
+
+    def __add__(self, other: "Coordinate") -> "Coordinate":
         """Add two coordinates component-wise."""
         if not isinstance(other, Coordinate):
             return NotImplemented
-        return Coordinate(
-            x=self.x + other.x,
-            y=self.y + other.y,
-            z=self.z + other.z
-        )
-        
-    def __mul__(self, scalar: float) -> 'Coordinate':
+        return Coordinate(x=self.x + other.x, y=self.y + other.y, z=self.z + other.z)
+
+    def __mul__(self, scalar: float) -> "Coordinate":
         """Multiply coordinate by a scalar."""
         if not isinstance(scalar, (int, float)):
             return NotImplemented
-        return Coordinate(
-            x=self.x * scalar,
-            y=self.y * scalar,
-            z=self.z * scalar
-        )
-        
+        return Coordinate(x=self.x * scalar, y=self.y * scalar, z=self.z * scalar)
+
     __rmul__ = __mul__  # Allow scalar * coordinate
 
 
@@ -223,18 +226,18 @@ class Coordinate(SpatialBase[float]):
 class Index(SpatialBase[int]):
     """
     Represents discrete array indices for voxel access.
-    
+
     All components must be non-negative integers.
     """
-    
+
     def _validate_component(self, name: str, value: int) -> int:
         """Validate that the component is a non-negative integer."""
         val = int(value)
         if val < 0:
             raise ValueError(f"{name} must be non-negative, got {val}")
         return val
-    
-    def to_continuous(self) -> 'ContinuousIndex':
+
+    def to_continuous(self) -> "ContinuousIndex":
         """Convert to a ContinuousIndex."""
         return ContinuousIndex(float(self.x), float(self.y), float(self.z))
 
@@ -243,19 +246,19 @@ class Index(SpatialBase[int]):
 class ContinuousIndex(SpatialBase[float]):
     """
     Represents precise sub-voxel positions in array space.
-    
+
     No constraints on component values.
     """
-    
+
     def _validate_component(self, name: str, value: float) -> float:
         """Convert to float with no additional validation."""
         return float(value)
-    
+
     def to_index(self) -> Index:
         """Convert to the nearest Index (rounding down)."""
         return Index(int(self.x), int(self.y), int(self.z))
-    
-    def round(self) -> 'ContinuousIndex':
+
+    def round(self) -> "ContinuousIndex":
         """Return a new ContinuousIndex with rounded components."""
         return ContinuousIndex(round(self.x), round(self.y), round(self.z))
 
@@ -264,31 +267,294 @@ class ContinuousIndex(SpatialBase[float]):
 class Dimension(SpatialBase[int]):
     """
     Represents the number of voxels in each dimension of a 3D array.
-    
+
     All components must be positive integers.
     """
-    
+
     def _validate_component(self, name: str, value: int) -> int:
         """Validate that the component is a positive integer."""
         val = int(value)
         if val <= 0:
             raise ValueError(f"{name} must be positive, got {val}")
         return val
-    
+
     def num_voxels(self) -> int:
         """Calculate the total number of voxels."""
         return self.x * self.y * self.z
-    
+
     def to_volume_size(self, voxel_size: VoxelSize) -> VolumeSize:
         """Convert to physical size using the given voxel dimensions."""
         return VolumeSize(
-            x=self.x * voxel_size.x,
-            y=self.y * voxel_size.y,
-            z=self.z * voxel_size.z
+            x=self.x * voxel_size.x, y=self.y * voxel_size.y, z=self.z * voxel_size.z
         )
-    
-    def contains(self, index: Index) -> bool:
-        """Check if the given index is within these dimensions."""
-        return (0 <= index.x < self.x and 
-                0 <= index.y < self.y and 
-                0 <= index.z < self.z)
+
+    def contains(self, index: Union[Index, "IndexArray"]) -> Union[bool, np.ndarray]:
+        """
+        Check if the given index is within these dimensions.
+
+        For an IndexArray, returns a boolean array with one entry per index.
+        """
+        if isinstance(index, SpatialArray):
+            limits = np.array([self.x, self.y, self.z])
+            return np.all((index.array >= 0) & (index.array < limits), axis=1)
+        return 0 <= index.x < self.x and 0 <= index.y < self.y and 0 <= index.z < self.z
+
+
+class SpatialArray(ABC):
+    """
+    Abstract base class for many 3D spatial values stored as one (N, 3) array.
+
+    The array is wrapped without copying when it already has a suitable dtype, and
+    x, y and z are views of its columns. Indexing with an integer returns the scalar
+    type of the array; slices and masks return a view of the same array type.
+    """
+
+    __slots__ = ("_array",)
+
+    scalar_type: type = SpatialBase
+
+    def __init__(self, data: Any) -> None:
+        """
+        Initialize from an (N, 3) or (3,) array, a scalar spatial value, or a sequence of
+        scalar spatial values.
+        """
+        if isinstance(data, SpatialArray):
+            data = data.array
+        elif isinstance(data, SpatialBase):
+            data = np.asarray(data)
+        elif (
+            isinstance(data, (list, tuple))
+            and data
+            and isinstance(data[0], SpatialBase)
+        ):
+            data = np.fromiter(
+                (
+                    component
+                    for value in data
+                    for component in (value.x, value.y, value.z)
+                ),
+                dtype=np.float64,
+                count=3 * len(data),
+            ).reshape(-1, 3)
+        array = np.asarray(data)
+        if array.ndim == 1 and array.size == 3:
+            array = array.reshape(1, 3)
+        elif array.size == 0:
+            array = array.reshape(0, 3)
+        if array.ndim != 2 or array.shape[1] != 3:
+            raise ValueError(
+                f"{self.__class__.__name__} requires an (N, 3) array, got shape {array.shape}"
+            )
+        self._array = self._validate(array)
+
+    @abstractmethod
+    def _validate(self, array: np.ndarray) -> np.ndarray:
+        """Validate the array and convert its dtype if needed. Must be implemented by subclasses."""
+        pass
+
+    @classmethod
+    def _wrap(cls, array: np.ndarray) -> "SpatialArray":
+        """Create from an array that is already valid, without checks or copies."""
+        result = cls.__new__(cls)
+        result._array = array
+        return result
+
+    @property
+    def array(self) -> np.ndarray:
+        """Underlying (N, 3) array."""
+        return self._array
+
+    @property
+    def x(self) -> np.ndarray:
+        """X components (view)."""
+        return self._array[:, 0]
+
+    @property
+    def y(self) -> np.ndarray:
+        """Y components (view)."""
+        return self._array[:, 1]
+
+    @property
+    def z(self) -> np.ndarray:
+        """Z components (view)."""
+        return self._array[:, 2]
+
+    def to_list(self) -> List[List[Any]]:
+        """Convert to a list of [x, y, z] lists."""
+        return self._array.tolist()
+
+    def __len__(self) -> int:
+        return len(self._array)
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, (int, np.integer)):
+            return self.scalar_type(*self._array[key].tolist())
+        return self._wrap(self._array[key].reshape(-1, 3))
+
+    def __iter__(self) -> Iterator[Any]:
+        for row in self._array.tolist():
+            yield self.scalar_type(*row)
+
+    def __array__(
+        self, dtype: Optional[Any] = None, copy: Optional[bool] = None
+    ) -> np.ndarray:
+        if copy:
+            return self._array.astype(
+                dtype if dtype is not None else self._array.dtype, copy=True
+            )
+        return self._array if dtype is None else self._array.astype(dtype, copy=False)
+
+    def __eq__(self, other: object) -> bool:
+        """Test equality of all points with another array of the same type."""
+        if not isinstance(other, SpatialArray):
+            return False
+        return self._array.shape == other.array.shape and bool(
+            np.array_equal(self._array, other.array)
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(n={len(self)}, dtype={self._array.dtype})"
+
+
+def _operand(other: Any) -> Any:
+    """Array operand of an arithmetic operation, or None if the type is not supported."""
+    if isinstance(other, SpatialArray):
+        return other.array
+    if isinstance(other, (SpatialBase, np.ndarray, int, float, np.number)):
+        return np.asarray(other)
+    return None
+
+
+@final
+class CoordinateArray(SpatialArray):
+    """
+    Physical points or continuous voxel indices in 3D space, as an (N, 3) float array.
+
+    float32 and float64 arrays are wrapped without copying; other inputs are converted
+    to float64. Arithmetic broadcasts against scalars, Coordinate, (3,), (N, 1) and
+    (N, 3) arrays.
+    """
+
+    __slots__ = ()
+
+    scalar_type = Coordinate
+
+    def _validate(self, array: np.ndarray) -> np.ndarray:
+        """Convert to a floating-point array with no additional validation."""
+        if array.dtype not in (np.float32, np.float64):
+            array = array.astype(np.float64)
+        return array
+
+    def distance_to(
+        self, other: Union[Coordinate, "CoordinateArray", np.ndarray]
+    ) -> np.ndarray:
+        """
+        Euclidean distance of each point to another coordinate, or point-wise to another
+        array of the same length.
+        """
+        delta = self._array - _operand(other)
+        return np.sqrt(np.einsum("ij,ij->i", delta, delta))
+
+    def to_index(self) -> "IndexArray":
+        """
+        Convert continuous voxel indices to IndexArray (rounding towards zero, as
+        ContinuousIndex.to_index).
+
+        Raises:
+            ValueError: If an index is negative.
+        """
+        return IndexArray(np.trunc(self._array).astype(np.int64))
+
+    def round(self) -> "CoordinateArray":
+        """Return a new CoordinateArray with rounded components (half to even)."""
+        return CoordinateArray._wrap(np.round(self._array))
+
+    def _binary(self, other: Any, operation: Any) -> Any:
+        operand = _operand(other)
+        if operand is None:
+            return NotImplemented
+        return CoordinateArray(operation(self._array, operand).reshape(-1, 3))
+
+    def __add__(self, other: Any) -> "CoordinateArray":
+        return self._binary(other, np.add)
+
+    def __sub__(self, other: Any) -> "CoordinateArray":
+        return self._binary(other, np.subtract)
+
+    def __rsub__(self, other: Any) -> "CoordinateArray":
+        return self._binary(other, lambda a, b: b - a)
+
+    def __mul__(self, other: Any) -> "CoordinateArray":
+        return self._binary(other, np.multiply)
+
+    def __truediv__(self, other: Any) -> "CoordinateArray":
+        return self._binary(other, np.true_divide)
+
+    def __neg__(self) -> "CoordinateArray":
+        return CoordinateArray._wrap(-self._array)
+
+    __radd__ = __add__
+    __rmul__ = __mul__
+
+
+@final
+class IndexArray(SpatialArray):
+    """
+    Discrete voxel indices as an (N, 3) integer array.
+
+    All components must be non-negative. Integer arrays are wrapped without copying.
+    """
+
+    __slots__ = ()
+
+    scalar_type = Index
+
+    def _validate(self, array: np.ndarray) -> np.ndarray:
+        """Validate that all components are non-negative integers."""
+        if not np.issubdtype(array.dtype, np.integer):
+            if array.size and not np.array_equal(array, np.trunc(array)):
+                raise ValueError("IndexArray requires integer components")
+            array = array.astype(np.int64)
+        if array.size and array.min() < 0:
+            raise ValueError(
+                f"Index components must be non-negative, got {array.min()}"
+            )
+        return array
+
+    def to_continuous(self) -> CoordinateArray:
+        """Convert to a float64 CoordinateArray of continuous indices."""
+        return CoordinateArray._wrap(self._array.astype(np.float64))
+
+    def to_flat(self, dimension: Dimension) -> np.ndarray:
+        """
+        Flat indices into a (z, y, x) array with the given dimensions.
+
+        Raises:
+            ValueError: If an index lies outside the dimensions.
+        """
+        return np.ravel_multi_index(
+            (self.z, self.y, self.x), (dimension.z, dimension.y, dimension.x)
+        )
+
+    def _binary(self, other: Any, operation: Any) -> Any:
+        operand = _operand(other)
+        if operand is None:
+            return NotImplemented
+        result = operation(self._array, operand).reshape(-1, 3)
+        if not np.issubdtype(result.dtype, np.integer):
+            return CoordinateArray(result)
+        return IndexArray(result)
+
+    def __add__(self, other: Any) -> SpatialArray:
+        return self._binary(other, np.add)
+
+    def __sub__(self, other: Any) -> SpatialArray:
+        return self._binary(other, np.subtract)
+
+    def __mul__(self, other: Any) -> SpatialArray:
+        return self._binary(other, np.multiply)
+
+    __radd__ = __add__
+    __rmul__ = __mul__
@@ -0,0 +1,212 @@
+"""
+Canonical voxel volume shared by ImageSet and Dose.
+
+Pinnacle stores image and dose volumes as contiguous slabs of axial slices, so
+the canonical in-memory layout is a (z, y, x) array: volume[k] is axial slice k
+with rows along y and columns along x. A Volume wraps such an array together
+with its storage layout (dtype, ByteOrder and BinaryHeaderSize) and exposes
+axial, coronal and sagittal slices as views of the underlying array.
+"""
+
+from pathlib import Path
+from typing import Any, Optional, Tuple, Union
+
+import numpy as np
+
+# Pinnacle ByteOrder header values
+LITTLE_ENDIAN = 0
+BIG_ENDIAN = 1
+
+ORIENTATIONS = ("axial", "coronal", "sagittal")
+
+
+class Volume:
+    """
+    A (z, y, x) voxel array with its on-disk layout.
+
+    Attributes:
+        array: The voxel data in (z, y, x) order. May be a numpy array, a memmap or an
+            array-like such as a CroppedVolume.
+        binary_header_size: Number of bytes preceding the voxels in the source file.
+
+    Example:
+        >>> volume = Volume.from_file("ImageSet_0.img", (101, 512, 512), Volume.pinnacle_dtype(2, 0))
+        >>> volume.axial(50).shape, volume.coronal(256).shape, volume.sagittal(256).shape
+        ((512, 512), (101, 512), (101, 512))
+    """
+
+    axis_order = ("z", "y", "x")
+
+    def __init__(self, array: Any, binary_header_size: int = 0) -> None:
+        if len(array.shape) != 3:
+            raise ValueError(
+                f"Expected a 3D (z, y, x) array, got shape {tuple(array.shape)}"
+            )
+        self.array = array
+        self.binary_header_size = int(binary_header_size or 0)
+
+    @staticmethod
+    def pinnacle_dtype(
+        bytes_pix: Optional[int] = 2,
+        byte_order: Optional[int] = LITTLE_ENDIAN,
+        kind: str = "u",
+    ) -> np.dtype:
+        """
+        Build the numpy dtype described by Pinnacle header fields.
+
+        Args:
+            bytes_pix: Bytes per voxel (BytesPix). Defaults to 2.
+            byte_order: Pinnacle ByteOrder (0 = little-endian, 1 = big-endian).
+            kind: Numpy kind character ("u" unsigned, "i" signed, "f" float).
+
+        Returns:
+            Numpy dtype with an explicit byte order.
+        """
+        endian = ">" if byte_order == BIG_ENDIAN else "<"
+        return np.dtype(f"{endian}{kind}{int(bytes_pix or 2)}")
+
+    @classmethod
+    def from_file(
+        cls,
+        path: Union[str, Path],
+        shape: Tuple[int, int, int],
+        dtype: Any,
+        binary_header_size: int = 0,
+        mmap: bool = False,
+    ) -> "Volume":
+        """
+        Read a raw binary (z, y, x) volume.
+
+        Args:
+            path: Path to the binary file.
+            shape: Volume shape as (z, y, x).
+            dtype: Voxel dtype including byte order.
+            binary_header_size: Number of bytes to skip at the start of the file.
+            mmap: If True, return a copy-on-write memmap instead of reading the file.
+
+        Returns:
+            Volume backed by the file data.
+        """
+        shape = tuple(int(n) for n in shape)
+        header_size = int(binary_header_size or 0)
+        if mmap:
+            array = np.memmap(
+                path, dtype=dtype, mode="c", offset=header_size, shape=shape
+            )
+        else:
+            array = np.fromfile(
+                path, dtype=dtype, count=int(np.prod(shape)), offset=header_size
+            )
+            if array.size != np.prod(shape):
+                raise ValueError(
+                    f"Binary file {path} holds {array.size} voxels, expected {int(np.prod(shape))} for {shape}"
+                )
+            array = array.reshape(shape)
+        return cls(array, binary_header_size=header_size)
+
+    @classmethod
+    def from_bytes(
+        cls, data: bytes, shape: Tuple[int, int, int], dtype: Any
+    ) -> "Volume":
+        """Wrap raw bytes as a read-only volume without copying."""
+        return cls(
+            np.frombuffer(data, dtype=dtype).reshape(tuple(int(n) for n in shape))
+        )
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return tuple(self.array.shape)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.array.dtype
+
+    @property
+    def byte_order(self) -> int:
+        """Pinnacle ByteOrder of the voxel data (0 = little-endian, 1 = big-endian)."""
+        order = self.dtype.byteorder
+        if order == "=":
+            order = "<" if np.little_endian else ">"
+        return BIG_ENDIAN if order == ">" else LITTLE_ENDIAN
+
+    @property
+    def dimensions(self) -> Tuple[int, int, int]:
+        """Dimensions as (x_dim, y_dim, z_dim), matching the Pinnacle header order."""
+        z_dim, y_dim, x_dim = self.shape
+        return (x_dim, y_dim, z_dim)
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.array[key]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self.array[key] = value
+
+    def __array__(
+        self, dtype: Optional[Any] = None, copy: Optional[bool] = None
+    ) -> np.ndarray:
+        array = np.asarray(self.array)
+        return array if dtype is None else array.astype(dtype, copy=False)
+
+    def axial(self, index: int) -> np.ndarray:
+        """Axial slice at z index, shaped (y, x)."""
+        return self.array[index]
+
+    def coronal(self, index: int) -> np.ndarray:
+        """Coronal slice at y index, shaped (z, x)."""
+        return self.array[:, index, :]
+
+    def sagittal(self, index: int) -> np.ndarray:
+        """Sagittal slice at x index, shaped (z, y)."""
+        return self.array[:, :, index]
+
+    def get_slice(self, index: int, orientation: str = "axial") -> np.ndarray:
+        """
+        Get a slice in the given orientation.
+
+        Args:
+            index: Slice index along the axis normal to the slice.
+            orientation: "axial", "coronal" or "sagittal".
+
+        Returns:
+            2D view of the slice where the layout allows it.
+
+        Raises:
+            ValueError: If the orientation is unknown.
+            IndexError: If the index is out of range.
+        """
+        if orientation not in ORIENTATIONS:
+            raise ValueError(
+                f"Unknown orientation '{orientation}'. Expected one of: {', '.join(ORIENTATIONS)}"
+            )
+        axis = ORIENTATIONS.index(orientation)
+        if not 0 <= index < self.shape[axis]:
+            raise IndexError(
+                f"{orientation.capitalize()} index {index} out of range for {self.shape[axis]} slices"
+            )
+        return getattr(self, orientation)(index)
+
+    def contains(self, x: int, y: int, z: int) -> bool:
+        """Whether the voxel index (x, y, z) lies inside the volume."""
+        x_dim, y_dim, z_dim = self.dimensions
+        return 0 <= x < x_dim and 0 <= y < y_dim and 0 <= z < z_dim
+
+    def get_value(self, x: int, y: int, z: int) -> Any:
+        """Voxel value at index (x, y, z)."""
+        return self.array[z, y, x]
+
+    def to_native(self) -> np.ndarray:
+        """The voxel data in native byte order, converting only if the data is byte-swapped."""
+        array = np.asarray(self.array)
+        if array.dtype.isnative:
+            return array
+        return array.astype(array.dtype.newbyteorder("="))
+
+    def tobytes(self) -> bytes:
+        """Raw voxel bytes in the volume's byte order."""
+        return np.asarray(self.array).tobytes()
+
+    def __repr__(self) -> str:
+        return f"<Volume(shape={self.shape}, dtype={self.dtype}, byte_order={self.byte_order})>"
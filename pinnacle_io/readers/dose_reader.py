@@ -2,16 +2,25 @@
 Reader for Pinnacle plan.Trail.binary.### files.
 """
 
-from pinnacle_io.models import Dose, DoseGrid, Trial, Beam
-from pinnacle_io.readers.pinnacle_file_reader import PinnacleFileReader
-import numpy as np
 import os
+from typing import Iterable
+
+import numpy as np
+
+from pinnacle_io.models import Beam, Dose, DoseGrid, Trial, Volume
+from pinnacle_io.models.volume import BIG_ENDIAN
+from pinnacle_io.readers.pinnacle_file_reader import PinnacleFileReader
+
+# Pinnacle binary dose volumes are stored as big-endian 32-bit floats
+DOSE_DATA_TYPE = Volume.pinnacle_dtype(4, BIG_ENDIAN, "f")
+
 
 class DoseReader:
     """
     Reader for Pinnacle plan.Trail.binary.### files.
     """
-    @staticmethod 
+
+    @staticmethod
     def read(plan_path: str, trial: Trial) -> Dose:
         """
         Read Pinnacle plan.Trail.binary.### files and create a Dose model for the given trial.
@@ -26,14 +35,15 @@ class DoseReader:
         """
         for beam in trial.beam_list:
             beam.dose = DoseReader.read_beam_dose(plan_path, beam, trial.dose_grid)
-        
+
         # TODO: Create a new dose for the trial that sums all beam doses
         trial_dose = Dose(dose_summation_type="PLAN")
         return trial_dose
 
-
     @staticmethod
-    def read_beam_dose(plan_path, beam: Beam, dose_grid: DoseGrid) -> Dose:
+    def read_beam_dose(
+        plan_path, beam: Beam, dose_grid: DoseGrid, lazy: bool = False
+    ) -> Dose:
         """
         Read a beam dose from a Pinnacle binary dose file.
 
@@ -41,6 +51,8 @@ class DoseReader:
             plan_path: Path to the patient's plan directory
             beam: Beam model to use for the dose
             dose_grid: DoseGrid model to use for the dose
+            lazy: If True, only record the source file on the Dose. Slices are then
+                read on demand by Dose.get_slice_data without loading the full volume.
 
         Returns:
             Dose model populated with data from the file
@@ -48,10 +60,12 @@ class DoseReader:
 
         # Get the unscaled binary dose data as a numpy array
         beam_dose_path = os.path.join(plan_path, beam.dose_volume_file)
-        dose_data = DoseReader.read_binary_dose(beam_dose_path, dose_grid)
+        dose_data = (
+            None if lazy else DoseReader.read_binary_dose(beam_dose_path, dose_grid)
+        )
 
         # TODO: Scale the dose data based on monitor unit info and the machine PDD
-        
+
         beam_dose = Dose(
             dose_type="PHYSICAL",
             dose_unit="CGY",
@@ -71,8 +85,9 @@ class DoseReader:
             z_start=dose_grid.origin.z,
             dose_comment=beam.name,
             pixel_data=dose_data,
-            beam = beam,
+            beam=beam,
         )
+        beam_dose.source_path = beam_dose_path
 
         return beam_dose
 
@@ -88,21 +103,41 @@ class DoseReader:
         Returns:
             Numpy array of unscaled dose data (i.e., dose per monitor unit per fraction).
         """
-        # Read the binary data directly from the file
-        with open(file_path, 'rb') as f:
-            binary_data = f.read()
-
         # The createdcm.py script loads the binary dose volume using:
         #     value = struct.unpack(">f", data_element)[0]
         # where ">f" indicates a 32-bit float in big-endian format
-        data_type = ">f4"
-
-        # Reshape binary data into 3D array
-        dose_volume = np.frombuffer(binary_data, dtype=data_type)
         if dose_grid:
-            # Convert dimensions to integers for reshaping
-            z_dim = int(dose_grid.dimension.z)
-            y_dim = int(dose_grid.dimension.y)
-            x_dim = int(dose_grid.dimension.x)
-            dose_volume = dose_volume.reshape((z_dim, y_dim, x_dim))
-        return dose_volume
\ No newline at end of file
+            # Convert dimensions to integers for reshaping into a (z, y, x) volume
+            shape = (
+                int(dose_grid.dimension.z),
+                int(dose_grid.dimension.y),
+                int(dose_grid.dimension.x),
+            )
+            return Volume.from_file(file_path, shape, DOSE_DATA_TYPE).array
+        return np.fromfile(file_path, dtype=DOSE_DATA_TYPE)
+
+    @staticmethod
+    def read_slices(
+        file_path: str, dose_grid: DoseGrid, z_indices: Iterable[int]
+    ) -> np.ndarray:
+        """
+        Read selected axial slices from a Pinnacle binary dose file.
+
+        Only the bytes of the requested slices are read from disk.
+
+        Args:
+            file_path: Path to the binary dose file.
+            dose_grid: A DoseGrid model object containing the dimensions of the dose volume.
+            z_indices: Indices of the axial slices to read.
+
+        Returns:
+            Numpy array of unscaled dose data with shape (len(z_indices), y_dim, x_dim).
+        """
+        shape = (
+            int(dose_grid.dimension_z),
+            int(dose_grid.dimension_y),
+            int(dose_grid.dimension_x),
+        )
+        return PinnacleFileReader.read_binary_slabs(
+            file_path, shape, DOSE_DATA_TYPE, z_indices
+        )
@@ -3,8 +3,12 @@ Reader for Pinnacle ImageSet files.
 """
 
 from pathlib import Path
+from typing import Iterable, Optional
+
 import numpy as np
-from pinnacle_io.models import ImageSet, ImageInfo
+
+from pinnacle_io.models import ImageInfo, ImageSet, Volume
+from pinnacle_io.readers.image_slice_reader import ImageSliceReader
 from pinnacle_io.readers.pinnacle_file_reader import PinnacleFileReader
 
 
@@ -18,7 +22,7 @@ class ImageSetReader:
     @staticmethod
     def read_header(image_header_path: str) -> ImageSet:
         """
-        Read a Pinnacle ImageSet header file and create an ImageSet model. 
+        Read a Pinnacle ImageSet header file and create an ImageSet model.
         The ImageInfoList is also read from the ImageInfo file.
 
         Args:
@@ -34,16 +38,18 @@ class ImageSetReader:
         if not path.exists():
             raise FileNotFoundError(f"ImageSet header file not found: {path}")
 
-        with open(path, 'r', encoding='latin1', errors='ignore') as f:
+        with open(path, "r", encoding="latin1", errors="ignore") as f:
             image_set = ImageSetReader.parse_header_content(f.readlines())
-        
-        image_set.image_info_list = ImageSetReader.read_image_info(str(path.with_suffix(".ImageInfo")))
+
+        image_set.image_info_list = ImageSetReader.read_image_info(
+            str(path.with_suffix(".ImageInfo"))
+        )
         return image_set
 
     @staticmethod
     def parse_header_content(content_lines: list[str]) -> ImageSet:
         """
-        Parse a Pinnacle ImageSet header content string and create an ImageSet model. 
+        Parse a Pinnacle ImageSet header content string and create an ImageSet model.
         The ImageInfoList is not parsed.
 
         Args:
@@ -74,7 +80,7 @@ class ImageSetReader:
         if not path.exists():
             raise FileNotFoundError(f"ImageSet info file not found: {path}")
 
-        with open(path, 'r', encoding='latin1', errors='ignore') as f:
+        with open(path, "r", encoding="latin1", errors="ignore") as f:
             return ImageSetReader.parse_image_info_content(f.readlines())
 
     @staticmethod
@@ -94,30 +100,104 @@ class ImageSetReader:
         return image_info_list
 
     @staticmethod
-    def read_image_set(path: str, image_set: ImageSet = None) -> ImageSet:
+    def read_image_set(
+        path: str,
+        image_set: ImageSet = None,
+        lazy: bool = False,
+        mmap: bool = False,
+        cache_size: Optional[int] = 64,
+        workers: Optional[int] = None,
+    ) -> ImageSet:
         """Read a Pinnacle ImageSet file and create an ImageSet model.
 
+        Image sets with a FnameFormat in their header are stored as one file per slice
+        and are read with an ImageSliceReader attached to the ImageSet.
+
         Args:
             path: /Path/to/ImageSet_# (the .img extension is optional)
+            image_set: Optional ImageSet model to populate. The header is read if not provided.
+            lazy: If True, only record the source file on the ImageSet. Slices are then
+                read on demand by ImageSet.get_slice_data without loading the full volume.
+            mmap: If True, the volume is a copy-on-write memmap of the .img file. Pages are
+                read on access and modifications are never written back to the file.
+                Ignored for multi-file image sets.
+            cache_size: Number of slices cached by the slice reader of a multi-file image set.
+            workers: Number of threads used to read the slice files of a multi-file image set.
 
         Returns:
             ImageSet model populated with data from the file
         """
-        path = Path(path)
-        if not str(path).lower().endswith(".img"):
-            path = path.with_suffix(".img")
-
-        if not path.exists():
-            raise FileNotFoundError(f"ImageSet file not found: {path}")
+        path = ImageSetReader._image_path(path)
 
         if image_set is None:
-            image_set = ImageSetReader.read_header(path.with_suffix(".header")) # Replaces the suffix
+            image_set = ImageSetReader.read_header(
+                path.with_suffix(".header")
+            )  # Replaces the suffix
 
-        with open(path, "rb") as f:
-            binary_data = f.read()
-            pixel_data = np.frombuffer(binary_data, dtype=np.uint16).reshape(
-                image_set.z_dim, image_set.y_dim, image_set.x_dim
+        if ImageSliceReader.is_multi_file(image_set):
+            image_set.slice_reader = ImageSliceReader(
+                image_set, path.parent, cache_size=cache_size
             )
+            if not lazy:
+                image_set.volume = image_set.slice_reader.read_volume(workers=workers)
+            return image_set
+
+        if not path.exists():
+            raise FileNotFoundError(f"ImageSet file not found: {path}")
 
-        image_set.pixel_data = pixel_data
+        image_set.source_path = str(path)
+        if lazy:
+            return image_set
+
+        image_set.volume = Volume.from_file(
+            path,
+            (image_set.z_dim, image_set.y_dim, image_set.x_dim),
+            Volume.pinnacle_dtype(image_set.bytes_pix, image_set.byte_order),
+            binary_header_size=image_set.binary_header_size,
+            mmap=mmap,
+        )
         return image_set
+
+    @staticmethod
+    def read_slices(
+        path: str, image_set: ImageSet, z_indices: Iterable[int]
+    ) -> np.ndarray:
+        """Read selected axial slices from a Pinnacle ImageSet file.
+
+        Byte offsets are computed from the image dimensions and BinaryHeaderSize, and
+        only the bytes of the requested slices are read from disk. For multi-file image
+        sets only the files of the requested slices are read.
+
+        Args:
+            path: /Path/to/ImageSet_# (the .img extension is optional)
+            image_set: ImageSet model containing the image dimensions
+            z_indices: Indices of the axial slices to read
+
+        Returns:
+            Numpy array of pixel data with shape (len(z_indices), y_dim, x_dim)
+        """
+        path = ImageSetReader._image_path(path)
+        if ImageSliceReader.is_multi_file(image_set):
+            reader = image_set.slice_reader or ImageSliceReader(image_set, path.parent)
+            return reader.read_slices(z_indices)
+
+        if not path.exists():
+            raise FileNotFoundError(f"ImageSet file not found: {path}")
+
+        shape = (image_set.z_dim, image_set.y_dim, image_set.x_dim)
+        dtype = Volume.pinnacle_dtype(image_set.bytes_pix, image_set.byte_order)
+        return PinnacleFileReader.read_binary_slabs(
+            str(path),
+            shape,
+            dtype,
+            z_indices,
+            header_size=image_set.binary_header_size or 0,
+        )
+
+    @staticmethod
+    def _image_path(path: str) -> Path:
+        """Return the path to the .img file for /Path/to/ImageSet_# (the .img extension is optional)."""
+        path = Path(path)
+        if not str(path).lower().endswith(".img"):
+            path = path.with_suffix(".img")
+        return path
@@ -0,0 +1,216 @@
+"""
+Reader for Pinnacle image sets stored as one file per slice.
+
+Image sets whose header has a FnameFormat (e.g. "ImageSet_2.%03d.img") store each
+axial slice in its own file. The file for slice k is found by formatting the
+file index FnameIndexStart + k * FnameIndexDelta. Slices are read on first access
+and kept in a least-recently-used cache, so long MR and 4D series can be browsed
+without reading every slice up front; prefetch() loads many slices in parallel.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Lock
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+
+from pinnacle_io.models import ImageSet, Volume
+
+
+class ImageSliceReader:
+    """
+    Lazy per-slice reader for FnameFormat (multi-file) image sets.
+
+    Each slice file holds BinaryHeaderSize header bytes followed by y_dim * x_dim voxels
+    of the dtype described by BytesPix and ByteOrder.
+
+    Example:
+        >>> reader = ImageSliceReader(image_set, "/path/to/Patient_1")
+        >>> axial = reader.read_slice(40)  # Reads a single file
+        >>> reader.prefetch(workers=8)  # Reads the remaining slices in parallel
+    """
+
+    def __init__(
+        self,
+        image_set: ImageSet,
+        directory: Union[str, Path],
+        cache_size: Optional[int] = 64,
+    ) -> None:
+        """
+        Args:
+            image_set: ImageSet with the dimensions and FnameFormat fields.
+            directory: Directory that relative slice filenames are resolved against
+                (normally the directory of the ImageSet header).
+            cache_size: Maximum number of slices kept in memory. None keeps every slice.
+        """
+        if not ImageSliceReader.is_multi_file(image_set):
+            raise ValueError(
+                f"ImageSet '{image_set.image_name}' does not have a FnameFormat."
+            )
+        self.directory = Path(directory)
+        self.fname_format = image_set.fname_format.strip()
+        self.index_start = int(image_set.fname_index_start or 0)
+        # A delta of 0 is written for single-file image sets; consecutive files are assumed
+        self.index_delta = int(image_set.fname_index_delta or 1)
+        self.shape = (int(image_set.z_dim), int(image_set.y_dim), int(image_set.x_dim))
+        self.dtype = Volume.pinnacle_dtype(image_set.bytes_pix, image_set.byte_order)
+        self.header_size = int(image_set.binary_header_size or 0)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        self._lock = Lock()
+
+    @staticmethod
+    def is_multi_file(image_set: ImageSet) -> bool:
+        """Whether the ImageSet header describes one file per slice."""
+        return bool((image_set.fname_format or "").strip())
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def slice_path(self, slice_index: int) -> Path:
+        """
+        Path of the file holding an axial slice.
+
+        FnameFormat may use printf-style ("%03d") or str.format-style ("{:03d}") fields.
+        """
+        if not 0 <= slice_index < self.shape[0]:
+            raise IndexError(
+                f"Slice index {slice_index} out of range for {self.shape[0]} slices"
+            )
+        file_index = self.index_start + slice_index * self.index_delta
+        if "%" in self.fname_format:
+            name = self.fname_format % file_index
+        else:
+            name = self.fname_format.format(file_index)
+        path = Path(name)
+        return path if path.is_absolute() else self.directory / path
+
+    @property
+    def slice_paths(self) -> List[Path]:
+        """Paths of all slice files in z order."""
+        return [self.slice_path(k) for k in range(self.shape[0])]
+
+    @property
+    def cached_slices(self) -> List[int]:
+        """Indices of the slices currently held in the cache, least recently used first."""
+        with self._lock:
+            return list(self._cache)
+
+    def read_slice(self, slice_index: int) -> np.ndarray:
+        """
+        Read an axial slice, from the cache if it has already been read.
+
+        Args:
+            slice_index: Index of the axial slice.
+
+        Returns:
+            Read-only (y_dim, x_dim) array.
+        """
+        with self._lock:
+            data = self._cache.get(slice_index)
+            if data is not None:
+                self._cache.move_to_end(slice_index)
+                return data
+
+        data = self._read_file(slice_index)
+
+        with self._lock:
+            self._cache[slice_index] = data
+            self._cache.move_to_end(slice_index)
+            while self.cache_size is not None and len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return data
+
+    def _read_file(self, slice_index: int) -> np.ndarray:
+        path = self.slice_path(slice_index)
+        if not path.exists():
+            raise FileNotFoundError(f"ImageSet slice file not found: {path}")
+        _, y_dim, x_dim = self.shape
+        count = y_dim * x_dim
+        data = np.fromfile(path, dtype=self.dtype, count=count, offset=self.header_size)
+        if data.size != count:
+            raise ValueError(
+                f"Slice file {path} holds {data.size} voxels, expected {count}"
+            )
+        data = data.reshape(y_dim, x_dim)
+        # Cached slices are shared between callers
+        data.flags.writeable = False
+        return data
+
+    def read_slices(
+        self, z_indices: Iterable[int], workers: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Read selected axial slices into a new (len(z_indices), y_dim, x_dim) array.
+
+        Args:
+            z_indices: Indices of the axial slices.
+            workers: Number of threads used to read uncached slices. Defaults to a
+                single thread.
+        """
+        indices = [int(k) for k in z_indices]
+        output = np.empty((len(indices),) + self.shape[1:], dtype=self.dtype)
+
+        def read(position: int) -> None:
+            output[position] = self.read_slice(indices[position])
+
+        if workers is None or workers <= 1:
+            for position in range(len(indices)):
+                read(position)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(read, range(len(indices))))
+        return output
+
+    def prefetch(
+        self, z_indices: Optional[Iterable[int]] = None, workers: Optional[int] = None
+    ) -> None:
+        """
+        Read slices into the cache in parallel.
+
+        Only the most recently read cache_size slices are kept, so prefetching more
+        slices than the cache holds evicts the earliest ones.
+
+        Args:
+            z_indices: Slices to read. Defaults to every slice.
+            workers: Number of threads. Defaults to the ThreadPoolExecutor default.
+        """
+        indices = (
+            range(self.shape[0]) if z_indices is None else [int(k) for k in z_indices]
+        )
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(self.read_slice, indices))
+
+    def read_volume(self, workers: Optional[int] = None) -> Volume:
+        """
+        Read every slice into a (z, y, x) Volume in parallel.
+
+        The slices are written straight into the volume and are not added to the cache.
+
+        Args:
+            workers: Number of threads. Defaults to the ThreadPoolExecutor default.
+        """
+        array = np.empty(self.shape, dtype=self.dtype)
+
+        def read(slice_index: int) -> None:
+            with self._lock:
+                cached = self._cache.get(slice_index)
+            array[slice_index] = (
+                cached if cached is not None else self._read_file(slice_index)
+            )
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(read, range(self.shape[0])))
+        return Volume(array, binary_header_size=self.header_size)
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def __repr__(self) -> str:
+        return (
+            f"<ImageSliceReader(format='{self.fname_format}', slices={self.shape[0]}, "
+            f"cached={len(self._cache)})>"
+        )
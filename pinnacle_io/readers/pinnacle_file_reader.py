@@ -2,131 +2,159 @@
 Pinnacle file reader.
 """
 
+import json
 import logging
 import re
-import json
-from typing import Dict, List, Any, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
 
-DEFAULT_ENCODING = 'latin1'
+DEFAULT_ENCODING = "latin1"
 
 logger = logging.getLogger(__name__)
 
+
 class PinnacleFileReader:
     """
     Base class for reading Pinnacle data files.
-    
+
     This class provides common functionality for parsing Pinnacle files,
     which typically use a hierarchical key-value format with nested structures.
     It handles complex Pinnacle file structures including nested dictionaries,
     lists, and various data types.
     """
-    
+
     # Compile regex patterns for better performance
-    _line_is_trial = re.compile(r'^\s*Trial\s*=\s*{$')
-    _line_is_poi = re.compile(r'^\s*Poi\s*=\s*{$')
-    _line_is_image_info = re.compile(r'^\s*ImageInfo\s*=\s*{$')
-    
-    _line_ends_with_opening_brace = re.compile(r'=\s*{$')
-    _line_contains_closing_brace = re.compile(r'^\s*};') # Closing brace is always on a new line. A comment may follow (}; // ...)
-    _line_contains_key_value_pair = re.compile(r'^\s*([\w]+(?:\s*\.\s*\w+)*)\s*[=:]\s*(.+)$')
-    
+    _line_is_trial = re.compile(r"^\s*Trial\s*=\s*{$")
+    _line_is_poi = re.compile(r"^\s*Poi\s*=\s*{$")
+    _line_is_image_info = re.compile(r"^\s*ImageInfo\s*=\s*{$")
+
+    _line_ends_with_opening_brace = re.compile(r"=\s*{$")
+    _line_contains_closing_brace = re.compile(
+        r"^\s*};"
+    )  # Closing brace is always on a new line. A comment may follow (}; // ...)
+    _line_contains_key_value_pair = re.compile(
+        r"^\s*([\w]+(?:\s*\.\s*\w+)*)\s*[=:]\s*(.+)$"
+    )
+
     @staticmethod
-    def parse_key_value_file(file_path: str, max_depth: Optional[int] = None, 
-                            ignore_keys: Optional[List[str]] = None) -> Dict[str, Any]:
+    def parse_key_value_file(
+        file_path: str,
+        max_depth: Optional[int] = None,
+        ignore_keys: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
         """
         Parse a Pinnacle key-value file.
-        
+
         Pinnacle files typically use a hierarchical format with nested structures.
-        
+
         Args:
             file_path: Path to the file to parse.
             max_depth: Optional parameter to limit the depth of nested levels to parse.
             ignore_keys: Optional parameter to specify keys to ignore during parsing.
-            
+
         Returns:
             Dictionary of key-value pairs with nested structures.
         """
         try:
-            with open(file_path, 'r', encoding=DEFAULT_ENCODING, errors='ignore') as f:
+            with open(file_path, "r", encoding=DEFAULT_ENCODING, errors="ignore") as f:
                 lines = f.readlines()
-                return PinnacleFileReader.parse_key_value_content_lines(lines, max_depth, ignore_keys)
+                return PinnacleFileReader.parse_key_value_content_lines(
+                    lines, max_depth, ignore_keys
+                )
         except Exception as e:
             logger.error(f"Error parsing Pinnacle file {file_path}: {e}")
             raise
-    
+
     @staticmethod
-    def parse_key_value_content(content: str, max_depth: Optional[int] = None, 
-                               ignore_keys: Optional[List[str]] = None) -> Dict[str, Any]:
+    def parse_key_value_content(
+        content: str,
+        max_depth: Optional[int] = None,
+        ignore_keys: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
         """
         Parse Pinnacle key-value content.
-        
+
         Args:
             content: Content to parse.
             max_depth: Optional parameter to limit the depth of nested levels to parse.
             ignore_keys: Optional parameter to specify keys to ignore during parsing.
-            
+
         Returns:
             Dictionary of key-value pairs with nested structures.
         """
         lines = content.splitlines()
-        return PinnacleFileReader.parse_key_value_content_lines(lines, max_depth, ignore_keys)
-    
+        return PinnacleFileReader.parse_key_value_content_lines(
+            lines, max_depth, ignore_keys
+        )
+
     @staticmethod
-    def parse_key_value_content_lines(lines: List[str], max_depth: Optional[int] = None, 
-                                     ignore_keys: Optional[List[str]] = None) -> Dict[str, Any]:
+    def parse_key_value_content_lines(
+        lines: List[str],
+        max_depth: Optional[int] = None,
+        ignore_keys: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
         """
         Parse Pinnacle key-value content from a list of lines.
-        
+
         Args:
             lines: List of lines to parse.
             max_depth: Optional parameter to limit the depth of nested levels to parse.
             ignore_keys: Optional parameter to specify keys to ignore during parsing.
-            
+
         Returns:
             Dictionary of key-value pairs with nested structures.
         """
         root = {}
         block_stack = [root]  # Stack of dictionaries to keep track of nesting
-        key_stack = []        # Stack of keys to keep track of the path
-        
+        key_stack = []  # Stack of keys to keep track of the path
+
         i = 0
-        
+
         # Check for and handle top-level lists (TrialList, PoiList, ImageInfoList)
         PinnacleFileReader._check_for_list(lines, i, block_stack, key_stack)
-        
+
         try:
             # Evaluate all remaining lines
             while i < len(lines):
                 line = lines[i].rstrip()
-                
+
                 # Skip empty lines
                 if not line.strip() or line.startswith("//"):
                     i += 1
                     continue
-                
+
                 if PinnacleFileReader._line_ends_with_opening_brace.search(line):
-                    i = PinnacleFileReader._handle_opening_brace(block_stack, key_stack, lines, i, max_depth, ignore_keys)
+                    i = PinnacleFileReader._handle_opening_brace(
+                        block_stack, key_stack, lines, i, max_depth, ignore_keys
+                    )
                 elif PinnacleFileReader._line_contains_closing_brace.search(line):
                     PinnacleFileReader._handle_closing_brace(block_stack, key_stack)
                 else:
                     match = PinnacleFileReader._line_contains_key_value_pair.match(line)
                     if match:
-                        PinnacleFileReader._handle_key_value_pair(block_stack[-1], match, ignore_keys)
-                
+                        PinnacleFileReader._handle_key_value_pair(
+                            block_stack[-1], match, ignore_keys
+                        )
+
                 i += 1
         except Exception as e:
             line_info = f"line {i+1}: {lines[i]}" if i < len(lines) else "end of file"
             logger.error(f"Error parsing {line_info}: {e}")
             raise Exception(f"Error parsing {line_info}", e)
-        
+
         return root
-    
+
     @staticmethod
-    def _check_for_list(lines: List[str], i: int, block_stack: List[Dict[str, Any]], 
-                             key_stack: List[str]) -> bool:
+    def _check_for_list(
+        lines: List[str],
+        i: int,
+        block_stack: List[Dict[str, Any]],
+        key_stack: List[str],
+    ) -> bool:
         """
         Check if the content contains a list of Trials and add a "TrialList" key to the root object if needed.
-        
+
         Args:
             lines: List of lines to parse.
             i: Current line index.
@@ -136,50 +164,65 @@ class PinnacleFileReader:
         # Ignore blank lines at the beginning of the content
         while i < len(lines) and not lines[i].strip():
             i += 1
-            
+
         # If we've reached the end of the file, return False
         if i >= len(lines):
             return False
-            
+
         # If the content contains a list of Trials, add a "TrialList" key to the root object
         temp_i = 0
         if PinnacleFileReader._line_is_trial.match(lines[i]):
-            PinnacleFileReader._handle_opening_brace(block_stack, key_stack, ["TrialList ={"], temp_i)
+            PinnacleFileReader._handle_opening_brace(
+                block_stack, key_stack, ["TrialList ={"], temp_i
+            )
         elif PinnacleFileReader._line_is_poi.match(lines[i]):
-            PinnacleFileReader._handle_opening_brace(block_stack, key_stack, ["PoiList ={"], temp_i)
+            PinnacleFileReader._handle_opening_brace(
+                block_stack, key_stack, ["PoiList ={"], temp_i
+            )
         elif PinnacleFileReader._line_is_image_info.match(lines[i]):
-            PinnacleFileReader._handle_opening_brace(block_stack, key_stack, ["ImageInfoList ={"], temp_i)
+            PinnacleFileReader._handle_opening_brace(
+                block_stack, key_stack, ["ImageInfoList ={"], temp_i
+            )
 
     @staticmethod
     def _is_list(key: str) -> bool:
         """Check if a key represents a list."""
         return key.endswith("List") or key.endswith("Array")
-    
+
     @staticmethod
     def _is_list_item(parent_key: str, new_key: str) -> bool:
         """Check if a key is an item in a list."""
-        return parent_key.endswith("List") and (parent_key == new_key + "List" or new_key.startswith('#'))
-    
+        return parent_key.endswith("List") and (
+            parent_key == new_key + "List" or new_key.startswith("#")
+        )
+
     @staticmethod
     def _is_points_array(key: str) -> bool:
         """Check if a key represents a points array."""
         return key == "Points[]"
-    
+
     @staticmethod
-    def _ignore_key(key: str, additional_ignore_keys: Optional[List[str]] = None) -> bool:
+    def _ignore_key(
+        key: str, additional_ignore_keys: Optional[List[str]] = None
+    ) -> bool:
         """Check if a key should be ignored."""
         ignore_keys = ["Float", "SimpleString"]
         if additional_ignore_keys:
             ignore_keys.extend(additional_ignore_keys)
         return key in ignore_keys
-    
+
     @staticmethod
-    def _handle_opening_brace(block_stack: List[Dict[str, Any]], key_stack: List[str], 
-                             lines: List[str], current_index: int, max_depth: Optional[int] = None, 
-                             ignore_keys: Optional[List[str]] = None) -> int:
+    def _handle_opening_brace(
+        block_stack: List[Dict[str, Any]],
+        key_stack: List[str],
+        lines: List[str],
+        current_index: int,
+        max_depth: Optional[int] = None,
+        ignore_keys: Optional[List[str]] = None,
+    ) -> int:
         """
         Handle a line that ends with an opening brace.
-        
+
         Args:
             block_stack: Stack of dictionaries to keep track of nesting.
             key_stack: Stack of keys to keep track of the path.
@@ -187,29 +230,29 @@ class PinnacleFileReader:
             current_index: Current line index.
             max_depth: Optional parameter to limit the depth of nested levels to parse.
             ignore_keys: Optional parameter to specify keys to ignore during parsing.
-            
+
         Returns:
             Updated line index.
         """
         line = lines[current_index]
-        new_key = line.strip().rstrip('= {')
-        
+        new_key = line.strip().rstrip("= {")
+
         if ignore_keys and new_key in ignore_keys:
             return PinnacleFileReader._ignore_child_object(lines, current_index)
-        
+
         parent_key = key_stack[-1] if key_stack else ""
         new_block = {}
         parent_block = block_stack[-1]
-        
+
         # Ignore the child object if:
         # 1. The current object depth exceeds the maximum depth
         # 2. The child object is a "Store"
         if (max_depth is not None and len(key_stack) > max_depth) or new_key == "Store":
             return PinnacleFileReader._ignore_child_object(lines, current_index)
-        
+
         # Always keep track of the new keys
         key_stack.append(new_key)
-        
+
         if PinnacleFileReader._is_list(new_key):
             # Initialize *List keys as an empty list
             if new_key not in parent_block:
@@ -218,15 +261,20 @@ class PinnacleFileReader:
             # If the parent key is a list, add a new block to the list
             parent_block[parent_key].append(new_block)
             block_stack.append(new_block)
-            
+
             # If the new key is not a direct child of the parent list and should not be ignored, add it to the new block
-            if not (PinnacleFileReader._is_list_item(parent_key, new_key) or PinnacleFileReader._ignore_key(new_key, ignore_keys)):
+            if not (
+                PinnacleFileReader._is_list_item(parent_key, new_key)
+                or PinnacleFileReader._ignore_key(new_key, ignore_keys)
+            ):
                 item_block = {}
                 new_block[new_key] = item_block
                 block_stack.append(item_block)
         elif PinnacleFileReader._is_points_array(new_key):
             parent_block["Points"] = []
-            while current_index < len(lines) - 1 and not lines[current_index + 1].rstrip().endswith("};"):
+            while current_index < len(lines) - 1 and not lines[
+                current_index + 1
+            ].rstrip().endswith("};"):
                 current_index += 1
                 line = lines[current_index]
                 points = [float(p.strip()) for p in line.split(",") if p.strip()]
@@ -235,18 +283,18 @@ class PinnacleFileReader:
             # All other keys should be initialized as an empty dictionary
             parent_block[new_key] = new_block
             block_stack.append(new_block)
-            
+
         return current_index
-    
+
     @staticmethod
     def _ignore_child_object(lines: List[str], current_index: int) -> int:
         """
         Step over all lines until the end of the child object is reached.
-        
+
         Args:
             lines: List of lines to parse.
             current_index: Current line index.
-            
+
         Returns:
             Updated line index.
         """
@@ -254,37 +302,42 @@ class PinnacleFileReader:
         while current_index < len(lines) - 1:
             current_index += 1
             next_line = lines[current_index].rstrip()
-            if next_line.endswith('{'):
+            if next_line.endswith("{"):
                 brace_counter += 1
             elif next_line.endswith("};"):
                 brace_counter -= 1
-                
+
             if brace_counter == 0:
                 break
-                
+
         return current_index
-    
+
     @staticmethod
-    def _handle_closing_brace(block_stack: List[Dict[str, Any]], key_stack: List[str]) -> None:
+    def _handle_closing_brace(
+        block_stack: List[Dict[str, Any]], key_stack: List[str]
+    ) -> None:
         """
         Handle a line that ends with a closing brace.
-        
+
         Args:
             block_stack: Stack of dictionaries to keep track of nesting.
             key_stack: Stack of keys to keep track of the path.
         """
         if not key_stack:
             return
-        
+
         key = key_stack.pop()
         parent_key = key_stack[-1] if key_stack else ""
-        
+
         # Following the logic of _handle_opening_brace, only pop a block from the stack if it was added when handling the opening brace
         if PinnacleFileReader._is_list(key):
             # Do nothing
             pass
         elif PinnacleFileReader._is_list(parent_key):
-            if not (PinnacleFileReader._is_list_item(parent_key, key) or PinnacleFileReader._ignore_key(key)):
+            if not (
+                PinnacleFileReader._is_list_item(parent_key, key)
+                or PinnacleFileReader._ignore_key(key)
+            ):
                 block_stack.pop()
             block_stack.pop()
         elif PinnacleFileReader._is_points_array(key):
@@ -295,21 +348,24 @@ class PinnacleFileReader:
             pass
         elif not PinnacleFileReader._ignore_key(key):
             block_stack.pop()
-    
+
     @staticmethod
-    def _handle_key_value_pair(dict_obj: Dict[str, Any], match: re.Match, 
-                              ignore_keys: Optional[List[str]] = None) -> None:
+    def _handle_key_value_pair(
+        dict_obj: Dict[str, Any],
+        match: re.Match,
+        ignore_keys: Optional[List[str]] = None,
+    ) -> None:
         """
         Handle a line that contains a key-value pair.
-        
+
         Args:
             dict_obj: Dictionary to add the key-value pair to.
             match: Regex match object containing the key and value.
             ignore_keys: Optional parameter to specify keys to ignore during parsing.
         """
         key = match.group(1)
-        value = match.group(2).strip().rstrip(';').strip('\\')
-        
+        value = match.group(2).strip().rstrip(";").strip("\\")
+
         # The parsed value will be either None, a float, or a string
         if value == "null" or not value.strip():
             parsed_value = None
@@ -321,13 +377,13 @@ class PinnacleFileReader:
                     parsed_value = float(value)
                 except ValueError:
                     parsed_value = value.strip('"')
-        
+
         # If no nested keys are present, then just add the value
-        if '.' not in key:
+        if "." not in key:
             if not ignore_keys or key not in ignore_keys:
                 dict_obj[key] = parsed_value
             return
-        
+
         # If nested keys need to be accounted for, then split the key into its components
         all_keys = [k.strip() for k in key.split(".") if k.strip()]
         keys = []
@@ -335,14 +391,16 @@ class PinnacleFileReader:
             if ignore_keys and k in ignore_keys:
                 break
             keys.append(k)
-        
+
         PinnacleFileReader._insert_nested_value(dict_obj, keys, parsed_value)
-    
+
     @staticmethod
-    def _insert_nested_value(dict_obj: Dict[str, Any], keys: List[str], value: Any) -> None:
+    def _insert_nested_value(
+        dict_obj: Dict[str, Any], keys: List[str], value: Any
+    ) -> None:
         """
         Insert a value into a nested dictionary structure.
-        
+
         Args:
             dict_obj: Dictionary to insert the value into.
             keys: List of keys representing the path to the value.
@@ -352,19 +410,79 @@ class PinnacleFileReader:
             if keys[i] not in dict_obj:
                 dict_obj[keys[i]] = {}
             dict_obj = dict_obj[keys[i]]
-        
+
         dict_obj[keys[-1]] = value
-    
+
+    @staticmethod
+    def read_binary_slabs(
+        file_path: str,
+        shape: Sequence[int],
+        dtype: Any,
+        z_indices: Iterable[int],
+        header_size: int = 0,
+    ) -> np.ndarray:
+        """
+        Read selected z-slabs from a raw binary volume without reading the whole file.
+
+        The volume is assumed to be stored contiguously in (z, y, x) order after an
+        optional fixed-size binary header. Byte offsets are computed from the shape
+        and each run of consecutive slab indices is read with a single readinto()
+        call directly into a preallocated output buffer.
+
+        Args:
+            file_path: Path to the binary volume file.
+            shape: Full volume shape as (z, y, x).
+            dtype: NumPy dtype of the stored voxels, including byte order (e.g. ">f4").
+            z_indices: Slab indices to read. Order is preserved and repeats are allowed.
+            header_size: Number of bytes to skip at the start of the file.
+
+        Returns:
+            Array of shape (len(z_indices), y, x) with the requested slabs.
+
+        Raises:
+            IndexError: If a slab index is out of range.
+            ValueError: If the file is too short for the requested slabs.
+        """
+        z_dim, y_dim, x_dim = (int(n) for n in shape)
+        dtype = np.dtype(dtype)
+        indices = [int(k) for k in z_indices]
+        for k in indices:
+            if not 0 <= k < z_dim:
+                raise IndexError(f"Slice index {k} out of range for {z_dim} slices")
+
+        slab_bytes = y_dim * x_dim * dtype.itemsize
+        output = np.empty((len(indices), y_dim, x_dim), dtype=dtype)
+        buffer = memoryview(output.reshape(-1).view(np.uint8))
+
+        with open(file_path, "rb") as f:
+            start = 0
+            while start < len(indices):
+                # Group consecutive slab indices into a single contiguous read
+                stop = start + 1
+                while stop < len(indices) and indices[stop] == indices[stop - 1] + 1:
+                    stop += 1
+                f.seek(header_size + indices[start] * slab_bytes)
+                target = buffer[start * slab_bytes : stop * slab_bytes]
+                count = f.readinto(target)
+                if count != len(target):
+                    raise ValueError(
+                        f"Binary file {file_path} is too short: expected {len(target)} bytes "
+                        f"for slices {indices[start]}-{indices[stop - 1]}, got {count}"
+                    )
+                start = stop
+
+        return output
+
     @staticmethod
     def to_json(data: Dict[str, Any], indent: int = 2) -> str:
         """
         Convert the parsed data to a JSON string.
-        
+
         Args:
             data: Dictionary of parsed data.
             indent: Number of spaces to use for indentation.
-            
+
         Returns:
             JSON string representation of the data.
         """
-        return json.dumps(data, indent=indent)
\ No newline at end of file
+        return json.dumps(data, indent=indent)
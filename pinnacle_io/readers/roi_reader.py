@@ -2,37 +2,167 @@
 Reader for Pinnacle plan.roi files.
 """
 
-import numpy as np
 from pathlib import Path
-from pinnacle_io.models import ROI, Curve
+from threading import Lock
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from pinnacle_io.models import ROI, Curve, RaggedCurves
 from pinnacle_io.readers.pinnacle_file_reader import PinnacleFileReader
-from typing import List
+
+
+class ROIIndexEntry(NamedTuple):
+    """
+    Location of one ROI in a plan.roi file.
+
+    Attributes:
+        name: ROI name.
+        roi_number: 1-based position of the ROI in the file.
+        num_curve: Number of curves declared in the ROI header.
+        start: Byte offset of the "roi={" line.
+        end: Byte offset where the next ROI (or the end of the file) begins.
+    """
+
+    name: Optional[str]
+    roi_number: int
+    num_curve: int
+    start: int
+    end: int
+
+
+# Offset indexes of plan.roi files, keyed by (path, size, mtime)
+_index_cache: Dict[Tuple[str, int, int], List[ROIIndexEntry]] = {}
+_index_cache_lock = Lock()
+
 
 class ROIReader:
     """
     Reader for Pinnacle plan.roi files.
     """
+
+    @staticmethod
+    def _roi_path(plan_path: str) -> Path:
+        path = Path(plan_path)
+        if not str(path).lower().endswith("plan.roi"):
+            path = path / "plan.roi"
+
+        if not path.exists():
+            raise FileNotFoundError(f"plan.roi file not found: {path}")
+        return path
+
     @staticmethod
-    def read(plan_path: str) -> List[ROI]:
+    def read(plan_path: str, names: Optional[Iterable[str]] = None) -> List[ROI]:
         """
         Read a Pinnacle plan.roi file and create a list of ROI models.
 
         Args:
             plan_path: Path to the patient's plan directory
+            names: Optional ROI names to read. Only the requested ROIs are parsed, using
+                the byte-offset index of the file.
 
         Returns:
-            List of ROI models populated with data from the file
+            List of ROI models populated with data from the file, in file order
         """
-        path = Path(plan_path)
-        if not str(path).lower().endswith("plan.roi"):
-            path = path / 'plan.roi'
+        if names is not None:
+            return list(ROIReader.iter_rois(plan_path, names))
 
-        if not path.exists():
-            raise FileNotFoundError(f"plan.roi file not found: {path}")
-        
-        with open(path, 'r', encoding='latin1', errors='ignore') as f:
+        path = ROIReader._roi_path(plan_path)
+        with open(path, "r", encoding="latin1", errors="ignore") as f:
             return ROIReader._parse_roi_lines(f.readlines())
 
+    @staticmethod
+    def iter_rois(
+        plan_path: str, names: Optional[Iterable[str]] = None
+    ) -> Iterator[ROI]:
+        """
+        Yield the ROIs of a plan.roi file one at a time.
+
+        Each ROI is read and parsed only when it is requested, so memory use is bounded by
+        the largest ROI rather than the file.
+
+        Args:
+            plan_path: Path to the patient's plan directory or plan.roi file
+            names: Optional ROI names to read; other ROIs are skipped without parsing.
+
+        Yields:
+            ROI models in file order
+        """
+        path = ROIReader._roi_path(plan_path)
+        wanted = None if names is None else set(names)
+        entries = [
+            entry
+            for entry in ROIReader.read_index(path)
+            if wanted is None or entry.name in wanted
+        ]
+        with open(path, "rb") as f:
+            for entry in entries:
+                f.seek(entry.start)
+                lines = (
+                    f.read(entry.end - entry.start)
+                    .decode("latin1", errors="ignore")
+                    .splitlines()
+                )
+                roi = ROIReader._parse_roi_block(
+                    [line.strip() for line in lines], entry.roi_number
+                )
+                if roi is not None:
+                    yield roi
+
+    @staticmethod
+    def read_index(plan_path: str) -> List[ROIIndexEntry]:
+        """
+        Byte-offset index of the ROIs in a plan.roi file.
+
+        Only the ROI headers are inspected. The index is cached by path, size and
+        modification time, so a file is scanned once.
+
+        Args:
+            plan_path: Path to the patient's plan directory or plan.roi file
+
+        Returns:
+            ROIIndexEntry for each ROI in file order
+        """
+        path = ROIReader._roi_path(plan_path)
+        stat = path.stat()
+        key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+        with _index_cache_lock:
+            entries = _index_cache.get(key)
+        if entries is None:
+            entries = ROIReader._build_index(path)
+            with _index_cache_lock:
+                _index_cache[key] = entries
+        return list(entries)
+
+    @staticmethod
+    def _build_index(path: Path) -> List[ROIIndexEntry]:
+        headers: List[list] = []
+        in_header = False
+        offset = 0
+        with open(path, "rb") as f:
+            for line in f:
+                stripped = line.strip()
+                if stripped == b"roi={":
+                    # [name, num_curve, start]
+                    headers.append([None, 0, offset])
+                    in_header = True
+                elif in_header:
+                    if stripped.startswith(b"name:"):
+                        headers[-1][0] = stripped[5:].strip().decode("latin1")
+                    elif stripped.startswith(b"num_curve"):
+                        value = stripped.split(b"=", 1)[-1].strip().rstrip(b";").strip()
+                        headers[-1][1] = int(value) if value.isdigit() else 0
+                        in_header = False
+                    elif stripped == b"curve={":
+                        in_header = False
+                offset += len(line)
+
+        entries = []
+        for number, (name, num_curve, start) in enumerate(headers):
+            end = headers[number + 1][2] if number + 1 < len(headers) else offset
+            entries.append(ROIIndexEntry(name, number + 1, num_curve, start, end))
+        return entries
+
     @staticmethod
     def parse_roi_content(content_lines: list[str]) -> List[ROI]:
         """
@@ -48,50 +178,88 @@ class ROIReader:
 
     @staticmethod
     def _parse_roi_lines(lines: list[str]) -> List[ROI]:
-            """
-            Parse ROI lines into a list of ROI models.
-
-            Args:
-                lines: List of lines from the ROI file.
-
-            Returns:
-                List of ROI models populated with data from the content.
-            """
-            lines = [line.strip() for line in lines]
-            beginning_of_rois = [i for i in range(len(lines)) if lines[i] == "roi={"]
-            beginning_of_curves = [i for i in range(len(lines)) if lines[i] == "curve={"]
-
-            rois = []
-            i_roi = 0
-            i_curve = 0
-            while i_roi < len(beginning_of_rois) and i_curve < len(beginning_of_curves):
-                beginning_of_roi = beginning_of_rois[i_roi]
-                beginning_of_curve = beginning_of_curves[i_curve]
-                roi_lines = lines[beginning_of_roi + 1 : beginning_of_curve]
-                roi_data = PinnacleFileReader.parse_key_value_content_lines(roi_lines)
-                roi_data["roi_number"] = i_roi + 1
-                roi = ROI(**roi_data)
-
-                curve_number = 0
-                while curve_number < roi_data["num_curve"]:
-                    beginning_of_curve = beginning_of_curves[i_curve]
-                    curve_lines = lines[beginning_of_curve + 1 : beginning_of_curve + 4]
-                    curve_data = PinnacleFileReader.parse_key_value_content_lines(curve_lines)
-                    curve_data["curve_number"] = curve_number
-
-                    beginning_of_points = beginning_of_curve + 5
-                    point_lines = lines[
-                        beginning_of_points : beginning_of_points + curve_data["num_points"]
-                    ]
-                    curve_data["points"] = np.array(
-                        [list(map(float, line.split())) for line in point_lines]
-                    )
-                    roi.curve_list.append(Curve(**curve_data))
-
-                    curve_number += 1
-                    i_curve += 1
+        """
+        Parse ROI lines into a list of ROI models.
+
+        Args:
+            lines: List of lines from the ROI file.
 
+        Returns:
+            List of ROI models populated with data from the content.
+        """
+        lines = [line.strip() for line in lines]
+        beginning_of_rois = [i for i in range(len(lines)) if lines[i] == "roi={"]
+
+        rois = []
+        for i_roi, beginning_of_roi in enumerate(beginning_of_rois):
+            end_of_roi = (
+                beginning_of_rois[i_roi + 1]
+                if i_roi + 1 < len(beginning_of_rois)
+                else len(lines)
+            )
+            roi = ROIReader._parse_roi_block(
+                lines[beginning_of_roi:end_of_roi], i_roi + 1
+            )
+            if roi is not None:
                 rois.append(roi)
-                i_roi += 1
 
-            return rois
\ No newline at end of file
+        return rois
+
+    @staticmethod
+    def _parse_roi_block(lines: list[str], roi_number: int) -> Optional[ROI]:
+        """
+        Parse the stripped lines of one ROI, starting with its "roi={" line.
+
+        Args:
+            lines: Stripped lines of the ROI.
+            roi_number: 1-based position of the ROI in the file.
+
+        Returns:
+            ROI model, or None if the lines do not hold an ROI.
+        """
+        if not lines or lines[0] != "roi={":
+            return None
+        beginning_of_curves = [i for i in range(len(lines)) if lines[i] == "curve={"]
+
+        end_of_header = beginning_of_curves[0] if beginning_of_curves else len(lines)
+        for i in range(1, end_of_header):
+            if lines[i].startswith("num_curve"):
+                end_of_header = i + 1
+                break
+        roi_data = PinnacleFileReader.parse_key_value_content_lines(
+            lines[1:end_of_header]
+        )
+        roi_data["roi_number"] = roi_number
+        roi = ROI(**roi_data)
+
+        # Point lines of all curves are parsed together into one buffer
+        point_lines = []
+        counts = []
+        num_curve = min(
+            roi_data.get("num_curve", len(beginning_of_curves)),
+            len(beginning_of_curves),
+        )
+        for curve_number in range(num_curve):
+            beginning_of_curve = beginning_of_curves[curve_number]
+            curve_lines = lines[beginning_of_curve + 1 : beginning_of_curve + 4]
+            curve_data = PinnacleFileReader.parse_key_value_content_lines(curve_lines)
+            curve_data["curve_number"] = curve_number
+
+            beginning_of_points = beginning_of_curve + 5
+            point_lines.extend(
+                lines[
+                    beginning_of_points : beginning_of_points + curve_data["num_points"]
+                ]
+            )
+            counts.append(curve_data["num_points"])
+            roi.curve_list.append(Curve(**curve_data))
+
+        points = np.array(" ".join(point_lines).split(), dtype=np.float32).reshape(
+            -1, 3
+        )
+        roi.set_curve_points(
+            RaggedCurves(
+                points, np.concatenate(([0], np.cumsum(counts, dtype=np.int64)))
+            )
+        )
+        return roi
@@ -0,0 +1,239 @@
+"""
+Voxel-wise biologically effective dose conversion (BED and EQD2).
+
+Using the linear-quadratic model with n fractions of dose d = D / n:
+
+    BED  = D * (1 + d / (alpha/beta))
+    EQD2 = BED / (1 + 2 / (alpha/beta))
+
+The alpha/beta ratio may vary per voxel: a default value applies everywhere
+except inside ROIs given their own ratio. compute_bed and compute_eqd2 take the
+ratios in Gy and convert them, like the 2 Gy EQD2 reference, to cGy for doses with
+a dose_unit of CGY; BiologicalDose takes them in the unit of the dose. Conversions
+are lazy dose expressions, so they are evaluated in place slab by slab on
+float32 data (optionally in parallel) and never create float64 copies of the
+volume.
+"""
+
+from typing import TYPE_CHECKING, Any, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+from pinnacle_io.utils.dose_expression import DoseExpression, as_expression
+
+if TYPE_CHECKING:
+    from pinnacle_io.models.dose import Dose
+    from pinnacle_io.models.roi import ROI
+
+
+class BiologicalDose(DoseExpression):
+    """Lazy BED or EQD2 conversion of a physical dose expression."""
+
+    def __init__(
+        self,
+        dose: Union[DoseExpression, "Dose"],
+        number_of_fractions: int,
+        alpha_beta: float = 10.0,
+        roi_alpha_beta: Optional[Mapping["ROI", float]] = None,
+        masks: Optional[Mapping["ROI", Any]] = None,
+        eqd2: bool = False,
+        reference_dose: float = 2.0,
+    ) -> None:
+        """
+        Args:
+            dose: Physical dose (a Dose or dose expression), in Gy or cGy.
+            number_of_fractions: Number of fractions the physical dose is delivered in.
+            alpha_beta: Default alpha/beta ratio, in the same unit as the dose.
+            roi_alpha_beta: Alpha/beta ratio per ROI. Later entries take precedence where
+                ROIs overlap.
+            masks: Boolean (z, y, x) mask on the dose grid for each ROI in roi_alpha_beta.
+                ROIs without a mask are rasterized on the dose grid when dose is a Dose.
+            eqd2: If True, convert to EQD2 instead of BED.
+            reference_dose: Dose per fraction of the EQD2 reference scheme (2 Gy), in the
+                same unit as the dose.
+        """
+        if not number_of_fractions or number_of_fractions < 1:
+            raise ValueError(
+                f"number_of_fractions must be a positive integer, got {number_of_fractions}"
+            )
+        if alpha_beta <= 0:
+            raise ValueError(f"alpha_beta must be positive, got {alpha_beta}")
+
+        self.dose = as_expression(dose)
+        self.number_of_fractions = int(number_of_fractions)
+        self.alpha_beta = float(alpha_beta)
+        self.eqd2 = eqd2
+        self.reference_dose = float(reference_dose)
+        self.regions = []
+        dose_grid = getattr(dose, "dose_grid", None)
+        if roi_alpha_beta and dose_grid is not None:
+            from pinnacle_io.utils.roi_mask import resolve_masks
+
+            masks = resolve_masks(roi_alpha_beta, dose_grid, masks)
+        for roi, ratio in (roi_alpha_beta or {}).items():
+            if ratio <= 0:
+                raise ValueError(
+                    f"alpha_beta for ROI '{roi.name}' must be positive, got {ratio}"
+                )
+            mask = None if masks is None else masks.get(roi)
+            if mask is None:
+                raise ValueError(f"A mask is required for ROI '{roi.name}'.")
+            mask = np.asarray(mask, dtype=bool)
+            if mask.shape != self.shape:
+                raise ValueError(
+                    f"Mask shape {mask.shape} for ROI '{roi.name}' does not match dose shape {self.shape}"
+                )
+            self.regions.append((mask, float(ratio)))
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self.dose.shape
+
+    def _alpha_beta(self, z0: int, z1: int) -> Union[float, np.ndarray]:
+        """Return the alpha/beta ratio for the chunk: a scalar, or a float32 array per voxel."""
+        if not self.regions:
+            return self.alpha_beta
+        ratios = np.full((z1 - z0,) + self.shape[1:], self.alpha_beta, dtype=np.float32)
+        for mask, ratio in self.regions:
+            ratios[mask[z0:z1]] = ratio
+        return ratios
+
+    def _evaluate(self, z0: int, z1: int) -> np.ndarray:
+        dose = self.dose._evaluate(z0, z1)
+        ratios = self._alpha_beta(z0, z1)
+
+        if np.isscalar(ratios):
+            # factor = 1 + D / (n * alpha/beta)
+            factor = dose * np.float32(1.0 / (self.number_of_fractions * ratios))
+            factor += np.float32(1.0)
+            dose *= factor
+            if self.eqd2:
+                dose *= np.float32(1.0 / (1.0 + self.reference_dose / ratios))
+            return dose
+
+        factor = np.multiply(ratios, np.float32(self.number_of_fractions))
+        np.divide(dose, factor, out=factor)
+        factor += np.float32(1.0)
+        dose *= factor
+        if self.eqd2:
+            # Reuse the ratio buffer for 1 + reference_dose / (alpha/beta)
+            np.divide(np.float32(self.reference_dose), ratios, out=ratios)
+            ratios += np.float32(1.0)
+            dose /= ratios
+        return dose
+
+
+def _convert(
+    dose: "Dose",
+    eqd2: bool,
+    number_of_fractions: Optional[int],
+    alpha_beta: float,
+    roi_alpha_beta: Optional[Mapping["ROI", float]],
+    masks: Optional[Mapping["ROI", Any]],
+    chunk_size: int,
+    workers: Optional[int],
+) -> "Dose":
+    if number_of_fractions is None:
+        number_of_fractions = dose.get_number_of_fractions()
+        if number_of_fractions is None:
+            raise ValueError(
+                "number_of_fractions was not given and could not be found in the trial prescriptions."
+            )
+    # alpha/beta and the 2 Gy EQD2 reference are given in Gy and expressed in the unit of the dose
+    unit_scale = 100.0 if (dose.dose_unit or "").upper() == "CGY" else 1.0
+    if roi_alpha_beta is not None:
+        roi_alpha_beta = {
+            roi: ratio * unit_scale for roi, ratio in roi_alpha_beta.items()
+        }
+    expression = BiologicalDose(
+        dose,
+        number_of_fractions,
+        alpha_beta * unit_scale,
+        roi_alpha_beta,
+        masks,
+        eqd2=eqd2,
+        reference_dose=2.0 * unit_scale,
+    )
+    kind = "EQD2" if eqd2 else "BED"
+    kwargs = {}
+    if dose.dose_grid is not None:
+        kwargs["dose_grid"] = dose.dose_grid
+    return expression.to_dose(
+        chunk_size=chunk_size,
+        workers=workers,
+        dose_type="EFFECTIVE",
+        dose_unit=dose.dose_unit,
+        dose_summation_type=dose.dose_summation_type,
+        dose_comment=f"{kind} ({number_of_fractions} fx, alpha/beta={alpha_beta:g} Gy)",
+        **kwargs,
+    )
+
+
+def compute_bed(
+    dose: "Dose",
+    number_of_fractions: Optional[int] = None,
+    alpha_beta: float = 10.0,
+    roi_alpha_beta: Optional[Mapping["ROI", float]] = None,
+    masks: Optional[Mapping["ROI", Any]] = None,
+    chunk_size: int = 16,
+    workers: Optional[int] = None,
+) -> "Dose":
+    """
+    Convert a physical dose to biologically effective dose (BED).
+
+    Args:
+        dose: Physical Dose.
+        number_of_fractions: Number of fractions. Defaults to the number of fractions in
+            the prescriptions of the dose's trial.
+        alpha_beta: Default alpha/beta ratio in Gy.
+        roi_alpha_beta: Alpha/beta ratio per ROI in Gy.
+        masks: Boolean mask on the dose grid for each ROI in roi_alpha_beta.
+        chunk_size: Number of z-slabs converted at a time.
+        workers: Number of threads used to convert slabs concurrently.
+
+    Returns:
+        New Dose with dose_type "EFFECTIVE".
+    """
+    return _convert(
+        dose,
+        False,
+        number_of_fractions,
+        alpha_beta,
+        roi_alpha_beta,
+        masks,
+        chunk_size,
+        workers,
+    )
+
+
+def compute_eqd2(
+    dose: "Dose",
+    number_of_fractions: Optional[int] = None,
+    alpha_beta: float = 10.0,
+    roi_alpha_beta: Optional[Mapping["ROI", float]] = None,
+    masks: Optional[Mapping["ROI", Any]] = None,
+    chunk_size: int = 16,
+    workers: Optional[int] = None,
+) -> "Dose":
+    """
+    Convert a physical dose to the equivalent dose in 2 Gy fractions (EQD2).
+
+    The 2 Gy reference and the alpha/beta ratios are converted to cGy for doses with a
+    dose_unit of CGY.
+
+    Args:
+        See compute_bed.
+
+    Returns:
+        New Dose with dose_type "EFFECTIVE".
+    """
+    return _convert(
+        dose,
+        True,
+        number_of_fractions,
+        alpha_beta,
+        roi_alpha_beta,
+        masks,
+        chunk_size,
+        workers,
+    )
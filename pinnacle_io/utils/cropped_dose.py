@@ -0,0 +1,415 @@
+"""
+Auto-cropped storage for sparse dose volumes.
+
+Beam doses are typically near zero outside the treated field, yet the full
+(z, y, x) dose grid is kept in memory. A CroppedVolume stores only the bounding
+box of voxels above a threshold together with its offset in the full grid, and
+behaves like the full array on access: indexing, np.asarray() and reductions such
+as np.max() pad the missing region with a fill value (zero by default).
+
+Summation, DVH and interpolation helpers (add_to, masked_values, interpolate)
+only touch the occupied region, which is usually a few percent of the grid for
+stereotactic and small-field plans.
+"""
+
+from typing import Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def _is_full_reduction(axis: Any, out: Any, kwargs: dict) -> bool:
+    """Return True for a plain reduction over all voxels (numpy passes unset options as None)."""
+    return (
+        axis is None and out is None and all(value is None for value in kwargs.values())
+    )
+
+
+class CroppedVolume:
+    """
+    A (z, y, x) volume stored as a cropped bounding box plus offset.
+
+    Attributes:
+        data: Voxel values inside the bounding box.
+        offset: (z, y, x) index of data[0, 0, 0] in the full volume.
+        shape: Shape of the full volume.
+        fill_value: Value of every voxel outside the bounding box.
+    """
+
+    def __init__(
+        self,
+        data: np.ndarray,
+        offset: Sequence[int],
+        shape: Sequence[int],
+        fill_value: float = 0.0,
+    ) -> None:
+        self.data = np.asarray(data)
+        self.offset = tuple(int(n) for n in offset)
+        self.shape = tuple(int(n) for n in shape)
+        self.fill_value = fill_value
+        if self.data.ndim != 3 or len(self.offset) != 3 or len(self.shape) != 3:
+            raise ValueError("CroppedVolume requires 3D data, offset and shape.")
+        for start, size, full in zip(self.offset, self.data.shape, self.shape):
+            if start < 0 or start + size > full:
+                raise ValueError(
+                    f"Cropped data {self.data.shape} at offset {self.offset} does not fit in {self.shape}"
+                )
+
+    @classmethod
+    def from_array(
+        cls,
+        array: Any,
+        threshold: float = 0.0,
+        margin: int = 0,
+        fill_value: float = 0.0,
+    ) -> "CroppedVolume":
+        """
+        Crop a volume to the bounding box of voxels whose value exceeds the threshold.
+
+        The bounding box is found slab by slab, so memmapped inputs are never loaded in
+        full. Voxels outside the box are replaced by fill_value on access, so values at or
+        below the threshold outside the box are not preserved.
+
+        Args:
+            array: Array-like (z, y, x) volume.
+            threshold: Voxels with values greater than this define the bounding box.
+            margin: Number of voxels added on each side of the bounding box.
+            fill_value: Value returned for voxels outside the bounding box.
+
+        Returns:
+            CroppedVolume holding a copy of the bounding box region.
+        """
+        shape = tuple(int(n) for n in array.shape)
+        if len(shape) != 3:
+            raise ValueError(f"Expected a 3D volume, got shape {shape}")
+
+        z_occupied = np.zeros(shape[0], dtype=bool)
+        y_occupied = np.zeros(shape[1], dtype=bool)
+        x_occupied = np.zeros(shape[2], dtype=bool)
+        for k in range(shape[0]):
+            above = np.asarray(array[k]) > threshold
+            if above.any():
+                z_occupied[k] = True
+                y_occupied |= above.any(axis=1)
+                x_occupied |= above.any(axis=0)
+
+        if not z_occupied.any():
+            dtype = getattr(array, "dtype", np.float32)
+            return cls(np.empty((0, 0, 0), dtype=dtype), (0, 0, 0), shape, fill_value)
+
+        bounds = []
+        for occupied, size in zip((z_occupied, y_occupied, x_occupied), shape):
+            indices = np.flatnonzero(occupied)
+            bounds.append(
+                (
+                    max(int(indices[0]) - margin, 0),
+                    min(int(indices[-1]) + 1 + margin, size),
+                )
+            )
+
+        (z0, z1), (y0, y1), (x0, x1) = bounds
+        data = np.array(array[z0:z1, y0:y1, x0:x1])
+        return cls(data, (z0, y0, x0), shape, fill_value)
+
+    @property
+    def ndim(self) -> int:
+        return 3
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.data.dtype
+
+    @property
+    def size(self) -> int:
+        """Number of voxels in the full volume."""
+        return int(np.prod(self.shape))
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes held by the cropped data."""
+        return self.data.nbytes
+
+    @property
+    def bbox(self) -> Tuple[slice, slice, slice]:
+        """Slices selecting the bounding box within the full volume."""
+        return tuple(
+            slice(start, start + size)
+            for start, size in zip(self.offset, self.data.shape)
+        )
+
+    @property
+    def occupancy(self) -> float:
+        """Fraction of the full volume covered by the bounding box."""
+        return self.data.size / self.size if self.size else 0.0
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def to_array(self, dtype: Optional[Any] = None) -> np.ndarray:
+        """Return the full, padded volume as a new array."""
+        full = np.full(self.shape, self.fill_value, dtype=dtype or self.dtype)
+        full[self.bbox] = self.data
+        return full
+
+    def __array__(
+        self, dtype: Optional[Any] = None, copy: Optional[bool] = None
+    ) -> np.ndarray:
+        return self.to_array(dtype)
+
+    def _z_block(self, z_indices: np.ndarray) -> np.ndarray:
+        """Return the padded (len(z_indices), y, x) block for the given slice indices."""
+        block = np.full(
+            (len(z_indices),) + self.shape[1:], self.fill_value, dtype=self.dtype
+        )
+        z0 = self.offset[0]
+        local = z_indices - z0
+        inside = (local >= 0) & (local < self.data.shape[0])
+        if inside.any():
+            _, y_slice, x_slice = self.bbox
+            block[np.flatnonzero(inside), y_slice, x_slice] = self.data[local[inside]]
+        return block
+
+    def __getitem__(self, key: Any) -> Any:
+        """
+        Index the full volume. Only the requested z-slabs are padded; a single slab or
+        a z-range (e.g. volume[k] or volume[z0:z1]) never materializes the full volume.
+        """
+        if not isinstance(key, tuple):
+            key = (key,)
+        first, rest = key[0], key[1:]
+        if first is Ellipsis:
+            return self.to_array()[key]
+
+        z_all = np.arange(self.shape[0])
+        if isinstance(first, (int, np.integer)):
+            block = self._z_block(z_all[[first]])[0]
+            return block[rest] if rest else block
+        block = self._z_block(z_all[first])
+        return block[(slice(None),) + rest] if rest else block
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        """
+        Assign to the full volume.
+
+        Values inside the bounding box are written in place. The box grows to cover
+        values other than fill_value written outside it; fill_value written outside the
+        box is dropped. Keys other than integers, slices and Ellipsis make the volume
+        dense (the box becomes the full volume).
+        """
+        original = key
+        key = key if isinstance(key, tuple) else (key,)
+        if any(k is Ellipsis for k in key):
+            i = next(i for i, k in enumerate(key) if k is Ellipsis)
+            key = key[:i] + (slice(None),) * (3 - len(key) + 1) + key[i + 1 :]
+        key = key + (slice(None),) * (3 - len(key))
+        if len(key) != 3 or not all(
+            isinstance(k, (int, np.integer, slice)) for k in key
+        ):
+            full = self.to_array()
+            full[original] = value
+            self.data, self.offset = full, (0, 0, 0)
+            return
+
+        # Full-volume indices selected along each axis
+        positions = []
+        for k, size in zip(key, self.shape):
+            if isinstance(k, slice):
+                positions.append(np.arange(size)[k])
+            else:
+                if not -size <= k < size:
+                    raise IndexError(
+                        f"Index {k} is out of bounds for axis with size {size}"
+                    )
+                positions.append(np.array([k % size]))
+        selected = tuple(len(p) for p in positions)
+        if not all(selected):
+            return
+        value_shape = tuple(n for k, n in zip(key, selected) if isinstance(k, slice))
+        block = np.broadcast_to(
+            np.asarray(value, dtype=self.dtype), value_shape
+        ).reshape(selected)
+
+        # Grow the box to cover written values other than fill_value
+        lower = list(self.offset)
+        upper = [start + n for start, n in zip(self.offset, self.data.shape)]
+        occupied = block != self.fill_value
+        if occupied.any():
+            for axis, axis_positions in enumerate(positions):
+                used = axis_positions[
+                    occupied.any(axis=tuple(a for a in range(3) if a != axis))
+                ]
+                low, high = int(used.min()), int(used.max()) + 1
+                if self.data.size:
+                    low, high = min(lower[axis], low), max(upper[axis], high)
+                lower[axis], upper[axis] = low, high
+        elif not self.data.size:
+            return
+        if (
+            tuple(lower) != self.offset
+            or tuple(h - l for l, h in zip(lower, upper)) != self.data.shape
+        ):
+            grown = np.full(
+                tuple(h - l for l, h in zip(lower, upper)),
+                self.fill_value,
+                dtype=self.dtype,
+            )
+            if self.data.size:
+                grown[
+                    tuple(
+                        slice(o - l, o - l + n)
+                        for o, l, n in zip(self.offset, lower, self.data.shape)
+                    )
+                ] = self.data
+            self.data, self.offset = grown, tuple(lower)
+
+        # Write the selected voxels that fall inside the box
+        inside = [(p >= l) & (p < h) for p, l, h in zip(positions, lower, upper)]
+        if all(i.any() for i in inside):
+            local = np.ix_(*[p[i] - l for p, i, l in zip(positions, inside, lower)])
+            self.data[local] = block[np.ix_(*[np.flatnonzero(i) for i in inside])]
+
+    def max(self, axis: Any = None, out: Any = None, **kwargs: Any) -> Any:
+        if not _is_full_reduction(axis, out, kwargs):
+            return np.max(self.to_array(), axis=axis, out=out, **kwargs)
+        if self.data.size == 0:
+            return self.dtype.type(self.fill_value)
+        value = self.data.max()
+        return (
+            max(value, self.dtype.type(self.fill_value))
+            if self.data.size < self.size
+            else value
+        )
+
+    def min(self, axis: Any = None, out: Any = None, **kwargs: Any) -> Any:
+        if not _is_full_reduction(axis, out, kwargs):
+            return np.min(self.to_array(), axis=axis, out=out, **kwargs)
+        if self.data.size == 0:
+            return self.dtype.type(self.fill_value)
+        value = self.data.min()
+        return (
+            min(value, self.dtype.type(self.fill_value))
+            if self.data.size < self.size
+            else value
+        )
+
+    def sum(self, axis: Any = None, out: Any = None, **kwargs: Any) -> Any:
+        if not _is_full_reduction(axis, out, kwargs):
+            return np.sum(self.to_array(), axis=axis, out=out, **kwargs)
+        return self.data.sum(dtype=np.float64) + self.fill_value * (
+            self.size - self.data.size
+        )
+
+    def mean(self, axis: Any = None, out: Any = None, **kwargs: Any) -> Any:
+        if not _is_full_reduction(axis, out, kwargs):
+            return np.mean(self.to_array(), axis=axis, out=out, **kwargs)
+        return self.sum() / self.size
+
+    def add_to(self, out: np.ndarray, z0: int = 0, factor: float = 1.0) -> np.ndarray:
+        """
+        Accumulate factor * volume[z0:z0 + len(out)] into out, touching only the bounding box.
+
+        Args:
+            out: Array of shape (n, y, x) to accumulate into.
+            z0: Index of the first slab of out in the full volume.
+            factor: Weight applied to the volume values.
+
+        Returns:
+            out
+        """
+        if self.fill_value:
+            out += np.float32(factor * self.fill_value)
+        bz0 = self.offset[0]
+        start = max(z0, bz0)
+        stop = min(z0 + out.shape[0], bz0 + self.data.shape[0])
+        if start < stop:
+            _, y_slice, x_slice = self.bbox
+            source = self.data[start - bz0 : stop - bz0]
+            if self.fill_value:
+                source = source - self.fill_value
+            target = out[start - z0 : stop - z0, y_slice, x_slice]
+            if factor == 1.0:
+                target += source
+            else:
+                target += factor * source
+        return out
+
+    def masked_values(self, mask: Any) -> np.ndarray:
+        """
+        Return the voxel values selected by a boolean mask over the full volume.
+
+        Values inside the bounding box are gathered directly; masked voxels outside the
+        box contribute fill_value. The order of the returned values is unspecified, which
+        is sufficient for DVH and dose statistics.
+
+        Args:
+            mask: Boolean array with the full volume shape.
+
+        Returns:
+            1D array of the masked voxel values.
+        """
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != self.shape:
+            raise ValueError(
+                f"Mask shape {mask.shape} does not match volume shape {self.shape}"
+            )
+        inside = mask[self.bbox]
+        values = self.data[inside]
+        outside = int(np.count_nonzero(mask)) - values.size
+        if outside:
+            values = np.concatenate(
+                [values, np.full(outside, self.fill_value, dtype=self.dtype)]
+            )
+        return values
+
+    def interpolate(self, indices: Any) -> np.ndarray:
+        """
+        Trilinearly interpolate the volume at continuous voxel indices.
+
+        Only points whose neighbouring voxels overlap the bounding box are interpolated;
+        every other point (including points outside the volume) returns fill_value.
+
+        Args:
+            indices: Array of shape (N, 3) with continuous (x, y, z) voxel indices.
+
+        Returns:
+            Array of N interpolated values.
+        """
+        indices = np.asarray(indices, dtype=np.float64).reshape(-1, 3)
+        result = np.full(len(indices), self.fill_value, dtype=np.float64)
+        if self.data.size == 0:
+            return result
+
+        # Reorder to (z, y, x) to match the array layout
+        zyx = indices[:, ::-1]
+        lower = np.array(self.offset, dtype=np.float64)
+        upper = lower + np.array(self.data.shape) - 1
+        near = np.all((zyx > lower - 1) & (zyx < upper + 1), axis=1)
+        if not near.any():
+            return result
+
+        points = zyx[near]
+        base = np.floor(points).astype(np.int64)
+        frac = points - base
+        local = base - np.array(self.offset)
+        values = np.zeros(len(points), dtype=np.float64)
+        for corner in range(8):
+            step = np.array([(corner >> 2) & 1, (corner >> 1) & 1, corner & 1])
+            weight = np.prod(np.where(step, frac, 1.0 - frac), axis=1)
+            idx = local + step
+            inside = np.all((idx >= 0) & (idx < np.array(self.data.shape)), axis=1)
+            corner_values = np.full(len(points), self.fill_value, dtype=np.float64)
+            corner_values[inside] = self.data[
+                idx[inside, 0], idx[inside, 1], idx[inside, 2]
+            ]
+            values += weight * corner_values
+
+        # Points outside the full volume are not interpolated
+        in_volume = np.all((points >= 0) & (points <= np.array(self.shape) - 1), axis=1)
+        values[~in_volume] = self.fill_value
+        result[near] = values
+        return result
+
+    def __repr__(self) -> str:
+        return (
+            f"<CroppedVolume(shape={self.shape}, bbox_shape={self.data.shape}, "
+            f"offset={self.offset}, occupancy={self.occupancy:.1%})>"
+        )
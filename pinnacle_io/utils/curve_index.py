@@ -0,0 +1,287 @@
+"""
+Slice-indexed lookup of ROI curves.
+
+Each curve lies on one CT slice. The index resolves the z-position of every curve
+of every ROI to a slice of an image set in one vectorized lookup (searchsorted
+on the ImageInfo table positions, or the regular slice grid when the image set
+has no table positions), sorts the curves by slice and keeps the start of each
+slice, so the curves on a slice are a contiguous range found in O(1). A 2D
+bounding box is kept per curve for viewport culling.
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from pinnacle_io.models.image_set import ImageSet
+    from pinnacle_io.models.roi import ROI, Curve
+
+
+def resolve_slice_indices(
+    image_set: "ImageSet", z: Any, tolerance: Optional[float] = None
+) -> np.ndarray:
+    """
+    Slice index of the image set nearest to each z-position.
+
+    Args:
+        image_set: ImageSet with ImageInfo table positions or a regular slice grid.
+        z: z-positions in cm.
+        tolerance: If given, positions further than this from the nearest slice get -1.
+            Defaults to half the slice spacing.
+
+    Returns:
+        int64 array of slice indices, with -1 outside the image set.
+    """
+    z = np.asarray(z, dtype=np.float64).ravel()
+    z_pixdim = image_set.z_pixdim
+    if tolerance is None and z_pixdim:
+        tolerance = abs(z_pixdim) / 2 * (1 + 1e-6)
+    table = image_set.image_info_table
+    if len(table) and not table.missing["table_position"].all():
+        return table.find_slices(z, tolerance)
+
+    if not z_pixdim or not image_set.z_dim:
+        return np.full(len(z), -1, dtype=np.int64)
+    continuous = (z - (image_set.z_start or 0.0)) / z_pixdim
+    indices = np.rint(continuous).astype(np.int64)
+    outside = (indices < 0) | (indices >= image_set.z_dim)
+    if tolerance is not None:
+        outside |= np.abs(continuous - indices) * abs(z_pixdim) > tolerance
+    indices[outside] = -1
+    return indices
+
+
+class CurveSliceIndex:
+    """
+    Curves of many ROIs grouped by image slice.
+
+    Attributes:
+        rois: ROIs in the index.
+        roi_indices: int32 index into rois of each indexed curve, sorted by slice.
+        curve_indices: int32 index of each indexed curve within its ROI.
+        slice_indices: int32 slice of each indexed curve (ascending).
+        bounding_boxes: float32 (n, 4) (x_min, y_min, x_max, y_max) of each indexed curve.
+        number_of_slices: Number of slices of the image set.
+    """
+
+    def __init__(
+        self,
+        rois: Sequence["ROI"],
+        roi_indices: np.ndarray,
+        curve_indices: np.ndarray,
+        slice_indices: np.ndarray,
+        bounding_boxes: np.ndarray,
+        number_of_slices: int,
+        image_set: Optional["ImageSet"] = None,
+    ) -> None:
+        self.rois = list(rois)
+        self.roi_indices = roi_indices
+        self.curve_indices = curve_indices
+        self.slice_indices = slice_indices
+        self.bounding_boxes = bounding_boxes
+        self.number_of_slices = int(number_of_slices)
+        self.image_set = image_set
+        # _slice_start[k] is the first entry of slice k
+        self._slice_start = np.searchsorted(
+            slice_indices, np.arange(self.number_of_slices + 1)
+        )
+
+    @classmethod
+    def build(
+        cls,
+        rois: Iterable["ROI"],
+        image_set: "ImageSet",
+        tolerance: Optional[float] = None,
+        assign: bool = True,
+    ) -> "CurveSliceIndex":
+        """
+        Index the curves of ROIs on the slices of an image set.
+
+        Args:
+            rois: ROIs whose curves are indexed.
+            image_set: ImageSet defining the slices.
+            tolerance: Maximum distance between a curve and its slice, in cm. Defaults to
+                half the slice spacing. Curves further from any slice are not indexed.
+            assign: If True, write Curve.slice_index and Curve.z_position.
+
+        Returns:
+            CurveSliceIndex over the slices of the image set.
+        """
+        rois = list(rois)
+        buffers = [roi.curve_points for roi in rois]
+        counts = np.array([len(ragged) for ragged in buffers], dtype=np.int64)
+        z = (
+            np.concatenate([ragged.z for ragged in buffers])
+            if buffers
+            else np.zeros(0, dtype=np.float32)
+        )
+        slices = resolve_slice_indices(image_set, z, tolerance)
+
+        # Per-curve 2D bounding boxes, one reduceat per ROI
+        boxes = np.full((len(z), 4), np.nan, dtype=np.float32)
+        start = 0
+        for ragged, count in zip(buffers, counts):
+            nonempty = np.flatnonzero(ragged.counts > 0)
+            if len(nonempty):
+                xy = ragged.points[:, :2]
+                boxes[start + nonempty, :2] = np.minimum.reduceat(
+                    xy, ragged.offsets[:-1][nonempty], axis=0
+                )
+                boxes[start + nonempty, 2:] = np.maximum.reduceat(
+                    xy, ragged.offsets[:-1][nonempty], axis=0
+                )
+            start += count
+
+        if assign:
+            position = 0
+            for roi, ragged in zip(rois, buffers):
+                for i, curve in enumerate(roi.curve_list):
+                    k = int(slices[position + i])
+                    curve.slice_index = k if k >= 0 else None
+                    curve.z_position = float(ragged.z[i])
+                position += len(ragged)
+
+        roi_indices = np.repeat(np.arange(len(rois), dtype=np.int32), counts)
+        curve_indices = (
+            np.arange(len(z)) - np.repeat(np.cumsum(counts) - counts, counts)
+        ).astype(np.int32)
+        keep = np.flatnonzero(slices >= 0)
+        order = keep[np.argsort(slices[keep], kind="stable")]
+        return cls(
+            rois,
+            roi_indices[order],
+            curve_indices[order],
+            slices[order].astype(np.int32),
+            boxes[order],
+            int(image_set.z_dim or (slices.max() + 1 if len(keep) else 0)),
+            image_set=image_set,
+        )
+
+    def __len__(self) -> int:
+        return len(self.slice_indices)
+
+    def _range(self, slice_index: int) -> Tuple[int, int]:
+        if not 0 <= slice_index < self.number_of_slices:
+            return 0, 0
+        return int(self._slice_start[slice_index]), int(
+            self._slice_start[slice_index + 1]
+        )
+
+    def entries_on_slice(
+        self,
+        slice_index: int,
+        roi: Optional["ROI"] = None,
+        bounds: Optional[Sequence[float]] = None,
+    ) -> np.ndarray:
+        """
+        Positions (into the index arrays) of the curves on a slice.
+
+        Args:
+            slice_index: Image slice.
+            roi: If given, only curves of this ROI.
+            bounds: If given, only curves whose bounding box overlaps this
+                (x_min, y_min, x_max, y_max) rectangle, e.g. a viewport.
+
+        Returns:
+            Array of positions into roi_indices, curve_indices and bounding_boxes.
+        """
+        start, stop = self._range(slice_index)
+        entries = np.arange(start, stop)
+        if roi is not None:
+            entries = entries[self.roi_indices[start:stop] == self._roi_position(roi)]
+        if bounds is not None and len(entries):
+            x_min, y_min, x_max, y_max = bounds
+            boxes = self.bounding_boxes[entries]
+            overlap = (
+                (boxes[:, 0] <= x_max)
+                & (boxes[:, 2] >= x_min)
+                & (boxes[:, 1] <= y_max)
+                & (boxes[:, 3] >= y_min)
+            )
+            entries = entries[overlap]
+        return entries
+
+    def curves_on_slice(
+        self,
+        slice_index: int,
+        roi: Optional["ROI"] = None,
+        bounds: Optional[Sequence[float]] = None,
+    ) -> List[Tuple["ROI", "Curve"]]:
+        """
+        (ROI, Curve) pairs of the curves on a slice.
+
+        Args:
+            slice_index: Image slice.
+            roi: If given, only curves of this ROI.
+            bounds: If given, only curves overlapping this (x_min, y_min, x_max, y_max)
+                rectangle.
+
+        Returns:
+            List of (ROI, Curve) in ROI order.
+        """
+        pairs = []
+        for entry in self.entries_on_slice(slice_index, roi, bounds):
+            owner = self.rois[self.roi_indices[entry]]
+            pairs.append((owner, owner.curve_list[self.curve_indices[entry]]))
+        return pairs
+
+    def points_on_slice(
+        self,
+        slice_index: int,
+        roi: Optional["ROI"] = None,
+        bounds: Optional[Sequence[float]] = None,
+    ) -> Dict["ROI", List[np.ndarray]]:
+        """
+        Points of the curves on a slice, grouped by ROI, as views into the ROI buffers.
+
+        Args:
+            slice_index: Image slice.
+            roi: If given, only curves of this ROI.
+            bounds: If given, only curves overlapping this (x_min, y_min, x_max, y_max)
+                rectangle.
+
+        Returns:
+            Mapping from ROI to the (N, 3) point arrays of its curves on the slice.
+        """
+        result: Dict["ROI", List[np.ndarray]] = {}
+        for entry in self.entries_on_slice(slice_index, roi, bounds):
+            owner = self.rois[self.roi_indices[entry]]
+            result.setdefault(owner, []).append(
+                owner.curve_points[int(self.curve_indices[entry])]
+            )
+        return result
+
+    def get_slice_mask(
+        self, roi: "ROI", slice_index: int, grid: Any = None
+    ) -> np.ndarray:
+        """
+        Rasterize the curves of an ROI on one slice.
+
+        Args:
+            roi: ROI to rasterize.
+            slice_index: Image slice.
+            grid: Grid of the slice (ImageSet or GridGeometry). Defaults to the image set
+                of the index.
+
+        Returns:
+            Boolean (y, x) mask of the slice.
+        """
+        from pinnacle_io.utils.frames import GridGeometry
+        from pinnacle_io.utils.roi_mask import fill_polygons
+
+        grid = GridGeometry.from_object(grid if grid is not None else self.image_set)
+        polygons = [
+            grid.to_index(points)[:, :2]
+            for points in self.points_on_slice(slice_index, roi).get(roi, [])
+        ]
+        return fill_polygons(polygons, grid.shape[1], grid.shape[2])
+
+    def _roi_position(self, roi: "ROI") -> int:
+        for position, candidate in enumerate(self.rois):
+            if candidate is roi:
+                return position
+        return -1
+
+    def __repr__(self) -> str:
+        return f"<CurveSliceIndex(rois={len(self.rois)}, curves={len(self)}, slices={self.number_of_slices})>"
@@ -0,0 +1,295 @@
+"""
+CT number to density conversion.
+
+A CT-to-density table maps CT numbers (the stored image values) to relative
+electron or mass density by piecewise-linear interpolation. Because CT volumes
+are stored as 16-bit integers, the table is expanded once into a 65,536-entry
+lookup table covering every possible stored value, and a whole volume is then
+converted with a single np.take. ROIs with density overrides are applied on top
+using their masks.
+
+CT-to-density tables are read from Pinnacle key-value files of the form:
+
+    Name = "Standard CT";
+    Version = "1";
+    DensityUnits = "g/cm^3";
+    Table ={
+      Points[] ={
+        0,0,
+        1000,1,
+        3000,2.5
+      };
+    };
+
+where Points holds (CT number, density) pairs.
+"""
+
+from pathlib import Path
+from threading import Lock
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from pinnacle_io.models.image_set import ImageSet
+    from pinnacle_io.models.roi import ROI
+
+PathLike = Union[str, Path]
+
+# Tables read from disk, keyed by (path, size, mtime)
+_table_cache: Dict[Tuple[str, int, int], "CTToDensityTable"] = {}
+_table_cache_lock = Lock()
+
+
+class CTToDensityTable:
+    """
+    Piecewise-linear CT number to density curve.
+
+    Attributes:
+        name: Name of the table (matches PatientRepresentation.ct_to_density_name).
+        ct_numbers: Increasing CT numbers of the curve points.
+        densities: Density at each CT number.
+        version: Table version.
+        density_units: Units of the densities, if known.
+    """
+
+    def __init__(
+        self,
+        name: Optional[str],
+        ct_numbers: Sequence[float],
+        densities: Sequence[float],
+        version: Optional[str] = None,
+        density_units: Optional[str] = None,
+    ) -> None:
+        self.name = name
+        self.ct_numbers = np.asarray(ct_numbers, dtype=np.float64)
+        self.densities = np.asarray(densities, dtype=np.float64)
+        self.version = version
+        self.density_units = density_units
+        if (
+            self.ct_numbers.ndim != 1
+            or self.ct_numbers.shape != self.densities.shape
+            or not len(self.ct_numbers)
+        ):
+            raise ValueError(
+                "CT-to-density table requires matching, non-empty CT number and density lists."
+            )
+        if np.any(np.diff(self.ct_numbers) <= 0):
+            raise ValueError(
+                f"CT numbers of table '{name}' must be strictly increasing."
+            )
+        self._lookup_tables: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_content_lines(cls, content_lines: Sequence[str]) -> "CTToDensityTable":
+        """
+        Parse a CT-to-density table from Pinnacle key-value content.
+
+        Args:
+            content_lines: Lines of the table file.
+
+        Returns:
+            CTToDensityTable with the (CT number, density) pairs of the first Points array.
+        """
+        from pinnacle_io.readers.pinnacle_file_reader import PinnacleFileReader
+
+        data = PinnacleFileReader.parse_key_value_content_lines(list(content_lines))
+        points = _find_points(data)
+        if points is None or len(points) % 2:
+            raise ValueError(
+                "CT-to-density table does not contain (CT number, density) point pairs."
+            )
+        pairs = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        return cls(
+            data.get("Name"),
+            pairs[:, 0],
+            pairs[:, 1],
+            version=data.get("Version"),
+            density_units=data.get("DensityUnits"),
+        )
+
+    @classmethod
+    def read(cls, path: PathLike) -> "CTToDensityTable":
+        """
+        Read a CT-to-density table file.
+
+        Tables are cached by path and modification time, so each file is parsed once.
+        """
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"CT-to-density table not found: {path}")
+        stat = path.stat()
+        key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+        with _table_cache_lock:
+            table = _table_cache.get(key)
+        if table is None:
+            with open(path, "r", encoding="latin1", errors="ignore") as f:
+                table = cls.from_content_lines(f.readlines())
+            with _table_cache_lock:
+                _table_cache[key] = table
+        return table
+
+    def lookup_table(self, dtype: Any = np.uint16) -> np.ndarray:
+        """
+        Float32 lookup table of the density of every 16-bit stored value.
+
+        The table is indexed by the raw 16 bits of a voxel (its value reinterpreted as a
+        native uint16), so it covers the full uint16 or int16 range and already accounts
+        for the byte order of the volume.
+
+        Args:
+            dtype: 16-bit integer dtype of the volume, including byte order.
+
+        Returns:
+            Array of 65,536 densities.
+        """
+        dtype = np.dtype(dtype)
+        if dtype.kind not in "iu" or dtype.itemsize != 2:
+            raise ValueError(
+                f"Lookup tables require a 16-bit integer dtype, got {dtype}"
+            )
+        lut = self._lookup_tables.get(dtype.str)
+        if lut is None:
+            codes = np.arange(65536, dtype=np.uint16)
+            ct_numbers = codes.view(dtype).astype(np.float64)
+            lut = np.interp(ct_numbers, self.ct_numbers, self.densities).astype(
+                np.float32
+            )
+            self._lookup_tables[dtype.str] = lut
+        return lut
+
+    def convert(self, image: Any, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Convert CT numbers to density.
+
+        Args:
+            image: Array of stored CT numbers. 16-bit integer arrays use the lookup table;
+                other dtypes are interpolated directly.
+            out: Optional float32 output array with the shape of image.
+
+        Returns:
+            Float32 density array.
+        """
+        image = np.asarray(image)
+        if image.dtype.kind in "iu" and image.dtype.itemsize == 2:
+            lut = self.lookup_table(image.dtype)
+            return np.take(lut, image.view(np.uint16), out=out)
+        densities = np.interp(image, self.ct_numbers, self.densities).astype(np.float32)
+        if out is None:
+            return densities
+        out[...] = densities
+        return out
+
+    def __repr__(self) -> str:
+        return f"<CTToDensityTable(name='{self.name}', points={len(self.ct_numbers)})>"
+
+
+def _find_points(data: Any) -> Optional[list]:
+    """Return the first Points array found in parsed key-value data."""
+    if isinstance(data, dict):
+        if isinstance(data.get("Points"), list):
+            return data["Points"]
+        values: Iterable[Any] = data.values()
+    elif isinstance(data, list):
+        values = data
+    else:
+        return None
+    for value in values:
+        points = _find_points(value)
+        if points is not None:
+            return points
+    return None
+
+
+def find_ct_to_density_table(directory: PathLike, name: str) -> CTToDensityTable:
+    """
+    Find the CT-to-density table with the given name in a directory.
+
+    A file named after the table is used if present; otherwise every file in the
+    directory is parsed until one has a matching Name.
+
+    Args:
+        directory: Directory holding the CT-to-density table files.
+        name: Table name, e.g. PatientRepresentation.ct_to_density_name.
+
+    Returns:
+        The matching CTToDensityTable.
+
+    Raises:
+        FileNotFoundError: If no table with the name exists.
+    """
+    directory = Path(directory)
+    candidate = directory / name
+    if candidate.is_file():
+        return CTToDensityTable.read(candidate)
+    for path in sorted(directory.iterdir()) if directory.is_dir() else []:
+        if not path.is_file():
+            continue
+        try:
+            table = CTToDensityTable.read(path)
+        except ValueError:
+            continue
+        if table.name == name:
+            return table
+    raise FileNotFoundError(f"CT-to-density table '{name}' not found in {directory}")
+
+
+def density_overrides(rois: Iterable["ROI"]) -> list:
+    """
+    ROIs with a density override, in the order they are applied.
+
+    ROIs are applied in increasing OverrideOrder, so the ROI with the highest order takes
+    precedence where ROIs overlap.
+    """
+    overrides = [roi for roi in rois if roi.override_data and roi.density is not None]
+    return sorted(overrides, key=lambda roi: roi.override_order or 0)
+
+
+def compute_density(
+    image_set: "ImageSet",
+    table: CTToDensityTable,
+    rois: Optional[Iterable["ROI"]] = None,
+    masks: Optional[Mapping["ROI", Any]] = None,
+) -> np.ndarray:
+    """
+    Convert the volume of an ImageSet to density and apply ROI density overrides.
+
+    Args:
+        image_set: ImageSet with pixel data.
+        table: CT-to-density table.
+        rois: ROIs to consider for density overrides (ROI.override_data and ROI.density).
+        masks: Boolean (z, y, x) mask on the image grid for each overriding ROI.
+
+    Returns:
+        Float32 (z, y, x) density array.
+    """
+    volume = image_set.volume
+    if volume is None:
+        raise ValueError(f"ImageSet '{image_set.image_name}' has no pixel data.")
+    density = table.convert(volume.array)
+
+    for roi in density_overrides(rois or ()):
+        mask = None if masks is None else masks.get(roi)
+        if mask is None:
+            raise ValueError(
+                f"A mask is required to override the density of ROI '{roi.name}'."
+            )
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != density.shape:
+            raise ValueError(
+                f"Mask shape {mask.shape} for ROI '{roi.name}' does not match image shape {density.shape}"
+            )
+        if roi.invert_density_loading:
+            mask = ~mask
+        density[mask] = np.float32(roi.density)
+    return density
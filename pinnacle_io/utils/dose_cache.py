@@ -0,0 +1,329 @@
+"""
+Compact on-disk storage for Dose pixel data.
+
+Doses are quantized to unsigned integers (uint16 or uint32) using a linear scale
+factor and offset, and each z-slab (axis 0 of the pixel data, matching the
+(z, y, x) layout produced by DoseReader) is compressed independently with zlib
+or lzma. A slab index stored in the file header allows a single slab to be read
+and decompressed without touching the rest of the file.
+
+File layout:
+    8 bytes    magic (b"PIODOSE" + format version)
+    4 bytes    little-endian uint32 length of the JSON header
+    N bytes    UTF-8 JSON header (shape, dtype, scale, offset, slab index, metadata)
+    ...        concatenated compressed slabs
+"""
+
+import json
+import lzma
+import struct
+import zlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from pinnacle_io.models.dose import Dose
+    from pinnacle_io.models.dose_grid import DoseGrid
+
+COMPACT_MAGIC = b"PIODOSE\x01"
+COMPACT_VERSION = 1
+
+# Quantized storage types, stored little-endian regardless of platform
+_QUANTIZED_DTYPES = {
+    "uint16": np.dtype("<u2"),
+    "uint32": np.dtype("<u4"),
+}
+
+_COMPRESSORS = {
+    "zlib": (lambda data, level: zlib.compress(data, level), zlib.decompress),
+    "lzma": (lambda data, level: lzma.compress(data, preset=level), lzma.decompress),
+}
+
+# Dose attributes carried through the compact file
+_METADATA_FIELDS = (
+    "dose_id",
+    "dose_type",
+    "dose_unit",
+    "dose_comment",
+    "dose_summation_type",
+    "referenced_plan_id",
+)
+
+PathLike = Union[str, Path]
+
+
+def _quantization_parameters(
+    pixel_data: np.ndarray, dtype: np.dtype
+) -> Tuple[float, float]:
+    """
+    Compute the (scale, offset) that map the pixel data range onto the integer range.
+
+    The minimum and maximum are gathered slab by slab so that memmapped inputs are
+    never converted to a single in-memory copy.
+
+    Args:
+        pixel_data: Dose array to quantize.
+        dtype: Target unsigned integer dtype.
+
+    Returns:
+        Tuple of (scale, offset) such that value = q * scale + offset.
+    """
+    vmin = np.inf
+    vmax = -np.inf
+    for k in range(pixel_data.shape[0]):
+        slab = np.asarray(pixel_data[k])
+        if slab.size:
+            vmin = min(vmin, float(slab.min()))
+            vmax = max(vmax, float(slab.max()))
+
+    if not np.isfinite(vmin) or not np.isfinite(vmax):
+        return 1.0, 0.0
+
+    # Keep zero exactly representable for non-negative doses
+    offset = min(vmin, 0.0)
+    qmax = float(np.iinfo(dtype).max)
+    span = vmax - offset
+    scale = span / qmax if span > 0 else 1.0
+    return scale, offset
+
+
+def _select_dtype(
+    pixel_data: np.ndarray,
+    dtype: str,
+    tolerance: Optional[float],
+    dose_grid_scaling: float,
+) -> Tuple[str, float, float]:
+    """
+    Choose the storage dtype and quantization parameters for the given tolerance.
+
+    Args:
+        pixel_data: Dose array to quantize.
+        dtype: "uint16", "uint32", or "auto".
+        tolerance: Maximum allowed absolute error in scaled dose units, or None.
+        dose_grid_scaling: Scaling applied to the pixel data to obtain dose.
+
+    Returns:
+        Tuple of (dtype name, scale, offset).
+
+    Raises:
+        ValueError: If the dtype is unknown or the tolerance cannot be met.
+    """
+    if dtype == "auto":
+        candidates = ["uint16", "uint32"]
+    elif dtype in _QUANTIZED_DTYPES:
+        candidates = [dtype]
+    else:
+        raise ValueError(
+            f"Unsupported compact dtype '{dtype}'. Expected one of: auto, "
+            f"{', '.join(_QUANTIZED_DTYPES)}"
+        )
+
+    error = np.inf
+    for name in candidates:
+        scale, offset = _quantization_parameters(pixel_data, _QUANTIZED_DTYPES[name])
+        # Rounding to the nearest integer bounds the error by half a step, and the
+        # float32 result adds up to half a float32 ulp of the largest value
+        max_value = max(
+            abs(offset),
+            abs(offset + scale * float(np.iinfo(_QUANTIZED_DTYPES[name]).max)),
+        )
+        error = (0.5 * scale + 0.5 * float(np.finfo(np.float32).eps) * max_value) * abs(
+            dose_grid_scaling
+        )
+        if tolerance is None or error <= tolerance:
+            return name, scale, offset
+
+    raise ValueError(
+        f"Cannot store dose within tolerance {tolerance} "
+        f"(best achievable error is {error:.6g})"
+    )
+
+
+def save_compact(
+    dose: "Dose",
+    path: PathLike,
+    dtype: str = "auto",
+    compression: str = "zlib",
+    level: int = 6,
+    tolerance: Optional[float] = None,
+) -> int:
+    """
+    Save the pixel data of a Dose in the compact quantized format.
+
+    Args:
+        dose: Dose with pixel data to save. Axis 0 of the pixel data is treated as z.
+        path: Destination file path.
+        dtype: Quantized storage type ("uint16", "uint32" or "auto"). With "auto",
+            uint16 is used unless it cannot meet the tolerance.
+        compression: Slab compression codec ("zlib" or "lzma").
+        level: Compression level (zlib level or lzma preset).
+        tolerance: Maximum allowed absolute round-trip error in dose units
+            (i.e. after applying dose_grid_scaling). None accepts any error.
+
+    Returns:
+        Number of bytes written.
+
+    Raises:
+        ValueError: If the dose has no pixel data, the codec is unknown, or the
+            tolerance cannot be met.
+    """
+    pixel_data = dose.pixel_data
+    if pixel_data is None:
+        raise ValueError("Dose has no pixel data to save.")
+    if compression not in _COMPRESSORS:
+        raise ValueError(
+            f"Unsupported compression '{compression}'. Expected one of: "
+            f"{', '.join(_COMPRESSORS)}"
+        )
+    if pixel_data.ndim != 3:
+        raise ValueError(f"Expected 3D pixel data, got shape {pixel_data.shape}")
+
+    dose_grid_scaling = (
+        float(dose.dose_grid_scaling) if dose.dose_grid_scaling is not None else 1.0
+    )
+    dtype_name, scale, offset = _select_dtype(
+        pixel_data, dtype, tolerance, dose_grid_scaling
+    )
+    storage_dtype = _QUANTIZED_DTYPES[dtype_name]
+    qmax = np.iinfo(storage_dtype).max
+    compress, _ = _COMPRESSORS[compression]
+
+    # Quantize and compress one slab at a time; only compressed bytes are retained
+    slabs = []
+    slab_index = []
+    position = 0
+    inv_scale = 1.0 / scale
+    for k in range(pixel_data.shape[0]):
+        slab = np.asarray(pixel_data[k], dtype=np.float64)
+        quantized = np.rint((slab - offset) * inv_scale)
+        np.clip(quantized, 0, qmax, out=quantized)
+        payload = compress(quantized.astype(storage_dtype).tobytes(), level)
+        slabs.append(payload)
+        slab_index.append([position, len(payload)])
+        position += len(payload)
+
+    header: Dict[str, Any] = {
+        "version": COMPACT_VERSION,
+        "shape": [int(n) for n in pixel_data.shape],
+        "dtype": dtype_name,
+        "scale": scale,
+        "offset": offset,
+        "compression": compression,
+        "dose_grid_scaling": dose_grid_scaling,
+        "slabs": slab_index,
+        "metadata": {field: getattr(dose, field, None) for field in _METADATA_FIELDS},
+    }
+    header["metadata"]["referenced_beam_numbers"] = dose.referenced_beam_numbers
+    header_bytes = json.dumps(header).encode("utf-8")
+
+    with open(path, "wb") as f:
+        f.write(COMPACT_MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        for payload in slabs:
+            f.write(payload)
+
+    return len(COMPACT_MAGIC) + 4 + len(header_bytes) + position
+
+
+def read_compact_header(path: PathLike) -> Dict[str, Any]:
+    """
+    Read the JSON header of a compact dose file.
+
+    The returned dictionary includes a "data_start" key with the byte offset of
+    the first slab.
+
+    Args:
+        path: Path to the compact dose file.
+
+    Returns:
+        Header dictionary.
+
+    Raises:
+        ValueError: If the file is not a compact dose file.
+    """
+    with open(path, "rb") as f:
+        return _read_header(f)
+
+
+def _read_header(f) -> Dict[str, Any]:
+    """Read and validate the header from an open compact dose file."""
+    magic = f.read(len(COMPACT_MAGIC))
+    if magic != COMPACT_MAGIC:
+        raise ValueError(f"Not a compact dose file (magic={magic!r})")
+    (header_length,) = struct.unpack("<I", f.read(4))
+    header = json.loads(f.read(header_length).decode("utf-8"))
+    header["data_start"] = len(COMPACT_MAGIC) + 4 + header_length
+    return header
+
+
+def _decode_slab(header: Dict[str, Any], payload: bytes) -> np.ndarray:
+    """Decompress and dequantize one slab into a float32 array."""
+    _, decompress = _COMPRESSORS[header["compression"]]
+    quantized = np.frombuffer(
+        decompress(payload), dtype=_QUANTIZED_DTYPES[header["dtype"]]
+    )
+    # Dequantize in float64 so that float32 rounding happens only once
+    slab = quantized * header["scale"] + header["offset"]
+    return slab.astype(np.float32).reshape(header["shape"][1:])
+
+
+def load_compact_slab(path: PathLike, index: int) -> np.ndarray:
+    """
+    Read and decompress a single z-slab from a compact dose file.
+
+    Args:
+        path: Path to the compact dose file.
+        index: Slab index along axis 0.
+
+    Returns:
+        2D float32 array of unscaled dose values for the slab.
+
+    Raises:
+        IndexError: If the slab index is out of range.
+    """
+    with open(path, "rb") as f:
+        header = _read_header(f)
+        slab_index = header["slabs"]
+        if not 0 <= index < len(slab_index):
+            raise IndexError(
+                f"Slab index {index} out of range for {len(slab_index)} slabs"
+            )
+        offset, length = slab_index[index]
+        f.seek(header["data_start"] + offset)
+        return _decode_slab(header, f.read(length))
+
+
+def load_compact(path: PathLike, dose_grid: Optional["DoseGrid"] = None) -> "Dose":
+    """
+    Load a compact dose file into a new Dose.
+
+    Args:
+        path: Path to the compact dose file.
+        dose_grid: Optional DoseGrid to associate with the loaded dose.
+
+    Returns:
+        Dose with float32 pixel data and the metadata saved with the file.
+    """
+    from pinnacle_io.models.dose import Dose
+
+    with open(path, "rb") as f:
+        header = _read_header(f)
+        pixel_data = np.empty(header["shape"], dtype=np.float32)
+        f.seek(header["data_start"])
+        for k, (_, length) in enumerate(header["slabs"]):
+            pixel_data[k] = _decode_slab(header, f.read(length))
+
+    metadata = dict(header.get("metadata") or {})
+    beam_numbers = metadata.pop("referenced_beam_numbers", None)
+    kwargs = {key: value for key, value in metadata.items() if value is not None}
+    if dose_grid is not None:
+        kwargs["dose_grid"] = dose_grid
+    return Dose(
+        dose_grid_scaling=header["dose_grid_scaling"],
+        referenced_beam_numbers=beam_numbers,
+        pixel_data=pixel_data,
+        **kwargs,
+    )
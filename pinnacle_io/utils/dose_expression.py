@@ -0,0 +1,412 @@
+"""
+Lazy, chunked arithmetic on Dose objects.
+
+Expressions such as ``sum(w * beam for ...) * fractions - other`` are built as a
+small expression graph instead of being evaluated immediately. The graph is then
+evaluated chunk by chunk along z (axis 0 of the (z, y, x) pixel data) into a
+single float32 output buffer or memmap, so peak memory depends on the chunk size
+rather than on the number of operands.
+
+Leaf values are in dose units, i.e. the pixel data multiplied by the Dose's
+dose_grid_scaling. Doses whose pixel data has not been loaded are read slab by
+slab from their binary source file, and cropped doses (see Dose.crop) are only
+added over their occupied bounding box.
+
+Example:
+    >>> expr = sum(w * beam.dose.lazy() for w, beam in zip(weights, beams))
+    >>> total = (expr * 30 - other_trial_dose).clip(0, None)
+    >>> pixel_data = total.evaluate(out="total.dat", chunk_size=16, workers=4)
+"""
+
+import numbers
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from pinnacle_io.models.dose import Dose
+    from pinnacle_io.utils.cropped_dose import CroppedVolume
+
+Operand = Union["DoseExpression", "Dose", float]
+
+
+class DoseExpression(ABC):
+    """
+    Base class for nodes in a lazy dose expression graph.
+
+    Subclasses implement ``shape`` and ``_evaluate(z0, z1)``, which must return a newly
+    allocated float32 array of shape (z1 - z0, y, x) that the caller may modify in place.
+    """
+
+    # Make numpy scalars defer to the reflected operators (e.g. np.float64(2) * expr)
+    __array_ufunc__ = None
+
+    @property
+    @abstractmethod
+    def shape(self) -> Tuple[int, int, int]:
+        """Shape (z, y, x) of the evaluated expression. Must be implemented by subclasses."""
+        pass
+
+    @property
+    def ndim(self) -> int:
+        return 3
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(np.float32)
+
+    @abstractmethod
+    def _evaluate(self, z0: int, z1: int) -> np.ndarray:
+        """Evaluate slabs z0:z1 into a new float32 array. Must be implemented by subclasses."""
+        pass
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        """Evaluate a single z-slab, allowing expressions to be streamed (e.g. by DoseWriter)."""
+        z_dim = self.shape[0]
+        if index < 0:
+            index += z_dim
+        if not 0 <= index < z_dim:
+            raise IndexError(f"Slice index {index} out of range for {z_dim} slices")
+        return self._evaluate(index, index + 1)[0]
+
+    def __add__(self, other: Operand) -> "DoseExpression":
+        return _LinearCombination.combine(self, 1.0, other, 1.0)
+
+    def __radd__(self, other: Operand) -> "DoseExpression":
+        # Supports sum(...), which starts from the integer 0
+        return _LinearCombination.combine(self, 1.0, other, 1.0)
+
+    def __sub__(self, other: Operand) -> "DoseExpression":
+        return _LinearCombination.combine(self, 1.0, other, -1.0)
+
+    def __rsub__(self, other: Operand) -> "DoseExpression":
+        return _LinearCombination.combine(self, -1.0, other, 1.0)
+
+    def __mul__(self, factor: float) -> "DoseExpression":
+        if not isinstance(factor, numbers.Real):
+            return NotImplemented
+        return _LinearCombination.from_expression(self).scaled(float(factor))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, divisor: float) -> "DoseExpression":
+        if not isinstance(divisor, numbers.Real):
+            return NotImplemented
+        return self * (1.0 / float(divisor))
+
+    def __neg__(self) -> "DoseExpression":
+        return self * -1.0
+
+    def maximum(self, other: Operand) -> "DoseExpression":
+        """Voxel-wise maximum of this expression and another dose or constant."""
+        return _Maximum(self, other)
+
+    def clip(
+        self, lower: Optional[float] = None, upper: Optional[float] = None
+    ) -> "DoseExpression":
+        """Clip the dose values to the range [lower, upper]. Either bound may be None."""
+        if lower is None and upper is None:
+            raise ValueError("At least one of lower or upper must be given.")
+        return _Clip(self, lower, upper)
+
+    def evaluate(
+        self,
+        out: Union[np.ndarray, str, Path, None] = None,
+        chunk_size: int = 16,
+        workers: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Evaluate the expression chunk by chunk along z.
+
+        Args:
+            out: Output buffer with the expression's shape, a file path for a new float32
+                memmap, or None to allocate an in-memory float32 array.
+            chunk_size: Number of z-slabs evaluated at a time.
+            workers: Number of threads used to evaluate chunks concurrently. None or 1
+                evaluates chunks sequentially.
+
+        Returns:
+            The output array (or memmap) containing the evaluated dose.
+        """
+        shape = self.shape
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+        if out is None:
+            out = np.empty(shape, dtype=np.float32)
+        elif isinstance(out, (str, Path)):
+            out = np.memmap(out, dtype=np.float32, mode="w+", shape=shape)
+        elif tuple(out.shape) != shape:
+            raise ValueError(
+                f"Output shape {tuple(out.shape)} does not match expression shape {shape}"
+            )
+
+        chunks = [
+            (z0, min(z0 + chunk_size, shape[0]))
+            for z0 in range(0, shape[0], chunk_size)
+        ]
+
+        def evaluate_chunk(bounds: Tuple[int, int]) -> None:
+            z0, z1 = bounds
+            out[z0:z1] = self._evaluate(z0, z1)
+
+        if workers is None or workers <= 1 or len(chunks) <= 1:
+            for bounds in chunks:
+                evaluate_chunk(bounds)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # list() propagates exceptions raised in worker threads
+                list(executor.map(evaluate_chunk, chunks))
+
+        if isinstance(out, np.memmap):
+            out.flush()
+        return out
+
+    def to_dose(
+        self,
+        out: Union[np.ndarray, str, Path, None] = None,
+        chunk_size: int = 16,
+        workers: Optional[int] = None,
+        **kwargs: Any,
+    ) -> "Dose":
+        """
+        Evaluate the expression into a new Dose.
+
+        The new Dose has a dose_grid_scaling of 1.0 because the evaluated values are
+        already in dose units.
+
+        Args:
+            out: See evaluate().
+            chunk_size: See evaluate().
+            workers: See evaluate().
+            **kwargs: Additional attributes for the new Dose (e.g. dose_type, dose_grid).
+
+        Returns:
+            Dose containing the evaluated pixel data.
+        """
+        from pinnacle_io.models.dose import Dose
+
+        pixel_data = self.evaluate(out=out, chunk_size=chunk_size, workers=workers)
+        kwargs.setdefault("dose_grid_scaling", 1.0)
+        return Dose(pixel_data=pixel_data, **kwargs)
+
+
+class DoseTerm(DoseExpression):
+    """Leaf node wrapping a Dose. Values are scaled by the Dose's dose_grid_scaling."""
+
+    def __init__(self, dose: "Dose") -> None:
+        self.dose = dose
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        if self.dose.pixel_data is not None:
+            return tuple(int(n) for n in self.dose.pixel_data.shape)
+        if self.dose.source_path is not None and self.dose.dose_grid is not None:
+            grid = self.dose.dose_grid
+            return (int(grid.dimension_z), int(grid.dimension_y), int(grid.dimension_x))
+        raise ValueError(
+            f"Dose '{self.dose.dose_id}' has no pixel data or source file to evaluate."
+        )
+
+    @property
+    def scaling(self) -> float:
+        scaling = self.dose.dose_grid_scaling
+        return 1.0 if scaling is None else float(scaling)
+
+    def cropped_volume(self) -> Optional["CroppedVolume"]:
+        """Return the dose's pixel data if it is stored as a CroppedVolume."""
+        from pinnacle_io.utils.cropped_dose import CroppedVolume
+
+        pixel_data = self.dose.pixel_data
+        return pixel_data if isinstance(pixel_data, CroppedVolume) else None
+
+    def _evaluate(self, z0: int, z1: int) -> np.ndarray:
+        if self.dose.pixel_data is not None:
+            chunk = np.array(self.dose.pixel_data[z0:z1], dtype=np.float32)
+        else:
+            from pinnacle_io.readers.dose_reader import DoseReader
+
+            chunk = DoseReader.read_slices(
+                self.dose.source_path, self.dose.dose_grid, range(z0, z1)
+            ).astype(np.float32)
+        if self.scaling != 1.0:
+            chunk *= np.float32(self.scaling)
+        return chunk
+
+    def __repr__(self) -> str:
+        return f"DoseTerm(dose_id={self.dose.dose_id!r})"
+
+
+class _Constant(DoseExpression):
+    """A constant dose broadcast to a given shape."""
+
+    def __init__(self, value: float, shape: Tuple[int, int, int]) -> None:
+        self.value = float(value)
+        self._shape = shape
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self._shape
+
+    def _evaluate(self, z0: int, z1: int) -> np.ndarray:
+        return np.full((z1 - z0,) + self._shape[1:], self.value, dtype=np.float32)
+
+
+class _LinearCombination(DoseExpression):
+    """sum(coefficient * term) + constant, accumulated in place into a single chunk buffer."""
+
+    def __init__(
+        self, terms: List[Tuple[float, DoseExpression]], constant: float = 0.0
+    ) -> None:
+        shapes = {term.shape for _, term in terms}
+        if len(shapes) > 1:
+            raise ValueError(
+                f"Cannot combine doses with different shapes: {sorted(shapes)}"
+            )
+        self.terms = terms
+        self.constant = constant
+
+    @classmethod
+    def from_expression(cls, expression: DoseExpression) -> "_LinearCombination":
+        if isinstance(expression, cls):
+            return expression
+        return cls([(1.0, expression)])
+
+    @classmethod
+    def combine(
+        cls,
+        left: DoseExpression,
+        left_factor: float,
+        right: Operand,
+        right_factor: float,
+    ) -> "_LinearCombination":
+        combined = cls.from_expression(left).scaled(left_factor)
+        if isinstance(right, numbers.Real):
+            return cls(combined.terms, combined.constant + right_factor * float(right))
+        right = cls.from_expression(as_expression(right)).scaled(right_factor)
+        return cls(combined.terms + right.terms, combined.constant + right.constant)
+
+    def scaled(self, factor: float) -> "_LinearCombination":
+        if factor == 1.0:
+            return self
+        return _LinearCombination(
+            [(factor * coefficient, term) for coefficient, term in self.terms],
+            factor * self.constant,
+        )
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self.terms[0][1].shape
+
+    def _evaluate(self, z0: int, z1: int) -> np.ndarray:
+        dense_terms = []
+        cropped_terms = []
+        for coefficient, term in self.terms:
+            cropped = term.cropped_volume() if isinstance(term, DoseTerm) else None
+            if cropped is None:
+                dense_terms.append((coefficient, term))
+            else:
+                cropped_terms.append((coefficient * term.scaling, cropped))
+
+        result = self._evaluate_dense(dense_terms, z0, z1)
+        if result is None:
+            result = np.zeros((z1 - z0,) + self.shape[1:], dtype=np.float32)
+        # Cropped doses only touch their occupied bounding box
+        for factor, cropped in cropped_terms:
+            cropped.add_to(result, z0, factor)
+        if self.constant:
+            result += np.float32(self.constant)
+        return result
+
+    @staticmethod
+    def _evaluate_dense(
+        terms: List[Tuple[float, DoseExpression]], z0: int, z1: int
+    ) -> Optional[np.ndarray]:
+        result = None
+        for coefficient, term in terms:
+            chunk = term._evaluate(z0, z1)
+            if result is None:
+                result = chunk
+                if coefficient != 1.0:
+                    result *= np.float32(coefficient)
+            elif coefficient == 1.0:
+                result += chunk
+            elif coefficient == -1.0:
+                result -= chunk
+            else:
+                chunk *= np.float32(coefficient)
+                result += chunk
+        return result
+
+
+class _Maximum(DoseExpression):
+    """Voxel-wise maximum of two operands."""
+
+    def __init__(self, left: DoseExpression, right: Operand) -> None:
+        self.left = left
+        if isinstance(right, numbers.Real):
+            right = _Constant(right, left.shape)
+        self.right = as_expression(right)
+        if self.left.shape != self.right.shape:
+            raise ValueError(
+                f"Cannot combine doses with different shapes: {self.left.shape}, {self.right.shape}"
+            )
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self.left.shape
+
+    def _evaluate(self, z0: int, z1: int) -> np.ndarray:
+        result = self.left._evaluate(z0, z1)
+        return np.maximum(result, self.right._evaluate(z0, z1), out=result)
+
+
+class _Clip(DoseExpression):
+    """Clip an operand to [lower, upper]."""
+
+    def __init__(
+        self, operand: DoseExpression, lower: Optional[float], upper: Optional[float]
+    ) -> None:
+        self.operand = operand
+        self.lower = lower
+        self.upper = upper
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self.operand.shape
+
+    def _evaluate(self, z0: int, z1: int) -> np.ndarray:
+        result = self.operand._evaluate(z0, z1)
+        return np.clip(result, self.lower, self.upper, out=result)
+
+
+def as_expression(value: Union[DoseExpression, "Dose"]) -> DoseExpression:
+    """
+    Wrap a Dose in a lazy expression. Expressions are returned unchanged.
+
+    Raises:
+        TypeError: If the value is neither a Dose nor a DoseExpression.
+    """
+    from pinnacle_io.models.dose import Dose
+
+    if isinstance(value, DoseExpression):
+        return value
+    if isinstance(value, Dose):
+        return DoseTerm(value)
+    raise TypeError(f"Cannot use {type(value).__name__} in a dose expression")
+
+
+def maximum(left: Union[DoseExpression, "Dose"], right: Operand) -> DoseExpression:
+    """Voxel-wise maximum of two doses (or a dose and a constant)."""
+    return as_expression(left).maximum(right)
+
+
+def clip(
+    value: Union[DoseExpression, "Dose"],
+    lower: Optional[float] = None,
+    upper: Optional[float] = None,
+) -> DoseExpression:
+    """Clip a dose to the range [lower, upper]."""
+    return as_expression(value).clip(lower, upper)
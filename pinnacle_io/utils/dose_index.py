@@ -0,0 +1,177 @@
+"""
+Sorted-dose index for fast dose-volume queries.
+
+Clinical goals are evaluated with many Vx ("volume receiving at least X") and
+Dx ("minimum dose to the hottest Y") queries per structure. A SortedDoseIndex
+sorts the dose values of a structure's voxels once, hottest first, together with
+the cumulative volume of those voxels, so each query is a binary search
+(np.searchsorted) instead of a scan over the dose grid.
+"""
+
+from typing import Any, Optional, Union
+
+import numpy as np
+
+ArrayOrFloat = Union[float, np.ndarray]
+
+
+class SortedDoseIndex:
+    """
+    Voxel doses of a structure sorted in descending order with cumulative volumes.
+
+    Attributes:
+        doses: Voxel doses (float32) sorted from hottest to coldest.
+        cumulative_volume: cumulative_volume[i] is the volume of voxels doses[0..i].
+        total_volume: Volume of the structure.
+    """
+
+    def __init__(
+        self, values: Any, voxel_volume: float = 1.0, weights: Optional[Any] = None
+    ) -> None:
+        """
+        Build the index from the dose values of the voxels in a structure.
+
+        Args:
+            values: Dose of each voxel in the structure (in dose units).
+            voxel_volume: Volume of a single voxel (e.g. cm^3).
+            weights: Optional fraction of each voxel inside the structure (0 to 1), used
+                for partial-volume masks. Defaults to whole voxels.
+        """
+        values = np.asarray(values, dtype=np.float32).ravel()
+        order = np.argsort(values, kind="stable")[::-1]
+        self.doses = values[order]
+        if weights is None:
+            volumes = np.full(len(values), voxel_volume, dtype=np.float64)
+        else:
+            volumes = (
+                np.asarray(weights, dtype=np.float64).ravel()[order] * voxel_volume
+            )
+        self.cumulative_volume = np.cumsum(volumes)
+        self.total_volume = float(self.cumulative_volume[-1]) if len(values) else 0.0
+        # Ascending negated doses for searchsorted on the descending dose list
+        self._negated_doses = -self.doses
+        # _volume_above[n] is the volume of the n hottest voxels
+        self._volume_above = np.concatenate(([0.0], self.cumulative_volume))
+
+    @classmethod
+    def from_mask(
+        cls, pixel_data: Any, mask: Any, scaling: float = 1.0, voxel_volume: float = 1.0
+    ) -> "SortedDoseIndex":
+        """
+        Build the index for the voxels selected by a mask.
+
+        Args:
+            pixel_data: (z, y, x) dose volume, a numpy array or CroppedVolume.
+            mask: Boolean mask, float mask of voxel fractions or FractionalMask, with the
+                same shape.
+            scaling: Factor applied to the pixel data to obtain dose (dose_grid_scaling).
+            voxel_volume: Volume of a single voxel.
+
+        Returns:
+            SortedDoseIndex for the masked voxels.
+        """
+        from pinnacle_io.utils.cropped_dose import CroppedVolume
+        from pinnacle_io.utils.roi_mask import FractionalMask
+
+        if isinstance(mask, FractionalMask):
+            values, weights = mask.values_and_weights(pixel_data)
+            values = values.astype(np.float32)
+            if scaling != 1.0:
+                values *= np.float32(scaling)
+            return cls(values, voxel_volume=voxel_volume, weights=weights)
+
+        mask = np.asarray(mask)
+        if tuple(mask.shape) != tuple(pixel_data.shape):
+            raise ValueError(
+                f"Mask shape {tuple(mask.shape)} does not match dose shape {tuple(pixel_data.shape)}"
+            )
+
+        weights = None
+        if mask.dtype == bool:
+            selected = mask
+        else:
+            selected = mask > 0
+            weights = mask[selected]
+
+        if isinstance(pixel_data, CroppedVolume) and weights is None:
+            values = pixel_data.masked_values(selected)
+        else:
+            values = np.asarray(pixel_data)[selected]
+        values = values.astype(np.float32)
+        if scaling != 1.0:
+            values *= np.float32(scaling)
+        return cls(values, voxel_volume=voxel_volume, weights=weights)
+
+    def __len__(self) -> int:
+        return len(self.doses)
+
+    @property
+    def max_dose(self) -> Optional[float]:
+        return float(self.doses[0]) if len(self.doses) else None
+
+    @property
+    def min_dose(self) -> Optional[float]:
+        return float(self.doses[-1]) if len(self.doses) else None
+
+    @property
+    def mean_dose(self) -> Optional[float]:
+        if not self.total_volume:
+            return None
+        volumes = np.diff(self.cumulative_volume, prepend=0.0)
+        return float(np.dot(self.doses, volumes) / self.total_volume)
+
+    def volume_receiving(
+        self, dose: ArrayOrFloat, relative: bool = False
+    ) -> ArrayOrFloat:
+        """
+        Vx: volume of the structure receiving at least the given dose.
+
+        Args:
+            dose: Dose threshold(s).
+            relative: If True, return the fraction of the structure volume (0 to 1).
+
+        Returns:
+            Volume (or fraction) for each dose threshold.
+        """
+        # Number of voxels with a dose of at least the threshold
+        count = np.searchsorted(
+            self._negated_doses, -np.asarray(dose, dtype=np.float32), side="right"
+        )
+        volume = self._volume_above[count]
+        if relative:
+            volume = (
+                volume / self.total_volume
+                if self.total_volume
+                else np.zeros(np.shape(volume))
+            )
+        return volume if np.ndim(volume) else float(volume)
+
+    def dose_to_volume(
+        self, volume: ArrayOrFloat, relative: bool = False
+    ) -> ArrayOrFloat:
+        """
+        Dx: minimum dose received by the hottest given volume of the structure.
+
+        Args:
+            volume: Volume(s) of the hottest region (or fractions 0 to 1 if relative).
+            relative: If True, volume is a fraction of the structure volume.
+
+        Returns:
+            Dose for each volume. Volumes larger than the structure return the minimum dose.
+        """
+        if not len(self.doses):
+            raise ValueError(
+                "Cannot evaluate a dose-volume query on an empty structure."
+            )
+        volume = np.asarray(volume, dtype=np.float64)
+        if relative:
+            volume = volume * self.total_volume
+        # Tolerate round-off in the cumulative sum when asking for the full volume
+        index = np.searchsorted(
+            self.cumulative_volume, volume * (1 - 1e-12), side="left"
+        )
+        dose = self.doses[np.minimum(index, len(self.doses) - 1)].astype(np.float64)
+        return dose if np.ndim(dose) else float(dose)
+
+    def __repr__(self) -> str:
+        return f"<SortedDoseIndex(voxels={len(self)}, total_volume={self.total_volume:.4g})>"
@@ -0,0 +1,448 @@
+"""
+Coordinate frames of grids, patient and DICOM space.
+
+Every frame is related to the Pinnacle patient frame (cm) by a 4x4 homogeneous
+affine. A grid frame maps continuous (x, y, z) voxel indices to patient
+coordinates, and the DICOM frame uses the matrices of the PatientSetup. A
+FrameRegistry holds the affine of each frame and composes (and caches) the affine
+between any two frames, so converting points between e.g. dose grid indices and
+image voxel indices is one matrix product on an (N, 3) array.
+
+Voxel-centre coordinate vectors are cached per grid geometry, and resampling
+between axis-aligned grids is separable: the target voxel centres along each axis
+are mapped into source indices once, and the volume is linearly interpolated
+along z, y and x in turn.
+
+Grid convention: voxel (i, j, k) of a grid with origin (x0, y0, z0) and spacing
+(dx, dy, dz) is centred at (x0 + i * dx, y0 + j * dy, z0 + k * dz), and volumes are
+(z, y, x) arrays.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+PATIENT = "patient"
+DICOM = "dicom"
+IMAGE = "image"
+DOSE = "dose"
+
+
+def apply_affine(
+    matrix: np.ndarray, points: np.ndarray, out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Apply a 4x4 affine transformation to (N, 3) points with a single matrix product.
+
+    Args:
+        matrix: 4x4 homogeneous transformation matrix.
+        points: (N, 3) points.
+        out: Optional (N, 3) output array, which may be points itself for an in-place
+            transform.
+
+    Returns:
+        Transformed (N, 3) points (float64 unless out is given).
+    """
+    points = np.asarray(points)
+    result = points @ matrix[:3, :3].T
+    result += matrix[:3, 3]
+    if out is None:
+        return result
+    out[...] = result
+    return out
+
+
+class GridGeometry:
+    """
+    Geometry of a regular (z, y, x) voxel grid.
+
+    Attributes:
+        origin: (x, y, z) coordinate of the centre of voxel (0, 0, 0).
+        spacing: (x, y, z) voxel size.
+        shape: Grid shape as (z, y, x).
+    """
+
+    def __init__(
+        self, origin: Sequence[float], spacing: Sequence[float], shape: Sequence[int]
+    ) -> None:
+        self.origin = tuple(float(v) for v in origin)
+        self.spacing = tuple(float(v) for v in spacing)
+        self.shape = tuple(int(n) for n in shape)
+        if len(self.origin) != 3 or len(self.spacing) != 3 or len(self.shape) != 3:
+            raise ValueError("GridGeometry requires a 3D origin, spacing and shape.")
+        if any(v == 0 for v in self.spacing):
+            raise ValueError(f"Grid spacing must be non-zero, got {self.spacing}")
+
+    @classmethod
+    def from_image_set(cls, image_set: Any) -> "GridGeometry":
+        """Geometry of an ImageSet (XStart/YStart/ZStart, pixel sizes and dimensions)."""
+        return cls(
+            (
+                image_set.x_start or 0.0,
+                image_set.y_start or 0.0,
+                image_set.z_start or 0.0,
+            ),
+            (image_set.x_pixdim, image_set.y_pixdim, image_set.z_pixdim),
+            (image_set.z_dim, image_set.y_dim, image_set.x_dim),
+        )
+
+    @classmethod
+    def from_dose_grid(cls, dose_grid: Any) -> "GridGeometry":
+        """Geometry of a DoseGrid (origin, voxel size and dimension)."""
+        return cls(
+            (dose_grid.origin_x, dose_grid.origin_y, dose_grid.origin_z),
+            (dose_grid.voxel_size_x, dose_grid.voxel_size_y, dose_grid.voxel_size_z),
+            (dose_grid.dimension_z, dose_grid.dimension_y, dose_grid.dimension_x),
+        )
+
+    @classmethod
+    def from_object(cls, grid: Any) -> "GridGeometry":
+        """
+        Geometry of a GridGeometry, ImageSet, DoseGrid or Dose.
+
+        Raises:
+            TypeError: If the geometry of the object cannot be determined.
+        """
+        if isinstance(grid, GridGeometry):
+            return grid
+        if hasattr(grid, "voxel_size_x"):
+            return cls.from_dose_grid(grid)
+        if getattr(grid, "dose_grid", None) is not None:
+            return cls.from_dose_grid(grid.dose_grid)
+        if hasattr(grid, "x_pixdim") and hasattr(grid, "x_start"):
+            return cls.from_image_set(grid)
+        raise TypeError(f"Cannot determine the grid geometry of {type(grid).__name__}")
+
+    @property
+    def key(self) -> Tuple[Tuple[float, ...], Tuple[float, ...], Tuple[int, ...]]:
+        """Hashable description of the grid, used as a cache key."""
+        return (self.origin, self.spacing, self.shape)
+
+    @property
+    def affine(self) -> np.ndarray:
+        """Read-only 4x4 affine from continuous (x, y, z) voxel indices to patient coordinates."""
+        return _grid_affines(self.key)[0]
+
+    @property
+    def inverse_affine(self) -> np.ndarray:
+        """Read-only 4x4 affine from patient coordinates to continuous (x, y, z) voxel indices."""
+        return _grid_affines(self.key)[1]
+
+    def to_index(self, points: np.ndarray) -> np.ndarray:
+        """Convert (N, 3) (x, y, z) coordinates to continuous (x, y, z) voxel indices."""
+        return apply_affine(
+            self.inverse_affine, np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        )
+
+    def to_patient(self, indices: np.ndarray) -> np.ndarray:
+        """Convert (N, 3) continuous (x, y, z) voxel indices to patient coordinates."""
+        return apply_affine(
+            self.affine, np.asarray(indices, dtype=np.float64).reshape(-1, 3)
+        )
+
+    def voxel_centers(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Cached read-only x, y and z coordinates of the voxel centres along each axis.
+        """
+        return _voxel_centers(self.key)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, GridGeometry) and self.key == other.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __repr__(self) -> str:
+        return f"<GridGeometry(origin={self.origin}, spacing={self.spacing}, shape={self.shape})>"
+
+
+@lru_cache(maxsize=256)
+def _grid_affines(
+    key: Tuple[Tuple[float, ...], Tuple[float, ...], Tuple[int, ...]],
+) -> Tuple[np.ndarray, np.ndarray]:
+    origin, spacing, _ = key
+    affine = np.eye(4)
+    affine[[0, 1, 2], [0, 1, 2]] = spacing
+    affine[:3, 3] = origin
+    inverse = np.eye(4)
+    inverse[[0, 1, 2], [0, 1, 2]] = 1.0 / np.array(spacing)
+    inverse[:3, 3] = -np.array(origin) / np.array(spacing)
+    affine.flags.writeable = False
+    inverse.flags.writeable = False
+    return affine, inverse
+
+
+@lru_cache(maxsize=64)
+def _voxel_centers(
+    key: Tuple[Tuple[float, ...], Tuple[float, ...], Tuple[int, ...]],
+) -> Tuple[np.ndarray, ...]:
+    origin, spacing, shape = key
+    centers = []
+    # shape is (z, y, x), origin and spacing are (x, y, z)
+    for axis, size in enumerate(shape[::-1]):
+        vector = origin[axis] + spacing[axis] * np.arange(size, dtype=np.float64)
+        vector.flags.writeable = False
+        centers.append(vector)
+    return tuple(centers)
+
+
+class FrameRegistry:
+    """
+    Named coordinate frames and the affines between them.
+
+    Each frame is stored with its affine to the reference (Pinnacle patient) frame.
+    Affines between two frames are composed on first use and cached until a frame is
+    added or replaced.
+
+    Attributes:
+        grids: GridGeometry of each grid frame.
+    """
+
+    def __init__(self) -> None:
+        self._to_reference: Dict[str, np.ndarray] = {PATIENT: np.eye(4)}
+        self._affines: Dict[Tuple[str, str], np.ndarray] = {}
+        self.grids: Dict[str, GridGeometry] = {}
+
+    @classmethod
+    def from_objects(
+        cls, image_set: Any = None, dose_grid: Any = None, patient_setup: Any = None
+    ) -> "FrameRegistry":
+        """
+        Registry with the usual frames of a plan.
+
+        Args:
+            image_set: Registered as the "image" grid frame.
+            dose_grid: DoseGrid (or Dose) registered as the "dose" grid frame.
+            patient_setup: PatientSetup whose matrices define the "dicom" frame.
+
+        Returns:
+            FrameRegistry with the given frames and the "patient" frame.
+        """
+        registry = cls()
+        if image_set is not None:
+            registry.add_grid(IMAGE, image_set)
+        if dose_grid is not None:
+            registry.add_grid(DOSE, dose_grid)
+        if patient_setup is not None:
+            registry.add_frame(DICOM, patient_setup.dicom_to_pinnacle_matrix_array)
+        return registry
+
+    @property
+    def frames(self) -> Tuple[str, ...]:
+        return tuple(self._to_reference)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._to_reference
+
+    def add_frame(self, name: str, to_patient: Any) -> None:
+        """
+        Register a frame by its 4x4 affine to patient coordinates.
+
+        Raises:
+            ValueError: If the matrix is not 4x4 or is singular.
+        """
+        matrix = np.array(to_patient, dtype=np.float64)
+        if matrix.shape != (4, 4):
+            raise ValueError(
+                f"Frame '{name}' requires a 4x4 affine, got shape {matrix.shape}"
+            )
+        if abs(np.linalg.det(matrix[:3, :3])) < 1e-12:
+            raise ValueError(f"Affine of frame '{name}' is singular")
+        matrix.flags.writeable = False
+        self._to_reference[name] = matrix
+        self.grids.pop(name, None)
+        self._affines.clear()
+
+    def add_grid(self, name: str, grid: Any) -> GridGeometry:
+        """
+        Register the continuous voxel-index frame of a grid.
+
+        Args:
+            name: Frame name.
+            grid: GridGeometry, ImageSet, DoseGrid or Dose.
+
+        Returns:
+            GridGeometry of the grid.
+        """
+        geometry = GridGeometry.from_object(grid)
+        self.add_frame(name, geometry.affine)
+        self.grids[name] = geometry
+        return geometry
+
+    def affine(self, src: str, dst: str) -> np.ndarray:
+        """
+        Read-only 4x4 affine mapping coordinates of frame src to frame dst.
+
+        Raises:
+            KeyError: If either frame is not registered.
+        """
+        key = (src, dst)
+        matrix = self._affines.get(key)
+        if matrix is None:
+            for name in key:
+                if name not in self._to_reference:
+                    raise KeyError(f"Unknown coordinate frame '{name}'")
+            matrix = np.linalg.inv(self._to_reference[dst]) @ self._to_reference[src]
+            matrix.flags.writeable = False
+            self._affines[key] = matrix
+        return matrix
+
+    def transform(
+        self, points: Any, src: str, dst: str, out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Transform (N, 3) points from frame src to frame dst.
+
+        Args:
+            points: (N, 3) points in frame src.
+            src: Source frame.
+            dst: Destination frame.
+            out: Optional (N, 3) output array.
+
+        Returns:
+            (N, 3) points in frame dst.
+        """
+        points = (
+            np.asarray(points, dtype=np.float64).reshape(-1, 3)
+            if out is None
+            else points
+        )
+        return apply_affine(self.affine(src, dst), points, out)
+
+    def voxel_centers(self, name: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Cached patient x, y and z coordinates of the voxel centres of a grid frame."""
+        if name not in self.grids:
+            raise KeyError(f"Coordinate frame '{name}' is not a grid")
+        return self.grids[name].voxel_centers()
+
+    def __repr__(self) -> str:
+        return f"<FrameRegistry(frames={list(self.frames)})>"
+
+
+def _trilinear(data: Any, indices: np.ndarray, fill_value: float) -> np.ndarray:
+    """Trilinear interpolation of a (z, y, x) array at continuous (x, y, z) indices."""
+    shape = np.array(data.shape)
+    zyx = indices[:, ::-1]
+    result = np.full(len(zyx), fill_value, dtype=np.float64)
+    inside = np.all((zyx >= 0) & (zyx <= shape - 1), axis=1)
+    if not inside.any():
+        return result
+    points = zyx[inside]
+    # Clamping the lower corner keeps the upper corner inside for points on the last voxel
+    base = np.minimum(np.floor(points).astype(np.int64), np.maximum(shape - 2, 0))
+    frac = points - base
+    values = np.zeros(len(points), dtype=np.float64)
+    for corner in range(8):
+        step = np.array([(corner >> 2) & 1, (corner >> 1) & 1, corner & 1])
+        weight = np.prod(np.where(step, frac, 1.0 - frac), axis=1)
+        idx = np.minimum(base + step, shape - 1)
+        values += weight * data[idx[:, 0], idx[:, 1], idx[:, 2]]
+    result[inside] = values
+    return result
+
+
+def interpolate(
+    data: Any, points: Any, grid: Any, fill_value: float = 0.0
+) -> np.ndarray:
+    """
+    Trilinearly interpolate a volume at patient coordinates.
+
+    Args:
+        data: (z, y, x) array or CroppedVolume on the grid.
+        points: (N, 3) patient coordinates.
+        grid: Grid of the volume (GridGeometry, ImageSet, DoseGrid or Dose).
+        fill_value: Value of points outside the volume. A CroppedVolume uses its own
+            fill_value.
+
+    Returns:
+        Array of N interpolated values.
+    """
+    from pinnacle_io.utils.cropped_dose import CroppedVolume
+
+    geometry = GridGeometry.from_object(grid)
+    indices = geometry.to_index(points)
+    if isinstance(data, CroppedVolume):
+        return data.interpolate(indices)
+    data = np.asarray(data)
+    if data.shape != geometry.shape:
+        raise ValueError(
+            f"Volume shape {data.shape} does not match grid shape {geometry.shape}"
+        )
+    return _trilinear(data, indices, fill_value)
+
+
+def _axis_weights(
+    target: np.ndarray, size: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Lower neighbour, upper weight and validity of continuous indices along one axis."""
+    valid = (target >= -1e-9) & (target <= size - 1 + 1e-9)
+    clipped = np.clip(target, 0, size - 1)
+    lower = np.minimum(np.floor(clipped).astype(np.int64), max(size - 2, 0))
+    weight = clipped - lower
+    return lower, weight, valid
+
+
+def resample(
+    data: Any,
+    source: Any,
+    target: Any,
+    fill_value: float = 0.0,
+    registry: Optional[FrameRegistry] = None,
+) -> np.ndarray:
+    """
+    Linearly resample a volume from one grid onto another.
+
+    The grids must be axis-aligned with each other, so each target axis maps to the
+    same source axis and the interpolation is done one axis at a time on the cached
+    voxel-centre vectors.
+
+    Args:
+        data: (z, y, x) array on the source grid.
+        source: Source grid (GridGeometry, ImageSet, DoseGrid or Dose), or the name of
+            a grid frame of registry.
+        target: Target grid, or the name of a grid frame of registry.
+        fill_value: Value of target voxels outside the source grid.
+        registry: FrameRegistry used to look up named grid frames.
+
+    Returns:
+        (z, y, x) array on the target grid.
+    """
+    source = (
+        registry.grids[source]
+        if isinstance(source, str)
+        else GridGeometry.from_object(source)
+    )
+    target = (
+        registry.grids[target]
+        if isinstance(target, str)
+        else GridGeometry.from_object(target)
+    )
+    data = np.asarray(data)
+    if data.shape != source.shape:
+        raise ValueError(
+            f"Volume shape {data.shape} does not match grid shape {source.shape}"
+        )
+
+    # Continuous source indices of the target voxel centres, one vector per axis
+    centers = target.voxel_centers()
+    affine = source.inverse_affine
+    dtype = np.result_type(data.dtype, np.float32)
+    result = data.astype(dtype, copy=False)
+    valid = []
+    # Interpolate along x (axis 2), y (axis 1) and z (axis 0) of the (z, y, x) array
+    for axis in range(3):
+        array_axis = 2 - axis
+        indices = affine[axis, axis] * centers[axis] + affine[axis, 3]
+        lower, weight, inside = _axis_weights(indices, source.shape[array_axis])
+        upper = np.minimum(lower + 1, source.shape[array_axis] - 1)
+        shape = [1, 1, 1]
+        shape[array_axis] = -1
+        weight = weight.astype(dtype).reshape(shape)
+        low = np.take(result, lower, axis=array_axis)
+        result = low + weight * (np.take(result, upper, axis=array_axis) - low)
+        valid.append(inside.reshape(shape))
+    outside = ~(valid[0] & valid[1] & valid[2])
+    if outside.any():
+        result = np.where(outside, dtype.type(fill_value), result)
+    return result
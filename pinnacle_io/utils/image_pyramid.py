@@ -0,0 +1,307 @@
+"""
+Multi-resolution image pyramid for fast browsing of large image sets.
+
+Level 0 is the full-resolution (z, y, x) volume. Each further level halves the
+in-plane resolution by averaging 2x2 pixel blocks, so an axial slice of level n
+is a 2^n times smaller image of the same slice. Levels are built in a single pass
+over the volume, one axial slice at a time, and can be persisted as .npy files
+that are memory-mapped when loaded again. Slice requests are served from the
+coarsest level that still satisfies the requested output size, so thumbnails and
+low-zoom views read a small fraction of the data.
+"""
+
+import json
+import warnings
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+PathLike = Union[str, Path]
+
+_METADATA_FILE = "pyramid.json"
+
+
+def downsample_block_mean(image: np.ndarray) -> np.ndarray:
+    """
+    Halve the resolution of a 2D image by averaging 2x2 blocks.
+
+    Odd dimensions are padded by repeating the last row or column, so the output has
+    shape (ceil(y / 2), ceil(x / 2)). Integer images are rounded back to their dtype.
+
+    Args:
+        image: 2D (y, x) array.
+
+    Returns:
+        Downsampled (y, x) array with the dtype of the input.
+    """
+    image = np.asarray(image)
+    y_dim, x_dim = image.shape
+    if y_dim % 2 or x_dim % 2:
+        image = np.pad(image, ((0, y_dim % 2), (0, x_dim % 2)), mode="edge")
+    blocks = image.reshape(image.shape[0] // 2, 2, image.shape[1] // 2, 2)
+    mean = blocks.mean(axis=(1, 3), dtype=np.float32)
+    if np.issubdtype(image.dtype, np.integer):
+        np.rint(mean, out=mean)
+    return mean.astype(image.dtype, copy=False)
+
+
+def _level_shape(shape: Sequence[int], level: int) -> Tuple[int, int, int]:
+    z_dim, y_dim, x_dim = (int(n) for n in shape)
+    for _ in range(level):
+        y_dim, x_dim = (y_dim + 1) // 2, (x_dim + 1) // 2
+    return (z_dim, y_dim, x_dim)
+
+
+class ImagePyramid:
+    """
+    Downsampled copies of a (z, y, x) volume.
+
+    Attributes:
+        levels: levels[n] is the (z, y_n, x_n) array of level n. Level 0 is the full volume,
+            which may be None if only the downsampled levels are held.
+        shape: Shape of the full-resolution volume.
+        cache_dir: Directory the downsampled levels were saved to, if any.
+    """
+
+    def __init__(
+        self,
+        levels: List[Any],
+        shape: Optional[Sequence[int]] = None,
+        cache_dir: Optional[PathLike] = None,
+        full_resolution: Optional[Callable[[int], np.ndarray]] = None,
+    ) -> None:
+        """
+        Args:
+            levels: Arrays of each level, starting with level 0 (which may be None).
+            shape: Shape of the full-resolution volume. Defaults to the shape of level 0.
+            cache_dir: Directory holding the persisted levels.
+            full_resolution: Callable returning a full-resolution axial slice, used when
+                level 0 is not held in memory.
+        """
+        if shape is None:
+            shape = levels[0].shape
+        self.levels = levels
+        self.shape = tuple(int(n) for n in shape)
+        self.cache_dir = None if cache_dir is None else Path(cache_dir)
+        self._full_resolution = full_resolution
+
+    @classmethod
+    def build(
+        cls,
+        get_slice: Callable[[int], np.ndarray],
+        shape: Sequence[int],
+        levels: int,
+        dtype: Any,
+        cache_dir: Optional[PathLike] = None,
+        signature: Optional[dict] = None,
+    ) -> "ImagePyramid":
+        """
+        Build the pyramid in a single pass over the axial slices.
+
+        Args:
+            get_slice: Callable returning the full-resolution (y, x) axial slice k.
+            shape: Shape of the full-resolution volume as (z, y, x).
+            levels: Number of downsampled levels to build.
+            dtype: Dtype of the volume.
+            cache_dir: If given, the downsampled levels are written to this directory as
+                .npy files and memory-mapped, instead of being held in memory. If the
+                directory cannot be written, the pyramid is built in memory instead.
+            signature: Description of the source stored with the persisted levels. A
+                persisted pyramid is only reused if its signature matches.
+
+        Returns:
+            ImagePyramid. Level 0 is served through get_slice.
+        """
+        if levels < 1:
+            raise ValueError(f"levels must be at least 1, got {levels}")
+        shape = tuple(int(n) for n in shape)
+        dtype = np.dtype(dtype)
+        if cache_dir is not None:
+            try:
+                return cls._build(
+                    get_slice, shape, levels, dtype, Path(cache_dir), signature
+                )
+            except OSError as e:
+                warnings.warn(
+                    f"ImagePyramid: Could not persist levels to {cache_dir} ({e}). Building in memory."
+                )
+        return cls._build(get_slice, shape, levels, dtype, None, signature)
+
+    @classmethod
+    def _build(
+        cls,
+        get_slice: Callable[[int], np.ndarray],
+        shape: Tuple[int, int, int],
+        levels: int,
+        dtype: np.dtype,
+        cache_dir: Optional[Path],
+        signature: Optional[dict],
+    ) -> "ImagePyramid":
+        if cache_dir is not None:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+
+        arrays: List[Any] = [None]
+        for level in range(1, levels + 1):
+            level_shape = _level_shape(shape, level)
+            if cache_dir is None:
+                arrays.append(np.empty(level_shape, dtype=dtype))
+            else:
+                arrays.append(
+                    np.lib.format.open_memmap(
+                        cache_dir / f"level_{level}.npy",
+                        mode="w+",
+                        dtype=dtype,
+                        shape=level_shape,
+                    )
+                )
+
+        for k in range(shape[0]):
+            image = np.asarray(get_slice(k))
+            for level in range(1, levels + 1):
+                image = downsample_block_mean(image)
+                arrays[level][k] = image
+
+        if cache_dir is not None:
+            for level in range(1, levels + 1):
+                arrays[level].flush()
+            metadata = {
+                "shape": list(shape),
+                "dtype": dtype.str,
+                "levels": levels,
+                "signature": signature or {},
+            }
+            (cache_dir / _METADATA_FILE).write_text(json.dumps(metadata))
+            arrays = [None] + [
+                np.load(cache_dir / f"level_{n}.npy", mmap_mode="r")
+                for n in range(1, levels + 1)
+            ]
+
+        return cls(arrays, shape, cache_dir=cache_dir, full_resolution=get_slice)
+
+    @classmethod
+    def load(
+        cls,
+        cache_dir: PathLike,
+        shape: Sequence[int],
+        levels: int,
+        get_slice: Optional[Callable[[int], np.ndarray]] = None,
+        signature: Optional[dict] = None,
+    ) -> Optional["ImagePyramid"]:
+        """
+        Load persisted levels as read-only memmaps.
+
+        Args:
+            cache_dir: Directory the levels were saved to.
+            shape: Expected full-resolution shape.
+            levels: Minimum number of downsampled levels required.
+            get_slice: Callable returning a full-resolution axial slice.
+            signature: Expected source signature.
+
+        Returns:
+            The ImagePyramid, or None if the directory does not hold a matching pyramid.
+        """
+        cache_dir = Path(cache_dir)
+        metadata_path = cache_dir / _METADATA_FILE
+        if not metadata_path.exists():
+            return None
+        try:
+            metadata = json.loads(metadata_path.read_text())
+        except (OSError, ValueError):
+            return None
+        if (
+            tuple(metadata.get("shape", ())) != tuple(int(n) for n in shape)
+            or metadata.get("levels", 0) < levels
+            or metadata.get("signature", {}) != (signature or {})
+        ):
+            return None
+
+        arrays: List[Any] = [None]
+        for level in range(1, levels + 1):
+            path = cache_dir / f"level_{level}.npy"
+            if not path.exists():
+                return None
+            try:
+                array = np.load(path, mmap_mode="r")
+            except (OSError, ValueError):
+                return None
+            if array.shape != _level_shape(shape, level):
+                return None
+            arrays.append(array)
+        return cls(arrays, shape, cache_dir=cache_dir, full_resolution=get_slice)
+
+    @property
+    def number_of_levels(self) -> int:
+        """Number of levels including the full-resolution level 0."""
+        return len(self.levels)
+
+    def level_shape(self, level: int) -> Tuple[int, int, int]:
+        """Shape of a level as (z, y, x)."""
+        return _level_shape(self.shape, level)
+
+    def level_for_size(self, size: Union[int, Sequence[int]]) -> int:
+        """
+        Coarsest level whose axial slices are at least the requested size.
+
+        Args:
+            size: Requested output size as (height, width), or a single maximum dimension.
+
+        Returns:
+            Level index. Level 0 is returned if no downsampled level is large enough.
+        """
+        if np.isscalar(size):
+            # A single size bounds the larger image dimension
+            _, y_dim, x_dim = self.shape
+            scale = float(size) / max(y_dim, x_dim)
+            height, width = y_dim * scale, x_dim * scale
+        else:
+            height, width = size
+        for level in range(self.number_of_levels - 1, 0, -1):
+            _, y_dim, x_dim = self.level_shape(level)
+            if y_dim >= height and x_dim >= width:
+                return level
+        return 0
+
+    def get_slice(self, slice_index: int, level: int = 0) -> np.ndarray:
+        """
+        Axial slice of a level.
+
+        Args:
+            slice_index: Index of the axial slice.
+            level: Pyramid level.
+
+        Returns:
+            (y, x) array of the level.
+        """
+        if not 0 <= level < self.number_of_levels:
+            raise IndexError(
+                f"Level {level} out of range for {self.number_of_levels} levels"
+            )
+        if not 0 <= slice_index < self.shape[0]:
+            raise IndexError(
+                f"Slice index {slice_index} out of range for {self.shape[0]} slices"
+            )
+        array = self.levels[level]
+        if array is None:
+            if self._full_resolution is None:
+                raise ValueError("The full-resolution volume is not available.")
+            return np.asarray(self._full_resolution(slice_index))
+        return array[slice_index]
+
+    def get_slice_for_size(
+        self, slice_index: int, size: Union[int, Sequence[int]]
+    ) -> np.ndarray:
+        """
+        Axial slice from the coarsest level that satisfies the requested output size.
+
+        Args:
+            slice_index: Index of the axial slice.
+            size: Requested output size as (height, width), or a single maximum dimension.
+
+        Returns:
+            (y, x) array of at least the requested size, where available.
+        """
+        return self.get_slice(slice_index, self.level_for_size(size))
+
+    def __repr__(self) -> str:
+        return f"<ImagePyramid(shape={self.shape}, levels={self.number_of_levels}, cache_dir={self.cache_dir})>"
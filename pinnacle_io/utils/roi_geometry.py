@@ -0,0 +1,275 @@
+"""
+ROI volume, centroid and extents computed from curves.
+
+All curves of many ROIs are concatenated into one ragged array (a float64 point
+buffer plus offsets), so the polygon area of every curve is a single vectorized
+shoelace sum: each point is paired with the next point of its own curve, the
+cross products are summed per curve with np.add.reduceat, and the area-weighted
+centroid of every curve follows from the same products.
+
+The volume of an ROI is the sum over slices of the contoured area times the
+slice thickness. Curves on the same slice follow the even-odd rule used for
+rasterization, so a curve inside another curve of the same ROI is a hole.
+"""
+
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from pinnacle_io.models.roi import ROI
+
+
+class ROIGeometry:
+    """
+    Geometric properties of an ROI derived from its curves.
+
+    Attributes:
+        curve_areas: Area enclosed by each curve (always positive), in cm^2.
+        curve_signs: +1 for curves adding area and -1 for holes.
+        curve_z: z-coordinate of each curve.
+        slice_thickness: Thickness of the slab of each curve, in cm.
+        volume: Volume of the ROI, in cm^3.
+        centroid: (x, y, z) volume centroid, or None for an empty ROI.
+        extents: ((x_min, y_min, z_min), (x_max, y_max, z_max)) of the curve points, or
+            None for an ROI without points.
+    """
+
+    def __init__(
+        self,
+        curve_areas: np.ndarray,
+        curve_signs: np.ndarray,
+        curve_z: np.ndarray,
+        slice_thickness: float,
+        centroid: Optional[Tuple[float, float, float]],
+        extents: Optional[
+            Tuple[Tuple[float, float, float], Tuple[float, float, float]]
+        ],
+    ) -> None:
+        self.curve_areas = curve_areas
+        self.curve_signs = curve_signs
+        self.curve_z = curve_z
+        self.slice_thickness = float(slice_thickness)
+        self.centroid = centroid
+        self.extents = extents
+
+    @property
+    def area(self) -> float:
+        """Total contoured area over all slices, with holes subtracted."""
+        return float(np.dot(self.curve_areas, self.curve_signs))
+
+    @property
+    def volume(self) -> float:
+        return self.area * self.slice_thickness
+
+    @property
+    def size(self) -> Optional[Tuple[float, float, float]]:
+        """Size of the extents along x, y and z."""
+        if self.extents is None:
+            return None
+        low, high = self.extents
+        return tuple(float(h - l) for l, h in zip(low, high))
+
+    def __repr__(self) -> str:
+        return (
+            f"<ROIGeometry(curves={len(self.curve_areas)}, volume={self.volume:.4g})>"
+        )
+
+
+def curve_areas_and_centroids(
+    points: np.ndarray, offsets: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Signed area and centroid of each closed planar curve of a ragged array.
+
+    Args:
+        points: (N, 3) points of all curves, concatenated.
+        offsets: (n_curves + 1,) start of each curve in points; the last entry is N.
+
+    Returns:
+        (areas, centroids): signed (x, y) area of each curve (positive counterclockwise)
+        and the (n_curves, 2) in-plane centroid. Degenerate curves have zero area and the
+        mean of their points as centroid.
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    counts = np.diff(offsets)
+    n_curves = len(counts)
+    areas = np.zeros(n_curves, dtype=np.float64)
+    centroids = np.zeros((n_curves, 2), dtype=np.float64)
+    if not len(points):
+        return areas, centroids
+
+    x = points[:, 0].astype(np.float64)
+    y = points[:, 1].astype(np.float64)
+    # Next point within the same curve, wrapping to the curve start
+    nonempty = counts > 0
+    starts = offsets[:-1][nonempty]
+    ends = offsets[1:][nonempty] - 1
+    x_next = np.empty_like(x)
+    y_next = np.empty_like(y)
+    x_next[:-1], y_next[:-1] = x[1:], y[1:]
+    x_next[ends], y_next[ends] = x[starts], y[starts]
+    cross = x * y_next - x_next * y
+
+    areas[nonempty] = np.add.reduceat(cross, starts) / 2.0
+    moment_x = np.add.reduceat((x + x_next) * cross, starts)
+    moment_y = np.add.reduceat((y + y_next) * cross, starts)
+    mean_x = np.add.reduceat(x, starts) / counts[nonempty]
+    mean_y = np.add.reduceat(y, starts) / counts[nonempty]
+
+    curve_areas = areas[nonempty]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        centroid_x = np.where(curve_areas != 0, moment_x / (6.0 * curve_areas), mean_x)
+        centroid_y = np.where(curve_areas != 0, moment_y / (6.0 * curve_areas), mean_y)
+    centroids[nonempty] = np.stack([centroid_x, centroid_y], axis=1)
+    return areas, centroids
+
+
+def _point_in_polygon(x: float, y: float, polygon: np.ndarray) -> bool:
+    """Even-odd test of a single point against a closed (N, 2+) polygon."""
+    x0, y0 = polygon[:, 0], polygon[:, 1]
+    x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+    spans = (y0 <= y) != (y1 <= y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crossing = x0 + (y - y0) * (x1 - x0) / (y1 - y0)
+    return bool(np.count_nonzero(spans & (x < crossing)) & 1)
+
+
+def _slice_thickness(curve_z: np.ndarray) -> float:
+    """Median spacing between the distinct curve z-positions, rounded to 1 um."""
+    levels = np.unique(np.round(curve_z, 4))
+    if len(levels) < 2:
+        return 0.0
+    return float(np.median(np.diff(levels)))
+
+
+def compute_roi_geometry(
+    rois: Iterable["ROI"],
+    slice_thickness: Optional[float] = None,
+    use_cache: bool = True,
+) -> Dict["ROI", ROIGeometry]:
+    """
+    Compute the volume, centroid and extents of many ROIs in one batch.
+
+    Results are cached on each ROI and reused until its curves change.
+
+    Args:
+        rois: ROIs to evaluate.
+        slice_thickness: Thickness of each contoured slice, in cm, e.g. the z pixel size
+            of the image set. Defaults to the median spacing between the curve z-positions
+            of each ROI (0 for an ROI contoured on a single slice).
+        use_cache: If False, recompute ROIs with cached results.
+
+    Returns:
+        ROIGeometry for each ROI.
+    """
+    rois = list(rois)
+    results: Dict["ROI", ROIGeometry] = {}
+    pending: List["ROI"] = []
+    for roi in rois:
+        cached = roi._geometry if use_cache else None
+        if cached is not None and cached[0] == slice_thickness:
+            results[roi] = cached[1]
+        else:
+            pending.append(roi)
+    if not pending:
+        return results
+
+    # One ragged array holding the curves of all pending ROIs
+    buffers = [roi.curve_points for roi in pending]
+    curve_counts = np.array([len(ragged) for ragged in buffers], dtype=np.int64)
+    point_counts = np.array([len(ragged.points) for ragged in buffers], dtype=np.int64)
+    point_start = np.concatenate(([0], np.cumsum(point_counts)))
+    offsets = np.concatenate(
+        [[0]]
+        + [
+            ragged.offsets[1:].astype(np.int64) + start
+            for ragged, start in zip(buffers, point_start)
+        ]
+    )
+    lengths = np.diff(offsets)
+    points = np.concatenate([ragged.points for ragged in buffers]).astype(np.float64)
+    n_curves = len(lengths)
+
+    signed, centroids = curve_areas_and_centroids(points, offsets)
+    areas = np.abs(signed)
+    nonempty = lengths > 0
+    curve_z = np.zeros(n_curves, dtype=np.float64)
+    if nonempty.any():
+        curve_z[nonempty] = (
+            np.add.reduceat(points[:, 2], offsets[:-1][nonempty]) / lengths[nonempty]
+        )
+    curve_start = np.concatenate(([0], np.cumsum(curve_counts)))
+
+    # Curves sharing a slice with another curve of the same ROI may be holes (even-odd
+    # nesting); sorting by (ROI, z) finds those slices without a per-ROI scan
+    signs = np.ones(n_curves, dtype=np.float64)
+    roi_of_curve = np.repeat(np.arange(len(pending)), curve_counts)
+    z_keys = np.round(curve_z, 4)
+    order = np.lexsort((z_keys, roi_of_curve))
+    same = (roi_of_curve[order][1:] == roi_of_curve[order][:-1]) & (
+        z_keys[order][1:] == z_keys[order][:-1]
+    )
+    if same.any():
+        group_start = np.flatnonzero(np.concatenate(([True], ~same)))
+        for members in np.split(order, group_start[1:]):
+            if len(members) < 2:
+                continue
+            for j in members:
+                px, py = points[offsets[j], 0], points[offsets[j], 1]
+                depth = sum(
+                    _point_in_polygon(px, py, points[offsets[m] : offsets[m + 1]])
+                    for m in members
+                    if m != j and lengths[m] >= 3
+                )
+                if depth % 2:
+                    signs[j] = -1.0
+
+    # Area-weighted sums and point extents per ROI
+    weighted = areas * signs
+    has_curves = curve_counts > 0
+    totals = np.zeros(len(pending))
+    moments = np.zeros((len(pending), 3))
+    if has_curves.any():
+        curve_moments = np.column_stack(
+            [centroids * weighted[:, None], curve_z * weighted]
+        )
+        totals[has_curves] = np.add.reduceat(weighted, curve_start[:-1][has_curves])
+        moments[has_curves] = np.add.reduceat(
+            curve_moments, curve_start[:-1][has_curves], axis=0
+        )
+    has_points = point_counts > 0
+    lows = np.zeros((len(pending), 3))
+    highs = np.zeros((len(pending), 3))
+    if has_points.any():
+        lows[has_points] = np.minimum.reduceat(
+            points, point_start[:-1][has_points], axis=0
+        )
+        highs[has_points] = np.maximum.reduceat(
+            points, point_start[:-1][has_points], axis=0
+        )
+
+    for i, roi in enumerate(pending):
+        first, last = int(curve_start[i]), int(curve_start[i + 1])
+        roi_z = curve_z[first:last]
+        thickness = (
+            _slice_thickness(roi_z)
+            if slice_thickness is None
+            else float(slice_thickness)
+        )
+        centroid = (
+            tuple(float(v) for v in moments[i] / totals[i]) if totals[i] > 0 else None
+        )
+        extents = None
+        if has_points[i]:
+            extents = (
+                tuple(float(v) for v in lows[i]),
+                tuple(float(v) for v in highs[i]),
+            )
+
+        geometry = ROIGeometry(
+            areas[first:last], signs[first:last], roi_z, thickness, centroid, extents
+        )
+        roi._geometry = (slice_thickness, geometry)
+        results[roi] = geometry
+    return results
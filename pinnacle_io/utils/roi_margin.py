@@ -0,0 +1,481 @@
+"""
+ROI margin expansion and contraction.
+
+Margins are applied to the voxel mask of an ROI with an exact Euclidean distance
+transform. An anisotropic margin (mx, my, mz) is an ellipsoid, so the grid is
+rescaled per axis to (dx / mx, dy / my, dz / mz): a voxel lies within the margin of
+the ROI exactly when its rescaled distance to the nearest ROI voxel is at most 1.
+Contraction applies the same test to the voxels outside the ROI.
+
+The distance transform is separable (Felzenszwalb and Huttenlocher): the squared
+distance is computed along one axis at a time as the lower envelope of parabolas,
+with the envelope of all lines of the volume built together, one position at a
+time. Only the bounding box of the ROI mask plus the margin is processed.
+
+The resulting mask is converted back to closed curves on each slice with
+marching squares. Contours pass through the midpoints between inside and outside
+voxel centres, so rasterizing them on the same grid gives back the mask, and
+collinear points are dropped.
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from pinnacle_io.utils.frames import GridGeometry
+from pinnacle_io.utils.roi_mask import PackedMask, get_roi_mask
+
+if TYPE_CHECKING:
+    from pinnacle_io.models.roi import ROI, RaggedCurves
+
+Margin = Union[float, Sequence[float]]
+
+# Tolerance of the margin distance test, relative to the margin
+_EPSILON = 1e-9
+
+
+def _squared_distance_1d(f: np.ndarray, spacing: float) -> np.ndarray:
+    """
+    Exact 1D squared distance transform of every row of f.
+
+    Args:
+        f: (lines, n) squared distances so far (0 at features).
+        spacing: Distance between neighbouring positions.
+
+    Returns:
+        (lines, n) array of min over q of f[:, q] + ((p - q) * spacing)^2.
+    """
+    n_lines, n = f.shape
+    if n == 1 or not n_lines:
+        return f.copy()
+    position = np.arange(n, dtype=np.float64) * spacing
+    lines = np.arange(n_lines)
+    g = f + position**2
+
+    # Lower envelope of the parabolas of all lines: vertices v and boundaries z
+    vertices = np.zeros((n_lines, n), dtype=np.int64)
+    bounds = np.full((n_lines, n + 1), np.inf)
+    bounds[:, 0] = -np.inf
+    k = np.zeros(n_lines, dtype=np.int64)
+    for q in range(1, n):
+        while True:
+            v = vertices[lines, k]
+            s = (g[:, q] - g[lines, v]) / (2.0 * (position[q] - position[v]))
+            pop = s <= bounds[lines, k]
+            if not pop.any():
+                break
+            k[pop] -= 1
+        k += 1
+        vertices[lines, k] = q
+        bounds[lines, k] = s
+        bounds[lines, k + 1] = np.inf
+
+    result = np.empty_like(f)
+    k[:] = 0
+    for q in range(n):
+        while True:
+            advance = bounds[lines, k + 1] < position[q]
+            if not advance.any():
+                break
+            k[advance] += 1
+        v = vertices[lines, k]
+        result[:, q] = (position[q] - position[v]) ** 2 + f[lines, v]
+    return result
+
+
+def squared_distance_transform(
+    mask: np.ndarray, sampling: Sequence[float]
+) -> np.ndarray:
+    """
+    Exact squared Euclidean distance from every voxel to the nearest True voxel.
+
+    Args:
+        mask: Boolean (z, y, x) array.
+        sampling: Voxel spacing along (z, y, x). An infinite spacing means distances
+            along that axis are not allowed (the axis is not traversed).
+
+    Returns:
+        float64 array of squared distances (0 inside the mask, inf if the mask is empty
+        or no True voxel is reachable).
+    """
+    mask = np.asarray(mask, dtype=bool)
+    finite = [float(s) for s in sampling if np.isfinite(s)]
+    # Finite stand-in for "no feature", larger than any reachable squared distance
+    far = (
+        sum((size * s) ** 2 for size, s in zip(mask.shape, sampling) if np.isfinite(s))
+        + 1.0
+    )
+    distance = np.where(mask, 0.0, far)
+    if finite:
+        for axis, spacing in enumerate(sampling):
+            if not np.isfinite(spacing) or mask.shape[axis] < 2:
+                continue
+            moved = np.moveaxis(distance, axis, -1)
+            shape = moved.shape
+            flat = _squared_distance_1d(moved.reshape(-1, shape[-1]), float(spacing))
+            distance = np.moveaxis(flat.reshape(shape), -1, axis)
+    distance = np.ascontiguousarray(distance)
+    distance[distance >= far] = np.inf
+    return distance
+
+
+def distance_transform(
+    mask: np.ndarray, sampling: Sequence[float] = (1.0, 1.0, 1.0)
+) -> np.ndarray:
+    """
+    Exact Euclidean distance from every voxel to the nearest True voxel.
+
+    Args:
+        mask: Boolean (z, y, x) array.
+        sampling: Voxel spacing along (z, y, x).
+
+    Returns:
+        float64 array of distances (0 inside the mask).
+    """
+    return np.sqrt(squared_distance_transform(mask, sampling))
+
+
+def _margin_vector(margin: Margin) -> np.ndarray:
+    """(x, y, z) margin from a scalar or a 3-sequence."""
+    values = np.broadcast_to(np.asarray(margin, dtype=np.float64), (3,)).copy()
+    if not np.all(np.isfinite(values)):
+        raise ValueError(f"Margins must be finite, got {margin}")
+    return values
+
+
+def _within(
+    mask: np.ndarray, spacing_zyx: np.ndarray, margin_zyx: np.ndarray
+) -> np.ndarray:
+    """Voxels within the ellipsoidal margin (non-negative per axis) of the mask."""
+    with np.errstate(divide="ignore"):
+        sampling = np.where(
+            margin_zyx > 0,
+            spacing_zyx / np.where(margin_zyx > 0, margin_zyx, 1.0),
+            np.inf,
+        )
+    return squared_distance_transform(mask, sampling) <= 1.0 + _EPSILON
+
+
+def apply_margin_to_box(
+    box: np.ndarray, spacing: Sequence[float], margin: Margin
+) -> np.ndarray:
+    """
+    Expand (positive) or contract (negative) a boolean (z, y, x) mask.
+
+    Each axis may have its own margin. Mixed signs expand along the positive axes
+    first and then contract along the negative axes. The mask is not enlarged, so it
+    must already contain room for an expansion.
+
+    Args:
+        box: Boolean (z, y, x) array.
+        spacing: (x, y, z) voxel size.
+        margin: Margin along x, y and z (or one value for all axes), in the unit of
+            the spacing.
+
+    Returns:
+        Boolean (z, y, x) array of the same shape.
+    """
+    margin_zyx = _margin_vector(margin)[::-1]
+    spacing_zyx = np.abs(np.asarray(spacing, dtype=np.float64))[::-1]
+    result = np.asarray(box, dtype=bool)
+    if (margin_zyx > 0).any():
+        result = _within(result, spacing_zyx, np.maximum(margin_zyx, 0.0))
+    if (margin_zyx < 0).any():
+        # Voxels near the outside (including outside the box) are removed
+        padded = np.pad(~result, 1, constant_values=True)
+        removed = _within(padded, spacing_zyx, np.maximum(-margin_zyx, 0.0))[
+            1:-1, 1:-1, 1:-1
+        ]
+        result = result & ~removed
+    return result
+
+
+def apply_margin(
+    mask: Union[np.ndarray, PackedMask], grid: Any, margin: Margin
+) -> PackedMask:
+    """
+    Expand or contract a mask on a grid, processing only its bounding box plus margin.
+
+    Args:
+        mask: Boolean (z, y, x) mask or PackedMask on the grid.
+        grid: Grid of the mask (GridGeometry, ImageSet, DoseGrid or Dose).
+        margin: Margin along x, y and z (or one value), in cm. Negative values contract.
+
+    Returns:
+        PackedMask of the result, clipped to the grid.
+    """
+    grid = GridGeometry.from_object(grid)
+    packed = mask if isinstance(mask, PackedMask) else PackedMask.from_array(mask)
+    if packed.shape != grid.shape:
+        raise ValueError(
+            f"Mask shape {packed.shape} does not match grid shape {grid.shape}"
+        )
+    if packed.empty:
+        return packed
+
+    # Voxels the expansion can reach on each side, along (z, y, x)
+    reach = np.ceil(np.maximum(_margin_vector(margin), 0.0) / np.abs(grid.spacing))[
+        ::-1
+    ].astype(np.int64)
+    offset = np.array(packed.offset)
+    start = np.maximum(offset - reach, 0)
+    stop = np.minimum(offset + np.array(packed.box_shape) + reach, grid.shape)
+    box = np.zeros(tuple(stop - start), dtype=bool)
+    local = offset - start
+    box[tuple(slice(a, a + size) for a, size in zip(local, packed.box_shape))] = (
+        packed.box()
+    )
+    return PackedMask.from_array_box(
+        grid.shape, tuple(start), apply_margin_to_box(box, grid.spacing, margin)
+    )
+
+
+def _case_segments() -> Dict[int, Tuple[Tuple[int, int], ...]]:
+    """
+    Marching-squares segments of each cell case, as (from edge, to edge) pairs.
+
+    Corners are top-left (8), top-right (4), bottom-right (2) and bottom-left (1).
+    Edges are top (0), right (1), bottom (2) and left (3). Segments are oriented with
+    the inside on the same side, so consecutive segments share an edge point; the
+    diagonal cases separate the two inside corners.
+    """
+    corner_position = {8: (0.0, 0.0), 4: (1.0, 0.0), 2: (1.0, 1.0), 1: (0.0, 1.0)}
+    edge_position = {0: (0.5, 0.0), 1: (1.0, 0.5), 2: (0.5, 1.0), 3: (0.0, 0.5)}
+    edge_corners = {0: (8, 4), 1: (4, 2), 2: (2, 1), 3: (1, 8)}
+
+    def oriented(a: int, b: int, inside: int) -> Tuple[int, int]:
+        (ax, ay), (bx, by) = edge_position[a], edge_position[b]
+        cx, cy = corner_position[inside]
+        cross = (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+        return (a, b) if cross > 0 else (b, a)
+
+    table: Dict[int, Tuple[Tuple[int, int], ...]] = {}
+    for case in range(1, 15):
+        inside = [corner for corner in (8, 4, 2, 1) if case & corner]
+        if case in (5, 10):
+            segments = []
+            for corner in inside:
+                edges = [
+                    edge for edge, corners in edge_corners.items() if corner in corners
+                ]
+                segments.append(oriented(edges[0], edges[1], corner))
+            table[case] = tuple(segments)
+            continue
+        edges = [
+            edge
+            for edge, (c0, c1) in edge_corners.items()
+            if bool(case & c0) != bool(case & c1)
+        ]
+        if len(inside) == 3:
+            # Orient against the outside corner
+            outside = next(corner for corner in (8, 4, 2, 1) if not case & corner)
+            b, a = oriented(edges[0], edges[1], outside)
+        else:
+            a, b = oriented(edges[0], edges[1], inside[0])
+        table[case] = ((a, b),)
+    return table
+
+
+_SEGMENTS = _case_segments()
+
+
+def marching_squares(mask: np.ndarray) -> Dict[int, list]:
+    """
+    Closed contours of a boolean (z, y, x) mask on each slice.
+
+    Args:
+        mask: Boolean (z, y, x) array.
+
+    Returns:
+        Mapping from slice index to a list of (N, 2) float64 arrays of (x, y) voxel
+        indices, one per closed contour.
+    """
+    mask = np.asarray(mask, dtype=bool)
+    z_dim, y_dim, x_dim = mask.shape
+    padded = np.pad(mask, ((0, 0), (1, 1), (1, 1)))
+    cases = (
+        8 * padded[:, :-1, :-1]
+        + 4 * padded[:, :-1, 1:]
+        + 2 * padded[:, 1:, 1:]
+        + 1 * padded[:, 1:, :-1]
+    ).astype(np.int64)
+
+    # Edge points: horizontal edges (k, r, c) between padded[k, r, c] and [k, r, c + 1],
+    # vertical edges between padded[k, r, c] and [k, r + 1, c]
+    rows, columns = y_dim + 2, x_dim + 2
+    n_horizontal = z_dim * rows * (columns - 1)
+
+    def edge_ids(k: np.ndarray, r: np.ndarray, c: np.ndarray, edge: int) -> np.ndarray:
+        if edge == 0:
+            return (k * rows + r) * (columns - 1) + c
+        if edge == 2:
+            return (k * rows + r + 1) * (columns - 1) + c
+        if edge == 3:
+            return n_horizontal + (k * (rows - 1) + r) * columns + c
+        return n_horizontal + (k * (rows - 1) + r) * columns + c + 1
+
+    starts, ends = [], []
+    for case, segments in _SEGMENTS.items():
+        k, r, c = np.nonzero(cases == case)
+        if not len(k):
+            continue
+        for a, b in segments:
+            starts.append(edge_ids(k, r, c, a))
+            ends.append(edge_ids(k, r, c, b))
+    if not starts:
+        return {}
+    starts = np.concatenate(starts)
+    ends = np.concatenate(ends)
+
+    n_edges = n_horizontal + z_dim * (rows - 1) * columns
+    segment_of_start = np.full(n_edges, -1, dtype=np.int64)
+    segment_of_start[starts] = np.arange(len(starts))
+    following = segment_of_start[ends]
+
+    # Coordinates (x, y, k) of each edge point in unpadded voxel indices
+    horizontal = starts < n_horizontal
+    index = np.where(horizontal, starts, starts - n_horizontal)
+    width = np.where(horizontal, columns - 1, columns)
+    height = np.where(horizontal, rows, rows - 1)
+    c = index % width
+    r = (index // width) % height
+    k = index // (width * height)
+    x = c + np.where(horizontal, 0.5, 0.0) - 1.0
+    y = r + np.where(horizontal, 0.0, 0.5) - 1.0
+
+    contours: Dict[int, list] = {}
+    visited = [False] * len(starts)
+    following_list = following.tolist()
+    for first in range(len(starts)):
+        if visited[first]:
+            continue
+        loop = []
+        segment = first
+        while not visited[segment]:
+            visited[segment] = True
+            loop.append(segment)
+            segment = following_list[segment]
+        loop = np.array(loop)
+        points = np.stack([x[loop], y[loop]], axis=1)
+        # Drop points where the direction does not change
+        incoming = points - np.roll(points, 1, axis=0)
+        outgoing = np.roll(points, -1, axis=0) - points
+        turning = incoming[:, 0] * outgoing[:, 1] - incoming[:, 1] * outgoing[:, 0] != 0
+        if turning.sum() >= 3:
+            contours.setdefault(int(k[first]), []).append(points[turning])
+    return contours
+
+
+def mask_to_curves(mask: Union[np.ndarray, PackedMask], grid: Any) -> "RaggedCurves":
+    """
+    Contour a mask on a grid into curves in patient coordinates.
+
+    Args:
+        mask: Boolean (z, y, x) mask or PackedMask on the grid.
+        grid: Grid of the mask (GridGeometry, ImageSet, DoseGrid or Dose).
+
+    Returns:
+        RaggedCurves ordered by slice.
+    """
+    from pinnacle_io.models.roi import RaggedCurves
+
+    grid = GridGeometry.from_object(grid)
+    if isinstance(mask, PackedMask):
+        box, offset = mask.box(), np.array(mask.offset)
+    else:
+        box, offset = np.asarray(mask, dtype=bool), np.zeros(3, dtype=np.int64)
+    contours = marching_squares(box) if box.size else {}
+    arrays = []
+    for k in sorted(contours):
+        for polygon in contours[k]:
+            indices = np.column_stack(
+                [
+                    polygon[:, 0] + offset[2],
+                    polygon[:, 1] + offset[1],
+                    np.full(len(polygon), k + offset[0]),
+                ]
+            )
+            arrays.append(grid.to_patient(indices))
+    if not arrays:
+        return RaggedCurves(np.zeros((0, 3), dtype=np.float32), [0])
+    return RaggedCurves.from_arrays(arrays)
+
+
+def roi_from_mask(
+    mask: Union[np.ndarray, PackedMask],
+    grid: Any,
+    name: str,
+    template: Optional["ROI"] = None,
+) -> "ROI":
+    """
+    Create an ROI from a mask on a grid.
+
+    Args:
+        mask: Boolean (z, y, x) mask or PackedMask on the grid.
+        grid: Grid of the mask.
+        name: Name of the new ROI.
+        template: Optional ROI whose display color and interpreted type are copied.
+
+    Returns:
+        New ROI with one curve per contour.
+    """
+    from pinnacle_io.models.roi import ROI, Curve
+
+    ragged = mask_to_curves(mask, grid)
+    roi = ROI(name=name)
+    if template is not None:
+        roi.color = template.color
+        roi.roi_interpreted_type = template.roi_interpreted_type
+    counts = ragged.counts
+    roi.curve_list = [
+        Curve(curve_number=i, num_points=int(counts[i])) for i in range(len(ragged))
+    ]
+    roi.set_curve_points(ragged)
+    return roi
+
+
+def expand_roi(
+    roi: "ROI", margin: Margin, grid: Any, name: Optional[str] = None
+) -> "ROI":
+    """
+    Create a new ROI by expanding (positive) or contracting (negative) an ROI.
+
+    Args:
+        roi: Source ROI.
+        margin: Margin along x, y and z (or one value), in cm.
+        grid: Grid on which the margin is applied, e.g. the primary CT.
+        name: Name of the new ROI. Defaults to the source name with a "_margin" suffix.
+
+    Returns:
+        New ROI.
+    """
+    result = apply_margin(get_roi_mask(roi, grid), grid, margin)
+    return roi_from_mask(result, grid, name or f"{roi.name}_margin", template=roi)
+
+
+def ring_roi(
+    roi: "ROI",
+    outer: Margin,
+    grid: Any,
+    inner: Margin = 0.0,
+    name: Optional[str] = None,
+) -> "ROI":
+    """
+    Create a ring ROI between two expansions of an ROI.
+
+    Args:
+        roi: Source ROI.
+        outer: Outer margin along x, y and z (or one value), in cm.
+        grid: Grid on which the margins are applied.
+        inner: Inner margin; voxels within this margin of the ROI are excluded.
+        name: Name of the new ROI. Defaults to the source name with a "_ring" suffix.
+
+    Returns:
+        New ROI.
+    """
+    mask = get_roi_mask(roi, grid)
+    outside = apply_margin(mask, grid, outer).to_array()
+    outside &= ~apply_margin(mask, grid, inner).to_array()
+    return roi_from_mask(
+        PackedMask.from_array(outside), grid, name or f"{roi.name}_ring", template=roi
+    )
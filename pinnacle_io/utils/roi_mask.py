@@ -0,0 +1,711 @@
+"""
+Contour-to-voxel-mask rasterization.
+
+ROI curves are closed planar polygons (float32 N x 3 points in patient
+coordinates). Each curve is assigned to the nearest slice of a target grid (an
+image set or dose grid) and all curves of a slice are filled together with an
+even-odd scanline rule, so holes and multiple islands per slice come out right
+without knowing which curve is the outer one.
+
+The fill is vectorized: for every polygon edge the scanlines it crosses are
+expanded with np.repeat, the crossing positions are computed in one array
+operation, and the crossings are accumulated per row and column so that a
+cumulative sum modulo two gives the inside pixels.
+
+Masks are cached per (ROI content hash, grid) as bit-packed arrays cropped to
+the ROI bounding box, and many ROIs can be rasterized in parallel with a thread
+pool.
+
+Fractional (partial-volume) masks refine a binary mask at the ROI boundary only:
+voxels crossed by a curve or on the edge of the binary mask are supersampled on
+an s x s sub-pixel grid, and the covered fraction of each is stored in a sparse
+boundary list (flat voxel indices with float16 fractions). Interior voxels stay
+in the packed binary mask.
+
+Grid convention: voxel (i, j, k) of a grid with origin (x0, y0, z0) and spacing
+(dx, dy, dz) is centred at (x0 + i * dx, y0 + j * dy, z0 + k * dz), and masks are
+(z, y, x) arrays.
+"""
+
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from pinnacle_io.utils.frames import GridGeometry
+
+if TYPE_CHECKING:
+    from pinnacle_io.models.roi import ROI, RaggedCurves
+
+
+class PackedMask:
+    """
+    A boolean (z, y, x) mask stored bit-packed and cropped to its bounding box.
+
+    Attributes:
+        shape: Shape of the full grid.
+        offset: (z, y, x) index of the first voxel of the bounding box.
+        box_shape: Shape of the bounding box.
+        bits: np.packbits of the flattened bounding box.
+        count: Number of voxels in the mask.
+    """
+
+    def __init__(
+        self,
+        shape: Sequence[int],
+        offset: Sequence[int],
+        box_shape: Sequence[int],
+        bits: np.ndarray,
+        count: int,
+    ) -> None:
+        self.shape = tuple(int(n) for n in shape)
+        self.offset = tuple(int(n) for n in offset)
+        self.box_shape = tuple(int(n) for n in box_shape)
+        self.bits = bits
+        self.count = int(count)
+
+    @classmethod
+    def from_array(cls, mask: np.ndarray) -> "PackedMask":
+        """Crop a full boolean mask to its bounding box and pack it."""
+        mask = np.asarray(mask, dtype=bool)
+        bounds = []
+        for axis in range(3):
+            other = tuple(a for a in range(3) if a != axis)
+            occupied = np.flatnonzero(mask.any(axis=other))
+            if not len(occupied):
+                return cls(
+                    mask.shape, (0, 0, 0), (0, 0, 0), np.zeros(0, dtype=np.uint8), 0
+                )
+            bounds.append((int(occupied[0]), int(occupied[-1]) + 1))
+        box = mask[tuple(slice(start, stop) for start, stop in bounds)]
+        return cls.from_box(mask.shape, [start for start, _ in bounds], box)
+
+    @classmethod
+    def from_box(
+        cls, shape: Sequence[int], offset: Sequence[int], box: np.ndarray
+    ) -> "PackedMask":
+        """Pack a boolean bounding-box array located at offset in the full grid."""
+        box = np.asarray(box, dtype=bool)
+        return cls(
+            shape,
+            offset,
+            box.shape,
+            np.packbits(box, axis=None),
+            int(np.count_nonzero(box)),
+        )
+
+    @classmethod
+    def from_array_box(
+        cls, shape: Sequence[int], offset: Sequence[int], box: np.ndarray
+    ) -> "PackedMask":
+        """Pack a boolean array located at offset in the full grid, cropped to the voxels set."""
+        cropped = cls.from_array(box)
+        if not cropped.count:
+            return cls(shape, (0, 0, 0), (0, 0, 0), cropped.bits, 0)
+        offset = tuple(int(o) + c for o, c in zip(offset, cropped.offset))
+        return cls(shape, offset, cropped.box_shape, cropped.bits, cropped.count)
+
+    @property
+    def bbox(self) -> Tuple[slice, slice, slice]:
+        """Slices selecting the bounding box within the full grid."""
+        return tuple(
+            slice(start, start + size)
+            for start, size in zip(self.offset, self.box_shape)
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return self.bits.nbytes
+
+    @property
+    def empty(self) -> bool:
+        return self.count == 0
+
+    def box(self) -> np.ndarray:
+        """Unpacked boolean array of the bounding box."""
+        size = int(np.prod(self.box_shape))
+        return np.unpackbits(self.bits, count=size).view(bool).reshape(self.box_shape)
+
+    def to_array(self) -> np.ndarray:
+        """Unpacked boolean mask of the full grid."""
+        full = np.zeros(self.shape, dtype=bool)
+        if self.count:
+            full[self.bbox] = self.box()
+        return full
+
+    def __array__(
+        self, dtype: Optional[Any] = None, copy: Optional[bool] = None
+    ) -> np.ndarray:
+        array = self.to_array()
+        return array if dtype is None else array.astype(dtype)
+
+    def __repr__(self) -> str:
+        return f"<PackedMask(shape={self.shape}, bbox_shape={self.box_shape}, count={self.count})>"
+
+
+class FractionalMask:
+    """
+    Partial-volume mask: whole interior voxels plus a sparse list of boundary fractions.
+
+    Attributes:
+        interior: PackedMask of the voxels fully inside the ROI.
+        indices: Flat indices (into the full grid) of the partially covered voxels.
+        fractions: Covered fraction (float16, 0 to 1) of each partially covered voxel.
+    """
+
+    def __init__(
+        self, interior: PackedMask, indices: np.ndarray, fractions: np.ndarray
+    ) -> None:
+        self.interior = interior
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.fractions = np.asarray(fractions, dtype=np.float16)
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self.interior.shape
+
+    @property
+    def voxel_count(self) -> float:
+        """Number of voxels in the ROI, counting boundary voxels by their fraction."""
+        return self.interior.count + float(self.fractions.sum(dtype=np.float64))
+
+    def volume(self, voxel_volume: float = 1.0) -> float:
+        """Volume of the ROI for the given voxel volume."""
+        return self.voxel_count * voxel_volume
+
+    @property
+    def nbytes(self) -> int:
+        return self.interior.nbytes + self.indices.nbytes + self.fractions.nbytes
+
+    def values_and_weights(self, data: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gather the values of a volume on the grid with the weight of each voxel.
+
+        Args:
+            data: (z, y, x) array (or CroppedVolume) on the grid of the mask.
+
+        Returns:
+            (values, weights) with weight 1 for interior voxels and the covered fraction
+            for boundary voxels.
+        """
+        if tuple(data.shape) != self.shape:
+            raise ValueError(
+                f"Mask shape {self.shape} does not match volume shape {tuple(data.shape)}"
+            )
+        interior = (
+            np.asarray(data[self.interior.bbox])[self.interior.box()]
+            if self.interior.count
+            else None
+        )
+        boundary = np.empty(0, dtype=np.float32)
+        if len(self.indices):
+            z, y, x = np.unravel_index(self.indices, self.shape)
+            if isinstance(data, np.ndarray):
+                boundary = data[z, y, x]
+            else:
+                z0 = int(z.min())
+                boundary = np.asarray(data[z0 : int(z.max()) + 1])[z - z0, y, x]
+        values = boundary if interior is None else np.concatenate([interior, boundary])
+        weights = np.ones(len(values), dtype=np.float32)
+        weights[len(values) - len(boundary) :] = self.fractions
+        return values, weights
+
+    def mean(self, data: Any) -> Optional[float]:
+        """Partial-volume weighted mean of a volume within the ROI."""
+        values, weights = self.values_and_weights(data)
+        total = float(weights.sum(dtype=np.float64))
+        return (
+            float(np.dot(values.astype(np.float64), weights) / total) if total else None
+        )
+
+    def to_array(self, dtype: Any = np.float32) -> np.ndarray:
+        """Full (z, y, x) array of voxel fractions."""
+        full = self.interior.to_array().astype(dtype)
+        full.ravel()[self.indices] = self.fractions
+        return full
+
+    def __array__(
+        self, dtype: Optional[Any] = None, copy: Optional[bool] = None
+    ) -> np.ndarray:
+        return self.to_array(np.float32 if dtype is None else dtype)
+
+    def __repr__(self) -> str:
+        return (
+            f"<FractionalMask(shape={self.shape}, interior={self.interior.count}, "
+            f"boundary={len(self.indices)}, voxels={self.voxel_count:.4g})>"
+        )
+
+
+def fill_polygons(polygons: Sequence[np.ndarray], y_dim: int, x_dim: int) -> np.ndarray:
+    """
+    Fill polygons on a (y, x) raster with the even-odd rule.
+
+    A pixel is inside if its centre is enclosed by an odd number of polygon boundaries,
+    so overlapping curves cut holes.
+
+    Args:
+        polygons: Closed polygons as (N, 2) arrays of continuous (x, y) pixel indices.
+            The closing edge from the last to the first point is implied.
+        y_dim: Number of rows.
+        x_dim: Number of columns.
+
+    Returns:
+        Boolean (y_dim, x_dim) mask.
+    """
+    starts = []
+    ends = []
+    for polygon in polygons:
+        polygon = np.asarray(polygon, dtype=np.float64)
+        if len(polygon) < 3:
+            continue
+        starts.append(polygon)
+        ends.append(np.roll(polygon, -1, axis=0))
+    mask = np.zeros((y_dim, x_dim), dtype=bool)
+    if not starts:
+        return mask
+    p0 = np.concatenate(starts)
+    p1 = np.concatenate(ends)
+
+    # Each edge crosses the scanlines (row centres) y in [min(y0, y1), max(y0, y1))
+    y_low = np.minimum(p0[:, 1], p1[:, 1])
+    y_high = np.maximum(p0[:, 1], p1[:, 1])
+    first_row = np.clip(np.ceil(y_low), 0, y_dim).astype(np.int64)
+    last_row = np.clip(np.ceil(y_high), 0, y_dim).astype(np.int64)
+    counts = last_row - first_row
+    keep = counts > 0
+    if not keep.any():
+        return mask
+    p0, p1, first_row, counts = p0[keep], p1[keep], first_row[keep], counts[keep]
+
+    # One entry per (edge, scanline) crossing
+    edge = np.repeat(np.arange(len(counts)), counts)
+    row = first_row[edge] + (
+        np.arange(len(edge)) - np.repeat(np.cumsum(counts) - counts, counts)
+    )
+    x0, y0 = p0[edge, 0], p0[edge, 1]
+    x1, y1 = p1[edge, 0], p1[edge, 1]
+    x = x0 + (row - y0) * (x1 - x0) / (y1 - y0)
+
+    # A crossing at x toggles every pixel centre to its right
+    column = np.clip(np.floor(x).astype(np.int64) + 1, 0, x_dim)
+    toggles = np.zeros((y_dim, x_dim + 1), dtype=np.int32)
+    np.add.at(toggles, (row, column), 1)
+    np.cumsum(toggles[:, :x_dim], axis=1, out=toggles[:, :x_dim])
+    return (toggles[:, :x_dim] & 1).astype(bool)
+
+
+def roi_content_hash(roi: "ROI") -> str:
+    """Hash of the curve points of an ROI, used to key cached masks."""
+    return roi.curve_points.content_hash()
+
+
+def mask_content_hash(mask: Any) -> str:
+    """Hash of the voxels of a PackedMask or boolean array, used to key cached results."""
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(mask, PackedMask):
+        digest.update(repr((mask.shape, mask.offset, mask.box_shape)).encode())
+        digest.update(mask.bits.tobytes())
+    else:
+        mask = np.asarray(mask, dtype=bool)
+        digest.update(repr(mask.shape).encode())
+        digest.update(np.packbits(mask, axis=None).tobytes())
+    return digest.hexdigest()
+
+
+def slice_polygons(
+    curves: Iterable[Any], grid: GridGeometry
+) -> Dict[int, List[np.ndarray]]:
+    """
+    Group curves by the nearest grid slice and convert them to (x, y) pixel indices.
+
+    Curves whose slice lies outside the grid are dropped.
+
+    Args:
+        curves: RaggedCurves, Curve objects or (N, 3) point arrays in patient coordinates.
+        grid: Target grid.
+
+    Returns:
+        Mapping from slice index to the polygons of that slice.
+    """
+    from pinnacle_io.models.roi import RaggedCurves
+
+    by_slice: Dict[int, List[np.ndarray]] = {}
+    if isinstance(curves, RaggedCurves):
+        # All curves are converted with a single call on the point buffer
+        index = grid.to_index(curves.points)[:, :2]
+        inverse = grid.inverse_affine
+        slices = np.rint(
+            inverse[2, 2] * curves.z.astype(np.float64) + inverse[2, 3]
+        ).astype(np.int64)
+        valid = (curves.counts >= 3) & (slices >= 0) & (slices < grid.shape[0])
+        for i in np.flatnonzero(valid):
+            by_slice.setdefault(int(slices[i]), []).append(
+                index[curves.offsets[i] : curves.offsets[i + 1]]
+            )
+        return by_slice
+
+    for curve in curves:
+        points = curve.points if hasattr(curve, "points") else np.asarray(curve)
+        if len(points) < 3:
+            continue
+        index = grid.to_index(points)
+        k = int(np.rint(index[:, 2].mean()))
+        if 0 <= k < grid.shape[0]:
+            by_slice.setdefault(k, []).append(index[:, :2])
+    return by_slice
+
+
+def rasterize_curves(curves: Iterable[Any], grid: Any) -> PackedMask:
+    """
+    Rasterize closed curves onto a grid.
+
+    Only the rows and columns covered by the curves of each slice are filled, and the
+    result is cropped to the bounding box of the curves.
+
+    Args:
+        curves: RaggedCurves, Curve objects or (N, 3) point arrays in patient coordinates.
+        grid: Target grid (GridGeometry, ImageSet, DoseGrid or Dose).
+
+    Returns:
+        PackedMask on the grid.
+    """
+    grid = GridGeometry.from_object(grid)
+    z_dim, y_dim, x_dim = grid.shape
+    by_slice = slice_polygons(curves, grid)
+    if not by_slice:
+        return PackedMask(
+            grid.shape, (0, 0, 0), (0, 0, 0), np.zeros(0, dtype=np.uint8), 0
+        )
+
+    # Bounding box of all curves, clipped to the grid
+    stacked = np.concatenate(
+        [polygon for polygons in by_slice.values() for polygon in polygons]
+    )
+    x_start = int(np.clip(np.floor(stacked[:, 0].min()), 0, x_dim))
+    x_stop = int(np.clip(np.ceil(stacked[:, 0].max()) + 1, 0, x_dim))
+    y_start = int(np.clip(np.floor(stacked[:, 1].min()), 0, y_dim))
+    y_stop = int(np.clip(np.ceil(stacked[:, 1].max()) + 1, 0, y_dim))
+    z_start, z_stop = min(by_slice), max(by_slice) + 1
+
+    box = np.zeros(
+        (z_stop - z_start, max(y_stop - y_start, 0), max(x_stop - x_start, 0)),
+        dtype=bool,
+    )
+    if box.size:
+        shift = np.array([x_start, y_start], dtype=np.float64)
+        for k, polygons in by_slice.items():
+            box[k - z_start] = fill_polygons(
+                [p - shift for p in polygons], box.shape[1], box.shape[2]
+            )
+    return PackedMask.from_array_box(grid.shape, (z_start, y_start, x_start), box)
+
+
+def _covered_fractions(
+    polygons: Sequence[np.ndarray],
+    rows: np.ndarray,
+    columns: np.ndarray,
+    x_dim: int,
+    samples: int,
+) -> np.ndarray:
+    """
+    Fraction of each pixel (rows[i], columns[i]) covered by polygons (even-odd rule).
+
+    Each pixel is sampled at samples x samples sub-pixel centres. In sub-pixel units the
+    sample points lie on integer scanlines and columns, so the polygon crossings of every
+    sub-scanline are computed once and each sample point counts the crossings to its left
+    with a binary search.
+    """
+    scale = float(samples)
+    p0 = np.concatenate([(polygon + 0.5) * scale - 0.5 for polygon in polygons])
+    p1 = np.concatenate(
+        [np.roll((polygon + 0.5) * scale - 0.5, -1, axis=0) for polygon in polygons]
+    )
+    lines = (int(rows.max()) + 1) * samples
+    width = x_dim * samples + 2
+
+    # Crossings of the edges with the integer sub-scanlines, as in fill_polygons
+    first = np.clip(np.ceil(np.minimum(p0[:, 1], p1[:, 1])), 0, lines).astype(np.int64)
+    last = np.clip(np.ceil(np.maximum(p0[:, 1], p1[:, 1])), 0, lines).astype(np.int64)
+    counts = last - first
+    keep = counts > 0
+    p0, p1, first, counts = p0[keep], p1[keep], first[keep], counts[keep]
+    edge = np.repeat(np.arange(len(counts)), counts)
+    line = first[edge] + (
+        np.arange(len(edge)) - np.repeat(np.cumsum(counts) - counts, counts)
+    )
+    x = p0[edge, 0] + (line - p0[edge, 1]) * (p1[edge, 0] - p0[edge, 0]) / (
+        p1[edge, 1] - p0[edge, 1]
+    )
+    keys = np.sort(line * width + np.clip(x, -1, width - 2))
+
+    # Sample points of each pixel in sub-pixel units
+    offsets = np.arange(samples)
+    sample_line = rows[:, None, None] * samples + offsets[None, :, None]
+    sample_column = columns[:, None, None] * samples + offsets[None, None, :]
+    sample_line, sample_column = np.broadcast_arrays(sample_line, sample_column)
+    line_start = np.searchsorted(keys, sample_line * width - 1.5)
+    left = np.searchsorted(keys, sample_line * width + sample_column) - line_start
+    return (left & 1).reshape(len(rows), -1).mean(axis=1)
+
+
+def _boundary_pixels(polygons: Sequence[np.ndarray], binary: np.ndarray) -> np.ndarray:
+    """Pixels crossed by the polygons or on the edge of their binary fill."""
+    y_dim, x_dim = binary.shape
+    boundary = np.zeros_like(binary)
+    # Edge of the binary mask: pixels whose 8-neighbourhood is not uniform
+    padded = np.pad(binary, 1, mode="constant")
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            if dy or dx:
+                boundary |= (
+                    padded[1 + dy : 1 + dy + y_dim, 1 + dx : 1 + dx + x_dim] != binary
+                )
+    # Pixels traversed by the curves, which also catches structures smaller than a voxel
+    for polygon in polygons:
+        p1 = np.roll(polygon, -1, axis=0)
+        steps = np.maximum(np.ceil(np.abs(p1 - polygon).max(axis=1) * 4), 1).astype(
+            np.int64
+        )
+        edge = np.repeat(np.arange(len(polygon)), steps)
+        t = (np.arange(len(edge)) - np.repeat(np.cumsum(steps) - steps, steps)) / steps[
+            edge
+        ]
+        samples = polygon[edge] + (p1[edge] - polygon[edge]) * t[:, None]
+        column = np.floor(samples[:, 0] + 0.5).astype(np.int64)
+        row = np.floor(samples[:, 1] + 0.5).astype(np.int64)
+        valid = (column >= 0) & (column < x_dim) & (row >= 0) & (row < y_dim)
+        boundary[row[valid], column[valid]] = True
+    return boundary
+
+
+def rasterize_fractional(
+    curves: Iterable[Any], grid: Any, samples: int = 8
+) -> FractionalMask:
+    """
+    Rasterize closed curves onto a grid with partial-volume fractions.
+
+    The binary fill gives the interior voxels; boundary voxels are supersampled on a
+    samples x samples sub-pixel grid in the slice plane to estimate their covered
+    fraction.
+
+    Args:
+        curves: RaggedCurves, Curve objects or (N, 3) point arrays in patient coordinates.
+        grid: Target grid (GridGeometry, ImageSet, DoseGrid or Dose).
+        samples: Number of sub-pixel samples along each in-plane axis.
+
+    Returns:
+        FractionalMask on the grid.
+    """
+    if samples < 1:
+        raise ValueError(f"samples must be at least 1, got {samples}")
+    grid = GridGeometry.from_object(grid)
+    z_dim, y_dim, x_dim = grid.shape
+    by_slice = slice_polygons(curves, grid)
+    empty = PackedMask(grid.shape, (0, 0, 0), (0, 0, 0), np.zeros(0, dtype=np.uint8), 0)
+    if not by_slice:
+        return FractionalMask(
+            empty, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float16)
+        )
+
+    stacked = np.concatenate(
+        [polygon for polygons in by_slice.values() for polygon in polygons]
+    )
+    x_start = int(np.clip(np.floor(stacked[:, 0].min()), 0, x_dim))
+    x_stop = int(np.clip(np.ceil(stacked[:, 0].max()) + 1, 0, x_dim))
+    y_start = int(np.clip(np.floor(stacked[:, 1].min()), 0, y_dim))
+    y_stop = int(np.clip(np.ceil(stacked[:, 1].max()) + 1, 0, y_dim))
+    z_start, z_stop = min(by_slice), max(by_slice) + 1
+    box = np.zeros(
+        (z_stop - z_start, max(y_stop - y_start, 0), max(x_stop - x_start, 0)),
+        dtype=bool,
+    )
+    if not box.size:
+        return FractionalMask(
+            empty, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float16)
+        )
+
+    shift = np.array([x_start, y_start], dtype=np.float64)
+    indices = []
+    fractions = []
+    for k, polygons in by_slice.items():
+        polygons = [p - shift for p in polygons if len(p) >= 3]
+        binary = fill_polygons(polygons, box.shape[1], box.shape[2])
+        boundary = _boundary_pixels(polygons, binary)
+        rows, columns = np.nonzero(boundary)
+        if len(rows):
+            covered = _covered_fractions(polygons, rows, columns, box.shape[2], samples)
+            binary &= ~boundary
+            full = covered >= 1.0
+            binary[rows[full], columns[full]] = True
+            partial = (covered > 0) & ~full
+            flat = np.ravel_multi_index(
+                (
+                    np.full(int(partial.sum()), k),
+                    rows[partial] + y_start,
+                    columns[partial] + x_start,
+                ),
+                grid.shape,
+            )
+            indices.append(flat)
+            fractions.append(covered[partial])
+        box[k - z_start] = binary
+
+    interior = PackedMask.from_array_box(grid.shape, (z_start, y_start, x_start), box)
+    indices = np.concatenate(indices) if indices else np.zeros(0, dtype=np.int64)
+    fractions = np.concatenate(fractions) if fractions else np.zeros(0)
+    order = np.argsort(indices, kind="stable")
+    return FractionalMask(interior, indices[order], fractions[order].astype(np.float16))
+
+
+class MaskCache:
+    """
+    Thread-safe LRU cache of ROI masks keyed by (ROI content hash, grid).
+
+    Attributes:
+        max_entries: Maximum number of masks kept. None keeps every mask.
+    """
+
+    def __init__(self, max_entries: Optional[int] = 512) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Any, ...], Any]" = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[Any]:
+        with self._lock:
+            mask = self._entries.get(key)
+            if mask is not None:
+                self._entries.move_to_end(key)
+            return mask
+
+    def put(self, key: Tuple[Any, ...], mask: Any) -> None:
+        with self._lock:
+            self._entries[key] = mask
+            self._entries.move_to_end(key)
+            while (
+                self.max_entries is not None and len(self._entries) > self.max_entries
+            ):
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared cache used by get_roi_mask
+mask_cache = MaskCache()
+
+
+def get_roi_mask(
+    roi: "ROI", grid: Any, cache: Optional[MaskCache] = mask_cache
+) -> PackedMask:
+    """
+    Rasterize an ROI onto a grid, using the mask cache.
+
+    Args:
+        roi: ROI with curves.
+        grid: Target grid (GridGeometry, ImageSet, DoseGrid or Dose).
+        cache: Mask cache, or None to always rasterize.
+
+    Returns:
+        PackedMask of the ROI on the grid.
+    """
+    return _cached_mask(roi.curve_points, GridGeometry.from_object(grid), cache)
+
+
+def _cached_mask(
+    ragged: "RaggedCurves", grid: GridGeometry, cache: Optional[MaskCache]
+) -> PackedMask:
+    """Rasterize a point buffer onto a grid, using the mask cache."""
+    if cache is None:
+        return rasterize_curves(ragged, grid)
+    key = (ragged.content_hash(), grid.key)
+    mask = cache.get(key)
+    if mask is None:
+        mask = rasterize_curves(ragged, grid)
+        cache.put(key, mask)
+    return mask
+
+
+def get_roi_fractional_mask(
+    roi: "ROI", grid: Any, samples: int = 8, cache: Optional[MaskCache] = mask_cache
+) -> FractionalMask:
+    """
+    Rasterize an ROI onto a grid with partial-volume fractions, using the mask cache.
+
+    Args:
+        roi: ROI with curves.
+        grid: Target grid (GridGeometry, ImageSet, DoseGrid or Dose).
+        samples: Number of sub-pixel samples along each in-plane axis.
+        cache: Mask cache, or None to always rasterize.
+
+    Returns:
+        FractionalMask of the ROI on the grid.
+    """
+    grid = GridGeometry.from_object(grid)
+    if cache is None:
+        return rasterize_fractional(roi.curve_points, grid, samples)
+    key = (roi_content_hash(roi), grid.key, samples)
+    mask = cache.get(key)
+    if mask is None:
+        mask = rasterize_fractional(roi.curve_points, grid, samples)
+        cache.put(key, mask)
+    return mask
+
+
+def get_roi_masks(
+    rois: Iterable["ROI"],
+    grid: Any,
+    workers: Optional[int] = None,
+    cache: Optional[MaskCache] = mask_cache,
+) -> Dict["ROI", PackedMask]:
+    """
+    Rasterize many ROIs onto a grid in parallel.
+
+    Args:
+        rois: ROIs to rasterize.
+        grid: Target grid (GridGeometry, ImageSet, DoseGrid or Dose).
+        workers: Number of threads. Defaults to the ThreadPoolExecutor default.
+        cache: Mask cache, or None to always rasterize.
+
+    Returns:
+        PackedMask for each ROI.
+    """
+    grid = GridGeometry.from_object(grid)
+    rois = list(rois)
+    # Curves are loaded on the calling thread; a Session must not be used concurrently
+    buffers = [roi.curve_points for roi in rois]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        masks = list(
+            executor.map(lambda ragged: _cached_mask(ragged, grid, cache), buffers)
+        )
+    return dict(zip(rois, masks))
+
+
+def resolve_masks(
+    rois: Iterable["ROI"], grid: Any, masks: Optional[Dict["ROI", Any]] = None
+) -> Dict["ROI", Any]:
+    """
+    Masks for a set of ROIs, rasterizing those not supplied by the caller.
+
+    ROIs with a mask in masks keep it; other ROIs with curves get their cached PackedMask
+    on the grid. ROIs without a mask and without curves are left out.
+
+    Args:
+        rois: ROIs that need a mask.
+        grid: Target grid (GridGeometry, ImageSet, DoseGrid or Dose).
+        masks: Caller-supplied masks.
+
+    Returns:
+        Mask for each ROI that has one.
+    """
+    resolved = dict(masks or {})
+    for roi in rois:
+        if resolved.get(roi) is None and roi.curve_list:
+            resolved[roi] = get_roi_mask(roi, grid)
+    return resolved
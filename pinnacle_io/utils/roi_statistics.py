@@ -0,0 +1,177 @@
+"""
+ROI pixel statistics computed from an image volume.
+
+Statistics for many ROIs are accumulated in a single pass over the image in
+z-slabs: each slab is read once (from memory or from disk) and every ROI whose
+bounding box overlaps the slab accumulates its voxel count, sum, sum of squares,
+minimum and maximum within its bounding box only. Results are written back to the
+ROI pixel_min, pixel_max, pixel_mean, pixel_std and volume columns.
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Mapping, Optional, Tuple
+
+import numpy as np
+
+from pinnacle_io.utils.roi_mask import PackedMask, get_roi_mask
+
+if TYPE_CHECKING:
+    from pinnacle_io.models.image_set import ImageSet
+    from pinnacle_io.models.roi import ROI
+
+
+class ROIStatistics:
+    """
+    Running pixel statistics of one ROI.
+
+    Attributes:
+        count: Number of voxels in the ROI.
+        minimum: Minimum pixel value, or None for an empty ROI.
+        maximum: Maximum pixel value, or None for an empty ROI.
+        volume: Volume of the ROI (count times the voxel volume).
+    """
+
+    def __init__(self, voxel_volume: float = 1.0) -> None:
+        self.voxel_volume = voxel_volume
+        self.count = 0
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.minimum: Optional[float] = None
+        self.maximum: Optional[float] = None
+
+    def add(self, values: np.ndarray) -> None:
+        """Accumulate the pixel values of a part of the ROI."""
+        if not values.size:
+            return
+        values = values.astype(np.float64, copy=False)
+        self.count += values.size
+        self.total += float(values.sum())
+        self.total_squares += float(np.dot(values, values))
+        low, high = float(values.min()), float(values.max())
+        self.minimum = low if self.minimum is None else min(self.minimum, low)
+        self.maximum = high if self.maximum is None else max(self.maximum, high)
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    @property
+    def std(self) -> Optional[float]:
+        """Population standard deviation of the pixel values."""
+        if not self.count:
+            return None
+        variance = self.total_squares / self.count - self.mean**2
+        return float(np.sqrt(max(variance, 0.0)))
+
+    @property
+    def volume(self) -> float:
+        return self.count * self.voxel_volume
+
+    def apply_to(self, roi: "ROI") -> None:
+        """Write the statistics to the ROI columns."""
+        roi.pixel_min = self.minimum
+        roi.pixel_max = self.maximum
+        roi.pixel_mean = self.mean
+        roi.pixel_std = self.std
+        roi.volume = self.volume
+
+    def __repr__(self) -> str:
+        return f"<ROIStatistics(count={self.count}, mean={self.mean}, std={self.std})>"
+
+
+def mask_bounding_box(mask: np.ndarray) -> Optional[Tuple[slice, slice, slice]]:
+    """
+    Bounding box of the True voxels of a (z, y, x) mask.
+
+    Returns:
+        Tuple of (z, y, x) slices, or None for an empty mask.
+    """
+    bounds = []
+    for axis in range(3):
+        other = tuple(a for a in range(3) if a != axis)
+        occupied = np.flatnonzero(mask.any(axis=other))
+        if not len(occupied):
+            return None
+        bounds.append(slice(int(occupied[0]), int(occupied[-1]) + 1))
+    return tuple(bounds)
+
+
+def compute_roi_statistics(
+    image_set: "ImageSet",
+    rois: Iterable["ROI"],
+    masks: Optional[Mapping["ROI", Any]] = None,
+    chunk_size: int = 16,
+    write: bool = True,
+) -> Dict["ROI", ROIStatistics]:
+    """
+    Compute pixel statistics for many ROIs in one pass over the image.
+
+    Args:
+        image_set: ImageSet with pixel data loaded or readable from its source files.
+        rois: ROIs to evaluate.
+        masks: Boolean (z, y, x) mask (or PackedMask) on the image grid for each ROI. ROIs
+            without a mask are rasterized from their curves through the mask cache, and
+            skipped if they have no curves.
+        chunk_size: Number of axial slices read at a time.
+        write: If True, write the results to the ROI columns.
+
+    Returns:
+        ROIStatistics for each evaluated ROI. The volume is in the unit of the pixel
+        spacing cubed (cm^3 for Pinnacle image sets).
+    """
+    shape = (int(image_set.z_dim), int(image_set.y_dim), int(image_set.x_dim))
+    spacing = [image_set.x_pixdim, image_set.y_pixdim, image_set.z_pixdim]
+    voxel_volume = float(np.prod(spacing)) if all(spacing) else 1.0
+
+    # Each ROI is evaluated only within the bounding box of its mask
+    regions = []
+    results: Dict["ROI", ROIStatistics] = {}
+    for roi in rois:
+        mask = None if masks is None else masks.get(roi)
+        if mask is None:
+            if not roi.curve_list:
+                continue
+            mask = get_roi_mask(roi, image_set)
+        results[roi] = ROIStatistics(voxel_volume)
+
+        if isinstance(mask, PackedMask):
+            if mask.shape != shape:
+                raise ValueError(
+                    f"Mask shape {mask.shape} for ROI '{roi.name}' does not match image shape {shape}"
+                )
+            if mask.count:
+                regions.append((results[roi], mask.box(), mask.bbox))
+            continue
+
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != shape:
+            raise ValueError(
+                f"Mask shape {mask.shape} for ROI '{roi.name}' does not match image shape {shape}"
+            )
+        bbox = mask_bounding_box(mask)
+        if bbox is not None:
+            regions.append((results[roi], mask[bbox], bbox))
+
+    if regions:
+        z_start = min(bbox[0].start for _, _, bbox in regions)
+        z_stop = max(bbox[0].stop for _, _, bbox in regions)
+        for z0 in range(z_start, z_stop, chunk_size):
+            z1 = min(z0 + chunk_size, z_stop)
+            active = [
+                region
+                for region in regions
+                if region[2][0].start < z1 and region[2][0].stop > z0
+            ]
+            if not active:
+                continue
+            slab = image_set.get_slab_data(z0, z1)
+            for statistics, box_mask, (z_box, y_box, x_box) in active:
+                start, stop = max(z0, z_box.start), min(z1, z_box.stop)
+                values = slab[start - z0 : stop - z0, y_box, x_box]
+                statistics.add(
+                    values[box_mask[start - z_box.start : stop - z_box.start]]
+                )
+
+    if write:
+        for roi, statistics in results.items():
+            statistics.apply_to(roi)
+    return results
@@ -1,20 +1,130 @@
 """
-Writer for Pinnacle Dose files.
+Writer for Pinnacle plan.Trial.binary.### files.
 """
 
-from pinnacle_io.models import Dose
+import os
+import stat
+import tempfile
+from typing import Any, Optional
+
+import numpy as np
+
+from pinnacle_io.models import Dose, DoseGrid
+from pinnacle_io.readers.dose_reader import DOSE_DATA_TYPE
+
+
+def _output_file_mode(file_path: str) -> int:
+    """Permission bits for the output file: those of the file it replaces, else 0666 minus the umask."""
+    try:
+        return stat.S_IMODE(os.stat(file_path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
 
 class DoseWriter:
     """
-    Writer for Pinnacle Dose files.
+    Writer for Pinnacle plan.Trial.binary.### files.
     """
+
     @staticmethod
-    def write(dose: Dose, path: str) -> None:
+    def write(dose: Dose, path: str) -> str:
         """
-        Write a Pinnacle Dose model to a file.
+        Write the pixel data of a Pinnacle Dose model to a binary dose file.
 
         Args:
-            dose: Dose model
-            path: Path to write the Dose file
+            dose: Dose model with unscaled pixel data in (z, y, x) order
+            path: Path to write the Dose file. If path is a directory, the file name is taken
+                from the dose's beam (e.g. plan.Trial.binary.001).
+
+        Returns:
+            Path of the written file
+
+        Raises:
+            ValueError: If the dose has no pixel data or its shape does not match the DoseGrid.
         """
-        raise NotImplementedError("DoseWriter.write is not implemented")
+        if dose.pixel_data is None:
+            raise ValueError("Dose has no pixel data to write.")
+
+        path = str(path)
+        if os.path.isdir(path):
+            if dose.beam is None:
+                raise ValueError(
+                    "A file name is required to write a Dose that is not associated with a beam."
+                )
+            path = os.path.join(path, dose.beam.dose_volume_file)
+
+        DoseWriter.write_binary_dose(dose.pixel_data, path, dose.dose_grid)
+        return path
+
+    @staticmethod
+    def write_binary_dose(
+        data: Any, file_path: str, dose_grid: Optional[DoseGrid] = None
+    ) -> int:
+        """
+        Stream a dose volume to a Pinnacle binary dose file one z-slab at a time.
+
+        The source may be any array-like object with a 3D ``shape`` that returns a (y, x)
+        slab for ``data[k]``, such as a numpy array, a memmap or a lazily evaluated dose.
+        Each slab is converted into a reusable big-endian float32 buffer, so a full
+        big-endian copy of the volume is never created. The data is written to a temporary
+        file in the destination directory, which is renamed over file_path only after the
+        size has been verified.
+
+        Args:
+            data: Unscaled dose data in (z, y, x) order.
+            file_path: Path of the binary dose file to write.
+            dose_grid: Optional DoseGrid providing the expected dimensions of the dose volume.
+
+        Returns:
+            Number of bytes written.
+
+        Raises:
+            ValueError: If the data shape does not match the DoseGrid dimensions, or the
+                written file does not have the expected size.
+        """
+        shape = tuple(int(n) for n in data.shape)
+        if len(shape) != 3:
+            raise ValueError(f"Expected 3D dose data, got shape {shape}")
+        if dose_grid is not None:
+            expected_shape = (
+                int(dose_grid.dimension_z),
+                int(dose_grid.dimension_y),
+                int(dose_grid.dimension_x),
+            )
+            if shape != expected_shape:
+                raise ValueError(
+                    f"Dose data shape {shape} does not match DoseGrid dimensions (z, y, x) {expected_shape}"
+                )
+
+        z_dim, y_dim, x_dim = shape
+        slab = np.empty((y_dim, x_dim), dtype=DOSE_DATA_TYPE)
+        expected_size = z_dim * slab.nbytes
+
+        directory = os.path.dirname(os.path.abspath(file_path))
+        fd, temp_path = tempfile.mkstemp(
+            prefix=f".{os.path.basename(file_path)}.", suffix=".tmp", dir=directory
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for k in range(z_dim):
+                    np.copyto(slab, data[k], casting="unsafe")
+                    f.write(memoryview(slab).cast("B"))
+                f.flush()
+                os.fsync(f.fileno())
+                written = os.fstat(f.fileno()).st_size
+
+            if written != expected_size:
+                raise ValueError(
+                    f"Wrote {written} bytes to {file_path}, expected {expected_size} for shape {shape}"
+                )
+            # mkstemp creates the file with mode 0600; use the mode open() would give
+            os.chmod(temp_path, _output_file_mode(file_path))
+            os.replace(temp_path, file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        return written
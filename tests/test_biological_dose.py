@@ -0,0 +1,89 @@
+"""
+Tests for BED/EQD2 conversion.
+"""
+
+import numpy as np
+import pytest
+
+from pinnacle_io.models import ROI, Dose, DoseGrid, Prescription, Trial
+from pinnacle_io.utils.biological_dose import BiologicalDose, compute_bed, compute_eqd2
+
+
+def _make_dose(trial=None, unit="GY"):
+    rng = np.random.default_rng(0)
+    pixel_data = rng.uniform(0, 30, (6, 4, 5)).astype(np.float32)
+    return Dose(
+        dose_id="1",
+        dose_unit=unit,
+        dose_type="PHYSICAL",
+        pixel_data=pixel_data,
+        dose_grid_scaling=2.0,
+        trial=trial,
+    )
+
+
+def test_bed_and_eqd2_uniform_alpha_beta():
+    """Test the LQ conversion against the closed-form expressions."""
+    dose = _make_dose()
+    physical = dose.pixel_data.astype(np.float64) * 2.0
+
+    bed = compute_bed(dose, number_of_fractions=5, alpha_beta=3.0, chunk_size=4)
+    assert bed.dose_type == "EFFECTIVE"
+    assert bed.dose_unit == "GY"
+    assert bed.dose_grid_scaling == 1.0
+    assert bed.pixel_data.dtype == np.float32
+    expected_bed = physical * (1 + physical / 5 / 3.0)
+    assert np.allclose(bed.pixel_data, expected_bed, rtol=1e-5)
+
+    eqd2 = dose.to_eqd2(number_of_fractions=5, alpha_beta=3.0)
+    assert np.allclose(eqd2.pixel_data, expected_bed / (1 + 2 / 3.0), rtol=1e-5)
+    assert "EQD2" in eqd2.dose_comment
+
+
+def test_eqd2_per_roi_alpha_beta_and_trial_fractions():
+    """Test per-ROI alpha/beta maps and the number of fractions from the trial."""
+    trial = Trial(name="Trial_1")
+    trial.prescription_list = [Prescription(name="Rx", number_of_fractions=3)]
+    dose = _make_dose(trial=trial, unit="CGY")
+    dose.pixel_data *= 100
+    physical = dose.pixel_data.astype(np.float64) * 2.0
+    assert dose.get_number_of_fractions() == 3
+
+    cord, ptv = ROI(name="Cord"), ROI(name="PTV")
+    cord_mask = np.zeros(physical.shape, dtype=bool)
+    cord_mask[:, 0, :] = True
+    ptv_mask = np.zeros(physical.shape, dtype=bool)
+    ptv_mask[2:4, :2, :] = True
+
+    result = compute_eqd2(
+        dose,
+        roi_alpha_beta={cord: 2.0, ptv: 10.0},
+        masks={cord: cord_mask, ptv: ptv_mask},
+        chunk_size=2,
+        workers=3,
+    )
+
+    ratios = np.full(physical.shape, 1000.0)
+    ratios[cord_mask] = 200.0
+    ratios[ptv_mask] = 1000.0
+    expected = physical * (1 + physical / 3 / ratios) / (1 + 200.0 / ratios)
+    assert np.allclose(result.pixel_data, expected, rtol=1e-5)
+
+
+def test_biological_dose_invalid_input():
+    """Test error handling for missing fractions, masks and invalid ratios."""
+    dose = _make_dose()
+    roi = ROI(name="Cord")
+    with pytest.raises(ValueError, match="number_of_fractions"):
+        dose.to_bed()
+    with pytest.raises(ValueError, match="alpha_beta"):
+        BiologicalDose(dose, 5, alpha_beta=0.0)
+    with pytest.raises(ValueError, match="mask is required"):
+        BiologicalDose(dose, 5, roi_alpha_beta={roi: 2.0})
+    with pytest.raises(ValueError, match="does not match"):
+        BiologicalDose(
+            dose,
+            5,
+            roi_alpha_beta={roi: 2.0},
+            masks={roi: np.ones((2, 2, 2), dtype=bool)},
+        )
@@ -2,12 +2,16 @@
 Tests for the CPManager model.
 """
 
+import numpy as np
+
 from pinnacle_io.models import (
-    ControlPoint,
     Beam,
+    ControlPoint,
     CPManager,
+    MLCLeafPositions,
 )
 
+
 def test_cp_manager_initialization():
     """Test CPManager initialization with all fields."""
     cp_manager = CPManager(
@@ -19,7 +23,7 @@ def test_cp_manager_initialization():
         gantry_is_ccw=1,
         mlc_push_method="AUTO",
         jaws_conformance="INNER",
-        _number_of_control_points=2
+        _number_of_control_points=2,
     )
 
     # Test all fields are set correctly
@@ -38,17 +42,17 @@ def test_cp_manager_initialization():
 def test_cp_manager_number_of_control_points():
     """Test the number_of_control_points property and setter."""
     cp_manager = CPManager(_number_of_control_points=3)
-    
+
     # Initially no control points
     assert cp_manager.number_of_control_points == 0
-    
+
     # Add control points
     ControlPoint(gantry=0.0, cp_manager=cp_manager)
     assert cp_manager.number_of_control_points == 1
-    
+
     ControlPoint(gantry=180.0, cp_manager=cp_manager)
     assert cp_manager.number_of_control_points == 2
-    
+
     # Test that _number_of_control_points can be different from actual number
     cp_manager.number_of_control_points = 5
     assert cp_manager._number_of_control_points == 5
@@ -59,17 +63,17 @@ def test_cp_manager_beam_relationship():
     """Test CPManager relationship with Beam."""
     beam = Beam(name="BEAM1", beam_number=1)
     cp_manager = CPManager(_number_of_control_points=2, beam=beam)
-    
+
     # Verify beam relationship
     assert cp_manager.beam is beam
     assert cp_manager.beam_id == beam.id
     assert beam.cp_manager is cp_manager
-    
+
     # Test control points are accessible through beam
     cp1 = ControlPoint(gantry=0.0, beam=beam)
     cp2 = ControlPoint(gantry=90.0, cp_manager=cp_manager)
     cp3 = ControlPoint(gantry=180.0, beam=beam, cp_manager=cp_manager)
-    
+
     assert cp1 in beam.control_point_list
     assert cp2 in beam.control_point_list
     assert cp3 in beam.control_point_list
@@ -80,11 +84,54 @@ def test_cp_manager_repr():
     cp_manager = CPManager()
     ControlPoint(gantry=0.0, cp_manager=cp_manager)
     ControlPoint(gantry=180.0, cp_manager=cp_manager)
-    
+
     expected_repr = "<CPManager(id=None, beam='', number_of_control_points=2)>"
     assert repr(cp_manager) == expected_repr
-    
+
     cp_manager.beam = Beam(name="BEAM1")
     expected_repr = "<CPManager(id=None, beam='BEAM1', number_of_control_points=2)>"
     assert repr(cp_manager) == expected_repr
-    
+
+
+def test_get_mlc_leaf_positions_array(db_session):
+    """Test the cached (n_cp, n_leaf_pairs, 2) leaf position array."""
+    rng = np.random.default_rng(0)
+    leaves = [
+        np.round(rng.uniform(-5, 5, (60, 2)), 1).astype(np.float32) for _ in range(3)
+    ]
+    cp_manager = CPManager(
+        control_point_list=[ControlPoint(mlc_leaf_positions=value) for value in leaves]
+    )
+    beam = Beam(name="Arc", cp_manager=cp_manager)
+
+    array = beam.get_mlc_leaf_positions()
+    assert array.shape == (3, 60, 2) and array.dtype == np.float32
+    np.testing.assert_allclose(array, np.stack(leaves), atol=1e-6)
+    assert beam.get_mlc_leaf_positions() is array
+
+    # Control point positions are views into the array
+    control_points = cp_manager.control_point_list
+    array[1, 0, 0] = -7.5
+    assert control_points[1].mlc_leaf_positions[0, 0] == -7.5
+
+    # Replacing positions or adding a control point rebuilds the array
+    control_points[2].mlc_leaf_positions = np.zeros((60, 2), dtype=np.float32)
+    rebuilt = beam.get_mlc_leaf_positions()
+    assert rebuilt is not array and not rebuilt[2].any()
+    cp_manager.control_point_list.append(ControlPoint())
+    extended = beam.get_mlc_leaf_positions()
+    assert extended.shape == (4, 60, 2) and np.isnan(extended[3]).all()
+    assert Beam(name="Empty").get_mlc_leaf_positions() is None
+
+    # In-place changes are written on commit, also for positions already in the database
+    db_session.add(beam)
+    db_session.commit()
+    extended[0, 0, 0] = 1.5
+    db_session.commit()
+    position_ids = [cp._mlc_leaf_positions.id for cp in control_points[:3]]
+    db_session.expunge_all()
+    reloaded = [
+        db_session.get(MLCLeafPositions, position_id) for position_id in position_ids
+    ]
+    assert reloaded[0].points[0, 0] == 1.5 and reloaded[1].points[0, 0] == -7.5
+    assert not reloaded[2].points.any()
@@ -0,0 +1,155 @@
+"""
+Tests for the auto-cropped sparse dose representation.
+"""
+
+import numpy as np
+import pytest
+
+from pinnacle_io.models import Dose, DoseGrid
+from pinnacle_io.utils.cropped_dose import CroppedVolume
+
+
+def _small_field(shape=(12, 16, 20)):
+    """Create a volume that is zero outside a small block."""
+    rng = np.random.default_rng(1)
+    volume = np.zeros(shape, dtype=np.float32)
+    volume[4:7, 5:9, 8:13] = rng.random((3, 4, 5), dtype=np.float32) + 0.5
+    return volume
+
+
+def test_crop_bounding_box_and_padding():
+    """Test that the bounding box is found and access is transparently padded."""
+    volume = _small_field()
+    cropped = CroppedVolume.from_array(volume)
+
+    assert cropped.shape == volume.shape
+    assert cropped.offset == (4, 5, 8)
+    assert cropped.data.shape == (3, 4, 5)
+    assert cropped.occupancy == pytest.approx(60 / volume.size)
+    assert np.array_equal(np.asarray(cropped), volume)
+    assert np.array_equal(cropped[5], volume[5])
+    assert np.array_equal(cropped[0], volume[0])
+    assert np.array_equal(cropped[3:8], volume[3:8])
+    assert np.array_equal(cropped[:, 6, :], volume[:, 6, :])
+    assert cropped[5, 6, 9] == volume[5, 6, 9]
+
+    with_margin = CroppedVolume.from_array(volume, margin=2)
+    assert with_margin.offset == (2, 3, 6)
+    assert with_margin.data.shape == (7, 8, 9)
+
+    empty = CroppedVolume.from_array(np.zeros((2, 3, 4)))
+    assert empty.data.size == 0
+    assert np.array_equal(empty[1], np.zeros((3, 4)))
+    assert empty.max() == 0.0
+
+
+def test_cropped_assignment_grows_the_box():
+    """Test writes inside and outside the bounding box, and Dose.set_slice_data after crop."""
+    volume = _small_field()
+    cropped = CroppedVolume.from_array(volume)
+
+    cropped[5, 6, 9] = 3.0
+    volume[5, 6, 9] = 3.0
+    assert cropped.offset == (4, 5, 8) and cropped.data.shape == (3, 4, 5)
+
+    # Zeros outside the box are dropped, other values grow it
+    cropped[0] = 0.0
+    assert cropped.data.shape == (3, 4, 5)
+    cropped[10, 2:4, 1::5] = [[1.0, 2.0, 0.0, 4.0], [5.0, 6.0, 7.0, 0.0]]
+    volume[10, 2:4, 1::5] = [[1.0, 2.0, 0.0, 4.0], [5.0, 6.0, 7.0, 0.0]]
+    assert cropped.offset == (4, 2, 1) and cropped.data.shape == (7, 7, 16)
+    cropped[..., 19] = 2.0
+    volume[..., 19] = 2.0
+    assert np.array_equal(np.asarray(cropped), volume)
+
+    empty = CroppedVolume.from_array(np.zeros((2, 3, 4), dtype=np.float32))
+    empty[1, 2] = [0.0, 1.0, 0.0, 0.0]
+    assert empty.offset == (1, 2, 1) and empty.data.shape == (1, 1, 1)
+
+    mask = volume > 1.0
+    cropped[mask] = -1.0
+    volume[mask] = -1.0
+    assert cropped.offset == (0, 0, 0)
+    assert np.array_equal(np.asarray(cropped), volume)
+
+    dose_grid = DoseGrid(dimension_x=20, dimension_y=16, dimension_z=12)
+    dose = Dose(dose_id="1", pixel_data=_small_field(), dose_grid=dose_grid)
+    dose.crop()
+    dose.set_slice_data(0, np.full((16, 20), 2.0, dtype=np.float32))
+    assert (dose.get_slice_data(0) == 2.0).all()
+    assert dose.pixel_data.offset[0] == 0
+
+
+def test_cropped_reductions_match_full_volume():
+    """Test that reductions only visit the occupied region but match the full volume."""
+    volume = _small_field()
+    cropped = CroppedVolume.from_array(volume)
+
+    assert np.max(cropped) == volume.max()
+    assert np.min(cropped) == volume.min()
+    assert np.sum(cropped) == pytest.approx(volume.sum(dtype=np.float64))
+    assert np.mean(cropped) == pytest.approx(volume.mean(dtype=np.float64))
+    assert np.array_equal(np.max(cropped, axis=0), volume.max(axis=0))
+
+
+def test_cropped_masked_values_and_interpolation():
+    """Test DVH value gathering and trilinear interpolation."""
+    volume = _small_field()
+    cropped = CroppedVolume.from_array(volume)
+
+    mask = np.zeros(volume.shape, dtype=bool)
+    mask[3:6, 4:10, 7:12] = True
+    assert np.array_equal(np.sort(cropped.masked_values(mask)), np.sort(volume[mask]))
+
+    rng = np.random.default_rng(2)
+    points = rng.uniform(0, 1, (200, 3)) * (np.array(volume.shape[::-1]) - 1)
+    expected = np.array([_trilinear(volume, p) for p in points])
+    assert np.allclose(cropped.interpolate(points), expected)
+    assert cropped.interpolate([[-5.0, 0.0, 0.0]])[0] == 0.0
+
+
+def _trilinear(volume, point):
+    """Reference trilinear interpolation at a continuous (x, y, z) index."""
+    z, y, x = point[::-1]
+    z0, y0, x0 = int(np.floor(z)), int(np.floor(y)), int(np.floor(x))
+    value = 0.0
+    for dz in (0, 1):
+        for dy in (0, 1):
+            for dx in (0, 1):
+                zi = min(z0 + dz, volume.shape[0] - 1)
+                yi = min(y0 + dy, volume.shape[1] - 1)
+                xi = min(x0 + dx, volume.shape[2] - 1)
+                weight = (
+                    (z - z0 if dz else 1 - (z - z0))
+                    * (y - y0 if dy else 1 - (y - y0))
+                    * (x - x0 if dx else 1 - (x - x0))
+                )
+                value += weight * volume[zi, yi, xi]
+    return value
+
+
+def test_dose_crop_and_summation():
+    """Test Dose.crop and summing cropped doses with lazy expressions."""
+    volume = _small_field()
+    dense = Dose(
+        dose_id="dense",
+        pixel_data=np.full(volume.shape, 0.25, dtype=np.float32),
+        dose_grid_scaling=1.0,
+    )
+    dose = Dose(dose_id="1", pixel_data=volume.copy(), dose_grid_scaling=2.0)
+
+    cropped = dose.crop(threshold=0.2)
+    assert dose.pixel_data is cropped
+    assert dose.get_max_dose() == pytest.approx(volume.max() * 2.0)
+    assert dose.get_mean_dose() == pytest.approx(volume.mean(dtype=np.float64) * 2.0)
+
+    other = Dose(
+        dose_id="2", pixel_data=np.roll(volume, 3, axis=2), dose_grid_scaling=1.0
+    )
+    other.crop()
+    result = (3.0 * dose.lazy() + other.lazy() - dense).evaluate(chunk_size=5)
+    expected = 6.0 * volume + np.roll(volume, 3, axis=2) - 0.25
+    assert np.allclose(result, expected)
+
+    with pytest.raises(ValueError, match="no pixel data"):
+        Dose(dose_id="empty").crop()
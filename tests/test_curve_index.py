@@ -0,0 +1,105 @@
+"""
+Tests for the slice-indexed curve lookup.
+"""
+
+import numpy as np
+
+from pinnacle_io.models import ROI, Curve, ImageInfo, ImageSet, Plan
+
+
+def _square(x0, y0, x1, y1, z):
+    return np.array(
+        [[x0, y0, z], [x1, y0, z], [x1, y1, z], [x0, y1, z]], dtype=np.float32
+    )
+
+
+def _image_set(**kwargs):
+    return ImageSet(
+        x_dim=10,
+        y_dim=10,
+        z_dim=4,
+        x_pixdim=1.0,
+        y_pixdim=1.0,
+        z_pixdim=0.5,
+        x_start=0.0,
+        y_start=0.0,
+        z_start=0.0,
+        **kwargs,
+    )
+
+
+def _plan():
+    body = ROI(
+        name="Body",
+        curve_list=[Curve(points=_square(0, 0, 9, 9, 0.5 * k)) for k in range(4)],
+    )
+    target = ROI(
+        name="Target",
+        curve_list=[
+            Curve(points=_square(2, 2, 4, 4, 0.5)),
+            Curve(points=_square(6, 6, 8, 8, 0.5)),
+            Curve(points=_square(2, 2, 4, 4, 5.0)),  # not on any slice
+        ],
+    )
+    return Plan(roi_list=[body, target]), body, target
+
+
+def test_curve_slice_index():
+    """Test slice lookup, bounding boxes and filled curve positions."""
+    plan, body, target = _plan()
+    image_set = _image_set()
+    index = plan.get_curve_slice_index(image_set)
+    assert len(index) == 6
+    assert plan.get_curve_slice_index(image_set) is index
+
+    pairs = index.curves_on_slice(1)
+    assert [(roi.name, curve) for roi, curve in pairs] == [
+        ("Body", body.curve_list[1]),
+        ("Target", target.curve_list[0]),
+        ("Target", target.curve_list[1]),
+    ]
+    assert [
+        curve for _, curve in index.curves_on_slice(1, roi=target)
+    ] == target.curve_list[:2]
+    assert [curve for _, curve in index.curves_on_slice(1, bounds=(5, 5, 7, 7))] == [
+        body.curve_list[1],
+        target.curve_list[1],
+    ]
+    assert index.curves_on_slice(3, roi=target) == []
+    assert index.curves_on_slice(10) == []
+    assert np.array_equal(
+        index.bounding_boxes[index.entries_on_slice(1, roi=target)],
+        [[2, 2, 4, 4], [6, 6, 8, 8]],
+    )
+
+    assert [curve.slice_index for curve in target.curve_list] == [1, 1, None]
+    assert target.curve_list[2].z_position == 5.0
+
+    mask = index.get_slice_mask(target, 1)
+    assert mask.shape == (10, 10)
+    assert mask.sum() == 2 * 4
+    assert index.points_on_slice(1, roi=target)[target][1][0, 0] == 6.0
+
+    # Editing a curve rebuilds the index
+    target.curve_list[2].points = _square(2, 2, 4, 4, 1.5)
+    rebuilt = plan.get_curve_slice_index(image_set)
+    assert rebuilt is not index
+    assert target.curve_list[2].slice_index == 3
+
+
+def test_curve_slice_index_from_table_positions():
+    """Test resolving slices from ImageInfo table positions in descending order."""
+    plan, body, target = _plan()
+    image_info_list = [
+        ImageInfo(table_position=0.5 * (3 - k), slice_number=k + 1) for k in range(4)
+    ]
+    image_set = _image_set(image_info_list=image_info_list)
+    index = plan.get_curve_slice_index(image_set)
+    assert [curve.slice_index for curve in body.curve_list] == [3, 2, 1, 0]
+    assert [
+        curve for _, curve in index.curves_on_slice(2, roi=target)
+    ] == target.curve_list[:2]
+    assert np.array_equal(
+        image_set.image_info_table.find_slices([1.4, 0.1, 9.0], tolerance=0.25),
+        [0, 3, -1],
+    )
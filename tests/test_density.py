@@ -0,0 +1,118 @@
+"""
+Tests for CT number to density conversion.
+"""
+
+import numpy as np
+import pytest
+
+from pinnacle_io.models import ROI, ImageSet, PatientRepresentation
+from pinnacle_io.utils.density import CTToDensityTable, find_ct_to_density_table
+
+TABLE_CONTENT = """Name = "Standard CT";
+Version = "1";
+Table ={
+  Points[] ={
+    0,0,
+    1000,1,
+    3000,2.5
+  };
+};
+"""
+
+
+def _table():
+    return CTToDensityTable("Standard CT", [0, 1000, 3000], [0.0, 1.0, 2.5])
+
+
+def test_parse_ct_to_density_table(tmp_path):
+    """Test reading a table file and finding it by name."""
+    path = tmp_path / "table_1"
+    path.write_text(TABLE_CONTENT)
+
+    table = CTToDensityTable.read(path)
+    assert table.name == "Standard CT"
+    assert table.version == "1"
+    assert np.array_equal(table.ct_numbers, [0, 1000, 3000])
+    assert np.array_equal(table.densities, [0.0, 1.0, 2.5])
+    assert CTToDensityTable.read(path) is table
+
+    (tmp_path / "notes.txt").write_text('Comment = "nothing here";\n')
+    assert find_ct_to_density_table(tmp_path, "Standard CT") is table
+    representation = PatientRepresentation(ct_to_density_name="Standard CT")
+    assert representation.get_ct_to_density_table(str(tmp_path)) is table
+    with pytest.raises(FileNotFoundError):
+        find_ct_to_density_table(tmp_path, "Other")
+
+    with pytest.raises(ValueError):
+        CTToDensityTable("Bad", [0, 0], [1, 2])
+
+
+def test_lookup_table_conversion():
+    """Test that the lookup table matches direct interpolation for all byte orders."""
+    table = _table()
+    image = np.array([[0, 500, 1000], [2000, 3000, 4000]], dtype=np.uint16)
+    expected = np.interp(image, [0, 1000, 3000], [0.0, 1.0, 2.5]).astype(np.float32)
+
+    assert table.lookup_table().shape == (65536,)
+    assert np.allclose(table.convert(image), expected)
+    assert np.allclose(table.convert(image.astype(">u2")), expected)
+    assert np.allclose(table.convert(image.astype(np.int16)), expected)
+    assert table.convert(np.array([-1000], dtype=np.int16))[0] == 0.0
+    assert np.allclose(table.convert(image.astype(np.float64)), expected)
+
+
+def test_image_set_density_with_overrides():
+    """Test density overrides by ROI order and caching per image set."""
+    volume = np.full((2, 3, 4), 1000, dtype=np.uint16)
+    image_set = ImageSet(x_dim=4, y_dim=3, z_dim=2, pixel_data=volume)
+    table = _table()
+
+    low = ROI(name="Lung", override_data=True, density=0.25, override_order=1)
+    high = ROI(name="Metal", override_data=True, density=4.0, override_order=2)
+    ignored = ROI(name="Body", override_data=False, density=9.0)
+    low_mask = np.zeros(volume.shape, dtype=bool)
+    low_mask[0] = True
+    high_mask = np.zeros(volume.shape, dtype=bool)
+    high_mask[0, 0] = True
+
+    density = image_set.get_density(
+        table, [high, ignored, low], {low: low_mask, high: high_mask}
+    )
+    assert density.dtype == np.float32
+    assert (density[0, 0] == 4.0).all()
+    assert (density[0, 1:] == 0.25).all()
+    assert (density[1] == 1.0).all()
+    assert (
+        image_set.get_density(
+            table, [high, ignored, low], {low: low_mask, high: high_mask}
+        )
+        is density
+    )
+
+    with pytest.raises(ValueError):
+        image_set.get_density(table, [low])
+
+    image_set.set_slice_data(1, np.zeros((3, 4), dtype=np.uint16))
+    assert (image_set.get_density(table)[1] == 0.0).all()
+
+
+def test_image_set_density_cache_keys_on_mask_contents():
+    """Test the density cache reuses equal masks, follows edits and stays bounded."""
+    volume = np.full((2, 3, 4), 1000, dtype=np.uint16)
+    image_set = ImageSet(x_dim=4, y_dim=3, z_dim=2, pixel_data=volume)
+    table = _table()
+    roi = ROI(name="Lung", override_data=True, density=0.25, override_order=1)
+    mask = np.zeros(volume.shape, dtype=bool)
+    mask[0] = True
+
+    density = image_set.get_density(table, [roi], {roi: mask})
+    assert image_set.get_density(table, [roi], {roi: mask.copy()}) is density
+
+    mask[1, 0] = True
+    edited = image_set.get_density(table, [roi], {roi: mask})
+    assert edited is not density
+    assert (edited[1, 0] == 0.25).all()
+
+    image_set.get_density(table)
+    assert len(image_set._density_cache) == 2
+    assert image_set.get_density(table, [roi], {roi: mask}) is edited
@@ -1,11 +1,15 @@
 """
 Tests for the Dose model, reader, and writer.
 """
+
+import os
+import stat
 from pathlib import Path
-import pytest
+
 import numpy as np
+import pytest
 
-from pinnacle_io.models import Dose, DoseGrid, Trial, Beam
+from pinnacle_io.models import Beam, Dose, DoseGrid, Trial
 from pinnacle_io.readers.dose_reader import DoseReader
 from pinnacle_io.writers.dose_writer import DoseWriter
 
@@ -13,11 +17,8 @@ from pinnacle_io.writers.dose_writer import DoseWriter
 def test_dose_initialization():
     """Test creating a Dose directly with kwargs."""
     # Create a test trial first
-    trial = Trial(
-        trial_id=1,
-        trial_name="Test Trial"
-    )
-    
+    trial = Trial(trial_id=1, trial_name="Test Trial")
+
     # Create a dose grid for testing and associate it with the trial
     dose_grid = DoseGrid(
         dimension_x=100,
@@ -29,21 +30,21 @@ def test_dose_initialization():
         origin_x=-100.0,
         origin_y=-100.0,
         origin_z=0.0,
-        trial=trial  # Associate with trial
+        trial=trial,  # Associate with trial
     )
-    
+
     # Create a test beam and associate it with the trial
     beam = Beam(
         beam_number=1,
         name="Beam 1",
         description="Test beam",
         dose_volume_file="plan.Trial.binary.1",
-        trial=trial  # Associate with trial
+        trial=trial,  # Associate with trial
     )
-    
-    # Create sample pixel data
-    pixel_data = np.random.rand(100, 100, 50).astype(np.float32)
-    
+
+    # Create sample pixel data in (z, y, x) order
+    pixel_data = np.random.rand(50, 100, 100).astype(np.float32)
+
     # Test with all parameters
     dose = Dose(
         dose_id="1",
@@ -63,9 +64,9 @@ def test_dose_initialization():
         dose_grid_id=dose_grid.id,  # Set the foreign key
         beam=beam,
         pixel_data=pixel_data,
-        non_existent_field="This should be ignored"
+        non_existent_field="This should be ignored",
     )
-    
+
     # Test properties
     assert dose.dose_id == "1"
     assert dose.dose_type == "PHYSICAL"
@@ -84,12 +85,12 @@ def test_dose_initialization():
     assert dose.beam == beam
     assert np.array_equal(dose.pixel_data, pixel_data)
     assert not hasattr(dose, "non_existent_field")
-    
+
     # Test getter methods
     assert dose.get_dose_dimensions() == (100, 100, 50)
     assert dose.get_dose_grid_resolution() == (2.0, 2.0, 3.0)
     assert dose.get_dose_grid_origin() == (-100.0, -100.0, 0.0)
-    
+
     # Test slice operations
     # Create a test slice with known values
     slice_data = np.zeros((100, 100), dtype=np.float32)
@@ -97,28 +98,30 @@ def test_dose_initialization():
     slice_data[0, 0] = 1.0
     slice_data[50, 50] = 2.0
     slice_data[99, 99] = 3.0
-    
+
     slice_index = 25
     dose.set_slice_data(slice_index, slice_data)
-    
+
     # Get the slice back and verify the values
     retrieved_slice = dose.get_slice_data(slice_index)
     assert retrieved_slice is not None
     assert retrieved_slice[0, 0] == 1.0
     assert retrieved_slice[50, 50] == 2.0
     assert retrieved_slice[99, 99] == 3.0
-    
+
     # Test point access
     x, y, z = 50, 50, 25
-    expected_value = float(pixel_data[x, y, z] * dose.dose_grid_scaling)
-    assert np.allclose(dose.get_dose_value(x, y, z), expected_value, rtol=1e-6, atol=1e-6)
+    expected_value = float(pixel_data[z, y, x] * dose.dose_grid_scaling)
+    assert np.allclose(
+        dose.get_dose_value(x, y, z), expected_value, rtol=1e-6, atol=1e-6
+    )
 
 
 def test_dose_beam_relationship():
     """Test the relationship between Dose and Beam."""
     # Create a test trial first
     trial = Trial(trial_id=1, trial_name="Test Trial")
-    
+
     # Create a dose grid for testing and associate it with the trial
     dose_grid = DoseGrid(
         dimension_x=100,
@@ -130,18 +133,18 @@ def test_dose_beam_relationship():
         origin_x=-100.0,
         origin_y=-100.0,
         origin_z=0.0,
-        trial=trial  # Associate with trial
+        trial=trial,  # Associate with trial
     )
-    
+
     # Create a beam and associate it with the trial
     beam = Beam(
         beam_number=1,
         name="Test Beam",
         description="Test beam description",
         dose_volume_file="plan.Trial.binary.1",
-        trial=trial
+        trial=trial,
     )
-    
+
     # Create a dose and set up relationships
     dose = Dose(dose_id="1", dose_grid=dose_grid, beam=beam)
 
@@ -154,7 +157,7 @@ def test_dose_grid_relationship():
     """Test the relationship between Dose and DoseGrid."""
     # Create a test trial first
     trial = Trial(trial_id=1, trial_name="Test Trial")
-    
+
     # Create a dose grid and associate it with the trial
     dose_grid = DoseGrid(
         dimension_x=100,
@@ -166,16 +169,16 @@ def test_dose_grid_relationship():
         origin_x=-100.0,
         origin_y=-100.0,
         origin_z=0.0,
-        trial=trial  # Associate with trial
+        trial=trial,  # Associate with trial
     )
-    
+
     # Create a test beam and associate it with the trial
     beam = Beam(
         beam_number=1,
         name="Test Beam",
         description="Test beam description",
         dose_volume_file="plan.Trial.binary.1",
-        trial=trial
+        trial=trial,
     )
 
     # Create a dose and set up relationships
@@ -192,7 +195,7 @@ def test_read_beam_dose():
     """Test reading a beam dose from a binary file."""
     # Create a test trial first
     trial = Trial(trial_id=1, trial_name="Test Trial")
-    
+
     # Create a test dose grid and associate it with the trial
     dose_grid = DoseGrid(
         dimension_x=20,
@@ -204,32 +207,36 @@ def test_read_beam_dose():
         origin_x=-20.0,
         origin_y=-20.0,
         origin_z=0.0,
-        trial=trial
+        trial=trial,
     )
-    
+
     # Create a test beam with required attributes
     beam = Beam(
         beam_number=1,
         name="Test Beam",
         description="Test beam description",
         dose_volume="test:1",  # This will be used to generate dose_volume_file
-        trial=trial
+        trial=trial,
     )
-    
+
     # Create a test binary dose file
-    test_data_dir = Path(__file__).parent / 'test_data/01/Institution_1/Mount_0/Patient_1/Plan_0'
+    test_data_dir = (
+        Path(__file__).parent / "test_data/01/Institution_1/Mount_0/Patient_1/Plan_0"
+    )
     test_data_dir.mkdir(parents=True, exist_ok=True)
-    
+
     # Create a test binary file with the expected name
     dose_file = test_data_dir / f"plan.Trial.binary.{beam.beam_number:03d}"
-    with open(dose_file, 'wb') as f:
+    with open(dose_file, "wb") as f:
         # Write some test data (20*20*10 floats = 16000 bytes)
-        f.write(np.zeros((20*20*10), dtype=np.float32).tobytes())
-    
+        f.write(np.zeros((20 * 20 * 10), dtype=np.float32).tobytes())
+
     # Read the beam dose
-    test_data_dir = Path(__file__).parent / 'test_data/01/Institution_1/Mount_0/Patient_1/Plan_0'
+    test_data_dir = (
+        Path(__file__).parent / "test_data/01/Institution_1/Mount_0/Patient_1/Plan_0"
+    )
     dose = DoseReader.read_beam_dose(test_data_dir, beam, dose_grid)
-    
+
     # Verify the dose properties
     assert dose is not None
     assert isinstance(dose, Dose)
@@ -241,11 +248,39 @@ def test_read_beam_dose():
     assert dose.pixel_data.shape == (10, 20, 20)  # z, y, x order from reader
 
 
+def test_read_dose_slices(tmp_path):
+    """Test reading individual slices from a binary dose file without loading the volume."""
+    dose_grid = DoseGrid(
+        dimension_x=4,
+        dimension_y=3,
+        dimension_z=5,
+        voxel_size_x=2.0,
+        voxel_size_y=2.0,
+        voxel_size_z=3.0,
+        origin_x=-4.0,
+        origin_y=-3.0,
+        origin_z=0.0,
+    )
+    beam = Beam(beam_number=1, dose_volume="test:1")
+    volume = np.arange(5 * 3 * 4, dtype=">f4").reshape(5, 3, 4)
+    (tmp_path / beam.dose_volume_file).write_bytes(volume.tobytes())
+
+    slices = DoseReader.read_slices(tmp_path / beam.dose_volume_file, dose_grid, [3, 0])
+    assert slices.shape == (2, 3, 4)
+    assert np.array_equal(slices, volume[[3, 0]])
+
+    dose = DoseReader.read_beam_dose(tmp_path, beam, dose_grid, lazy=True)
+    assert dose.pixel_data is None
+    assert dose.source_path == str(tmp_path / beam.dose_volume_file)
+    assert np.array_equal(dose.get_slice_data(2), volume[2])
+    assert dose.get_slice_data(5) is None
+
+
 def test_read_trial_dose():
     """Test reading a trial dose (sum of beam doses)."""
     # Create a test trial
     trial = Trial(trial_id=1, trial_name="Test Trial")
-    
+
     # Set up a test dose grid and associate it with the trial
     trial.dose_grid = DoseGrid(
         dimension_x=20,
@@ -257,41 +292,35 @@ def test_read_trial_dose():
         origin_x=-20.0,
         origin_y=-20.0,
         origin_z=0.0,
-        trial=trial
+        trial=trial,
     )
-    
+
     # Create test beams with required attributes
-    beam1 = Beam(
-        beam_number=1, 
-        name="Beam 1", 
-        dose_volume="test:1",
-        trial=trial
-    )
-    beam2 = Beam(
-        beam_number=2, 
-        name="Beam 2", 
-        dose_volume="test:2",
-        trial=trial
-    )
+    beam1 = Beam(beam_number=1, name="Beam 1", dose_volume="test:1", trial=trial)
+    beam2 = Beam(beam_number=2, name="Beam 2", dose_volume="test:2", trial=trial)
     trial.beam_list = [beam1, beam2]
-    
+
     # Create test binary dose files
-    test_data_dir = Path(__file__).parent / 'test_data/01/Institution_1/Mount_0/Patient_1/Plan_0'
+    test_data_dir = (
+        Path(__file__).parent / "test_data/01/Institution_1/Mount_0/Patient_1/Plan_0"
+    )
     test_data_dir.mkdir(parents=True, exist_ok=True)
-    
+
     # Create test binary files with the expected names
     for beam in [beam1, beam2]:
         dose_file = test_data_dir / f"plan.Trial.binary.{beam.beam_number:03d}"
-        with open(dose_file, 'wb') as f:
+        with open(dose_file, "wb") as f:
             # Write some test data (20*20*10 floats = 16000 bytes)
             # Use different values for each beam to test summation
-            data = np.ones((20*20*10), dtype=np.float32) * beam.beam_number
+            data = np.ones((20 * 20 * 10), dtype=np.float32) * beam.beam_number
             f.write(data.tobytes())
-    
+
     # Read the trial dose
-    test_data_dir = Path(__file__).parent / 'test_data/01/Institution_1/Mount_0/Patient_1/Plan_0'
+    test_data_dir = (
+        Path(__file__).parent / "test_data/01/Institution_1/Mount_0/Patient_1/Plan_0"
+    )
     dose = DoseReader.read(test_data_dir, trial)
-    
+
     # Verify the dose properties
     assert dose is not None
     assert isinstance(dose, Dose)
@@ -299,18 +328,80 @@ def test_read_trial_dose():
     # TODO: Add more assertions once the implementation is complete
 
 
-def test_dose_writer():
-    """Test the DoseWriter (currently not implemented)."""
-    dose = Dose(dose_id="1")
-    with pytest.raises(NotImplementedError):
-        DoseWriter.write(dose, "/path/to/dose")
+def test_dose_writer(tmp_path):
+    """Test writing a beam dose to a binary file and reading it back."""
+    dose_grid = DoseGrid(
+        dimension_x=4,
+        dimension_y=3,
+        dimension_z=5,
+        voxel_size_x=2.0,
+        voxel_size_y=2.0,
+        voxel_size_z=3.0,
+        origin_x=-4.0,
+        origin_y=-3.0,
+        origin_z=0.0,
+    )
+    beam = Beam(beam_number=2, dose_volume="test:2")
+    volume = np.arange(5 * 3 * 4, dtype=np.float64).reshape(5, 3, 4) / 7.0
+    dose = Dose(dose_id="1", pixel_data=volume, dose_grid=dose_grid, beam=beam)
+
+    path = DoseWriter.write(dose, tmp_path)
+    assert path == str(tmp_path / "plan.Trial.binary.002")
+    assert Path(path).stat().st_size == volume.size * 4
+    assert [p.name for p in tmp_path.iterdir()] == ["plan.Trial.binary.002"]
+
+    data = DoseReader.read_binary_dose(path, dose_grid)
+    assert np.array_equal(data, volume.astype(np.float32))
+
+    # Memmapped sources are streamed slab by slab
+    source = np.memmap(
+        tmp_path / "source.npy", dtype=np.float32, mode="w+", shape=(5, 3, 4)
+    )
+    source[:] = 2.5
+    DoseWriter.write_binary_dose(source, tmp_path / "memmap.bin", dose_grid)
+    assert np.all(DoseReader.read_binary_dose(tmp_path / "memmap.bin") == 2.5)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX file modes")
+def test_dose_writer_file_mode(tmp_path):
+    """Test that written files get the umask mode, or keep the mode of the replaced file."""
+    dose_grid = DoseGrid(dimension_x=4, dimension_y=3, dimension_z=5)
+    volume = np.ones((5, 3, 4), dtype=np.float32)
+
+    umask = os.umask(0o022)
+    try:
+        DoseWriter.write_binary_dose(volume, tmp_path / "new.bin", dose_grid)
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE((tmp_path / "new.bin").stat().st_mode) == 0o644
+
+    target = tmp_path / "shared.bin"
+    target.write_bytes(b"original")
+    target.chmod(0o664)
+    DoseWriter.write_binary_dose(volume, target, dose_grid)
+    assert stat.S_IMODE(target.stat().st_mode) == 0o664
+
+
+def test_dose_writer_invalid(tmp_path):
+    """Test that the DoseWriter rejects missing or mis-shaped data without touching the target."""
+    dose_grid = DoseGrid(dimension_x=4, dimension_y=3, dimension_z=5)
+    target = tmp_path / "plan.Trial.binary.001"
+    target.write_bytes(b"original")
+
+    with pytest.raises(ValueError, match="no pixel data"):
+        DoseWriter.write(Dose(dose_id="1"), target)
+    with pytest.raises(ValueError, match="does not match"):
+        DoseWriter.write_binary_dose(np.zeros((5, 4, 3)), target, dose_grid)
+
+    assert target.read_bytes() == b"original"
+    assert [p.name for p in tmp_path.iterdir()] == [target.name]
 
 
 def test_dose_repr():
     """Test the string representation of Dose."""
     # Create a test trial first
     trial = Trial(trial_id=1, trial_name="Test Trial")
-    
+
     # Create a dose grid and associate it with the trial
     dose_grid = DoseGrid(
         dimension_x=100,
@@ -322,43 +413,45 @@ def test_dose_repr():
         origin_x=-100.0,
         origin_y=-100.0,
         origin_z=0.0,
-        trial=trial  # Associate with trial
+        trial=trial,  # Associate with trial
     )
-    
+
     # Create a dose with required relationships and test data
     dose = Dose(
-        dose_id="TestDose123", 
-        dose_type="PHYSICAL", 
+        dose_id="TestDose123",
+        dose_type="PHYSICAL",
         dose_grid=dose_grid,
-        pixel_data=np.zeros((100, 100, 50), dtype=np.float32)  # Add pixel data to test dimensions
+        pixel_data=np.zeros(
+            (50, 100, 100), dtype=np.float32
+        ),  # Add pixel data to test dimensions
     )
-    
+
     # Get the string representation
     repr_str = repr(dose)
-    
+
     # Verify the format and content
     expected_start = "<Dose(id='TestDose123'"
     expected_type = "type='PHYSICAL'"
     expected_dims = "dimensions=(100, 100, 50)"
-    
+
     assert repr_str.startswith("<Dose(")
     assert repr_str.endswith(")>")
     assert expected_start in repr_str
     assert expected_type in repr_str
     assert expected_dims in repr_str
-    
+
     # Test with a different dose type and ID
     dose_grid.dimension_x = 50
     dose_grid.dimension_y = 50
     dose_grid.dimension_z = 25
     pixel_data = np.zeros((50, 50, 25), dtype=np.float32)
     dose2 = Dose(
-        dose_id="AnotherDose", 
-        dose_type="EFFECTIVE", 
+        dose_id="AnotherDose",
+        dose_type="EFFECTIVE",
         dose_grid=dose_grid,
-        pixel_data=pixel_data
+        pixel_data=pixel_data,
     )
-    
+
     repr_str2 = repr(dose2)
     assert "id='AnotherDose'" in repr_str2
     assert "type='EFFECTIVE'" in repr_str2
@@ -0,0 +1,139 @@
+"""
+Tests for the compact dose cache format.
+"""
+
+import numpy as np
+import pytest
+
+from pinnacle_io.models import Dose
+from pinnacle_io.utils.dose_cache import (
+    load_compact,
+    load_compact_slab,
+    read_compact_header,
+    save_compact,
+)
+
+
+def _make_dose(shape=(8, 32, 24), scaling=1.0):
+    """Create a Dose with a smooth, mostly-zero dose distribution."""
+    z, y, x = np.meshgrid(
+        np.linspace(-1, 1, shape[0]),
+        np.linspace(-1, 1, shape[1]),
+        np.linspace(-1, 1, shape[2]),
+        indexing="ij",
+    )
+    pixel_data = (70.0 * np.exp(-(x**2 + y**2 + z**2) * 4.0)).astype(np.float32)
+    return Dose(
+        dose_id="D1",
+        dose_type="PHYSICAL",
+        dose_unit="GY",
+        dose_comment="Beam 1",
+        dose_grid_scaling=scaling,
+        referenced_beam_numbers=[1, 2],
+        pixel_data=pixel_data,
+    )
+
+
+def test_compact_round_trip_within_tolerance(tmp_path):
+    """Test that a saved dose loads back within the requested tolerance."""
+    dose = _make_dose()
+    path = tmp_path / "dose.pcd"
+    tolerance = 0.01
+
+    written = save_compact(dose, path, tolerance=tolerance)
+    assert written == path.stat().st_size
+    assert written < dose.pixel_data.nbytes
+
+    loaded = load_compact(path)
+    assert loaded.pixel_data.dtype == np.float32
+    assert loaded.pixel_data.shape == dose.pixel_data.shape
+    assert np.max(np.abs(loaded.pixel_data - dose.pixel_data)) <= tolerance
+    assert loaded.dose_id == "D1"
+    assert loaded.dose_type == "PHYSICAL"
+    assert loaded.dose_unit == "GY"
+    assert loaded.dose_comment == "Beam 1"
+    assert loaded.referenced_beam_numbers == [1, 2]
+
+
+def test_compact_auto_dtype_uses_uint32_for_tight_tolerance(tmp_path):
+    """Test that the auto dtype falls back to uint32 when uint16 is too coarse."""
+    dose = _make_dose()
+    path = tmp_path / "dose.pcd"
+
+    save_compact(dose, path, tolerance=1e-4)
+    header = read_compact_header(path)
+    assert header["dtype"] == "uint32"
+    assert np.max(np.abs(load_compact(path).pixel_data - dose.pixel_data)) <= 1e-4
+
+    save_compact(dose, path, tolerance=1e-2)
+    assert read_compact_header(path)["dtype"] == "uint16"
+
+
+def test_compact_tolerance_accounts_for_dose_grid_scaling(tmp_path):
+    """Test that the tolerance is expressed in scaled dose units."""
+    dose = _make_dose(scaling=100.0)
+    path = tmp_path / "dose.pcd"
+
+    with pytest.raises(ValueError, match="tolerance"):
+        save_compact(dose, path, dtype="uint16", tolerance=0.01)
+
+    save_compact(dose, path, tolerance=0.01)
+    loaded = load_compact(path)
+    assert loaded.dose_grid_scaling == 100.0
+    error = np.abs(loaded.pixel_data - dose.pixel_data) * dose.dose_grid_scaling
+    assert np.max(error) <= 0.01
+
+
+def test_compact_tolerance_includes_float32_rounding(tmp_path):
+    """Test that the float32 representation error counts towards the tolerance."""
+    rng = np.random.default_rng(1)
+    pixel_data = rng.uniform(0.0, 70.0, size=(4, 8, 8)).astype(np.float32)
+    dose = Dose(pixel_data=pixel_data, dose_grid_scaling=1.0)
+    path = tmp_path / "dose.pcd"
+
+    with pytest.raises(ValueError, match="tolerance"):
+        save_compact(dose, path, tolerance=1e-6)
+
+    save_compact(dose, path, tolerance=1e-5)
+    assert np.max(np.abs(load_compact(path).pixel_data - pixel_data)) <= 1e-5
+
+
+@pytest.mark.parametrize("compression", ["zlib", "lzma"])
+def test_compact_single_slab_access(tmp_path, compression):
+    """Test that individual slabs can be decompressed on their own."""
+    dose = _make_dose()
+    path = tmp_path / "dose.pcd"
+    save_compact(dose, path, compression=compression)
+
+    full = load_compact(path).pixel_data
+    for k in (0, 3, dose.pixel_data.shape[0] - 1):
+        assert np.array_equal(load_compact_slab(path, k), full[k])
+
+    with pytest.raises(IndexError):
+        load_compact_slab(path, dose.pixel_data.shape[0])
+
+
+def test_compact_dose_methods(tmp_path):
+    """Test the Dose.save_compact / Dose.load_compact convenience methods."""
+    dose = _make_dose()
+    path = tmp_path / "dose.pcd"
+    dose.save_compact(str(path), dtype="uint16")
+
+    loaded = Dose.load_compact(str(path))
+    assert isinstance(loaded, Dose)
+    assert np.allclose(loaded.pixel_data, dose.pixel_data, atol=70.0 / 65535)
+
+
+def test_compact_invalid_input(tmp_path):
+    """Test error handling for invalid inputs."""
+    path = tmp_path / "dose.pcd"
+    with pytest.raises(ValueError, match="no pixel data"):
+        save_compact(Dose(), path)
+    with pytest.raises(ValueError, match="compression"):
+        save_compact(_make_dose(), path, compression="brotli")
+    with pytest.raises(ValueError, match="dtype"):
+        save_compact(_make_dose(), path, dtype="int8")
+
+    path.write_bytes(b"not a dose file")
+    with pytest.raises(ValueError, match="Not a compact dose file"):
+        load_compact(path)
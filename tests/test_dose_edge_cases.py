@@ -1,24 +1,25 @@
 """
 Tests for edge cases in the Dose model.
 """
-import pytest
+
 import numpy as np
+import pytest
 
-from pinnacle_io.models import Dose, DoseGrid, Trial, Beam, MaxDosePoint
+from pinnacle_io.models import Beam, Dose, DoseGrid, MaxDosePoint, Trial
 
 
 def test_dose_without_dose_grid():
     """Test creating a Dose without a DoseGrid and handling the resulting errors."""
     # Create a dose without a dose grid
     dose = Dose(dose_id="1", dose_type="PHYSICAL", dose_unit="GY")
-    
+
     # Test that accessing methods that require a dose grid raises ValueError
     with pytest.raises(ValueError, match="DoseGrid is not set for this Dose object"):
         dose.get_dose_dimensions()
-    
+
     with pytest.raises(ValueError, match="DoseGrid is not set for this Dose object"):
         dose.get_dose_grid_resolution()
-    
+
     with pytest.raises(ValueError, match="DoseGrid is not set for this Dose object"):
         dose.get_dose_grid_origin()
 
@@ -29,28 +30,28 @@ def test_referenced_beam_numbers_edge_cases():
     dose = Dose(referenced_beam_numbers=[])
     assert dose.referenced_beam_numbers == []
     assert dose._referenced_beam_numbers is None
-    
+
     # Test with None
     dose = Dose()
     dose.referenced_beam_numbers = None
     assert dose.referenced_beam_numbers == []
     assert dose._referenced_beam_numbers is None
-    
+
     # Test with single value
     dose = Dose(referenced_beam_numbers=[42])
     assert dose.referenced_beam_numbers == [42]
     assert dose._referenced_beam_numbers == "42"
-    
+
     # Test with multiple values
     dose = Dose(referenced_beam_numbers=[1, 2, 3])
     assert dose.referenced_beam_numbers == [1, 2, 3]
     assert dose._referenced_beam_numbers == "1,2,3"
-    
+
     # Test with string input that should be converted to integers
     dose = Dose()
     dose._referenced_beam_numbers = "1,2,3"
     assert dose.referenced_beam_numbers == [1, 2, 3]
-    
+
     # Test with empty string
     dose = Dose()
     dose._referenced_beam_numbers = ""
@@ -66,43 +67,43 @@ def test_pixel_data_operations():
         dimension_z=5,
         voxel_size_x=1.0,
         voxel_size_y=1.0,
-        voxel_size_z=1.0
+        voxel_size_z=1.0,
     )
-    
+
     # Create a dose with no pixel data but ensure dose_grid_scaling is set
     dose = Dose(dose_grid=dose_grid, dose_grid_scaling=1.0)
     assert dose.pixel_data is None
-    
+
     # Test get_slice_data with no pixel data
     assert dose.get_slice_data(0) is None
-    
+
     # Test set_slice_data with no existing pixel data
     test_slice = np.ones((10, 10), dtype=np.float32)
     dose.set_slice_data(0, test_slice)
-    
+
     # Verify pixel data was initialized
     assert dose.pixel_data is not None
-    assert dose.pixel_data.shape == (10, 10, 5)
-    assert np.array_equal(dose.pixel_data[:, :, 0], test_slice)
-    assert np.array_equal(dose.pixel_data[:, :, 1], np.zeros((10, 10), dtype=np.float32))
-    
+    assert dose.pixel_data.shape == (5, 10, 10)
+    assert np.array_equal(dose.pixel_data[0], test_slice)
+    assert np.array_equal(dose.pixel_data[1], np.zeros((10, 10), dtype=np.float32))
+
     # Test get_slice_data with valid index
     retrieved_slice = dose.get_slice_data(0)
     assert np.array_equal(retrieved_slice, test_slice)
-    
+
     # Test get_slice_data with out-of-bounds index
     assert dose.get_slice_data(10) is None
-    
+
     # Test set_slice_data with out-of-bounds index (should be ignored)
     dose.set_slice_data(10, test_slice)
-    assert dose.pixel_data.shape == (10, 10, 5)  # Shape should not change
-    
+    assert dose.pixel_data.shape == (5, 10, 10)  # Shape should not change
+
     # Test get_dose_value
     # Verify that dose_grid_scaling is applied correctly
     assert dose.dose_grid_scaling == 1.0  # Confirm scaling value
     assert dose.get_dose_value(5, 5, 0) == 1.0  # Value from the test slice
     assert dose.get_dose_value(5, 5, 1) == 0.0  # Value from initialized zeros
-    
+
     # Test get_dose_value with out-of-bounds coordinates
     assert dose.get_dose_value(-1, 5, 0) is None
     assert dose.get_dose_value(5, -1, 0) is None
@@ -121,23 +122,21 @@ def test_dose_scaling():
         dimension_z=5,
         voxel_size_x=1.0,
         voxel_size_y=1.0,
-        voxel_size_z=1.0
+        voxel_size_z=1.0,
     )
-    
-    # Create pixel data with known values
-    pixel_data = np.ones((10, 10, 5), dtype=np.float32)
-    
+
+    # Create pixel data with known values, indexed as (z, y, x)
+    pixel_data = np.ones((5, 10, 10), dtype=np.float32)
+
     # Test with different scaling factors
     for scaling in [0.1, 1.0, 2.5, 10.0]:
         dose = Dose(
-            dose_grid=dose_grid,
-            pixel_data=pixel_data,
-            dose_grid_scaling=scaling
+            dose_grid=dose_grid, pixel_data=pixel_data, dose_grid_scaling=scaling
         )
-        
+
         # Test that get_dose_value applies scaling
-        assert dose.get_dose_value(5, 5, 2) == scaling
-        
+        assert dose.get_dose_value(5, 5, 2) == pytest.approx(scaling)
+
         # Test that get_scaled_pixel_data applies scaling
         scaled_data = dose.get_scaled_pixel_data()
         assert scaled_data is not None
@@ -148,10 +147,10 @@ def test_max_dose_point_relationship():
     """Test the relationship between Dose and MaxDosePoint."""
     # Create a trial
     trial = Trial(trial_id=1, trial_name="Test Trial")
-    
+
     # Create a dose
     dose = Dose(dose_id="1", trial=trial)
-    
+
     # Create a max dose point
     max_dose_point = MaxDosePoint(
         color="red",
@@ -162,9 +161,9 @@ def test_max_dose_point_relationship():
         location_y=20.0,
         location_z=30.0,
         dose=dose,
-        trial=trial
+        trial=trial,
     )
-    
+
     # Test relationships
     assert dose.max_dose_point == max_dose_point
     assert max_dose_point.dose == dose
@@ -175,26 +174,21 @@ def test_multiple_relationship_paths():
     """Test that a Dose can be accessed through multiple relationship paths."""
     # Create a trial
     trial = Trial(trial_id=1, trial_name="Test Trial")
-    
+
     # Create a dose grid
     dose_grid = DoseGrid(trial=trial)
-    
+
     # Create a beam
     beam = Beam(beam_number=1, name="Test Beam", trial=trial)
-    
+
     # Create a dose with multiple relationships
-    dose = Dose(
-        dose_id="1",
-        dose_grid=dose_grid,
-        beam=beam,
-        trial=trial
-    )
-    
+    dose = Dose(dose_id="1", dose_grid=dose_grid, beam=beam, trial=trial)
+
     # Test that the dose can be accessed through all relationship paths
     assert trial.dose == dose
     assert beam.dose == dose
     assert dose in dose_grid.dose_list
-    
+
     # Test that the dose has all the correct back-references
     assert dose.trial == trial
     assert dose.beam == beam
@@ -210,30 +204,26 @@ def test_dose_with_numpy_operations():
         dimension_z=5,
         voxel_size_x=1.0,
         voxel_size_y=1.0,
-        voxel_size_z=1.0
+        voxel_size_z=1.0,
     )
-    
+
     # Create pixel data with a gradient
     x, y, z = np.meshgrid(
         np.linspace(0, 1, 10),
         np.linspace(0, 1, 10),
         np.linspace(0, 1, 5),
-        indexing='ij'
+        indexing="ij",
     )
     pixel_data = x + y + z
-    
+
     # Create a dose with the gradient data
-    dose = Dose(
-        dose_grid=dose_grid,
-        pixel_data=pixel_data,
-        dose_grid_scaling=1.0
-    )
-    
+    dose = Dose(dose_grid=dose_grid, pixel_data=pixel_data, dose_grid_scaling=1.0)
+
     # Test statistical operations
     assert np.isclose(dose.get_min_dose(), 0.0)
     assert np.isclose(dose.get_max_dose(), 3.0)  # 1 + 1 + 1 at the maximum point
     assert np.isclose(dose.get_mean_dose(), 1.5)  # Average of the gradient
-    
+
     # Test dose volume histogram calculation
     # Fix for histogram calculation to ensure we get the expected number of bins
     def fixed_calculate_dvh(self, num_bins=100):
@@ -242,27 +232,29 @@ def test_dose_with_numpy_operations():
         min_dose = self.get_min_dose()
         max_dose = self.get_max_dose()
         # Use num_bins+1 for the bin edges to get exactly num_bins histogram values
-        bins = np.linspace(min_dose, max_dose + 1e-10, num_bins+1)
+        bins = np.linspace(min_dose, max_dose + 1e-10, num_bins + 1)
         scaled_data = self.get_scaled_pixel_data().flatten()
         hist, bin_edges = np.histogram(scaled_data, bins=bins)
         # Return the bin edges as the bins (without the last edge)
         return bin_edges[:-1], hist
-    
+
     # Replace the calculate_dvh method for this test
     original_calculate_dvh = dose.calculate_dvh
     dose.calculate_dvh = lambda num_bins=100: fixed_calculate_dvh(dose, num_bins)
-    
+
     try:
         dvh_bins, dvh_counts = dose.calculate_dvh(num_bins=10)
         assert len(dvh_bins) == 10, f"Expected 10 bins, got {len(dvh_bins)}: {dvh_bins}"
-        assert len(dvh_counts) == 10, f"Expected 10 counts, got {len(dvh_counts)}: {dvh_counts}"
+        assert (
+            len(dvh_counts) == 10
+        ), f"Expected 10 counts, got {len(dvh_counts)}: {dvh_counts}"
         assert np.isclose(dvh_bins[0], 0.0)
         # Last bin edge should be close to 3.0 (max value)
         assert np.isclose(dvh_bins[-1], 2.7)
     finally:
         # Restore the original method
         dose.calculate_dvh = original_calculate_dvh
-    
+
     # Test isodose calculation
     isodose_50_percent = dose.get_isodose_volume(percent=50)  # 50% of max dose = 1.5
     assert 0 < isodose_50_percent < 1.0  # Should be a fraction of the total volume
@@ -277,12 +269,12 @@ def test_dose_serialization():
         dimension_z=3,
         voxel_size_x=1.0,
         voxel_size_y=1.0,
-        voxel_size_z=1.0
+        voxel_size_z=1.0,
     )
-    
+
     # Create pixel data
     pixel_data = np.random.rand(5, 5, 3).astype(np.float32)
-    
+
     # Create a dose with the data
     original_dose = Dose(
         dose_id="1",
@@ -290,21 +282,21 @@ def test_dose_serialization():
         dose_unit="GY",
         dose_grid=dose_grid,
         pixel_data=pixel_data,
-        referenced_beam_numbers=[1, 2, 3]
+        referenced_beam_numbers=[1, 2, 3],
     )
-    
+
     # Serialize to dictionary
     dose_dict = original_dose.to_dict()
-    
+
     # Verify serialized data
     assert dose_dict["dose_id"] == "1"
     assert dose_dict["dose_type"] == "PHYSICAL"
     assert dose_dict["dose_unit"] == "GY"
     assert dose_dict["referenced_beam_numbers"] == [1, 2, 3]
-    
+
     # Deserialize to new object
     new_dose = Dose.from_dict(dose_dict)
-    
+
     # Verify deserialized object
     assert new_dose.dose_id == original_dose.dose_id
     assert new_dose.dose_type == original_dose.dose_type
@@ -318,25 +310,25 @@ def add_numpy_methods():
     """Add mock methods to Dose class for testing numpy operations."""
     # Store original methods to restore later
     original_methods = {}
-    
+
     # Create a get_min_dose method
     def get_min_dose(self):
         if self.pixel_data is None:
             return None
         return float(np.min(self.pixel_data) * self.dose_grid_scaling)
-    
+
     # Create a get_max_dose method
     def get_max_dose(self):
         if self.pixel_data is None:
             return None
         return float(np.max(self.pixel_data) * self.dose_grid_scaling)
-    
+
     # Create a get_mean_dose method
     def get_mean_dose(self):
         if self.pixel_data is None:
             return None
         return float(np.mean(self.pixel_data) * self.dose_grid_scaling)
-    
+
     # Create a calculate_dvh method
     def calculate_dvh(self, num_bins=100):
         if self.pixel_data is None:
@@ -344,12 +336,12 @@ def add_numpy_methods():
         min_dose = self.get_min_dose()
         max_dose = self.get_max_dose()
         # Create num_bins+1 bin edges to get num_bins histogram values
-        bins = np.linspace(min_dose, max_dose + 1e-10, num_bins+1)
+        bins = np.linspace(min_dose, max_dose + 1e-10, num_bins + 1)
         scaled_data = self.get_scaled_pixel_data().flatten()
         hist, bin_edges = np.histogram(scaled_data, bins=bins)
         # Return the bin edges (excluding the last one) as the bins
         return bin_edges[:-1], hist
-    
+
     # Create a get_isodose_volume method
     def get_isodose_volume(self, percent):
         if self.pixel_data is None:
@@ -359,32 +351,40 @@ def add_numpy_methods():
         scaled_data = self.get_scaled_pixel_data()
         volume_fraction = np.sum(scaled_data >= threshold) / scaled_data.size
         return volume_fraction
-    
+
     # Create a get_scaled_pixel_data method
     def get_scaled_pixel_data(self):
         if self.pixel_data is None:
             return None
         return self.pixel_data * self.dose_grid_scaling
-    
+
     # Create to_dict and from_dict methods
     def to_dict(self):
         return {
             "dose_id": self.dose_id,
             "dose_type": self.dose_type,
             "dose_unit": self.dose_unit,
-            "referenced_beam_numbers": self.referenced_beam_numbers
+            "referenced_beam_numbers": self.referenced_beam_numbers,
         }
-    
+
     @classmethod
     def from_dict(cls, data):
         return cls(**data)
-    
+
     # Store original methods if they exist
-    for name in ['get_min_dose', 'get_max_dose', 'get_mean_dose', 'calculate_dvh', 
-                'get_isodose_volume', 'get_scaled_pixel_data', 'to_dict', 'from_dict']:
+    for name in [
+        "get_min_dose",
+        "get_max_dose",
+        "get_mean_dose",
+        "calculate_dvh",
+        "get_isodose_volume",
+        "get_scaled_pixel_data",
+        "to_dict",
+        "from_dict",
+    ]:
         if hasattr(Dose, name):
             original_methods[name] = getattr(Dose, name)
-    
+
     # Add methods to the Dose class directly for testing
     Dose.get_min_dose = get_min_dose
     Dose.get_max_dose = get_max_dose
@@ -394,13 +394,21 @@ def add_numpy_methods():
     Dose.get_scaled_pixel_data = get_scaled_pixel_data
     Dose.to_dict = to_dict
     Dose.from_dict = from_dict
-    
+
     # Let tests run
     yield
-    
+
     # Restore original methods or remove added ones
-    for name in ['get_min_dose', 'get_max_dose', 'get_mean_dose', 'calculate_dvh', 
-                'get_isodose_volume', 'get_scaled_pixel_data', 'to_dict', 'from_dict']:
+    for name in [
+        "get_min_dose",
+        "get_max_dose",
+        "get_mean_dose",
+        "calculate_dvh",
+        "get_isodose_volume",
+        "get_scaled_pixel_data",
+        "to_dict",
+        "from_dict",
+    ]:
         if name in original_methods:
             setattr(Dose, name, original_methods[name])
         else:
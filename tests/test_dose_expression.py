@@ -0,0 +1,123 @@
+"""
+Tests for lazy, chunked dose expressions.
+"""
+
+import numpy as np
+import pytest
+
+from pinnacle_io.models import Beam, Dose, DoseGrid
+from pinnacle_io.utils.dose_expression import DoseExpression, clip, maximum
+from pinnacle_io.writers.dose_writer import DoseWriter
+
+SHAPE = (7, 5, 6)
+
+
+def _make_doses(count=3, seed=0):
+    """Create doses with random pixel data and different dose grid scalings."""
+    rng = np.random.default_rng(seed)
+    return [
+        Dose(
+            dose_id=str(i),
+            pixel_data=rng.random(SHAPE, dtype=np.float32),
+            dose_grid_scaling=1.0 + i,
+        )
+        for i in range(count)
+    ]
+
+
+def _scaled(dose):
+    return dose.pixel_data * np.float32(dose.dose_grid_scaling)
+
+
+def test_weighted_sum_matches_eager_evaluation():
+    """Test that a weighted sum of beams minus another dose matches numpy."""
+    doses = _make_doses(4)
+    weights = [0.5, 1.5, 2.0]
+
+    expr = sum(w * dose.lazy() for w, dose in zip(weights, doses[:3])) * 30 - doses[3]
+    assert isinstance(expr, DoseExpression)
+    assert expr.shape == SHAPE
+
+    expected = sum(w * _scaled(d) for w, d in zip(weights, doses[:3])) * 30 - _scaled(
+        doses[3]
+    )
+    result = expr.evaluate(chunk_size=3)
+    assert result.dtype == np.float32
+    assert np.allclose(result, expected, rtol=1e-5)
+
+
+def test_maximum_clip_and_constants():
+    """Test the non-linear operators and scalar operands."""
+    a, b = _make_doses(2)
+    expected = np.clip(np.maximum(_scaled(a) - 0.5, _scaled(b) / 2), 0.2, 1.0)
+
+    expr = clip(maximum(a.lazy() - 0.5, b.lazy() / 2), 0.2, 1.0)
+    assert np.allclose(expr.evaluate(chunk_size=2), expected)
+    assert np.allclose((a.lazy().maximum(1.2)).evaluate(), np.maximum(_scaled(a), 1.2))
+    assert np.allclose((1.0 - a.lazy()).evaluate(), 1.0 - _scaled(a))
+    assert np.allclose((np.float64(2.0) * -a.lazy()).evaluate(), -2.0 * _scaled(a))
+
+
+def test_evaluate_into_memmap_with_threads(tmp_path):
+    """Test chunked multithreaded evaluation into a memmap and into a Dose."""
+    doses = _make_doses(3)
+    expr = doses[0].lazy() + doses[1] + doses[2]
+    expected = sum(_scaled(d) for d in doses)
+
+    result = expr.evaluate(out=tmp_path / "sum.dat", chunk_size=2, workers=4)
+    assert isinstance(result, np.memmap)
+    assert np.allclose(result, expected)
+
+    dose = expr.to_dose(chunk_size=1, workers=2, dose_type="PHYSICAL")
+    assert isinstance(dose, Dose)
+    assert dose.dose_grid_scaling == 1.0
+    assert dose.dose_type == "PHYSICAL"
+    assert np.allclose(dose.pixel_data, expected)
+
+
+def test_expression_reads_lazy_doses_and_streams_to_writer(tmp_path):
+    """Test that unloaded doses are read slab by slab and expressions can be written directly."""
+    dose_grid = DoseGrid(
+        dimension_x=SHAPE[2], dimension_y=SHAPE[1], dimension_z=SHAPE[0]
+    )
+    beam = Beam(beam_number=1, dose_volume="test:1")
+    volume = np.arange(np.prod(SHAPE), dtype=np.float32).reshape(SHAPE)
+    DoseWriter.write_binary_dose(volume, tmp_path / beam.dose_volume_file, dose_grid)
+
+    lazy_dose = Dose(dose_id="1", dose_grid=dose_grid, dose_grid_scaling=0.5)
+    lazy_dose.source_path = tmp_path / beam.dose_volume_file
+
+    expr = lazy_dose.lazy() * 2
+    assert expr.shape == SHAPE
+    assert np.allclose(expr[3], volume[3])
+
+    DoseWriter.write_binary_dose(expr + 1.0, tmp_path / "out.bin", dose_grid)
+    written = np.fromfile(tmp_path / "out.bin", dtype=">f4").reshape(SHAPE)
+    assert np.allclose(written, volume + 1.0)
+
+
+def test_invalid_expressions():
+    """Test error handling for mismatched shapes and invalid operands."""
+    a = _make_doses(1)[0]
+    b = Dose(dose_id="b", pixel_data=np.zeros((2, 2, 2), dtype=np.float32))
+
+    with pytest.raises(ValueError, match="different shapes"):
+        a.lazy() + b
+    with pytest.raises(ValueError, match="different shapes"):
+        maximum(a, b)
+    with pytest.raises(TypeError):
+        a.lazy() + "dose"
+    with pytest.raises(ValueError, match="no pixel data"):
+        Dose(dose_id="empty").lazy().shape
+    with pytest.raises(ValueError, match="Output shape"):
+        a.lazy().evaluate(out=np.zeros((1, 1, 1), dtype=np.float32))
+    with pytest.raises(IndexError):
+        a.lazy()[SHAPE[0]]
+
+    class Incomplete(DoseExpression):
+        @property
+        def shape(self):
+            return SHAPE
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,156 @@
+"""
+Tests for the sorted-dose index used for Vx/Dx queries.
+"""
+
+import numpy as np
+import pytest
+
+from pinnacle_io.models import ROI, Curve, Dose, DoseGrid
+from pinnacle_io.utils.dose_index import SortedDoseIndex
+
+
+def test_volume_and_dose_queries_match_brute_force():
+    """Test Vx and Dx against direct computation on the voxel values."""
+    rng = np.random.default_rng(0)
+    values = rng.uniform(0, 70, 1000).astype(np.float32)
+    index = SortedDoseIndex(values, voxel_volume=0.008)
+
+    assert len(index) == 1000
+    assert index.total_volume == pytest.approx(8.0)
+    assert index.max_dose == values.max()
+    assert index.min_dose == values.min()
+    assert index.mean_dose == pytest.approx(values.mean(), rel=1e-5)
+
+    for threshold in (0.0, 10.0, 35.5, 69.9, 80.0):
+        expected = np.count_nonzero(values >= threshold) * 0.008
+        assert index.volume_receiving(threshold) == pytest.approx(expected)
+    assert index.volume_receiving(values[10]) == pytest.approx(
+        np.count_nonzero(values >= values[10]) * 0.008
+    )
+    assert index.volume_receiving(35.0, relative=True) == pytest.approx(
+        np.mean(values >= 35.0)
+    )
+
+    hottest = np.sort(values)[::-1]
+    assert index.dose_to_volume(0.008) == hottest[0]
+    assert index.dose_to_volume(0.8) == hottest[99]
+    assert index.dose_to_volume(0.5, relative=True) == hottest[499]
+    assert index.dose_to_volume(1.0, relative=True) == hottest[-1]
+    assert index.dose_to_volume(100.0) == hottest[-1]
+
+    thresholds = np.array([10.0, 20.0, 30.0])
+    assert np.allclose(
+        index.volume_receiving(thresholds),
+        [index.volume_receiving(t) for t in thresholds],
+    )
+
+
+def test_fractional_weights():
+    """Test that partial-volume weights contribute fractional volumes."""
+    index = SortedDoseIndex(
+        [10.0, 20.0, 30.0], voxel_volume=2.0, weights=[1.0, 0.5, 0.25]
+    )
+    assert index.total_volume == pytest.approx(3.5)
+    assert index.volume_receiving(20.0) == pytest.approx(1.5)
+    assert index.dose_to_volume(1.0) == 20.0
+
+
+def test_dose_index_cache_and_invalidation():
+    """Test that the per-(Dose, ROI) index is cached and invalidated when the dose changes."""
+    rng = np.random.default_rng(1)
+    pixel_data = rng.uniform(0, 1, (4, 5, 6)).astype(np.float32)
+    dose_grid = DoseGrid(
+        dimension_x=6,
+        dimension_y=5,
+        dimension_z=4,
+        voxel_size_x=0.2,
+        voxel_size_y=0.2,
+        voxel_size_z=0.3,
+    )
+    dose = Dose(
+        dose_id="1", pixel_data=pixel_data, dose_grid_scaling=10.0, dose_grid=dose_grid
+    )
+    roi = ROI(name="PTV")
+    mask = np.zeros(pixel_data.shape, dtype=bool)
+    mask[1:3, 1:4, 2:5] = True
+
+    index = dose.get_dose_index(roi, mask)
+    assert dose.get_dose_index(roi) is index
+    assert index.total_volume == pytest.approx(mask.sum() * 0.2 * 0.2 * 0.3)
+    assert dose.get_volume_at_dose(roi, 5.0) == pytest.approx(
+        np.count_nonzero(pixel_data[mask] * 10.0 >= 5.0) * 0.012
+    )
+    assert dose.get_dose_at_volume(roi, 1.0, relative=True) == pytest.approx(
+        pixel_data[mask].min() * 10.0
+    )
+
+    dose.dose_grid_scaling = 20.0
+    rebuilt = dose.get_dose_index(roi, mask)
+    assert rebuilt is not index
+    assert rebuilt.max_dose == pytest.approx(pixel_data[mask].max() * 20.0)
+
+    dose.pixel_data = pixel_data * 2
+    with pytest.raises(ValueError, match="mask is required"):
+        dose.get_dose_index(roi)
+
+    other = ROI(name="Other")
+    with pytest.raises(ValueError, match="does not match"):
+        dose.get_dose_index(other, np.ones((2, 2, 2), dtype=bool))
+
+
+def test_dose_index_follows_roi_edits_and_masks():
+    """Test that curve edits and explicit masks are not answered from a stale index."""
+    pixel_data = np.tile(np.arange(8, dtype=np.float32), (3, 8, 1))
+    dose_grid = DoseGrid(
+        dimension_x=8,
+        dimension_y=8,
+        dimension_z=3,
+        voxel_size_x=1.0,
+        voxel_size_y=1.0,
+        voxel_size_z=1.0,
+        origin_x=0.0,
+        origin_y=0.0,
+        origin_z=0.0,
+    )
+    dose = Dose(dose_id="1", pixel_data=pixel_data, dose_grid=dose_grid)
+    square = np.array(
+        [[0.5, 0.5, 1.0], [5.5, 0.5, 1.0], [5.5, 5.5, 1.0], [0.5, 5.5, 1.0]]
+    )
+    roi = ROI(name="PTV", curve_list=[Curve(points=square)])
+
+    volume = dose.get_volume_at_dose(roi, 0.0)
+    assert volume == roi.get_mask(dose_grid).sum()
+    assert dose.get_dose_index(roi) is dose.get_dose_index(roi)
+
+    # Shrinking the curve changes Vx
+    roi.curve_list[0].points = square * [0.5, 1.0, 1.0] + [0.25, 0.0, 0.0]
+    smaller = roi.get_mask(dose_grid)
+    assert 0 < smaller.sum() < volume
+    assert dose.get_volume_at_dose(roi, 0.0) == smaller.sum()
+    assert dose.get_volume_at_dose(roi, 2.0) == np.count_nonzero(
+        pixel_data[smaller] >= 2.0
+    )
+
+    # An explicit mask is always used
+    mask = np.zeros(pixel_data.shape, dtype=bool)
+    mask[1, 0, :] = True
+    assert dose.get_volume_at_dose(roi, 0.0, mask=mask) == 8
+    mask[1, 1, :] = True
+    assert dose.get_volume_at_dose(roi, 0.0, mask=mask) == 16
+    assert dose.get_volume_at_dose(roi, 0.0) == smaller.sum()
+
+
+def test_dose_index_with_cropped_dose():
+    """Test that cropped doses produce the same index as dense doses."""
+    pixel_data = np.zeros((6, 6, 6), dtype=np.float32)
+    pixel_data[2:4, 2:4, 2:4] = 5.0
+    mask = np.zeros(pixel_data.shape, dtype=bool)
+    mask[1:5, 1:5, 1:5] = True
+
+    dense = SortedDoseIndex.from_mask(pixel_data, mask)
+    dose = Dose(dose_id="1", pixel_data=pixel_data)
+    dose.crop()
+    cropped = dose.get_dose_index(ROI(name="Body"), mask)
+
+    assert np.array_equal(np.sort(cropped.doses), np.sort(dense.doses))
+    assert cropped.volume_receiving(5.0) == 8.0
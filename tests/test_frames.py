@@ -0,0 +1,130 @@
+"""
+Tests for the coordinate frame registry, interpolation and resampling.
+"""
+
+import numpy as np
+import pytest
+
+from pinnacle_io.models import Dose, DoseGrid, ImageSet, PatientSetup, Plan
+from pinnacle_io.utils.frames import FrameRegistry, GridGeometry, interpolate, resample
+
+
+def _dose_grid():
+    return DoseGrid(
+        dimension_x=6,
+        dimension_y=5,
+        dimension_z=4,
+        voxel_size_x=0.4,
+        voxel_size_y=0.4,
+        voxel_size_z=0.5,
+        origin_x=-1.0,
+        origin_y=-1.0,
+        origin_z=0.0,
+    )
+
+
+def _image_set():
+    return ImageSet(
+        x_dim=12,
+        y_dim=10,
+        z_dim=8,
+        x_pixdim=0.2,
+        y_pixdim=0.2,
+        z_pixdim=0.25,
+        x_start=-1.0,
+        y_start=-1.0,
+        z_start=0.0,
+    )
+
+
+def test_registry_affines_and_transform():
+    """Test composed affines between grid, patient and DICOM frames."""
+    setup = PatientSetup(
+        pinnacle_to_dicom_matrix=[
+            [-10, 0, 0, 0],
+            [0, -10, 0, 0],
+            [0, 0, 10, 0],
+            [0, 0, 0, 1],
+        ],
+        dicom_to_pinnacle_matrix=[
+            [-0.1, 0, 0, 0],
+            [0, -0.1, 0, 0],
+            [0, 0, 0.1, 0],
+            [0, 0, 0, 1],
+        ],
+    )
+    registry = FrameRegistry.from_objects(_image_set(), _dose_grid(), setup)
+    assert set(registry.frames) == {"patient", "image", "dose", "dicom"}
+
+    dose_indices = np.array([[0, 0, 0], [5, 4, 3], [2.5, 1.0, 0.5]])
+    image_indices = registry.transform(dose_indices, "dose", "image")
+    np.testing.assert_allclose(image_indices, dose_indices * [2, 2, 2])
+    assert registry.affine("dose", "image") is registry.affine("dose", "image")
+
+    dicom = registry.transform(dose_indices, "dose", "dicom")
+    patient = dose_indices * [0.4, 0.4, 0.5] + [-1.0, -1.0, 0.0]
+    np.testing.assert_allclose(dicom, setup.transform_points_pinnacle_to_dicom(patient))
+    np.testing.assert_allclose(
+        registry.transform(dicom, "dicom", "dose"), dose_indices, atol=1e-12
+    )
+
+    x, y, z = registry.voxel_centers("dose")
+    np.testing.assert_allclose(x, -1.0 + 0.4 * np.arange(6))
+    assert registry.voxel_centers("dose")[2] is z and not z.flags.writeable
+
+    with pytest.raises(KeyError):
+        registry.affine("dose", "unknown")
+    with pytest.raises(ValueError):
+        registry.add_frame("flat", np.zeros((4, 4)))
+
+    plan = Plan(primary_ct_image_set=_image_set())
+    assert (
+        "image" in plan.get_frame_registry()
+        and "dicom" not in plan.get_frame_registry()
+    )
+
+
+def test_interpolate_and_resample_linear_field():
+    """Test that interpolation and resampling reproduce a linear field exactly."""
+    dose_grid = _dose_grid()
+    geometry = GridGeometry.from_dose_grid(dose_grid)
+    x, y, z = geometry.voxel_centers()
+    field = (2 * x[None, None, :] + 3 * y[None, :, None] - z[:, None, None]).astype(
+        np.float32
+    )
+    dose = Dose(pixel_data=field, dose_grid=dose_grid, dose_grid_scaling=2.0)
+
+    points = np.array(
+        [[0.1, 0.3, 0.7], [-1.0, -1.0, 0.0], [1.0, 0.6, 1.5], [5.0, 0.0, 0.0]]
+    )
+    expected = 2.0 * (2 * points[:, 0] + 3 * points[:, 1] - points[:, 2])
+    expected[3] = 0.0
+    np.testing.assert_allclose(dose.interpolate(points), expected, atol=1e-5)
+    np.testing.assert_allclose(
+        interpolate(field, points, geometry, fill_value=-1)[3], -1
+    )
+
+    image_set = _image_set()
+    registry = FrameRegistry.from_objects(image_set, dose_grid)
+    image_points = registry.transform(points, "patient", "image")
+    np.testing.assert_allclose(
+        dose.interpolate(image_points, "image", registry), expected, atol=1e-5
+    )
+
+    resampled = dose.resample(image_set)
+    assert resampled.shape == (8, 10, 12)
+    ix, iy, iz = GridGeometry.from_image_set(image_set).voxel_centers()
+    linear = 2.0 * (2 * ix[None, None, :] + 3 * iy[None, :, None] - iz[:, None, None])
+    inside = (
+        (ix[None, None, :] <= 1.0 + 1e-9)
+        & (iy[None, :, None] <= 0.6 + 1e-9)
+        & (iz[:, None, None] <= 1.5 + 1e-9)
+    )
+    np.testing.assert_allclose(
+        resampled[inside], np.broadcast_to(linear, resampled.shape)[inside], atol=1e-5
+    )
+    assert not resampled[~np.broadcast_to(inside, resampled.shape)].any()
+
+    np.testing.assert_allclose(
+        resample(field, "dose", "dose", registry=registry), field, atol=1e-6
+    )
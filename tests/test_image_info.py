@@ -1,10 +1,13 @@
 """
 Tests for the ImageInfo model, reader, and writer.
 """
+
 from pathlib import Path
+
+import numpy as np
 import pytest
 
-from pinnacle_io.models import ImageInfo, ImageSet
+from pinnacle_io.models import ImageInfo, ImageInfoTable, ImageSet
 from pinnacle_io.readers.image_set_reader import ImageSetReader
 
 
@@ -20,9 +23,9 @@ def test_image_info_initialization():
         frame_uid="1.2.3.4.7",
         class_uid="1.2.3.4.8",
         instance_uid="1.2.3.4.9",
-        dicom_file_name="slice_5.dcm"
+        dicom_file_name="slice_5.dcm",
     )
-    
+
     assert image_info.table_position == 10.5
     assert image_info.couch_pos == 15.2
     assert image_info.slice_number == 5
@@ -41,18 +44,18 @@ def test_image_info_relationships():
         series_uid="1.2.3.4.5",
         study_uid="1.2.3.4.6",
         image_name="Test Image",
-        modality="CT"
+        modality="CT",
     )
-    
+
     # Create an image info and associate it with the image set
     image_info = ImageInfo(
         table_position=10.5,
         slice_number=5,
         instance_uid="1.2.3.4.9",
         dicom_file_name="slice_5.dcm",
-        image_set=image_set
+        image_set=image_set,
     )
-    
+
     # Check the relationship
     assert image_info in image_set.image_info_list
     assert image_info.image_set == image_set
@@ -62,24 +65,20 @@ def test_image_info_relationships():
 def test_image_info_relationships_initialization():
     """Test that all ImageInfo relationships are initialized correctly."""
     # Test initializing with an image_set directly
-    image_set = ImageSet(
-        series_uid="1.2.3.4.5",
-        image_name="Test Image",
-        modality="CT"
-    )
-    
+    image_set = ImageSet(series_uid="1.2.3.4.5", image_name="Test Image", modality="CT")
+
     image_info = ImageInfo(
         table_position=10.5,
         slice_number=0,
         instance_uid="1.2.3.4.9",
-        image_set=image_set
+        image_set=image_set,
     )
-    
+
     # Verify image_set relationship
     assert image_info.image_set is image_set
     assert image_info.image_set_id == image_set.id
     assert image_info in image_set.image_info_list
-    
+
     # Test initializing with an image_set as a dictionary
     image_info2 = ImageInfo(
         table_position=11.5,
@@ -88,25 +87,25 @@ def test_image_info_relationships_initialization():
         image_set={
             "series_uid": "1.2.3.4.6",
             "image_name": "Test Image 2",
-            "modality": "MR"
-        }
+            "modality": "MR",
+        },
     )
-    
+
     # Verify image_set relationship
     assert image_info2.image_set is not None
     assert image_info2.image_set.series_uid == "1.2.3.4.6"
     assert image_info2.image_set.image_name == "Test Image 2"
     assert image_info2.image_set.modality == "MR"
     assert image_info2 in image_info2.image_set.image_info_list
-    
+
     # Test initializing with ImageSet (PascalCase)
     image_info3 = ImageInfo(
         table_position=12.5,
         slice_number=2,
         instance_uid="1.2.3.4.11",
-        ImageSet=image_set
+        ImageSet=image_set,
     )
-    
+
     # Verify ImageSet relationship
     assert image_info3.image_set is image_set
     assert image_info3.image_set_id == image_set.id
@@ -125,10 +124,10 @@ def test_image_info_dictionary_initialization():
             "series_uid": "1.2.3.4.5",
             "study_uid": "1.2.3.4.6",
             "image_name": "Test Image",
-            "modality": "CT"
-        }
+            "modality": "CT",
+        },
     )
-    
+
     assert image_info.image_set is not None
     assert image_info.image_set.series_uid == "1.2.3.4.5"
     assert image_info.image_set.study_uid == "1.2.3.4.6"
@@ -139,17 +138,23 @@ def test_image_info_dictionary_initialization():
 
 def test_read_image_info_from_file():
     """Tests reading ImageInfo as part of an ImageSet file."""
-    image_set = ImageSetReader.read_header(Path(__file__).parent / 'test_data/01/Institution_1/Mount_0/Patient_1/ImageSet_0')
-    
+    image_set = ImageSetReader.read_header(
+        Path(__file__).parent
+        / "test_data/01/Institution_1/Mount_0/Patient_1/ImageSet_0"
+    )
+
     # Check that we have image info objects
     assert len(image_set.image_info_list) > 0
     image_info = image_set.image_info_list[0]
-    
+
     # Verify first image info properties
     assert isinstance(image_info, ImageInfo)
     assert image_info.table_position == -8.75
     assert image_info.slice_number == 1
-    assert image_info.dicom_file_name == "CT_1.2.840.113619.2.55.3.3535481354.111.3513513585.3.1.dcm"
+    assert (
+        image_info.dicom_file_name
+        == "CT_1.2.840.113619.2.55.3.3535481354.111.3513513585.3.1.dcm"
+    )
     assert image_info.image_set == image_set
 
 
@@ -159,9 +164,9 @@ def test_write_image_info():
         table_position=10.5,
         slice_number=5,
         instance_uid="1.2.3.4.9",
-        dicom_file_name="slice_5.dcm"
+        dicom_file_name="slice_5.dcm",
     )
-    
+
     with pytest.raises(AttributeError):
         image_info.write("/path/to/image_info")
 
@@ -174,21 +179,21 @@ def test_image_info_repr():
         table_position=10.5,
         slice_number=5,
         instance_uid="1.2.3.4.9",
-        dicom_file_name="slice_5.dcm"
+        dicom_file_name="slice_5.dcm",
     )
 
     expected_repr = "<ImageInfo(id=42, slice_number=5, table_position=10.5)>"
     assert repr(image_info) == expected_repr
-    
+
     # Test with different values
     image_info2 = ImageInfo(
         ID=123,
         table_position=-15.75,
         slice_number=10,
         instance_uid="1.2.3.4.10",
-        dicom_file_name="slice_10.dcm"
+        dicom_file_name="slice_10.dcm",
     )
-    
+
     expected_repr2 = "<ImageInfo(id=123, slice_number=10, table_position=-15.75)>"
     assert repr(image_info2) == expected_repr2
 
@@ -196,11 +201,8 @@ def test_image_info_repr():
 def test_image_info_optional_fields():
     """Test that ImageInfo handles optional fields correctly."""
     # Create with minimal required fields
-    image_info = ImageInfo(
-        table_position=10.5,
-        slice_number=5
-    )
-    
+    image_info = ImageInfo(table_position=10.5, slice_number=5)
+
     assert image_info.table_position == 10.5
     assert image_info.slice_number == 5
     assert image_info.couch_pos is None
@@ -211,3 +213,66 @@ def test_image_info_optional_fields():
     assert image_info.instance_uid is None
     assert image_info.dicom_file_name is None
     assert image_info.image_set is None
+
+
+def test_image_info_table():
+    """Test the columnar slice metadata and the z-position lookup."""
+    image_info_list = [
+        ImageInfo(
+            table_position=-2.5 + 0.25 * k, slice_number=k, instance_uid=f"1.2.{k}"
+        )
+        for k in range(5)
+    ][::-1]
+    image_info_list.append(ImageInfo(slice_number=None, instance_uid="1.2.9"))
+    table = ImageInfoTable.from_image_info_list(image_info_list)
+
+    assert len(table) == 6
+    assert table.table_position.dtype == np.float64
+    assert table.slice_number.dtype == np.int64
+    assert table.to_list("table_position") == [-1.5, -1.75, -2.0, -2.25, -2.5, None]
+    assert table.to_list("slice_number") == [4, 3, 2, 1, 0, None]
+    assert table.instance_uid[-1] == "1.2.9"
+    assert table.first("instance_uid") == "1.2.4"
+
+    assert table.find_slice(-1.5) == 0
+    assert table.find_slice(-2.3) == 3
+    assert table.find_slice(-9.0) == 4
+    assert table.find_slice(-9.0, tolerance=0.5) is None
+    assert ImageInfoTable.from_image_info_list([]).find_slice(0.0) is None
+
+
+def test_image_set_image_info_table_invalidation():
+    """Test that the table backing the ImageSet properties follows ImageInfo changes."""
+    image_set = ImageSet(
+        image_info_list=[ImageInfo(table_position=0.0), ImageInfo(table_position=0.5)]
+    )
+    table = image_set.image_info_table
+    assert image_set.table_positions == [0.0, 0.5]
+    assert image_set.image_info_table is table
+    assert image_set.find_slice_index(0.4) == 1
+
+    image_set.image_info_list.append(ImageInfo(table_position=1.0))
+    assert image_set.table_positions == [0.0, 0.5, 1.0]
+
+    image_set.image_info_list[0].table_position = -0.5
+    assert image_set.table_positions == [-0.5, 0.5, 1.0]
+
+    image_set.image_info_list = [ImageInfo(table_position=3.0)]
+    assert image_set.table_positions == [3.0]
+
+
+def test_image_info_table_invalidation_after_reload(db_session):
+    """Test that edits of ImageInfo rows loaded from the database invalidate the table."""
+    image_set = ImageSet(
+        image_info_list=[ImageInfo(table_position=float(z)) for z in range(3)]
+    )
+    db_session.add(image_set)
+    db_session.commit()
+    image_set_id = image_set.id
+    db_session.expunge_all()
+
+    reloaded = db_session.get(ImageSet, image_set_id)
+    assert reloaded.table_positions == [0.0, 1.0, 2.0]
+    reloaded.image_info_list[0].table_position = 10.0
+    assert reloaded.table_positions == [10.0, 1.0, 2.0]
+    assert reloaded.find_slice_index(10.0) == 0
@@ -1,10 +1,13 @@
 """
 Tests for the ImageSet model, reader, and writer.
 """
+
 from pathlib import Path
+
+import numpy as np
 import pytest
 
-from pinnacle_io.models import ImageSet, ImageInfo, Patient
+from pinnacle_io.models import ImageInfo, ImageSet, Patient
 from pinnacle_io.readers.image_set_reader import ImageSetReader
 from pinnacle_io.writers.image_set_writer import ImageSetWriter
 
@@ -21,9 +24,9 @@ def test_image_info_initialization():
         frame_uid="1.2.3.4.7",
         class_uid="1.2.3.4.8",
         instance_uid="1.2.3.4.9",
-        dicom_file_name="slice_5.dcm"
+        dicom_file_name="slice_5.dcm",
     )
-    
+
     assert image_info.table_position == 10.5
     assert image_info.couch_pos == 15.2
     assert image_info.slice_number == 5
@@ -61,7 +64,7 @@ def test_image_set_initialization():
                 "frame_uid": "1.2.3.4.7",
                 "class_uid": "1.2.3.4.8",
                 "instance_uid": "1.2.3.4.9",
-                "dicom_file_name": "slice_0.dcm"
+                "dicom_file_name": "slice_0.dcm",
             },
             {
                 "table_position": 10.75,
@@ -72,11 +75,11 @@ def test_image_set_initialization():
                 "frame_uid": "1.2.3.4.7",
                 "class_uid": "1.2.3.4.8",
                 "instance_uid": "1.2.3.4.10",
-                "dicom_file_name": "slice_1.dcm"
-            }
-        ]
+                "dicom_file_name": "slice_1.dcm",
+            },
+        ],
     )
-    
+
     assert image_set.series_uid == "1.2.3.4.5"
     assert image_set.study_uid == "1.2.3.4.6"
     assert image_set.series_number == 1
@@ -90,13 +93,13 @@ def test_image_set_initialization():
     assert image_set.y_pixdim == 0.097656
     assert image_set.z_pixdim == 0.25
     assert len(image_set.image_info_list) == 2
-    
+
     # Check first image info
     image_info_1 = image_set.image_info_list[0]
     assert image_info_1.table_position == 10.5
     assert image_info_1.slice_number == 0
     assert image_info_1.dicom_file_name == "slice_0.dcm"
-    
+
     # Check second image info
     image_info_2 = image_set.image_info_list[1]
     assert image_info_2.table_position == 10.75
@@ -128,7 +131,7 @@ def test_image_set_properties():
                 "frame_uid": "1.2.3.4.7",
                 "class_uid": "1.2.3.4.8",
                 "instance_uid": "1.2.3.4.9",
-                "dicom_file_name": "slice_0.dcm"
+                "dicom_file_name": "slice_0.dcm",
             },
             {
                 "table_position": 10.75,
@@ -139,11 +142,11 @@ def test_image_set_properties():
                 "frame_uid": "1.2.3.4.7",
                 "class_uid": "1.2.3.4.8",
                 "instance_uid": "1.2.3.4.10",
-                "dicom_file_name": "slice_1.dcm"
-            }
-        ]
+                "dicom_file_name": "slice_1.dcm",
+            },
+        ],
     )
-    
+
     # Test the properties
     assert image_set.table_positions == [10.5, 10.75]
     assert image_set.couch_positions == [15.2, 15.45]
@@ -153,7 +156,7 @@ def test_image_set_properties():
     assert image_set.class_uid == "1.2.3.4.8"
     assert image_set.instance_uids == ["1.2.3.4.9", "1.2.3.4.10"]
     assert image_set.dicom_file_names == ["slice_0.dcm", "slice_1.dcm"]
-    
+
     # Test the methods
     assert image_set.get_image_dimensions() == (512, 512, 101)
     assert image_set.get_pixel_spacing() == (0.097656, 0.097656, 0.25)
@@ -162,23 +165,19 @@ def test_image_set_properties():
 def test_image_set_patient_relationship():
     """Test the relationship between Patient and ImageSet."""
     # Create a patient
-    patient = Patient(
-        patient_id=123,
-        first_name="John",
-        last_name="Doe"
-    )
-    
+    patient = Patient(patient_id=123, first_name="John", last_name="Doe")
+
     # Create an image set
     image_set = ImageSet(
         series_uid="1.2.3.4.5",
         study_uid="1.2.3.4.6",
         image_name="Test Image",
-        modality="CT"
+        modality="CT",
     )
-    
+
     # Associate the image set with the patient
     patient.image_set_list.append(image_set)
-    
+
     # Check the relationship
     assert len(patient.image_set_list) == 1
     assert patient.image_set_list[0].series_uid == "1.2.3.4.5"
@@ -189,7 +188,10 @@ def test_image_set_patient_relationship():
 
 def test_read_image_set_file():
     """Tests reading a valid ImageSet file."""
-    image_set = ImageSetReader.read_header(Path(__file__).parent / 'test_data/01/Institution_1/Mount_0/Patient_1/ImageSet_0')
+    image_set = ImageSetReader.read_header(
+        Path(__file__).parent
+        / "test_data/01/Institution_1/Mount_0/Patient_1/ImageSet_0"
+    )
 
     assert isinstance(image_set, ImageSet)
     assert image_set.series_uid == "1.2.840.113619.2.55.3.3535481354.000.3513513585.000"
@@ -206,10 +208,109 @@ def test_read_image_set_file():
     assert len(image_set.image_info_list) > 2
     assert image_set.image_info_list[0].table_position == -8.75
     assert image_set.image_info_list[0].slice_number == 1
-    assert image_set.image_info_list[0].dicom_file_name == "CT_1.2.840.113619.2.55.3.3535481354.111.3513513585.3.1.dcm"
+    assert (
+        image_set.image_info_list[0].dicom_file_name
+        == "CT_1.2.840.113619.2.55.3.3535481354.111.3513513585.3.1.dcm"
+    )
     assert image_set.image_info_list[1].table_position == -8.5
     assert image_set.image_info_list[1].slice_number == 2
-    assert image_set.image_info_list[1].dicom_file_name == "CT_1.2.840.113619.2.55.3.3535481354.111.3513513585.3.2.dcm"
+    assert (
+        image_set.image_info_list[1].dicom_file_name
+        == "CT_1.2.840.113619.2.55.3.3535481354.111.3513513585.3.2.dcm"
+    )
+
+
+def test_read_image_set_slices(tmp_path):
+    """Tests reading individual slices from an ImageSet file without loading the volume."""
+    image_set = ImageSet(x_dim=4, y_dim=3, z_dim=5, binary_header_size=8)
+    volume = np.arange(5 * 3 * 4, dtype=np.uint16).reshape(5, 3, 4)
+    (tmp_path / "ImageSet_0.img").write_bytes(b"\x00" * 8 + volume.tobytes())
+
+    slices = ImageSetReader.read_slices(tmp_path / "ImageSet_0", image_set, [1, 4])
+    assert slices.shape == (2, 3, 4)
+    assert np.array_equal(slices, volume[[1, 4]])
+
+    image_set = ImageSetReader.read_image_set(
+        tmp_path / "ImageSet_0", image_set, lazy=True
+    )
+    assert image_set.pixel_data is None
+    assert np.array_equal(image_set.get_slice_data(3), volume[3])
+    assert image_set.get_slice_data(5) is None
+
+    # Editing a slice of a lazy image set keeps the other slices
+    image_set.set_slice_data(0, np.full((3, 4), 9, dtype=np.uint16))
+    assert (image_set.get_slice_data(0) == 9).all()
+    assert np.array_equal(image_set.get_slice_data(1), volume[1])
+
+
+def test_image_set_volume_is_zero_copy():
+    """Tests that arrays are used as the volume without copying and slices are views."""
+    volume = np.arange(3 * 4 * 5, dtype=np.uint16).reshape(3, 4, 5)
+    image_set = ImageSet(x_dim=5, y_dim=4, z_dim=3, pixel_data=volume)
+
+    assert image_set.volume.array is volume
+    assert np.shares_memory(image_set.get_slice_data(1), volume)
+    assert image_set.get_slice_data(3) is None
+
+    image_set.set_slice_data(2, np.full((4, 5), 7, dtype=np.uint16))
+    assert image_set.volume.array is volume
+    assert np.all(volume[2] == 7)
+
+    # Bytes are produced lazily and reflect slice writes
+    assert image_set.pixel_data == volume.tobytes()
+    image_set.set_slice_data(0, np.ones((4, 5), dtype=np.uint16))
+    assert image_set.pixel_data == volume.tobytes()
+
+
+def test_image_set_volume_from_bytes():
+    """Tests decoding raw bytes into a volume and copy-on-write slice updates."""
+    volume = np.arange(2 * 3 * 4, dtype=np.uint16).reshape(2, 3, 4)
+    image_set = ImageSet(
+        x_dim=4, y_dim=3, z_dim=2, bytes_pix=2, pixel_data=volume.tobytes()
+    )
+
+    assert np.array_equal(image_set.volume, volume)
+    assert not image_set.volume.array.flags.writeable
+    image_set.set_slice_data(1, np.zeros((3, 4), dtype=np.uint16))
+    assert image_set.volume.array.flags.writeable
+    assert np.array_equal(image_set.volume[0], volume[0])
+    assert not image_set.volume[1].any()
+
+    image_set.pixel_data = None
+    assert image_set.volume is None
+    assert image_set.pixel_data is None
+
+
+def test_image_set_volume_persistence(db_session):
+    """Tests that the volume bytes are produced when the ImageSet is flushed."""
+    volume = np.arange(2 * 3 * 4, dtype=np.uint16).reshape(2, 3, 4)
+    image_set = ImageSet(x_dim=4, y_dim=3, z_dim=2, pixel_data=volume)
+    db_session.add(image_set)
+    db_session.flush()
+
+    image_set.set_slice_data(1, np.full((3, 4), 9, dtype=np.uint16))
+    db_session.flush()
+    db_session.expire(image_set)
+
+    reloaded = db_session.get(ImageSet, image_set.id)
+    assert reloaded.pixel_data == volume.tobytes()
+    assert np.all(reloaded.get_slice_data(1) == 9)
+
+
+def test_read_image_set_memmap(tmp_path):
+    """Tests reading an ImageSet file as a copy-on-write memmap."""
+    image_set = ImageSet(x_dim=4, y_dim=3, z_dim=2, binary_header_size=4)
+    volume = np.arange(2 * 3 * 4, dtype=np.uint16).reshape(2, 3, 4)
+    (tmp_path / "ImageSet_0.img").write_bytes(b"\x00" * 4 + volume.tobytes())
+
+    image_set = ImageSetReader.read_image_set(
+        tmp_path / "ImageSet_0", image_set, mmap=True
+    )
+    assert isinstance(image_set.volume.array, np.memmap)
+    assert np.array_equal(image_set.volume, volume)
+
+    image_set.set_slice_data(0, np.zeros((3, 4), dtype=np.uint16))
+    assert (tmp_path / "ImageSet_0.img").read_bytes()[4:] == volume.tobytes()
 
 
 def test_write_image_set_file(tmp_path):
@@ -222,99 +323,72 @@ def test_write_image_set_file(tmp_path):
 def test_image_set_relationships_initialization():
     """Test that all ImageSet relationships are initialized correctly."""
     # Test initializing with a patient directly
-    patient = Patient(
-        patient_id=123,
-        first_name="John",
-        last_name="Doe"
-    )
-    
+    patient = Patient(patient_id=123, first_name="John", last_name="Doe")
+
     image_set = ImageSet(
-        series_uid="1.2.3.4.5",
-        image_name="Test Image",
-        modality="CT",
-        patient=patient
+        series_uid="1.2.3.4.5", image_name="Test Image", modality="CT", patient=patient
     )
-    
+
     # Verify patient relationship
     assert image_set.patient is patient
     assert image_set.patient_id == patient.id
     assert image_set in patient.image_set_list
-    
+
     # Test initializing with a patient as a dictionary
     image_set2 = ImageSet(
         series_uid="1.2.3.4.6",
         image_name="Test Image 2",
         modality="MR",
-        patient={
-            "patient_id": 456,
-            "first_name": "Jane",
-            "last_name": "Smith"
-        }
+        patient={"patient_id": 456, "first_name": "Jane", "last_name": "Smith"},
     )
-    
+
     # Verify patient relationship
     assert image_set2.patient is not None
     assert image_set2.patient.patient_id == 456
     assert image_set2.patient.first_name == "Jane"
     assert image_set2.patient.last_name == "Smith"
     assert image_set2 in image_set2.patient.image_set_list
-    
+
     # Test initializing with image_info_list
     image_set3 = ImageSet(
         series_uid="1.2.3.4.7",
         image_name="Test Image 3",
         modality="PT",
         image_info_list=[
-            {
-                "table_position": 10.5,
-                "slice_number": 0,
-                "instance_uid": "1.2.3.4.9"
-            },
-            {
-                "table_position": 10.75,
-                "slice_number": 1,
-                "instance_uid": "1.2.3.4.10"
-            }
-        ]
+            {"table_position": 10.5, "slice_number": 0, "instance_uid": "1.2.3.4.9"},
+            {"table_position": 10.75, "slice_number": 1, "instance_uid": "1.2.3.4.10"},
+        ],
     )
-    
+
     # Verify image_info_list relationship
     assert len(image_set3.image_info_list) == 2
     assert image_set3.image_info_list[0].table_position == 10.5
     assert image_set3.image_info_list[0].slice_number == 0
     assert image_set3.image_info_list[0].instance_uid == "1.2.3.4.9"
     assert image_set3.image_info_list[0].image_set is image_set3
-    
+
     assert image_set3.image_info_list[1].table_position == 10.75
     assert image_set3.image_info_list[1].slice_number == 1
     assert image_set3.image_info_list[1].instance_uid == "1.2.3.4.10"
     assert image_set3.image_info_list[1].image_set is image_set3
-    
+
     # Test initializing with ImageInfoList (PascalCase)
     image_set4 = ImageSet(
         series_uid="1.2.3.4.8",
         image_name="Test Image 4",
         modality="CT",
         ImageInfoList=[
-            {
-                "table_position": 11.5,
-                "slice_number": 0,
-                "instance_uid": "1.2.3.4.11"
-            },
-            {
-                "table_position": 11.75,
-                "slice_number": 1,
-                "instance_uid": "1.2.3.4.12"
-            }
-        ]
+            {"table_position": 11.5, "slice_number": 0, "instance_uid": "1.2.3.4.11"},
+            {"table_position": 11.75, "slice_number": 1, "instance_uid": "1.2.3.4.12"},
+        ],
     )
-    
+
     # Verify ImageInfoList relationship
     assert len(image_set4.image_info_list) == 2
     assert image_set4.image_info_list[0].table_position == 11.5
     assert image_set4.image_info_list[0].instance_uid == "1.2.3.4.11"
     assert image_set4.image_info_list[0].image_set is image_set4
-    
+
     # Test initializing with both patient and image_info_list
     image_set5 = ImageSet(
         series_uid="1.2.3.4.9",
@@ -322,14 +396,10 @@ def test_image_set_relationships_initialization():
         modality="CT",
         patient=patient,
         image_info_list=[
-            {
-                "table_position": 12.5,
-                "slice_number": 0,
-                "instance_uid": "1.2.3.4.13"
-            }
-        ]
+            {"table_position": 12.5, "slice_number": 0, "instance_uid": "1.2.3.4.13"}
+        ],
     )
-    
+
     # Verify all relationships
     assert image_set5.patient is patient
     assert image_set5 in patient.image_set_list
@@ -344,19 +414,156 @@ def test_image_set_repr():
     image_set = ImageSet(
         ID=42,  # Setting ID directly for testing repr
         image_name="Test Image",
-        modality="CT"
+        modality="CT",
     )
-    
+
     # Check the string representation
     expected_repr = "<ImageSet(id=42, name='Test Image', modality='CT')>"
     assert repr(image_set) == expected_repr
-    
+
     # Test with different values
-    image_set2 = ImageSet(
-        ID=123,
-        image_name="MRI Scan",
-        modality="MR"
-    )
-    
+    image_set2 = ImageSet(ID=123, image_name="MRI Scan", modality="MR")
+
     expected_repr2 = "<ImageSet(id=123, name='MRI Scan', modality='MR')>"
     assert repr(image_set2) == expected_repr2
+
+
+def _write_multi_file_image_set(directory, volume, header_size=0):
+    """Write one file per slice using the FnameFormat naming scheme."""
+    for k, axial in enumerate(volume):
+        (directory / f"ImageSet_0.{10 + 2 * k:03d}.img").write_bytes(
+            b"\x00" * header_size + axial.tobytes()
+        )
+    return ImageSet(
+        image_name="4D",
+        x_dim=volume.shape[2],
+        y_dim=volume.shape[1],
+        z_dim=volume.shape[0],
+        bytes_pix=2,
+        binary_header_size=header_size,
+        fname_format="ImageSet_0.%03d.img",
+        fname_index_start=10,
+        fname_index_delta=2,
+    )
+
+
+def test_read_multi_file_image_set(tmp_path):
+    """Test reading an image set stored as one file per slice."""
+    volume = np.arange(6 * 4 * 5, dtype=np.uint16).reshape(6, 4, 5)
+    image_set = _write_multi_file_image_set(tmp_path, volume, header_size=4)
+
+    image_set = ImageSetReader.read_image_set(
+        tmp_path / "ImageSet_0", image_set, workers=3
+    )
+    assert np.array_equal(image_set.volume, volume)
+    assert image_set.slice_reader.slice_path(1) == tmp_path / "ImageSet_0.012.img"
+
+    slices = ImageSetReader.read_slices(tmp_path / "ImageSet_0", image_set, [5, 0])
+    assert np.array_equal(slices, volume[[5, 0]])
+
+
+def test_multi_file_image_set_lazy_cache(tmp_path):
+    """Test that slices are read on first access and kept in an LRU cache."""
+    volume = np.arange(6 * 4 * 5, dtype=np.uint16).reshape(6, 4, 5)
+    image_set = _write_multi_file_image_set(tmp_path, volume)
+
+    image_set = ImageSetReader.read_image_set(
+        tmp_path / "ImageSet_0", image_set, lazy=True, cache_size=2
+    )
+    reader = image_set.slice_reader
+    assert image_set.volume is None
+    assert reader.cached_slices == []
+
+    assert np.array_equal(image_set.get_slice_data(3), volume[3])
+    assert np.array_equal(image_set.get_slice_data(1), volume[1])
+    assert image_set.get_slice_data(3) is image_set.get_slice_data(3)
+    assert np.array_equal(image_set.get_slice_data(4), volume[4])
+    assert reader.cached_slices == [3, 4]
+    assert image_set.get_slice_data(6) is None
+
+    edited = ImageSetReader.read_image_set(
+        tmp_path / "ImageSet_0",
+        _write_multi_file_image_set(tmp_path, volume),
+        lazy=True,
+    )
+    edited.set_slice_data(2, np.zeros((4, 5), dtype=np.uint16))
+    assert not edited.get_slice_data(2).any()
+    assert np.array_equal(edited.get_slice_data(5), volume[5])
+
+    reader.cache_size = None
+    image_set.prefetch_slices(workers=4)
+    assert sorted(reader.cached_slices) == list(range(6))
+
+    (tmp_path / "ImageSet_0.020.img").unlink()
+    reader.clear_cache()
+    with pytest.raises(FileNotFoundError):
+        reader.read_slice(5)
+
+
+def test_image_set_pyramid(tmp_path):
+    """Test building, persisting and serving slices from the image pyramid."""
+    volume = (np.arange(3 * 8 * 10, dtype=np.uint16) * 7).reshape(3, 8, 10)
+    image_set = ImageSet(image_name="CT", x_dim=10, y_dim=8, z_dim=3, bytes_pix=2)
+    (tmp_path / "ImageSet_0.img").write_bytes(volume.tobytes())
+    image_set = ImageSetReader.read_image_set(
+        tmp_path / "ImageSet_0", image_set, lazy=True
+    )
+
+    # Nothing is written next to the image file by default
+    assert image_set.pyramid(levels=1).cache_dir is None
+    assert not (tmp_path / "ImageSet_0.img.pyramid").exists()
+
+    cache_dir = tmp_path / "cache" / "CT"
+    pyramid = image_set.pyramid(levels=2, cache_dir=cache_dir)
+    assert pyramid.number_of_levels == 3
+    assert pyramid.level_shape(1) == (3, 4, 5)
+    assert pyramid.level_shape(2) == (3, 2, 3)
+    expected = np.rint(volume[1].reshape(4, 2, 5, 2).mean(axis=(1, 3))).astype(
+        np.uint16
+    )
+    assert np.array_equal(pyramid.get_slice(1, level=1), expected)
+    assert np.array_equal(pyramid.get_slice(1, level=0), volume[1])
+    assert (cache_dir / "level_2.npy").exists()
+    assert image_set.pyramid(levels=2) is pyramid
+
+    # Served from the coarsest level that is at least the requested size
+    assert pyramid.level_for_size((4, 5)) == 1
+    assert pyramid.level_for_size(3) == 1
+    assert pyramid.level_for_size(2) == 2
+    assert pyramid.level_for_size((6, 6)) == 0
+    assert pyramid.get_slice_for_size(2, (2, 2)).shape == (2, 3)
+
+    # A new ImageSet for the same file reuses the persisted levels
+    other = ImageSetReader.read_image_set(
+        tmp_path / "ImageSet_0",
+        ImageSet(x_dim=10, y_dim=8, z_dim=3, bytes_pix=2),
+        lazy=True,
+    )
+    loaded = other.pyramid(levels=2, cache_dir=cache_dir)
+    assert isinstance(loaded.levels[1], np.memmap)
+    assert np.array_equal(loaded.get_slice(1, level=1), expected)
+
+    # An unwritable cache directory falls back to an in-memory pyramid
+    with pytest.warns(UserWarning, match="in memory"):
+        fallback = other.pyramid(
+            levels=2, cache_dir=tmp_path / "ImageSet_0.img" / "pyramid", rebuild=True
+        )
+    assert fallback.cache_dir is None
+    assert np.array_equal(fallback.get_slice(1, level=1), expected)
+
+
+def test_image_set_pyramid_in_memory():
+    """Test an in-memory pyramid with odd dimensions and invalidation on edit."""
+    volume = np.ones((2, 5, 3), dtype=np.uint16)
+    image_set = ImageSet(x_dim=3, y_dim=5, z_dim=2, pixel_data=volume)
+
+    pyramid = image_set.pyramid(levels=1, persist=False)
+    assert pyramid.cache_dir is None
+    assert pyramid.get_slice(0, level=1).shape == (3, 2)
+    assert (pyramid.get_slice(0, level=1) == 1).all()
+
+    image_set.set_slice_data(0, np.full((5, 3), 9, dtype=np.uint16))
+    assert (image_set.pyramid(levels=1, persist=False).get_slice(0, level=1) == 9).all()
+
+    with pytest.raises(ValueError):
+        ImageSet(x_dim=3, y_dim=5, z_dim=2).pyramid()
@@ -2,33 +2,42 @@
 Tests for the PatientSetup model.
 """
 
+import json
+
 import numpy as np
+
 from pinnacle_io.models import (
+    ROI,
+    Curve,
     PatientSetup,
     Plan,
 )
 from pinnacle_io.utils.patient_enum import (
-    PatientPositionEnum,
     PatientOrientationEnum,
-    TableMotionEnum,
+    PatientPositionEnum,
     PatientSetupEnum,
+    TableMotionEnum,
 )
 
 
 def test_patient_setup_initialization():
     """Test PatientSetup initialization with all fields."""
-    pinnacle_to_dicom = np.array([[-1, 0, 0, 0], [0, -1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]])
-    dicom_to_pinnacle = np.array([[-1, 0, 0, 0], [0, -1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]])
-    image_orientation = [1.0, 0.0, 0.0, 0.0, 1.0, 0.0]    
+    pinnacle_to_dicom = np.array(
+        [[-1, 0, 0, 0], [0, -1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]]
+    )
+    dicom_to_pinnacle = np.array(
+        [[-1, 0, 0, 0], [0, -1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]]
+    )
+    image_orientation = [1.0, 0.0, 0.0, 0.0, 1.0, 0.0]
     patient_setup = PatientSetup(
         position=PatientPositionEnum.Supine.value,
         orientation=PatientOrientationEnum.HeadFirst.value,
-        table_motion= TableMotionEnum.Unknown.value,
+        table_motion=TableMotionEnum.Unknown.value,
         patient_setup=PatientSetupEnum.HFS.value,
         pinnacle_to_dicom_matrix=pinnacle_to_dicom.tolist(),
         dicom_to_pinnacle_matrix=dicom_to_pinnacle.tolist(),
         image_orientation_patient=image_orientation,
-        patient_position_description="Head First Supine"
+        patient_position_description="Head First Supine",
     )
 
     # Test all fields are set correctly
@@ -37,28 +46,26 @@ def test_patient_setup_initialization():
     assert patient_setup.table_motion == TableMotionEnum.Unknown.value
     assert patient_setup.patient_setup == PatientSetupEnum.HFS.value
     assert patient_setup.patient_position_description == "Head First Supine"
-    
+
     # Test matrix conversions
     np.testing.assert_array_equal(
-        patient_setup.pinnacle_to_dicom_matrix_array,
-        pinnacle_to_dicom
+        patient_setup.pinnacle_to_dicom_matrix_array, pinnacle_to_dicom
     )
     np.testing.assert_array_equal(
-        patient_setup.dicom_to_pinnacle_matrix_array,
-        dicom_to_pinnacle
+        patient_setup.dicom_to_pinnacle_matrix_array, dicom_to_pinnacle
     )
     assert patient_setup.image_orientation_patient_array == image_orientation
 
 
 def test_patient_setup_plan_relationship():
     """Test PatientSetup relationship with Plan."""
-    plan = Plan(name="Plan1")    
+    plan = Plan(name="Plan1")
     patient_setup = PatientSetup(
         position=PatientPositionEnum.Supine.value,
         orientation=PatientOrientationEnum.HeadFirst.value,
-        plan=plan
+        plan=plan,
     )
-    
+
     # Verify plan relationship
     assert patient_setup.plan is plan
     assert patient_setup.plan_id == plan.id
@@ -66,12 +73,12 @@ def test_patient_setup_plan_relationship():
 
 
 def test_patient_setup_enum_properties():
-    """Test enum property getters for PatientSetup."""    
+    """Test enum property getters for PatientSetup."""
     patient_setup = PatientSetup(
         position=PatientPositionEnum.Supine.value,
         orientation=PatientOrientationEnum.HeadFirst.value,
         table_motion=TableMotionEnum.IntoScanner.value,
-        patient_setup=PatientSetupEnum.HFS.value
+        patient_setup=PatientSetupEnum.HFS.value,
     )
 
     assert patient_setup.position_enum == PatientPositionEnum.Supine
@@ -95,7 +102,7 @@ def test_coordinate_transformations():
     """Test coordinate transformation methods."""
     # Test HFS setup (default transformation matrices)
     patient_setup = PatientSetup(patient_setup=PatientSetupEnum.HFS.value)
-    
+
     # Matrices are initialized by the PatientSetup constructor based on HFS setup
 
     # Test single point transformation
@@ -113,22 +120,44 @@ def test_coordinate_transformations():
     assert dicom_contour == [[-1.0, -2.0, 3.0], [-4.0, -5.0, 6.0]]
 
     # Transform contour back to pinnacle coordinates
-    back_to_pinnacle_contour = patient_setup.transform_contour_dicom_to_pinnacle(dicom_contour)
+    back_to_pinnacle_contour = patient_setup.transform_contour_dicom_to_pinnacle(
+        dicom_contour
+    )
     assert back_to_pinnacle_contour == contour_points
 
 
 def test_different_patient_setups():
     """Test transformation matrices for different patient setups."""
     test_cases = [
-        (PatientSetupEnum.HFS, [-1, 0, 0, 0], [0, -1, 0, 0], [0, 0, 1, 0]),  # Head First Supine
-        (PatientSetupEnum.HFP, [1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0]),   # Head First Prone
-        (PatientSetupEnum.FFS, [1, 0, 0, 0], [0, -1, 0, 0], [0, 0, -1, 0]),  # Feet First Supine
-        (PatientSetupEnum.FFP, [-1, 0, 0, 0], [0, 1, 0, 0], [0, 0, -1, 0])   # Feet First Prone
+        (
+            PatientSetupEnum.HFS,
+            [-1, 0, 0, 0],
+            [0, -1, 0, 0],
+            [0, 0, 1, 0],
+        ),  # Head First Supine
+        (
+            PatientSetupEnum.HFP,
+            [1, 0, 0, 0],
+            [0, 1, 0, 0],
+            [0, 0, 1, 0],
+        ),  # Head First Prone
+        (
+            PatientSetupEnum.FFS,
+            [1, 0, 0, 0],
+            [0, -1, 0, 0],
+            [0, 0, -1, 0],
+        ),  # Feet First Supine
+        (
+            PatientSetupEnum.FFP,
+            [-1, 0, 0, 0],
+            [0, 1, 0, 0],
+            [0, 0, -1, 0],
+        ),  # Feet First Prone
     ]
 
     for setup, x_row, y_row, z_row in test_cases:
         patient_setup = PatientSetup(patient_setup=setup.value)
-        
+
         # Matrices are initialized by the PatientSetup constructor based on the setup enum
 
         # Check transformation matrix
@@ -148,22 +177,100 @@ def test_invalid_matrix_handling():
 
     # Should return identity matrix for invalid transformations
     np.testing.assert_array_equal(
-        patient_setup.pinnacle_to_dicom_matrix_array,
-        np.eye(4)
+        patient_setup.pinnacle_to_dicom_matrix_array, np.eye(4)
     )
     np.testing.assert_array_equal(
-        patient_setup.dicom_to_pinnacle_matrix_array,
-        np.eye(4)
+        patient_setup.dicom_to_pinnacle_matrix_array, np.eye(4)
     )
     # Should return default orientation for invalid image orientation
-    assert patient_setup.image_orientation_patient_array == [1.0, 0.0, 0.0, 0.0, 1.0, 0.0]
+    assert patient_setup.image_orientation_patient_array == [
+        1.0,
+        0.0,
+        0.0,
+        0.0,
+        1.0,
+        0.0,
+    ]
 
 
 def test_patient_setup_repr():
     """Test the __repr__ method of PatientSetup."""
-    patient_setup = PatientSetup(
-        patient_setup=PatientSetupEnum.HFS.value
-    )
-    
+    patient_setup = PatientSetup(patient_setup=PatientSetupEnum.HFS.value)
+
     expected_repr = f"<PatientSetup(id=None, setup='{PatientSetupEnum.HFS.value}')>"
     assert repr(patient_setup) == expected_repr
+
+
+def test_batch_and_roi_transforms(db_session):
+    """Test cached matrices, batch point transforms and in-place ROI transforms."""
+    patient_setup = PatientSetup(
+        pinnacle_to_dicom_matrix=[
+            [-1, 0, 0, 1],
+            [0, -1, 0, 2],
+            [0, 0, 1, 3],
+            [0, 0, 0, 1],
+        ],
+        dicom_to_pinnacle_matrix=[
+            [-1, 0, 0, 1],
+            [0, -1, 0, 2],
+            [0, 0, 1, -3],
+            [0, 0, 0, 1],
+        ],
+    )
+    matrix = patient_setup.pinnacle_to_dicom_matrix_array
+    assert patient_setup.pinnacle_to_dicom_matrix_array is matrix
+    assert not matrix.flags.writeable
+
+    points = np.random.default_rng(0).normal(size=(100, 3))
+    dicom = patient_setup.transform_points_pinnacle_to_dicom(points)
+    expected = [
+        patient_setup.transform_point_pinnacle_to_dicom(p) for p in points.tolist()
+    ]
+    np.testing.assert_allclose(dicom, expected)
+    np.testing.assert_allclose(
+        patient_setup.transform_points_dicom_to_pinnacle(dicom), points
+    )
+
+    # Changing the column invalidates the cached matrix
+    patient_setup.pinnacle_to_dicom_matrix = json.dumps(np.eye(4).tolist())
+    np.testing.assert_array_equal(
+        patient_setup.pinnacle_to_dicom_matrix_array, np.eye(4)
+    )
+    patient_setup.pinnacle_to_dicom_matrix = json.dumps(
+        [[-1, 0, 0, 1], [0, -1, 0, 2], [0, 0, 1, 3], [0, 0, 0, 1]]
+    )
+
+    roi = ROI(
+        name="Target",
+        curve_list=[
+            Curve(points=np.array([[0, 0, 1], [1, 0, 1], [1, 1, 1]], dtype=np.float32)),
+            Curve(
+                points=np.array(
+                    [[0, 0, 2], [2, 0, 2], [2, 2, 2], [0, 2, 2]], dtype=np.float32
+                )
+            ),
+        ],
+    )
+    before = roi.curve_points
+    volume = roi.geometry.volume
+    buffer = before.points
+    copy = patient_setup.transform_roi_pinnacle_to_dicom(roi, in_place=False)
+    assert copy.points is not buffer and roi.curve_points is before
+
+    patient_setup.transform_roi_pinnacle_to_dicom(roi)
+    assert np.shares_memory(roi.curve_points.points, buffer)
+    assert roi.curve_points is not before
+    np.testing.assert_allclose(roi.curve_list[1].points[1], [-1.0, 2.0, 5.0])
+    np.testing.assert_allclose(roi.curve_points.z, [4.0, 5.0])
+    np.testing.assert_allclose(roi.curve_points.points, copy.points)
+    assert roi.geometry.volume == volume
+
+    # In-place transforms of a persisted ROI are written on commit
+    db_session.add(roi)
+    db_session.commit()
+    patient_setup.transform_roi_dicom_to_pinnacle(roi)
+    db_session.commit()
+    roi_id = roi.id
+    db_session.expunge_all()
+    reloaded = db_session.get(ROI, roi_id)
+    np.testing.assert_allclose(reloaded.curve_list[1].points[1], [2.0, 0.0, 2.0])
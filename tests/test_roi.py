@@ -1,17 +1,20 @@
 """
 Tests for the ROI model, reader, and writer.
 """
+
 from pathlib import Path
 from typing import List
-import pytest
+
 import numpy as np
-# from sqlalchemy import create_engine
-# from sqlalchemy.orm import Session
+import pytest
 
-from pinnacle_io.models import ROI, Curve, Plan, Patient, Trial
+from pinnacle_io.models import ROI, Curve, Patient, Plan, RaggedCurves, Trial
 from pinnacle_io.readers.roi_reader import ROIReader
 from pinnacle_io.writers.roi_writer import ROIWriter
 
+# from sqlalchemy import create_engine
+# from sqlalchemy.orm import Session
+
 
 def test_curve_initialization():
     """Test creating a Curve directly with kwargs."""
@@ -26,9 +29,9 @@ def test_curve_initialization():
         curve_number=1,
         slice_index=5,
         z_position=3.0,
-        non_existent_field="This should be ignored"
+        non_existent_field="This should be ignored",
     )
-    
+
     assert np.array_equal(curve.points, points)
     assert curve.contour_geometric_type == "CLOSED_PLANAR"
     assert curve.flags == 131092
@@ -84,9 +87,9 @@ def test_roi_initialization():
         bev_drr_outline=False,
         display_on_other_vols=True,
         is_linked=False,
-        non_existent_field="This should be ignored"
+        non_existent_field="This should be ignored",
     )
-    
+
     # Test ROI properties
     assert roi.roi_number == 1
     assert roi.name == "TestROI"
@@ -133,28 +136,28 @@ def test_roi_list_operations():
     """Test working with a list of ROIs."""
     # Create a list to hold ROIs
     rois: List[ROI] = []
-    
+
     # Test adding an ROI
     roi1 = ROI(name="TestROI1", roi_number=1)
     rois.append(roi1)
-    
+
     assert len(rois) == 1
     assert rois[0].name == "TestROI1"
-    
+
     # Test finding ROI by number
     found_roi = next((r for r in rois if r.roi_number == 1), None)
     assert found_roi is not None
     assert found_roi.name == "TestROI1"
-    
+
     # Test finding ROI by name
     found_roi = next((r for r in rois if r.name == "TestROI1"), None)
     assert found_roi is not None
     assert found_roi.roi_number == 1
-    
+
     # Test non-existent ROI
     found_roi = next((r for r in rois if r.roi_number == 2), None)
     assert found_roi is None
-    
+
     found_roi = next((r for r in rois if r.name == "Nonexistent"), None)
     assert found_roi is None
 
@@ -162,13 +165,13 @@ def test_roi_list_operations():
 def test_read_roi_file():
     """Tests reading a valid ROI file."""
     rois = ROIReader.read(
-        Path(__file__).parent / 'test_data/01/Institution_1/Mount_0/Patient_1/Plan_0'
+        Path(__file__).parent / "test_data/01/Institution_1/Mount_0/Patient_1/Plan_0"
     )
-    
+
     assert isinstance(rois, list)
     assert all(isinstance(roi, ROI) for roi in rois)
     assert len(rois) > 0
-    
+
     # Test the first ROI
     roi = rois[0]
     assert roi.name == "bb"
@@ -202,7 +205,7 @@ def test_read_roi_file():
     assert roi.bev_drr_outline is False
     assert roi.display_on_other_vols is True
     assert roi.is_linked is False
-    
+
     # Test curves in the first ROI
     assert len(roi.curve_list) > 0
     curve = roi.curve_list[0]
@@ -215,10 +218,32 @@ def test_read_roi_file():
     assert len(curve.get_curve_data()) == 75  # 25 points * 3 coordinates
 
 
+def test_read_roi_file_by_name():
+    """Tests reading selected ROIs through the byte-offset index."""
+    plan_path = (
+        Path(__file__).parent / "test_data/01/Institution_1/Mount_0/Patient_1/Plan_0"
+    )
+    index = ROIReader.read_index(plan_path)
+    assert [entry.name for entry in index] == ["bb", "ROI_1", "ROI_2", "ROI_3", "ROI_4"]
+    assert index[0].num_curve == 8 and index[1].num_curve == 2
+    assert index[0].end == index[1].start
+
+    all_rois = ROIReader.read(plan_path)
+    rois = ROIReader.read(plan_path, names=["ROI_3", "bb", "Missing"])
+    assert [roi.name for roi in rois] == ["bb", "ROI_3"]
+    assert [roi.roi_number for roi in rois] == [1, 4]
+    assert len(rois[1].curve_list) == len(all_rois[3].curve_list)
+    assert np.array_equal(rois[1].curve_points.points, all_rois[3].curve_points.points)
+
+    streamed = ROIReader.iter_rois(plan_path / "plan.roi")
+    assert next(streamed).name == "bb"
+    assert [roi.name for roi in streamed] == ["ROI_1", "ROI_2", "ROI_3", "ROI_4"]
+
+
 def test_write_roi_file():
     """Tests writing an ROI file."""
     roi = ROI(name="TestROI")
-    
+
     with pytest.raises(NotImplementedError):
         ROIWriter.write(roi, "/path/to/roi")
 
@@ -228,7 +253,7 @@ def test_curve_repr():
     # Initialize with points_json to avoid JSON parsing error
     curve = Curve(curve_number=1, num_points=0, points_json="[]")
     assert repr(curve) == "<Curve(id=None, curve_number=1, point_count=0)>"
-    
+
 
 def test_roi_repr():
     """Test the string representation of ROI."""
@@ -240,7 +265,7 @@ def test_roi_init_with_plan():
     """Test initializing an ROI with a Plan."""
     plan = Plan(plan_id=1, plan_name="Test Plan")
     roi = ROI(name="TestROI", roi_number=1, plan=plan)
-    
+
     assert roi.plan == plan
     assert roi.plan_id == plan.id
     assert roi in plan.roi_list
@@ -250,7 +275,7 @@ def test_roi_init_with_plan_dict():
     """Test initializing an ROI with a Plan dictionary."""
     plan_dict = {"plan_id": 1, "plan_name": "Test Plan"}
     roi = ROI(name="TestROI", roi_number=1, plan=plan_dict)
-    
+
     assert roi.plan.plan_id == 1
     assert roi.plan.name == "Test Plan"
     assert roi.plan_id == roi.plan.id
@@ -262,7 +287,7 @@ def test_roi_init_with_curves():
     curve1 = Curve(points=[[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]], curve_number=1)
     curve2 = Curve(points=[[7.0, 8.0, 9.0], [10.0, 11.0, 12.0]], curve_number=2)
     roi = ROI(name="TestROI", roi_number=1, curve_list=[curve1, curve2])
-    
+
     assert len(roi.curve_list) == 2
     assert roi.curve_list[0].curve_number == 1
     assert roi.curve_list[1].curve_number == 2
@@ -275,7 +300,7 @@ def test_roi_init_with_curve_list_kwarg():
     curve_dict1 = {"points": [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]], "curve_number": 1}
     curve_dict2 = {"points": [[7.0, 8.0, 9.0], [10.0, 11.0, 12.0]], "curve_number": 2}
     roi = ROI(name="TestROI", roi_number=1, CurveList=[curve_dict1, curve_dict2])
-    
+
     assert len(roi.curve_list) == 2
     assert roi.curve_list[0].curve_number == 1
     assert roi.curve_list[1].curve_number == 2
@@ -287,20 +312,22 @@ def test_complete_relationship_chain():
     """Test the complete relationship chain from Patient to ROI."""
     # Create a patient
     patient = Patient(patient_id=1, first_name="John", last_name="Doe")
-    
+
     # Create a plan linked to the patient
     plan = Plan(plan_id=1, plan_name="Test Plan", patient=patient)
-    
+
     # Create a trial linked to the plan
     trial = Trial(trial_id=1, trial_name="Test Trial", plan=plan)
-    
+
     # Create an ROI linked to the plan
     roi = ROI(name="TestROI", roi_number=1, plan=plan)
-    
+
     # Create curves linked to the ROI
     curve1 = Curve(points=[[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]], curve_number=1, roi=roi)
-    curve2 = Curve(points=[[7.0, 8.0, 9.0], [10.0, 11.0, 12.0]], curve_number=2, roi=roi)
-    
+    curve2 = Curve(
+        points=[[7.0, 8.0, 9.0], [10.0, 11.0, 12.0]], curve_number=2, roi=roi
+    )
+
     # Verify relationships
     assert roi.plan == plan
     assert roi in plan.roi_list
@@ -312,3 +339,72 @@ def test_complete_relationship_chain():
     assert curve2 in roi.curve_list
     assert curve1.roi == roi
     assert curve2.roi == roi
+
+
+def test_read_roi_file_ragged_points():
+    """Tests that read curves are views into one contiguous point buffer per ROI."""
+    rois = ROIReader.read(
+        Path(__file__).parent / "test_data/01/Institution_1/Mount_0/Patient_1/Plan_0"
+    )
+    roi = rois[0]
+    ragged = roi.curve_points
+    assert isinstance(ragged, RaggedCurves)
+    assert ragged.points.dtype == np.float32
+    assert len(ragged) == len(roi.curve_list)
+    assert (
+        ragged.offsets[-1]
+        == len(ragged.points)
+        == sum(c.num_points for c in roi.curve_list)
+    )
+    for index, curve in enumerate(roi.curve_list):
+        assert np.shares_memory(curve.points, ragged.points)
+        assert np.array_equal(curve.points, ragged[index])
+        assert np.isclose(ragged.z[index], curve.points[:, 2].mean())
+        assert curve.points_data is None
+
+
+def test_ragged_curve_points(db_session):
+    """Tests building, editing and persisting the ROI point buffer."""
+    with pytest.raises(ValueError):
+        RaggedCurves(np.zeros((4, 3)), [0, 2, 5])
+
+    first = [[0.0, 0.0, 1.0], [1.0, 0.0, 1.0], [1.0, 1.0, 1.0]]
+    second = [[0.0, 0.0, 2.0], [2.0, 0.0, 2.0], [2.0, 2.0, 2.0], [0.0, 2.0, 2.0]]
+    roi = ROI(name="TestROI", curve_list=[Curve(points=first), Curve(points=second)])
+    ragged = roi.curve_points
+    assert np.array_equal(ragged.offsets, [0, 3, 7])
+    assert np.allclose(ragged.z, [1.0, 2.0])
+    assert roi.curve_points is ragged
+    low, high = ragged.bounding_box()
+    assert np.array_equal(low, [0, 0, 1]) and np.array_equal(high, [2, 2, 2])
+
+    # Whole-ROI operations act on all curves at once
+    ragged.points[:, 0] += 10.0
+    assert roi.curve_list[1].points[1, 0] == 12.0
+
+    # In-place edits of the buffer are persisted, also for curves already in the database
+    db_session.add(roi)
+    db_session.commit()
+    assert roi._synced_curve_points_hash == ragged.content_hash()
+    ragged.points[:, 1] += 5.0
+    db_session.commit()
+    roi_id = roi.id
+    db_session.expunge_all()
+    reloaded = db_session.get(ROI, roi_id)
+    assert np.array_equal(
+        reloaded.curve_list[1].points, np.array(second, dtype=np.float32) + [10, 5, 0]
+    )
+    roi = reloaded
+    ragged = roi.curve_points
+
+    # Assigning points_data detaches the curve from the buffer
+    roi.curve_list[1].points_data = np.zeros((4, 3), dtype=np.float32).tobytes()
+    assert not roi.curve_list[1].points.any()
+    assert roi.curve_points is not ragged
+
+    # Assigning points detaches the curve and rebuilds the buffer
+    roi.curve_list[0].points = np.zeros((5, 3))
+    assert roi.curve_points is not ragged
+    assert np.array_equal(roi.curve_points.offsets, [0, 5, 9])
+    roi.curve_list.append(Curve(points=first))
+    assert len(roi.curve_points) == 3
@@ -0,0 +1,70 @@
+"""
+Tests for ROI volume, centroid and extents computed from curves.
+"""
+
+import numpy as np
+
+from pinnacle_io.models import ROI, Curve, Plan
+from pinnacle_io.utils.roi_geometry import (
+    compute_roi_geometry,
+    curve_areas_and_centroids,
+)
+
+
+def _square(x0, y0, x1, y1, z, clockwise=False):
+    points = [[x0, y0, z], [x1, y0, z], [x1, y1, z], [x0, y1, z]]
+    return np.array(points[::-1] if clockwise else points, dtype=np.float32)
+
+
+def test_curve_areas_and_centroids():
+    """Test the ragged shoelace sum against known polygons."""
+    triangle = np.array([[0, 0, 0], [4, 0, 0], [0, 3, 0]], dtype=np.float64)
+    square = _square(1, 1, 3, 5, 0, clockwise=True)
+    points = np.concatenate([triangle, square])
+    areas, centroids = curve_areas_and_centroids(points, [0, 3, 3, 7])
+    assert np.allclose(areas, [6.0, 0.0, -8.0])
+    assert np.allclose(centroids[0], [4 / 3, 1.0])
+    assert np.allclose(centroids[2], [2.0, 3.0])
+
+
+def test_roi_geometry_with_holes_and_cache():
+    """Test volume, centroid, extents, holes and invalidation when curves change."""
+    roi = ROI(name="Ring")
+    roi.curve_list = [Curve(points=_square(0, 0, 4, 4, z)) for z in (0.0, 0.5, 1.0)] + [
+        Curve(points=_square(1, 1, 3, 3, 0.5, clockwise=True))
+    ]
+
+    geometry = roi.geometry
+    assert geometry.slice_thickness == 0.5
+    assert np.allclose(geometry.curve_signs, [1, 1, 1, -1])
+    assert np.isclose(geometry.area, 3 * 16 - 4)
+    assert np.isclose(geometry.volume, 44 * 0.5)
+    assert np.allclose(geometry.centroid, (2.0, 2.0, 0.5))
+    assert geometry.extents == ((0.0, 0.0, 0.0), (4.0, 4.0, 1.0))
+    assert roi.geometry is geometry
+    assert np.isclose(roi.get_geometry(slice_thickness=0.3).volume, 44 * 0.3)
+
+    roi.curve_list.append(Curve(points=_square(0, 0, 2, 2, 1.5)))
+    assert roi.geometry is not geometry
+    assert np.isclose(roi.geometry.area, 48.0)
+
+    geometry = roi.geometry
+    roi.curve_list[0].points = _square(0, 0, 1, 1, 0.0)
+    assert np.isclose(roi.geometry.area, 33.0)
+
+    assert ROI(name="Empty").geometry.centroid is None
+
+
+def test_plan_batch_geometry():
+    """Test computing the geometry of all ROIs of a plan in one batch."""
+    rois = []
+    for i in range(200):
+        curves = [Curve(points=_square(i, 0, i + 2, 3, 0.3 * k)) for k in range(20)]
+        rois.append(ROI(name=f"ROI {i}", curve_list=curves))
+    plan = Plan(roi_list=rois)
+
+    results = plan.compute_roi_geometry(slice_thickness=0.3)
+    assert len(results) == 200
+    assert np.isclose(results[rois[7]].volume, 6.0 * 20 * 0.3)
+    assert np.allclose(results[rois[7]].centroid, (8.0, 1.5, 0.3 * 9.5))
+    assert compute_roi_geometry(rois, slice_thickness=0.3)[rois[7]] is results[rois[7]]
@@ -0,0 +1,98 @@
+"""
+Tests for ROI margin expansion and contraction.
+"""
+
+import numpy as np
+
+from pinnacle_io.models import ROI, Curve
+from pinnacle_io.utils.frames import GridGeometry
+from pinnacle_io.utils.roi_margin import (
+    apply_margin,
+    distance_transform,
+    mask_to_curves,
+    ring_roi,
+)
+from pinnacle_io.utils.roi_mask import rasterize_curves
+
+
+def _grid():
+    # 30 x 30 pixels of 0.2 cm, 15 slices of 0.3 cm
+    return GridGeometry((-3.0, -3.0, -2.1), (0.2, 0.2, 0.3), (15, 30, 30))
+
+
+def _brute_force_distance(mask, sampling):
+    features = np.argwhere(mask) * sampling
+    voxels = np.argwhere(np.ones_like(mask)) * sampling
+    squared = ((voxels[:, None, :] - features[None]) ** 2).sum(axis=-1).min(axis=1)
+    return np.sqrt(squared).reshape(mask.shape)
+
+
+def test_distance_transform_is_exact():
+    """Test the separable distance transform against brute force."""
+    rng = np.random.default_rng(3)
+    mask = rng.random((6, 9, 8)) > 0.92
+    sampling = (0.3, 0.2, 0.25)
+    np.testing.assert_allclose(
+        distance_transform(mask, sampling),
+        _brute_force_distance(mask, sampling),
+        atol=1e-9,
+    )
+    assert np.isinf(distance_transform(np.zeros((2, 3, 3), dtype=bool))).all()
+
+
+def test_anisotropic_margins_and_contours():
+    """Test expansion, contraction and contouring against ellipsoid membership."""
+    grid = _grid()
+    mask = np.zeros(grid.shape, dtype=bool)
+    mask[7, 14:16, 14:16] = True
+    margin = (0.6, 0.4, 0.9)
+
+    expanded = apply_margin(mask, grid, margin)
+    sampling = np.array(grid.spacing[::-1]) / np.array(margin[::-1])
+    expected = _brute_force_distance(mask, sampling) <= 1.0 + 1e-9
+    np.testing.assert_array_equal(expanded.to_array(), expected)
+    assert expanded.to_array()[7, 15, 11] and not expanded.to_array()[7, 15, 10]
+    assert expanded.to_array()[4, 15, 15] and not expanded.to_array()[3, 15, 15]
+
+    contracted = apply_margin(expanded, grid, tuple(-m for m in margin))
+    assert contracted.to_array()[mask].all()
+    # Slices 4 to 10 lose 3 slices (0.9 cm) on each side
+    column = apply_margin(expanded, grid, (0.0, 0.0, -0.9)).to_array()[:, 15, 15]
+    np.testing.assert_array_equal(np.flatnonzero(column), [7])
+
+    # Contours rasterize back to the same mask
+    curves = mask_to_curves(expanded, grid)
+    assert len(curves) == expanded.box_shape[0]
+    np.testing.assert_array_equal(
+        rasterize_curves(curves, grid).to_array(), expanded.to_array()
+    )
+
+
+def test_expand_roi_and_ring():
+    """Test new ROIs created from margins of an ROI."""
+    grid = _grid()
+    square = np.array(
+        [[-0.5, -0.5, 0.0], [0.5, -0.5, 0.0], [0.5, 0.5, 0.0], [-0.5, 0.5, 0.0]],
+        dtype=np.float32,
+    )
+    roi = ROI(
+        name="CTV",
+        color="red",
+        curve_list=[Curve(points=square + [0, 0, z]) for z in (-0.3, 0.0, 0.3)],
+    )
+
+    ptv = roi.expand(0.5, grid, name="PTV")
+    assert ptv.name == "PTV" and ptv.color == "red"
+    assert len(ptv.curve_list) == 5
+    assert ptv.get_mask(grid).sum() > roi.get_mask(grid).sum()
+    assert ptv.get_mask(grid)[roi.get_mask(grid)].all()
+    assert all(curve.num_points == len(curve.points) for curve in ptv.curve_list)
+
+    shrunk = roi.expand(-0.2, grid)
+    assert shrunk.name == "CTV_margin"
+    assert shrunk.get_mask(grid).sum() == 3 * 9
+
+    ring = ring_roi(roi, 0.6, grid, inner=0.2)
+    ring_mask = ring.get_mask(grid)
+    assert not (ring_mask & roi.get_mask(grid)).any()
+    assert ring_mask[7, 15, 11] and not ring_mask[7, 15, 15]
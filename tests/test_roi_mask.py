@@ -0,0 +1,183 @@
+"""
+Tests for contour-to-mask rasterization.
+"""
+
+import threading
+
+import numpy as np
+
+from pinnacle_io.models import ROI, Curve, Dose, DoseGrid, ImageSet, Plan
+from pinnacle_io.utils.roi_mask import (
+    GridGeometry,
+    MaskCache,
+    PackedMask,
+    fill_polygons,
+    get_roi_mask,
+    get_roi_masks,
+)
+
+
+def _square(x0, y0, x1, y1, z):
+    return np.array(
+        [[x0, y0, z], [x1, y0, z], [x1, y1, z], [x0, y1, z]], dtype=np.float32
+    )
+
+
+def _grid():
+    # 10 x 10 pixels of 1 cm, 5 slices of 2 cm starting at z = 0
+    return GridGeometry((0.0, 0.0, 0.0), (1.0, 1.0, 2.0), (5, 10, 10))
+
+
+def test_fill_polygons_with_holes():
+    """Test the even-odd fill of squares, holes and separate islands."""
+    outer = np.array([[1.5, 1.5], [7.5, 1.5], [7.5, 7.5], [1.5, 7.5]])
+    hole = np.array([[3.5, 3.5], [5.5, 3.5], [5.5, 5.5], [3.5, 5.5]])
+    island = np.array([[8.2, 8.2], [9.8, 8.2], [9.8, 9.8], [8.2, 9.8]])
+
+    mask = fill_polygons([outer], 10, 10)
+    assert mask[2:8, 2:8].all()
+    assert mask.sum() == 36
+
+    mask = fill_polygons([outer, hole, island], 10, 10)
+    assert not mask[4:6, 4:6].any()
+    assert mask[9, 9]
+    assert mask.sum() == 36 - 4 + 1
+
+    assert not fill_polygons([outer[:2]], 10, 10).any()
+
+
+def test_rasterize_roi_and_packed_mask():
+    """Test curve-to-slice mapping, bounding-box cropping and unpacking."""
+    roi = ROI(name="Target")
+    roi.curve_list = [
+        Curve(points=_square(1.5, 2.5, 4.5, 6.5, 2.1)),
+        Curve(points=_square(1.5, 2.5, 4.5, 6.5, 6.2)),
+        Curve(points=_square(0.0, 0.0, 5.0, 5.0, 50.0)),  # outside the grid
+    ]
+    packed = roi.get_mask(_grid(), packed=True)
+    assert isinstance(packed, PackedMask)
+    assert packed.offset == (1, 3, 2)
+    assert packed.box_shape == (3, 4, 3)
+    assert packed.count == 24
+
+    mask = roi.get_mask(_grid())
+    assert mask.shape == (5, 10, 10)
+    assert mask[1, 3:7, 2:5].all() and mask[3, 3:7, 2:5].all()
+    assert mask.sum() == 24
+    assert np.array_equal(np.asarray(packed), mask)
+    assert np.array_equal(PackedMask.from_array(mask).to_array(), mask)
+
+    empty = ROI(name="Empty").get_mask(_grid(), packed=True)
+    assert empty.empty and not empty.to_array().any()
+
+
+def test_mask_cache_and_parallel_rasterization(monkeypatch):
+    """Test that masks are cached by ROI content and grid."""
+    cache = MaskCache(max_entries=2)
+    roi = ROI(name="A", curve_list=[Curve(points=_square(1.5, 1.5, 3.5, 3.5, 0.0))])
+    mask = get_roi_mask(roi, _grid(), cache)
+    assert get_roi_mask(roi, _grid(), cache) is mask
+
+    # Editing the curves gives a new content hash
+    roi.curve_list[0].points = _square(1.5, 1.5, 5.5, 3.5, 0.0)
+    changed = get_roi_mask(roi, _grid(), cache)
+    assert changed is not mask
+    assert changed.count == 8
+    assert len(cache) == 2
+
+    rois = [
+        ROI(
+            name=f"R{i}",
+            curve_list=[Curve(points=_square(i + 0.5, 0.5, i + 2.5, 2.5, 4.0))],
+        )
+        for i in (0, 4, 8)
+    ]
+    # Curves are resolved on the calling thread, not in the workers
+    threads = []
+    curve_points = ROI.curve_points
+
+    def record_thread(roi):
+        threads.append(threading.get_ident())
+        return curve_points.fget(roi)
+
+    monkeypatch.setattr(ROI, "curve_points", property(record_thread))
+    masks = get_roi_masks(rois, _grid(), workers=3, cache=None)
+    assert [masks[roi].count for roi in rois] == [4, 4, 2]
+    assert set(threads) == {threading.get_ident()}
+
+
+def test_masks_default_to_rasterized_curves():
+    """Test that dose, density and statistics rasterize ROIs without supplied masks."""
+    roi = ROI(name="Box", curve_list=[Curve(points=_square(1.5, 1.5, 3.5, 3.5, 2.0))])
+
+    dose_grid = DoseGrid(
+        dimension_x=10,
+        dimension_y=10,
+        dimension_z=5,
+        voxel_size_x=1.0,
+        voxel_size_y=1.0,
+        voxel_size_z=2.0,
+        origin_x=0.0,
+        origin_y=0.0,
+        origin_z=0.0,
+    )
+    pixel_data = np.zeros((5, 10, 10), dtype=np.float32)
+    pixel_data[1, 2:4, 2:4] = 5.0
+    dose = Dose(pixel_data=pixel_data, dose_grid=dose_grid)
+    assert dose.get_dose_index(roi).volume_receiving(5.0) == 4.0 * 2.0
+
+    image = np.arange(500, dtype=np.uint16).reshape(5, 10, 10)
+    image_set = ImageSet(
+        x_dim=10,
+        y_dim=10,
+        z_dim=5,
+        x_pixdim=1.0,
+        y_pixdim=1.0,
+        z_pixdim=2.0,
+        x_start=0.0,
+        y_start=0.0,
+        z_start=0.0,
+        pixel_data=image,
+    )
+    plan = Plan(roi_list=[roi, ROI(name="NoCurves")])
+    plan.update_roi_statistics(image_set=image_set)
+    assert roi.pixel_min == 122 and roi.pixel_max == 133
+    assert roi.volume == 8.0
+    assert plan.roi_list[1].volume is None
+
+    masks = plan.get_roi_masks(image_set)
+    assert masks[roi].count == 4
+
+
+def test_fractional_mask_partial_volumes():
+    """Test partial-volume fractions for structures smaller than a few voxels."""
+    angles = np.linspace(0, 2 * np.pi, 200, endpoint=False)
+    grid = GridGeometry((0.0, 0.0, 0.0), (0.4, 0.4, 0.4), (3, 30, 30))
+    for radius in (0.15, 0.5, 3.0):
+        circle = np.stack(
+            [
+                6 + radius * np.cos(angles),
+                6 + radius * np.sin(angles),
+                np.full(200, 0.4),
+            ],
+            axis=1,
+        )
+        roi = ROI(name="Nerve", curve_list=[Curve(points=circle.astype(np.float32))])
+        fractional = roi.get_fractional_mask(grid, samples=8)
+        area = np.pi * radius**2
+        assert abs(fractional.volume(0.16 * 0.4) / 0.4 - area) < 0.05 * area + 0.01
+        assert fractional.fractions.dtype == np.float16
+        assert ((fractional.fractions > 0) & (fractional.fractions < 1)).all()
+        assert np.isclose(fractional.to_array().sum(), fractional.voxel_count)
+        assert roi.get_fractional_mask(grid, samples=8) is fractional
+
+    dose = np.zeros(grid.shape, dtype=np.float32)
+    dose[1] = 10.0
+    values, weights = fractional.values_and_weights(dose)
+    assert len(values) == fractional.interior.count + len(fractional.indices)
+    assert fractional.mean(dose) == 10.0
+
+    dose_data = Dose(pixel_data=dose)
+    index = dose_data.get_dose_index(roi, fractional)
+    assert np.isclose(index.total_volume, fractional.voxel_count)
+    assert index.mean_dose == 10.0
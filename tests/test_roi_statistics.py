@@ -0,0 +1,95 @@
+"""
+Tests for ROI pixel statistics computed from the image volume.
+"""
+
+import numpy as np
+import pytest
+
+from pinnacle_io.models import ROI, ImageSet, Plan
+from pinnacle_io.readers.image_set_reader import ImageSetReader
+from pinnacle_io.utils.roi_statistics import compute_roi_statistics, mask_bounding_box
+
+
+def _image_set(volume):
+    z_dim, y_dim, x_dim = volume.shape
+    return ImageSet(
+        x_dim=x_dim,
+        y_dim=y_dim,
+        z_dim=z_dim,
+        x_pixdim=0.1,
+        y_pixdim=0.1,
+        z_pixdim=0.25,
+        pixel_data=volume,
+    )
+
+
+def _masks(shape):
+    body = np.ones(shape, dtype=bool)
+    target = np.zeros(shape, dtype=bool)
+    target[3:6, 2:4, 1:5] = True
+    return body, target
+
+
+def test_mask_bounding_box():
+    """Test the bounding box of a mask."""
+    _, target = _masks((8, 6, 7))
+    assert mask_bounding_box(target) == (slice(3, 6), slice(2, 4), slice(1, 5))
+    assert mask_bounding_box(np.zeros((2, 2, 2), dtype=bool)) is None
+
+
+def test_plan_roi_statistics():
+    """Test that statistics of all plan ROIs are computed and written back."""
+    rng = np.random.default_rng(3)
+    volume = rng.integers(0, 2000, size=(8, 6, 7)).astype(np.uint16)
+    body_mask, target_mask = _masks(volume.shape)
+    body = ROI(name="Body")
+    target = ROI(name="PTV")
+    untouched = ROI(name="Couch", pixel_mean=12.0)
+    empty = ROI(name="Empty")
+    plan = Plan(roi_list=[body, target, untouched, empty])
+    plan.primary_ct_image_set = _image_set(volume)
+
+    results = plan.update_roi_statistics(
+        {
+            body: body_mask,
+            target: target_mask,
+            empty: np.zeros(volume.shape, dtype=bool),
+        },
+        chunk_size=3,
+    )
+
+    values = volume[target_mask].astype(np.float64)
+    assert target.pixel_min == values.min()
+    assert target.pixel_max == values.max()
+    assert target.pixel_mean == pytest.approx(values.mean())
+    assert target.pixel_std == pytest.approx(values.std())
+    assert target.volume == pytest.approx(values.size * 0.1 * 0.1 * 0.25)
+    assert body.pixel_mean == pytest.approx(volume.mean())
+    assert untouched.pixel_mean == 12.0
+    assert untouched not in results
+    assert empty.volume == 0.0
+    assert empty.pixel_mean is None
+
+
+def test_roi_statistics_from_file(tmp_path):
+    """Test that only the slabs covered by the ROIs are read from a lazy image set."""
+    volume = np.arange(8 * 6 * 7, dtype=np.uint16).reshape(8, 6, 7)
+    (tmp_path / "ImageSet_0.img").write_bytes(volume.astype(">u2").tobytes())
+    image_set = ImageSet(x_dim=7, y_dim=6, z_dim=8, byte_order=1)
+    image_set = ImageSetReader.read_image_set(
+        tmp_path / "ImageSet_0", image_set, lazy=True
+    )
+    _, target_mask = _masks(volume.shape)
+    target = ROI(name="PTV")
+
+    results = compute_roi_statistics(
+        image_set, [target], {target: target_mask}, write=False
+    )
+    assert results[target].mean == pytest.approx(volume[target_mask].mean())
+    assert target.pixel_mean is None
+    assert np.array_equal(image_set.get_slab_data(3, 5), volume[3:5])
+
+    with pytest.raises(ValueError):
+        compute_roi_statistics(
+            image_set, [target], {target: np.ones((2, 2, 2), dtype=bool)}
+        )
@@ -0,0 +1,86 @@
+"""
+Tests for the array-backed spatial types.
+"""
+
+import numpy as np
+import pytest
+
+from pinnacle_io.models import (
+    ContinuousIndex,
+    Coordinate,
+    CoordinateArray,
+    Dimension,
+    Index,
+    IndexArray,
+)
+
+
+def test_coordinate_array_semantics():
+    """Test validation, views, distances and arithmetic of CoordinateArray."""
+    points = np.array(
+        [[0.0, 0.0, 0.0], [3.0, 4.0, 0.0], [1.5, -2.5, 7.25]], dtype=np.float32
+    )
+    coordinates = CoordinateArray(points)
+    assert coordinates.array is points
+    assert np.asarray(coordinates) is points
+    coordinates.x[0] = 1.0
+    assert points[0, 0] == 1.0
+    points[0, 0] = 0.0
+
+    assert coordinates[1] == Coordinate(3.0, 4.0, 0.0)
+    assert isinstance(coordinates[1:], CoordinateArray) and len(coordinates[1:]) == 2
+    assert [c.to_list() for c in coordinates] == points.tolist()
+    with pytest.raises(ValueError):
+        CoordinateArray(np.zeros((4, 2)))
+
+    origin = Coordinate(0.0, 0.0, 0.0)
+    np.testing.assert_allclose(
+        coordinates.distance_to(origin), [0.0, 5.0, np.sqrt(1.5**2 + 2.5**2 + 7.25**2)]
+    )
+    assert coordinates.distance_to(origin)[1] == Coordinate(3.0, 4.0, 0.0).distance_to(
+        origin
+    )
+    np.testing.assert_allclose(coordinates.distance_to(coordinates), 0.0)
+
+    shifted = coordinates + Coordinate(1.0, 2.0, 3.0)
+    np.testing.assert_allclose(shifted.array, points + [1.0, 2.0, 3.0])
+    np.testing.assert_allclose((2 * coordinates - coordinates).array, points)
+    np.testing.assert_allclose(
+        (coordinates / np.array([1.0, 2.0, 4.0])).array, points / [1.0, 2.0, 4.0]
+    )
+    np.testing.assert_allclose((1.0 - coordinates).array, 1.0 - points)
+    assert CoordinateArray(
+        [Coordinate(1, 2, 3), Coordinate(4, 5, 6)]
+    ) == CoordinateArray([[1, 2, 3], [4, 5, 6]])
+    assert CoordinateArray(Coordinate(1, 2, 3))[0] == Coordinate(1, 2, 3)
+
+
+def test_index_array_rounding_and_containment():
+    """Test rounding, to_index and Dimension.contains on index arrays."""
+    continuous = CoordinateArray([[0.4, 1.5, 2.6], [2.5, 0.0, 9.9]])
+    for i, value in enumerate(continuous):
+        scalar = ContinuousIndex(value.x, value.y, value.z)
+        assert continuous.to_index()[i] == scalar.to_index()
+        assert continuous.round()[i].to_list() == scalar.round().to_list()
+
+    indices = continuous.to_index()
+    assert isinstance(indices, IndexArray) and indices.array.dtype == np.int64
+    np.testing.assert_array_equal(Dimension(3, 3, 5).contains(indices), [True, False])
+    assert Dimension(3, 3, 5).contains(Index(0, 1, 2))
+
+    raw = np.array([[1, 2, 3]], dtype=np.int32)
+    assert IndexArray(raw).array is raw
+    assert IndexArray(raw)[0] == Index(1, 2, 3)
+    assert (IndexArray(raw) + 1)[0] == Index(2, 3, 4)
+    assert isinstance(IndexArray(raw) * 0.5, CoordinateArray)
+    np.testing.assert_array_equal(
+        IndexArray(raw).to_continuous().array, [[1.0, 2.0, 3.0]]
+    )
+    assert IndexArray(raw).to_flat(Dimension(4, 4, 4)) == [3 * 16 + 2 * 4 + 1]
+
+    with pytest.raises(ValueError):
+        IndexArray([[0, -1, 0]])
+    with pytest.raises(ValueError):
+        IndexArray([[0.5, 1, 0]])
+    with pytest.raises(ValueError):
+        CoordinateArray([[-1.5, 0, 0]]).to_index()
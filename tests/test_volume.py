@@ -0,0 +1,99 @@
+"""
+Tests for the canonical (z, y, x) Volume shared by ImageSet and Dose.
+"""
+
+import numpy as np
+import pytest
+
+from pinnacle_io.models import Dose, DoseGrid, ImageSet, Volume
+from pinnacle_io.models.volume import BIG_ENDIAN, LITTLE_ENDIAN
+
+
+def _volume(shape=(3, 4, 5), dtype=np.uint16):
+    return np.arange(np.prod(shape), dtype=dtype).reshape(shape)
+
+
+def test_volume_views():
+    """Test that axial, coronal and sagittal slices are views with the expected shapes."""
+    array = _volume()
+    volume = Volume(array)
+
+    assert volume.shape == (3, 4, 5)
+    assert volume.dimensions == (5, 4, 3)
+    assert len(volume) == 3
+    assert volume.axial(1).shape == (4, 5)
+    assert volume.coronal(2).shape == (3, 5)
+    assert volume.sagittal(3).shape == (3, 4)
+    assert np.shares_memory(volume.axial(1), array)
+    assert np.shares_memory(volume.coronal(2), array)
+    assert np.shares_memory(volume.sagittal(3), array)
+    assert np.array_equal(volume.get_slice(2, "coronal"), array[:, 2, :])
+    assert volume.get_value(4, 3, 2) == array[2, 3, 4]
+    assert volume.contains(4, 3, 2)
+    assert not volume.contains(5, 0, 0)
+
+
+def test_volume_get_slice_errors():
+    """Test that invalid orientations and indices are rejected."""
+    volume = Volume(_volume())
+
+    with pytest.raises(ValueError):
+        volume.get_slice(0, "oblique")
+    with pytest.raises(IndexError):
+        volume.get_slice(5, "sagittal")
+    with pytest.raises(ValueError):
+        Volume(np.zeros((4, 5)))
+
+
+def test_volume_pinnacle_dtype():
+    """Test dtypes derived from BytesPix and ByteOrder."""
+    assert Volume.pinnacle_dtype(2, LITTLE_ENDIAN) == np.dtype("<u2")
+    assert Volume.pinnacle_dtype(2, BIG_ENDIAN) == np.dtype(">u2")
+    assert Volume.pinnacle_dtype(None, None) == np.dtype("<u2")
+    assert Volume.pinnacle_dtype(4, BIG_ENDIAN, "f") == np.dtype(">f4")
+
+    volume = Volume(_volume().astype(">u2"))
+    assert volume.byte_order == BIG_ENDIAN
+    native = volume.to_native()
+    assert native.dtype.isnative
+    assert np.array_equal(native, _volume())
+    native_array = _volume()
+    assert Volume(native_array).to_native() is native_array
+
+
+def test_volume_from_file_and_bytes(tmp_path):
+    """Test reading a volume with a binary header and wrapping raw bytes."""
+    array = _volume(dtype=">u2")
+    path = tmp_path / "volume.img"
+    path.write_bytes(b"\0" * 8 + array.tobytes())
+
+    volume = Volume.from_file(path, array.shape, ">u2", binary_header_size=8)
+    assert volume.binary_header_size == 8
+    assert volume.byte_order == BIG_ENDIAN
+    assert np.array_equal(volume, array)
+
+    mapped = Volume.from_file(path, array.shape, ">u2", binary_header_size=8, mmap=True)
+    assert isinstance(mapped.array, np.memmap)
+    assert np.array_equal(mapped.axial(2), array[2])
+
+    with pytest.raises(ValueError):
+        Volume.from_file(path, (4, 4, 5), ">u2", binary_header_size=8)
+
+    decoded = Volume.from_bytes(array.tobytes(), array.shape, ">u2")
+    assert np.array_equal(decoded, array)
+    assert decoded.tobytes() == array.tobytes()
+
+
+def test_image_set_and_dose_share_axis_order():
+    """Test that ImageSet and Dose expose (z, y, x) volumes with identical indexing."""
+    array = _volume()
+    image_set = ImageSet(x_dim=5, y_dim=4, z_dim=3, pixel_data=array)
+    dose_grid = DoseGrid(dimension_x=5, dimension_y=4, dimension_z=3)
+    dose = Dose(
+        dose_grid=dose_grid, dose_grid_scaling=1.0, pixel_data=array.astype(np.float32)
+    )
+
+    assert image_set.volume.shape == dose.volume.shape == (3, 4, 5)
+    assert np.array_equal(image_set.get_slice_data(2), dose.get_slice_data(2))
+    assert dose.get_dose_value(4, 3, 2) == float(array[2, 3, 4])
+    assert dose.get_dose_value(5, 0, 0) is None